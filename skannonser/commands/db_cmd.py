@@ -1,5 +1,4 @@
-import sqlite3
-from datetime import datetime
+import time
 from pathlib import Path
 
 import typer
@@ -13,36 +12,68 @@ app = typer.Typer(no_args_is_help=True, help="Database maintenance")
 @app.command()
 def backup(
     dest_dir: Path = typer.Option(Path("backups"), help="Backup directory"),
-    keep: int = typer.Option(30, help="How many newest backups to keep (0 = keep all)"),
+    keep: int = typer.Option(30, help="How many newest restore points to keep (0 = keep all)"),
+    compress: bool = typer.Option(False, "--compress", help="gzip the full copy"),
+    incremental: bool = typer.Option(
+        False, "--incremental",
+        help="Store only the pages changed since the previous backup (implies --compress)",
+    ),
+    full_every: int = typer.Option(
+        7, "--full-every", help="With --incremental: start a new full copy every N points"
+    ),
+    step_pages: int = typer.Option(
+        2048, "--step-pages", help="Pages copied per backup step (writers run in between)"
+    ),
 ) -> None:
-    """Copy the live DB via SQLite's online backup API (safe under WAL)."""
+    """Copy the live DB via SQLite's online backup API (safe under WAL), in
+    page steps, verified with integrity_check; see skannonser.store.backup."""
+    from skannonser.store.backup import BackupError, create_backup, prune
+
     src = get_secrets().db_path
     if not src.exists():
         typer.echo(f"Error: database not found at {src}", err=True)
         raise typer.Exit(code=1)
-    dest_dir.mkdir(parents=True, exist_ok=True)
-    dest = dest_dir / f"properties-{datetime.now().strftime('%Y%m%d-%H%M%S')}.db"
-    src_conn = sqlite3.connect(f"file:{src}?mode=ro", uri=True)
-    dest_conn = sqlite3.connect(dest)
-    dest_closed = False
     try:
-        with dest_conn:
-            src_conn.backup(dest_conn)
-    except Exception:
-        dest_conn.close()
-        dest_closed = True
-        dest.unlink(missing_ok=True)
-        raise
-    finally:
-        src_conn.close()
-        if not dest_closed:
-            dest_conn.close()
-    typer.echo(f"Backed up {src} -> {dest}")
+        entry = create_backup(
+            src, dest_dir, compress=compress, incremental=incremental,
+            full_every=full_every, step_pages=step_pages,
+        )
+    except BackupError as exc:
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(f"Backed up {src} -> {dest_dir / entry['file']}")
+    typer.echo(
+        f"{entry['kind']}: {entry['changed_pages']}/{entry['pages']} pages, "
+        f"{entry['db_bytes']} -> {entry['written_bytes']} bytes in {entry['seconds']:.2f}s, "
+        f"integrity {entry['integrity']}"
+    )
     if keep > 0:
-        backups = sorted(dest_dir.glob("properties-*.db"))
-        for old in backups[:-keep]:
-            old.unlink()
-            typer.echo(f"Pruned {old.name}")
+        for name in prune(dest_dir, keep):
+            typer.echo(f"Pruned {name}")
+
+
+@app.command()
+def restore(
+    point: str = typer.Argument("latest", help="Restore point (properties-YYYYMMDD-HHMMSS) or 'latest'"),
+    dest_dir: Path = typer.Option(Path("backups"), help="Backup directory"),
+    to: Path | None = typer.Option(None, "--to", help="Where to write the DB (default: the live DB path)"),
+    force: bool = typer.Option(False, "--force", help="Overwrite an existing file at the target"),
+) -> None:
+    """Rebuild a restore point (full copy plus its deltas), verified, in one
+    step. Stop everything writing to the DB before restoring over it."""
+    from skannonser.store.backup import BackupError
+    from skannonser.store.backup import restore as run_restore
+
+    target = to if to is not None else get_secrets().db_path
+    try:
+        result = run_restore(dest_dir, point, target, force=force)
+    except BackupError as exc:
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(
+        f"Restored {result['point']} -> {target} "
+        f"({len(result['chain'])} file(s), {result['bytes']} bytes in {result['seconds']:.2f}s)"
+    )
 
 
 @app.command()
@@ -75,3 +106,65 @@ def stats() -> None:
     for t in tables:
         n = conn.execute(f'SELECT COUNT(*) AS n FROM "{t}"').fetchone()["n"]
         typer.echo(f"{t}: {n}")
+
+
+@app.command()
+def optimize(
+    vacuum: bool = typer.Option(False, "--vacuum", help="Full VACUUM (rewrites the file; locks writers out)"),
+    incremental: bool = typer.Option(
+        False, "--incremental",
+        help="Incremental vacuum (with --vacuum: switch the file to auto_vacuum=incremental)",
+    ),
+) -> None:
+    """ANALYZE + PRAGMA optimize, WAL checkpoint/truncate, fragmentation report,
+    optional VACUUM."""
+    from skannonser.store.maintenance import optimize as run_optimize
+
+    db_path = get_secrets().db_path
+    if not db_path.exists():
+        typer.echo(f"Error: database not found at {db_path}", err=True)
+        raise typer.Exit(code=1)
+    conn = connection.connect(db_path, profile="maintenance")
+    try:
+        report = run_optimize(conn, db_path, vacuum=vacuum, incremental=incremental)
+    finally:
+        conn.close()
+    before, after = report["before"], report["after"]
+    for key in ("pages", "free_pages", "db_bytes", "wal_bytes", "fragmentation"):
+        old, new = before[key], after[key]
+        if key == "fragmentation" and old is not None:
+            old, new = f"{old:.1%}", f"{new:.1%}"
+        typer.echo(f"{key}: {old} -> {new}")
+    typer.echo(f"auto_vacuum: {before['auto_vacuum']} -> {after['auto_vacuum']}")
+    for name, seconds in report["timings"].items():
+        typer.echo(f"{name}: {seconds:.2f}s")
+    for note in report["notes"]:
+        typer.echo(f"note: {note}")
+
+
+@app.command(name="rebuild-listing-view")
+def rebuild_listing_view(
+    check: bool = typer.Option(
+        False, "--check", help="Only report drift from the source join; exit 1 if any"
+    ),
+) -> None:
+    """Re-materialize listing_view (migration 023) from scratch."""
+    from skannonser.store.repositories.listing_view import ListingViewRepo
+
+    db_path = get_secrets().db_path
+    if not db_path.exists():
+        typer.echo(f"Error: database not found at {db_path}", err=True)
+        raise typer.Exit(code=1)
+    conn = connection.connect(db_path, profile="batch-writer")
+    if migrations.pending(conn):
+        typer.echo("Error: pending migrations - run 'skannonser db migrate' first", err=True)
+        raise typer.Exit(code=1)
+    repo = ListingViewRepo(conn)
+    typer.echo(f"pending: {repo.pending()}")
+    drifted = repo.drift()
+    typer.echo(f"drift: {len(drifted)}" + (f" ({', '.join(drifted[:10])})" if drifted else ""))
+    if check:
+        raise typer.Exit(code=1 if drifted else 0)
+    started = time.monotonic()
+    rows = repo.rebuild()
+    typer.echo(f"rebuilt: {rows} rows in {time.monotonic() - started:.2f}s")
@@ -24,6 +24,7 @@ from skannonser.gateway import BudgetExceeded, Gateway
 from skannonser.ingest.finn.refresh import MODES as REFRESH_MODES
 from skannonser.ingest.finn.refresh import refresh_listings
 from skannonser.nightly import run_nightly, run_sheets
+from skannonser.parallel import resolve_workers
 from skannonser.pipeline import FAILURE_RATE_THRESHOLD, run_dnb_ingest, run_finn_ingest
 from skannonser.publish.sheets_client import SheetsClient
 from skannonser.store import connection, migrations
@@ -31,6 +32,23 @@ from skannonser.store import connection, migrations
 app = typer.Typer(no_args_is_help=True, help="Run ingest pipelines")
 
 
+def _loggable(stats: dict) -> dict:
+    """`stats` for a log line: `deactivated_keys` (every finnkode/url the
+    ingest deactivated -- thousands on a bad day) is shown as its count. The
+    full list stays in the returned stats for callers that want it."""
+    if not isinstance(stats, dict) or not isinstance(stats.get("deactivated_keys"), list):
+        return stats
+    return {**stats, "deactivated_keys": len(stats["deactivated_keys"])}
+
+
+def _loggable_nightly(result: dict) -> dict:
+    steps = {
+        name: {**step, "stats": _loggable(step["stats"])} if "stats" in step else step
+        for name, step in result["steps"].items()
+    }
+    return {**result, "steps": steps}
+
+
 def _failure_rate_ok(source: str, stats: dict) -> bool:
     """Report (not enforce) the failure-rate breach for operator/cron
     visibility. The actual protection -- skipping mark_inactive /
@@ -102,6 +120,10 @@ def ingest(
     project_dir: Path = typer.Option(
         Path("data/eiendom"), help="FINN ad HTML cache root"
     ),
+    workers: int = typer.Option(
+        1, "--workers",
+        help="Parse worker processes (0 = every core). Fetching stays single-stream and paced.",
+    ),
 ) -> None:
     """Run the FINN and/or DNB ingest pipeline against the configured (or
     overridden) database. Non-interactive; exits non-zero if any run
@@ -115,7 +137,7 @@ def ingest(
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
 
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if not _require_no_pending_migrations(conn):
         raise typer.Exit(code=1)
     domain = load_domain()
@@ -129,9 +151,13 @@ def ingest(
         # parallel-run era. Separate from legacy's archive dir until
         # phase-4 cutover.
         stats = run_finn_ingest(
-            domain, conn, project_dir, archive_dir=project_dir / "html_crawled_rebuild"
+            domain,
+            conn,
+            project_dir,
+            archive_dir=project_dir / "html_crawled_rebuild",
+            workers=resolve_workers(workers),
         )
-        typer.echo(f"finn: {stats}")
+        typer.echo(f"finn: {_loggable(stats)}")
         if not _crawled_ok("finn", stats):
             ok = False
         if not _failure_rate_ok("finn", stats):
@@ -141,7 +167,7 @@ def ingest(
 
     if source in ("dnb", "all"):
         stats = run_dnb_ingest(domain, conn)
-        typer.echo(f"dnb: {stats}")
+        typer.echo(f"dnb: {_loggable(stats)}")
         if not _crawled_ok("dnb", stats):
             ok = False
         if not _failure_rate_ok("dnb", stats):
@@ -162,6 +188,10 @@ def refresh(
     project_dir: Path = typer.Option(
         Path("data/eiendom"), help="FINN ad HTML cache root"
     ),
+    workers: int = typer.Option(
+        1, "--workers",
+        help="Parse worker processes (0 = every core). Fetching stays single-stream and paced.",
+    ),
 ) -> None:
     """Re-download listings from FINN.no and record status changes to
     `eiendom_status_history`. Never touches `active` -- that lifecycle is
@@ -178,12 +208,14 @@ def refresh(
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
 
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if not _require_no_pending_migrations(conn):
         raise typer.Exit(code=1)
     domain = load_domain()
 
-    stats = refresh_listings(conn, domain, project_dir, mode)
+    stats = refresh_listings(
+        conn, domain, project_dir, mode, workers=resolve_workers(workers)
+    )
     typer.echo(f"refresh ({mode}): {stats}")
 
 
@@ -206,7 +238,7 @@ def geocode(
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
 
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if not _require_no_pending_migrations(conn):
         raise typer.Exit(code=1)
 
@@ -216,12 +248,11 @@ def geocode(
         raise typer.Exit(code=1)
 
     domain = load_domain()
-    gateway = Gateway(conn, domain.budget)
-
     try:
-        stats = run_geocode(
-            conn, domain, gateway, api_key, limit=limit, include_inactive=include_inactive
-        )
+        with Gateway(conn, domain.budget) as gateway:
+            stats = run_geocode(
+                conn, domain, gateway, api_key, limit=limit, include_inactive=include_inactive
+            )
     except BudgetExceeded:
         typer.echo("geocode budget exhausted - resumes next window", err=True)
         raise typer.Exit(code=3)
@@ -257,7 +288,7 @@ def enrich(
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
 
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if not _require_no_pending_migrations(conn):
         raise typer.Exit(code=1)
 
@@ -267,12 +298,11 @@ def enrich(
         raise typer.Exit(code=1)
 
     domain = load_domain()
-    gateway = Gateway(conn, domain.budget)
-
     try:
-        stats = run_enrich(
-            conn, domain, gateway, api_key, targets=targets, force_api=force_api
-        )
+        with Gateway(conn, domain.budget) as gateway:
+            stats = run_enrich(
+                conn, domain, gateway, api_key, targets=targets, force_api=force_api
+            )
     except BudgetExceeded:
         typer.echo("enrich budget exhausted - resumes next window", err=True)
         raise typer.Exit(code=3)
@@ -342,7 +372,7 @@ def enrich_sold(
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
 
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if not _require_no_pending_migrations(conn):
         raise typer.Exit(code=1)
 
@@ -406,7 +436,7 @@ def enrich_dnb(
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
 
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if not _require_no_pending_migrations(conn):
         raise typer.Exit(code=1)
 
@@ -416,10 +446,9 @@ def enrich_dnb(
         raise typer.Exit(code=1)
 
     domain = load_domain()
-    gateway = Gateway(conn, domain.budget)
-
     try:
-        stats = run_dnb_travel(conn, domain, gateway, api_key, limit=limit)
+        with Gateway(conn, domain.budget) as gateway:
+            stats = run_dnb_travel(conn, domain, gateway, api_key, limit=limit)
     except BudgetExceeded:
         typer.echo("dnb travel budget exhausted - resumes next window", err=True)
         raise typer.Exit(code=3)
@@ -429,6 +458,9 @@ def enrich_dnb(
 
 @app.command(name="validate-travel")
 def validate_travel_cmd(
+    include_inactive: bool = typer.Option(
+        False, "--include-inactive", help="Also scan inactive/solgt/inaktiv listings"
+    ),
     db: Path | None = typer.Option(
         None, "--db", help="Override the DB path for this run (supervised parallel runs)"
     ),
@@ -444,7 +476,7 @@ def validate_travel_cmd(
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
 
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     domain = load_domain()
 
     findings = validate_travel(
@@ -452,6 +484,7 @@ def validate_travel_cmd(
         domain,
         radius_m=domain.travel.reuse_within_meters,
         max_travel_minutes=domain.travel.max_travel_minutes,
+        include_inactive=include_inactive,
     )
 
     typer.echo("=" * 72)
@@ -509,7 +542,7 @@ def sheets(
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
 
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if not _require_no_pending_migrations(conn):
         raise typer.Exit(code=1)
 
@@ -536,6 +569,10 @@ def nightly(
             "instead of touching Sheets"
         ),
     ),
+    workers: int = typer.Option(
+        1, "--workers",
+        help="Parse worker processes (0 = every core). Fetching stays single-stream and paced.",
+    ),
 ) -> None:
     """The legacy `make full` cron replacement: ingest finn -> ingest dnb ->
     geocode -> enrich(all) -> enrich(mvv_uni) -> enrich-dnb ->
@@ -549,7 +586,7 @@ def nightly(
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
 
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if not _require_no_pending_migrations(conn):
         raise typer.Exit(code=1)
 
@@ -574,11 +611,18 @@ def nightly(
         client = SheetsClient(get_secrets().spreadsheet_id)
 
     domain = load_domain()
-    gateway = Gateway(conn, domain.budget)
-
-    result = run_nightly(conn, domain, gateway, api_key, client, sheets_writer=sheets_writer)
+    with Gateway(conn, domain.budget) as gateway:
+        result = run_nightly(
+            conn,
+            domain,
+            gateway,
+            api_key,
+            client,
+            sheets_writer=sheets_writer,
+            workers=resolve_workers(workers),
+        )
 
-    typer.echo(f"nightly: {result}")
+    typer.echo(f"nightly: {_loggable_nightly(result)}")
     if result["budget_exhausted"]:
         typer.echo(
             "nightly: budget exhausted on: " + ", ".join(result["budget_exhausted"]), err=True
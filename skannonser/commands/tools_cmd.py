@@ -9,11 +9,13 @@ Typer or CLI wiring). It's re-exported here so
 resolves, matching the task brief's stated interface path; the command below
 is a thin wrapper.
 """
+import time
 from pathlib import Path
 
 import typer
 
 from skannonser.config.settings import get_secrets
+from skannonser.parallel import resolve_workers
 from skannonser.publish.annotations import import_sheet_annotations
 from skannonser.publish.sheets_client import SheetsClient
 from skannonser.store import connection, migrations
@@ -36,7 +38,7 @@ def import_sheet_annotations_cmd(
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
 
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     pending = migrations.pending(conn)
     if pending:
         typer.echo("Error: pending migrations - run 'skannonser db migrate' first", err=True)
@@ -52,6 +54,13 @@ def import_sheet_annotations_cmd(
     typer.echo(f"import-sheet-annotations ({tab}): {result}")
 
 
+def _throughput(result: dict, elapsed: float) -> str:
+    """Closing line of a backfill: ads walked this run, wall time, ads/s."""
+    walked = result["parsed"] + result["missing_html"] + result["skipped"]
+    rate = walked / elapsed if elapsed > 0 else 0.0
+    return f"throughput: {walked} ads in {elapsed:.1f}s ({rate:.1f} ads/s)"
+
+
 @app.command(name="backfill-details")
 def backfill_details_cmd(
     db: Path | None = typer.Option(None, "--db", help="Override the DB path for this run"),
@@ -60,10 +69,18 @@ def backfill_details_cmd(
     ),
     wipe: bool = typer.Option(False, "--wipe", help="Clear both details tables first, then rebuild"),
     status: bool = typer.Option(False, "--status", help="Print coverage only; parse nothing"),
+    workers: int = typer.Option(
+        1, "--workers", help="Parse worker processes (0 = every core). Writes stay single-stream."
+    ),
+    resume: bool = typer.Option(
+        True, "--resume/--restart",
+        help="Continue after an interrupted run's last committed batch (default), or start over",
+    ),
 ) -> None:
     """(Re)build the listing_details/listing_facilities derived cache from
     already-downloaded ad HTML. Purely local -- zero FINN traffic. Safe to
-    re-run any time; use --wipe after a parser change."""
+    re-run any time; use --wipe after a parser change. An interrupted run
+    resumes where it stopped unless --restart is given."""
     from skannonser.ingest.finn.backfill import backfill_details
     from skannonser.store.repositories.details import DetailsRepo
 
@@ -71,7 +88,7 @@ def backfill_details_cmd(
     if not db_path.exists():
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if migrations.pending(conn):
         typer.echo("Error: pending migrations - run 'skannonser db migrate' first", err=True)
         raise typer.Exit(code=1)
@@ -80,8 +97,12 @@ def backfill_details_cmd(
         typer.echo(f"backfill-details coverage: {DetailsRepo(conn).coverage()}")
         return
 
-    result = backfill_details(conn, project_dir, wipe=wipe)
+    started = time.monotonic()
+    result = backfill_details(
+        conn, project_dir, wipe=wipe, workers=resolve_workers(workers), resume=resume
+    )
     typer.echo(f"backfill-details: {result}")
+    typer.echo(_throughput(result, time.monotonic() - started))
 
 
 @app.command(name="backfill-salgsoppgave")
@@ -92,10 +113,18 @@ def backfill_salgsoppgave_cmd(
     ),
     wipe: bool = typer.Option(False, "--wipe", help="Clear the salgsoppgave tables first, then rebuild"),
     status: bool = typer.Option(False, "--status", help="Print coverage only; parse nothing"),
+    workers: int = typer.Option(
+        1, "--workers", help="Parse worker processes (0 = every core). Writes stay single-stream."
+    ),
+    resume: bool = typer.Option(
+        True, "--resume/--restart",
+        help="Continue after an interrupted run's last committed batch (default), or start over",
+    ),
 ) -> None:
     """(Re)build the listing_salgsoppgave derived cache from already-downloaded
     ad HTML. Purely local -- zero FINN traffic, zero API calls. Safe to re-run
-    any time; use --wipe after a parser change."""
+    any time; use --wipe after a parser change. An interrupted run resumes
+    where it stopped unless --restart is given."""
     from skannonser.ingest.finn.backfill_salgsoppgave import backfill_salgsoppgave
     from skannonser.store.repositories.salgsoppgave import SalgsoppgaveRepo
 
@@ -104,7 +133,7 @@ def backfill_salgsoppgave_cmd(
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
 
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if migrations.pending(conn):
         typer.echo("Error: pending migrations - run 'skannonser db migrate' first", err=True)
         raise typer.Exit(code=1)
@@ -114,11 +143,131 @@ def backfill_salgsoppgave_cmd(
         typer.echo(f"backfill-salgsoppgave status: {repo.coverage()}")
         return
 
-    result = backfill_salgsoppgave(conn, project_dir, wipe=wipe)
+    started = time.monotonic()
+    result = backfill_salgsoppgave(
+        conn, project_dir, wipe=wipe, workers=resolve_workers(workers), resume=resume
+    )
     typer.echo(f"backfill-salgsoppgave: {result}")
+    typer.echo(_throughput(result, time.monotonic() - started))
     typer.echo(f"coverage: {repo.coverage()}")
 
 
+@app.command(name="parser-equivalence")
+def parser_equivalence_cmd(
+    backend: str = typer.Option("lxml", "--backend", help="Candidate HTML parser backend"),
+    project_dir: Path = typer.Option(
+        Path("data/eiendom"), "--project-dir", help="FINN cache root (html_extracted/ lives here)"
+    ),
+    fixtures: Path = typer.Option(
+        Path("tests/rebuild/fixtures/finn"), "--fixtures",
+        help="Golden fixture dir, compared first (skipped if absent)",
+    ),
+    limit: int | None = typer.Option(None, "--limit", help="Stop after this many ads"),
+    show: int = typer.Option(20, "--show", help="Print at most this many differences"),
+) -> None:
+    """Parse every golden fixture and cached ad under both the reference
+    (html.parser) and --backend, and report each field that differs. Exits
+    non-zero on any difference -- run before setting SKANNONSER_HTML_PARSER.
+    Purely local."""
+    from skannonser.ingest.finn.equivalence import ad_files, compare_corpus
+
+    paths = ad_files(fixtures, project_dir / "html_extracted")
+    try:
+        report = compare_corpus(paths, backend, limit=limit)
+    except Exception as exc:  # unknown backend, or lxml not installed
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(code=1)
+
+    for diff in report.diffs[:show]:
+        typer.echo(
+            f"{diff.finnkode} {diff.extractor}.{diff.field}: "
+            f"{diff.reference!r} != {diff.candidate!r}"
+        )
+    timings = ", ".join(f"{name} {secs:.1f}s" for name, secs in report.seconds.items())
+    typer.echo(
+        f"parser-equivalence ({backend}): {report.ads} ads, "
+        f"{report.differing_ads} differing, {len(report.diffs)} field diffs; {timings}"
+    )
+    if not report.identical:
+        raise typer.Exit(code=1)
+
+
+@app.command(name="compact-html-cache")
+def compact_html_cache_cmd(
+    project_dir: Path = typer.Option(
+        Path("data/eiendom"), "--project-dir", help="FINN cache root (html_extracted/ lives here)"
+    ),
+) -> None:
+    """One-shot migration of html_extracted/ to the compressed layout:
+    every legacy `{finnkode}.html` becomes `{finnkode}.html.gz` plus a
+    `{finnkode}.sha256` sidecar. Idempotent and safe to interrupt (each file
+    is converted atomically). Snapshots are left as they are. Purely local."""
+    from skannonser.ingest.finn.html_cache import compact_cache
+
+    started = time.monotonic()
+    stats = compact_cache(project_dir)
+    saved = stats["bytes_before"] - stats["bytes_after"]
+    typer.echo(f"compact-html-cache: {stats}")
+    typer.echo(
+        f"saved {saved / 1e6:.1f} MB in {time.monotonic() - started:.1f}s"
+    )
+
+
+@app.command(name="pack-snapshots")
+def pack_snapshots_cmd(
+    project_dir: Path = typer.Option(
+        Path("data/eiendom"), "--project-dir", help="FINN cache root (html_snapshots/ lives here)"
+    ),
+) -> None:
+    """One-shot migration of html_snapshots/: fold every loose
+    `{uid}.{YYYYMMDD}.html.gz` into its monthly delta-encoded pack and
+    delete it. Idempotent and safe to interrupt (a file is removed only
+    after its row is committed). Purely local."""
+    from skannonser.ingest.finn.snapshot_archive import SnapshotArchive
+
+    started = time.monotonic()
+    stats = SnapshotArchive(project_dir / "html_snapshots").pack_loose()
+    typer.echo(f"pack-snapshots: {stats}")
+    typer.echo(f"done in {time.monotonic() - started:.1f}s")
+
+
+@app.command(name="extract-history")
+def extract_history_cmd(
+    db: Path | None = typer.Option(None, "--db", help="Override the DB path for this run"),
+    project_dir: Path = typer.Option(
+        Path("data/eiendom"), "--project-dir", help="FINN cache root (html_snapshots/ lives here)"
+    ),
+    workers: int = typer.Option(
+        1, "--workers", help="Parse worker processes (0 = every core). Writes stay single-stream."
+    ),
+    rebuild: bool = typer.Option(
+        False, "--rebuild", help="Forget all extracted history first and re-parse every snapshot"
+    ),
+) -> None:
+    """Fold the dated ad-HTML snapshots into listing_history (price, status
+    and cost changes per ad). Incremental: only snapshots newer than the last
+    run are parsed. Purely local -- zero FINN traffic."""
+    from skannonser.ingest.finn.history import extract_history
+
+    db_path = db if db is not None else get_secrets().db_path
+    if not db_path.exists():
+        typer.echo(f"Error: database not found at {db_path}", err=True)
+        raise typer.Exit(code=1)
+    conn = connection.connect(db_path, profile="batch-writer")
+    if migrations.pending(conn):
+        typer.echo("Error: pending migrations - run 'skannonser db migrate' first", err=True)
+        raise typer.Exit(code=1)
+
+    started = time.monotonic()
+    result = extract_history(
+        conn, project_dir, workers=resolve_workers(workers), rebuild=rebuild
+    )
+    elapsed = time.monotonic() - started
+    rate = result["snapshots"] / elapsed if elapsed > 0 else 0.0
+    typer.echo(f"extract-history: {result}")
+    typer.echo(f"throughput: {result['snapshots']} snapshots in {elapsed:.1f}s ({rate:.1f}/s)")
+
+
 @app.command(name="classify-tilstand")
 def classify_tilstand_cmd(
     db: Path | None = typer.Option(None, "--db", help="Override the DB path for this run"),
@@ -146,6 +295,10 @@ def classify_tilstand_cmd(
         help="Stage-1 harness: blind-estimate ads that carry surveyor-stated "
              "costs and score against them. Calls the API; respects --limit."),
     status: bool = typer.Option(False, "--status", help="Print coverage only"),
+    workers: int = typer.Option(
+        1, "--workers",
+        help="Input-building worker processes (0 = every core). API calls stay sequential.",
+    ),
 ) -> None:
     """Classify TG2/TG3 condition findings from cached salgsoppgave text
     (Claude Opus 5). COSTS MONEY on uncached ads -- run staged: --limit 200,
@@ -163,7 +316,7 @@ def classify_tilstand_cmd(
     if not db_path.exists():
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if migrations.pending(conn):
         typer.echo("Error: pending migrations - run 'skannonser db migrate' first", err=True)
         raise typer.Exit(code=1)
@@ -186,9 +339,13 @@ def classify_tilstand_cmd(
     if wipe:
         repo.wipe()
     if batch:
-        result = classify_tilstand_batch(conn, project_dir, limit=limit)
+        result = classify_tilstand_batch(
+            conn, project_dir, limit=limit, workers=resolve_workers(workers)
+        )
     else:
-        result = classify_tilstand(conn, project_dir, limit=limit)
+        result = classify_tilstand(
+            conn, project_dir, limit=limit, workers=resolve_workers(workers)
+        )
     typer.echo(f"classify-tilstand: {result}")
     typer.echo(f"coverage: {repo.coverage()}")
 
@@ -212,7 +369,7 @@ def export_tilstand_cache_cmd(
     if not db_path.exists():
         typer.echo(f"Error: database not found at {db_path}", err=True)
         raise typer.Exit(code=1)
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if migrations.pending(conn):
         typer.echo("Error: pending migrations - run 'skannonser db migrate' first", err=True)
         raise typer.Exit(code=1)
@@ -254,7 +411,7 @@ def import_tilstand_cache_cmd(
     if not in_.is_file():
         typer.echo(f"Error: cache file not found at {in_}", err=True)
         raise typer.Exit(code=1)
-    conn = connection.connect(db_path)
+    conn = connection.connect(db_path, profile="batch-writer")
     if migrations.pending(conn):
         typer.echo("Error: pending migrations - run 'skannonser db migrate' first", err=True)
         raise typer.Exit(code=1)
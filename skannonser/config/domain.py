@@ -26,11 +26,26 @@ class Travel(BaseModel):
 
 
 class Budget(BaseModel):
+    """Monthly caps plus the per-minute rate. `*_burst` is the token-bucket
+    capacity shared by every process on the DB: up to that many calls may go
+    back to back before the `*_rpm` spacing applies (1 = strict spacing)."""
+
     routes_monthly_cap: int
     geocode_monthly_cap: int
     warn_pcts: list[int]
     routes_rpm: int = 60
     geocode_rpm: int = 60
+    routes_burst: int = 1
+    geocode_burst: int = 1
+    # Gateway ledger rows buffered per write (1 = a commit per call).
+    ledger_batch: int = 1
+
+    @model_validator(mode="after")
+    def _rates_positive(self) -> "Budget":
+        for name in ("routes_rpm", "geocode_rpm", "routes_burst", "geocode_burst", "ledger_batch"):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be >= 1 (got {getattr(self, name)})")
+        return self
 
 
 class Destination(BaseModel):
@@ -18,6 +18,8 @@ class Secrets(BaseSettings):
         default=Path("main/database/properties.db"),
         validation_alias="SKANNONSER_DB_PATH",
     )
+    # BeautifulSoup tree builder for the extractors -- see skannonser/htmlsoup.py.
+    html_parser: str = Field(default="html.parser", validation_alias="SKANNONSER_HTML_PARSER")
 
 
 @lru_cache
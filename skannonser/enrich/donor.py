@@ -25,13 +25,25 @@ donor-*value* lookup, `_seed_mvv_uni_lookup` line 485, treats sentinels as a
 resolvable value so a known failure isn't retried forever -- but that lookup
 is built by the caller, outside this module's `resolve_mvv_uni_donor_value`,
 which only walks pre-built `links`/`values` dicts per lines 491-504.)
+
+Donor caches: legacy kept each cache as a plain list of `(lat, lng,
+finnkode)` tuples and scanned all of it for every nearest-donor lookup,
+rebuilding it to evict an acceptor. `build_donor_cache` returns a
+`DonorCache` instead -- the same tuples, in the same order, plus a finnkode
+index (O(1) membership and eviction) and a lat/lng grid that a radius query
+only reads the neighbouring cells of. Every function here also still
+accepts a plain list (the legacy linear scan), and both return the same
+donor, ties included. Likewise the pre-pass's link cascade ("everyone who
+pointed at this row now points at its donor") reads a `DonorLinkIndex`
+(donor -> the rows linking to it) instead of rescanning every row.
 """
 
 import math
-from typing import Optional
-
+from collections.abc import Iterable, Iterator
+from typing import Optional, Union
 
-EARTH_RADIUS_M = 6371000.0
+from skannonser.geo import EARTH_RADIUS_M
+from skannonser.geo import haversine_meters as _haversine_meters
 
 
 def _clean(value) -> str:
@@ -41,20 +53,6 @@ def _clean(value) -> str:
     return str(value).strip()
 
 
-def _haversine_meters(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """Byte-for-byte port of `_haversine_meters` (post_process.py:81-93)."""
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    d_phi = math.radians(lat2 - lat1)
-    d_lambda = math.radians(lng2 - lng1)
-
-    a = (
-        math.sin(d_phi / 2.0) ** 2
-        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2.0) ** 2
-    )
-    return 2.0 * EARTH_RADIUS_M * math.atan2(math.sqrt(a), math.sqrt(1.0 - a))
-
-
 def _is_valid_travel_value(value: Optional[int], max_travel_minutes: float) -> bool:
     """Port of `_is_valid_travel_value` (post_process.py:105-109).
 
@@ -73,9 +71,178 @@ def _row_has_all_valid_values(
     return all(_is_valid_travel_value(values.get(col), max_travel_minutes) for col in columns)
 
 
+DonorEntry = tuple[float, float, str]
+
+
+class DonorCache:
+    """Ordered `(lat, lng, finnkode)` donor entries with a spatial index.
+
+    Iterates, compares (`==` against a list) and appends like the list it
+    replaces; entries keep insertion order, which is what breaks distance
+    ties in `nearest`. On top of that:
+
+      - `has(finnkode)` / `discard(finnkode)` are O(1) via a finnkode index
+        (`discard` drops every entry with that finnkode, like legacy's
+        list-comprehension rebuild);
+      - `nearest(...)` buckets entries into square lat/lng grid cells whose
+        side is the query radius (built lazily on the first query, rebuilt
+        only if the radius changes) and computes haversine only for entries
+        in the cells the query circle can reach.
+
+    Degrees of longitude shrink towards the poles, so the query widens its
+    longitude cell range by `asin(sin(d) / cos(lat))` (d = the radius as an
+    angle): every point within the radius lies in a scanned cell. Circles
+    reaching a pole or the antimeridian fall back to a full scan.
+    """
+
+    def __init__(self, entries: Iterable[DonorEntry] = ()):
+        self._entries: dict[int, DonorEntry] = {}
+        self._by_finnkode: dict[str, list[int]] = {}
+        self._next_seq = 0
+        self._cell_deg: Optional[float] = None
+        self._cells: dict[tuple[int, int], dict[int, DonorEntry]] = {}
+        for entry in entries:
+            self.append(entry)
+
+    def __iter__(self) -> Iterator[DonorEntry]:
+        return iter(list(self._entries.values()))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (DonorCache, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"DonorCache({list(self)!r})"
+
+    def append(self, entry: DonorEntry) -> None:
+        lat, lng, finnkode = entry
+        entry = (lat, lng, finnkode)
+        seq = self._next_seq
+        self._next_seq += 1
+        self._entries[seq] = entry
+        self._by_finnkode.setdefault(finnkode, []).append(seq)
+        if self._cell_deg is not None:
+            self._cells.setdefault(self._cell(lat, lng), {})[seq] = entry
+
+    def has(self, finnkode: str) -> bool:
+        return finnkode in self._by_finnkode
+
+    def discard(self, finnkode: str) -> None:
+        for seq in self._by_finnkode.pop(finnkode, ()):
+            lat, lng, _ = self._entries.pop(seq)
+            if self._cell_deg is not None:
+                key = self._cell(lat, lng)
+                cell = self._cells[key]
+                del cell[seq]
+                if not cell:
+                    del self._cells[key]
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self._cell_deg), math.floor(lng / self._cell_deg)
+
+    def _index(self, cell_deg: float) -> None:
+        self._cell_deg = cell_deg
+        self._cells = {}
+        for seq, entry in self._entries.items():
+            self._cells.setdefault(self._cell(entry[0], entry[1]), {})[seq] = entry
+
+    def _candidates(self, lat: float, lng: float, max_distance_m: float):
+        """(seq, entry) pairs that may lie within `max_distance_m`."""
+        # A hair wider than the radius so float rounding at the edge can
+        # only add candidates, never drop one the exact check would accept.
+        delta = max_distance_m / EARTH_RADIUS_M * (1 + 1e-9) + 1e-12
+        phi = math.radians(lat)
+        if delta >= math.pi / 2 or abs(phi) + delta >= math.pi / 2:
+            return self._entries.items()
+        d_lat = math.degrees(delta)
+        d_lng = math.degrees(math.asin(min(1.0, math.sin(delta) / math.cos(phi))))
+        if lng - d_lng < -180.0 or lng + d_lng > 180.0:
+            return self._entries.items()
+        if self._cell_deg != d_lat:
+            self._index(d_lat)
+        i0, j0 = self._cell(lat - d_lat, lng - d_lng)
+        i1, j1 = self._cell(lat + d_lat, lng + d_lng)
+        found = []
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = self._cells.get((i, j))
+                if cell:
+                    found.extend(cell.items())
+        return found
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        max_distance_m: float,
+        exclude_finnkode: Optional[str] = None,
+    ) -> Optional[str]:
+        """Same result as `find_nearby_donor`'s scan over `list(self)`:
+        the closest entry within `max_distance_m`, earliest-added on ties."""
+        best = None  # (distance, seq, finnkode)
+        for seq, (cand_lat, cand_lng, cand_finnkode) in self._candidates(lat, lng, max_distance_m):
+            if exclude_finnkode and cand_finnkode == exclude_finnkode:
+                continue
+            distance_m = _haversine_meters(lat, lng, cand_lat, cand_lng)
+            if distance_m <= max_distance_m and (best is None or (distance_m, seq) < best[:2]):
+                best = (distance_m, seq, cand_finnkode)
+        return best[2] if best else None
+
+
+DonorCacheLike = Union[DonorCache, list[DonorEntry]]
+
+
+class DonorLinkIndex:
+    """Reverse index over row dicts' `donor_link`: cleaned donor finnkode ->
+    the rows currently linking to it, in row order.
+
+    Only stays true while links are changed through `link`/`redirect`;
+    `assign_donors_prepass` builds one per call for exactly that reason.
+    """
+
+    def __init__(self, rows: Iterable[dict] = ()):
+        self._acceptors: dict[str, dict[int, dict]] = {}
+        for row in rows:
+            self._add(row)
+
+    def _add(self, row: dict) -> None:
+        donor = _clean(row.get("donor_link"))
+        if donor:
+            self._acceptors.setdefault(donor, {})[id(row)] = row
+
+    def _remove(self, row: dict) -> None:
+        donor = _clean(row.get("donor_link"))
+        acceptors = self._acceptors.get(donor)
+        if acceptors is not None:
+            acceptors.pop(id(row), None)
+            if not acceptors:
+                del self._acceptors[donor]
+
+    def acceptors(self, finnkode: str) -> list[dict]:
+        """Rows whose cleaned `donor_link` is `finnkode`."""
+        return list(self._acceptors.get(finnkode, {}).values())
+
+    def link(self, row: dict, donor: Optional[str]) -> None:
+        """Set `row["donor_link"] = donor`, keeping the index in step."""
+        self._remove(row)
+        row["donor_link"] = donor
+        self._add(row)
+
+    def redirect(self, old_donor: str, new_donor: str, skip: Optional[dict] = None) -> None:
+        """Point every row linking to `old_donor` (except `skip`) at
+        `new_donor` -- the pre-pass cascade, touching only those rows."""
+        for other in self.acceptors(old_donor):
+            if other is not skip:
+                self.link(other, new_donor)
+
+
 def build_donor_cache(
     rows: list[dict], required_columns: list[str], max_travel_minutes: float
-) -> list[tuple[float, float, str]]:
+) -> DonorCache:
     """Port of `_build_travel_donor_cache` (post_process.py:116-141).
 
     `max_travel_minutes` is threaded through explicitly since our row schema
@@ -85,9 +252,9 @@ def build_donor_cache(
 
     Eligible: valid (non-None) lat/lng, no existing donor link, ALL
     `required_columns` hold a valid (non-sentinel) travel value, non-empty
-    finnkode.
+    finnkode. Returned as a `DonorCache` (same entries, same order).
     """
-    cache: list[tuple[float, float, str]] = []
+    cache = DonorCache()
     for row in rows:
         lat, lng = row.get("lat"), row.get("lng")
         if lat is None or lng is None:
@@ -106,7 +273,7 @@ def build_donor_cache(
 def find_nearby_donor(
     lat: Optional[float],
     lng: Optional[float],
-    cache: list[tuple[float, float, str]],
+    cache: DonorCacheLike,
     max_distance_m: float,
     exclude_finnkode: Optional[str] = None,
 ) -> Optional[str]:
@@ -117,9 +284,13 @@ def find_nearby_donor(
     finnkode are dropped before the nearest search runs, so a *different*
     donor can still be found if the excluded one would otherwise have won.
     `maybe_assign_donor` deliberately does NOT use this (see its docstring).
+
+    A `DonorCache` answers from its grid index; a plain list is scanned.
     """
     if lat is None or lng is None or max_distance_m <= 0:
         return None
+    if isinstance(cache, DonorCache):
+        return cache.nearest(lat, lng, max_distance_m, exclude_finnkode)
 
     best_finnkode = None
     best_distance = None
@@ -135,7 +306,7 @@ def find_nearby_donor(
 
 
 def assign_donors_prepass(
-    rows: list[dict], caches: dict[str, list[tuple[float, float, str]]], reuse_within_meters: float
+    rows: list[dict], caches: dict[str, DonorCacheLike], reuse_within_meters: float
 ) -> None:
     """Port of the pre-pass (post_process.py:534-587). Mutates `rows` in place.
 
@@ -154,7 +325,8 @@ def assign_donors_prepass(
       - cascade-collapses any other row currently pointing at *this* row's
         finnkode so it points at `nearest` instead (one-shot, using
         in-progress mutated state -- exactly legacy's live `df.at[...]`
-        mask), guaranteeing no A->B->C chains survive this pass
+        mask, answered from a `DonorLinkIndex` rather than a scan of every
+        row), guaranteeing no A->B->C chains survive this pass
       - evicts this row's finnkode from every cache in `caches` (it is now
         an acceptor and can never be a donor again)
 
@@ -171,6 +343,7 @@ def assign_donors_prepass(
         return
 
     all_caches = list(caches.values())
+    links = DonorLinkIndex(rows)
 
     for row in rows:
         if _clean(row.get("donor_link")):
@@ -186,22 +359,31 @@ def assign_donors_prepass(
         if not nearest:
             continue
 
-        row["donor_link"] = nearest
+        links.link(row, nearest)
 
         # Cascade: collapse any A->B links (B = this row) to A->nearest.
-        for other in rows:
-            if other is row:
-                continue
-            if _clean(other.get("donor_link")) == finnkode:
-                other["donor_link"] = nearest
+        links.redirect(finnkode, nearest, skip=row)
 
         # This row is now an acceptor -- remove it from every donor cache.
         for cache in all_caches:
-            cache[:] = [c for c in cache if c[2] != finnkode]
+            _evict(cache, finnkode)
+
+
+def _evict(cache: DonorCacheLike, finnkode: str) -> None:
+    if isinstance(cache, DonorCache):
+        cache.discard(finnkode)
+    else:
+        cache[:] = [c for c in cache if c[2] != finnkode]
+
+
+def _has_donor(cache: DonorCacheLike, finnkode: str) -> bool:
+    if isinstance(cache, DonorCache):
+        return cache.has(finnkode)
+    return any(c[2] == finnkode for c in cache)
 
 
 def maybe_assign_donor(
-    row: dict, cache: list[tuple[float, float, str]], max_distance_m: float
+    row: dict, cache: DonorCacheLike, max_distance_m: float
 ) -> Optional[str]:
     """Port of `_maybe_assign_donor` (post_process.py:818-840).
 
@@ -231,7 +413,7 @@ def maybe_assign_donor(
 
 def add_row_as_donor_if_complete(
     row: dict,
-    caches: dict[str, list[tuple[float, float, str]]],
+    caches: dict[str, DonorCacheLike],
     required_by_target: dict[str, list[str]],
     max_travel_minutes: float,
 ) -> None:
@@ -261,7 +443,7 @@ def add_row_as_donor_if_complete(
         cache = caches.get(target)
         if cache is None:
             continue
-        if not any(c[2] == finnkode for c in cache):
+        if not _has_donor(cache, finnkode):
             cache.append((lat, lng, finnkode))
 
 
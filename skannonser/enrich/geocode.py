@@ -222,6 +222,10 @@ def run_geocode(
     processed when the budget is hit is left as-is (not marked failed), and
     the caller (the CLI) is responsible for exiting non-zero.
 
+    The writes run under `ProcessedRepo.write_behind`, so they commit in
+    batches rather than one by one; the open batch is committed before any
+    exception (including `BudgetExceeded`) leaves this function.
+
     `domain` is accepted for symmetry with the other `run_*` pipeline entry
     points (e.g. `run_finn_ingest`); geocoding itself needs only the
     candidate rows, the api key, and the gateway.
@@ -233,23 +237,24 @@ def run_geocode(
 
     stats = {"candidates": len(candidates), "geocoded": 0, "failed": 0}
 
-    for row in candidates:
-        finnkode = str(row.get("Finnkode") or "").strip()
-        address = str(row.get("ADRESSE") or "").strip()
-        postal = str(row.get("Postnummer") or "").strip()
+    with repo.write_behind():
+        for row in candidates:
+            finnkode = str(row.get("Finnkode") or "").strip()
+            address = str(row.get("ADRESSE") or "").strip()
+            postal = str(row.get("Postnummer") or "").strip()
 
-        if not finnkode or not address:
-            stats["failed"] += 1
-            continue
+            if not finnkode or not address:
+                stats["failed"] += 1
+                continue
 
-        result = geocode_address(address, postal, api_key, gateway, get=get)
-        if result is None:
-            repo.mark_geocode_failed(finnkode)
-            stats["failed"] += 1
-            continue
+            result = geocode_address(address, postal, api_key, gateway, get=get)
+            if result is None:
+                repo.mark_geocode_failed(finnkode)
+                stats["failed"] += 1
+                continue
 
-        lat, lng = result
-        repo.set_coordinates(finnkode, lat, lng)
-        stats["geocoded"] += 1
+            lat, lng = result
+            repo.set_coordinates(finnkode, lat, lng)
+            stats["geocoded"] += 1
 
     return stats
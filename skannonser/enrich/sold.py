@@ -24,6 +24,7 @@ via `skannonser enrich-sold --bbox ...` on the polite-access infra
 retry harder.
 """
 
+import math
 from typing import Callable, Optional
 
 from skannonser.http import browser_get
@@ -159,16 +160,16 @@ def select_sold_targets(
     rows = conn.execute(
         f"""
         SELECT e.finnkode AS finnkode, p.lat AS lat, p.lng AS lng,
-               LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) AS status,
+               e.status_norm AS status,
                COALESCE(a.attempts, 0) AS attempts
         FROM eiendom e
         JOIN eiendom_processed p ON e.finnkode = p.finnkode
         LEFT JOIN sold_prices s ON e.finnkode = s.finnkode
         LEFT JOIN sold_price_attempts a ON e.finnkode = a.finnkode
         WHERE (
-            LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) = 'solgt'
+            e.status_norm = 'solgt'
             OR (
-              LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) = 'inaktiv'
+              e.status_norm = 'inaktiv'
               AND e.updated_at >= datetime('now', ?)
             )
           )
@@ -204,7 +205,7 @@ def sold_coverage(conn, min_age_days: int = 100) -> dict:
         FROM eiendom e
         JOIN eiendom_processed p ON e.finnkode = p.finnkode
         LEFT JOIN sold_prices s ON e.finnkode = s.finnkode
-        WHERE LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) = 'solgt'
+        WHERE e.status_norm = 'solgt'
           AND p.lat IS NOT NULL AND p.lng IS NOT NULL
           AND e.updated_at < datetime('now', ?)
         """,
@@ -232,7 +233,7 @@ def inaktiv_pending(conn, grace_days: int = 180) -> dict:
         FROM eiendom e
         JOIN eiendom_processed p ON e.finnkode = p.finnkode
         LEFT JOIN sold_prices s ON e.finnkode = s.finnkode
-        WHERE LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) = 'inaktiv'
+        WHERE e.status_norm = 'inaktiv'
           AND p.lat IS NOT NULL AND p.lng IS NOT NULL
         """,
         (f"-{int(grace_days)} days",),
@@ -256,7 +257,7 @@ def given_up_targets(conn, max_attempts: int = 5) -> int:
         JOIN eiendom_processed p ON e.finnkode = p.finnkode
         LEFT JOIN sold_prices s ON e.finnkode = s.finnkode
         JOIN sold_price_attempts a ON e.finnkode = a.finnkode
-        WHERE LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) IN ('solgt', 'inaktiv')
+        WHERE e.status_norm IN ('solgt', 'inaktiv')
           AND p.lat IS NOT NULL AND p.lng IS NOT NULL
           AND (s.finnkode IS NULL OR s.sold_price IS NULL)
           AND a.attempts >= ?
@@ -343,11 +344,38 @@ def target_bbox(t: dict, pad_lon: float = _PAD_LON, pad_lat: float = _PAD_LAT) -
     )
 
 
-def _targets_in_bbox(targets: list[dict], bbox: Bbox) -> list[dict]:
-    lon0, lat0, lon1, lat1 = bbox
-    return [
-        t for t in targets if lon0 <= t["lng"] <= lon1 and lat0 <= t["lat"] <= lat1
-    ]
+class _TargetGrid:
+    """Targets bucketed into lat/lng grid cells the size of one pad box, so a
+    box lookup only visits the (at most 2 x 2) cells its bounds overlap
+    instead of scanning every target.
+
+    Membership is still decided by the inclusive bound comparisons a plain
+    scan would use, and ``floor(x / step)`` is monotonic, so a target inside
+    the box always lies in a visited cell: counts are exact, not
+    approximate.
+    """
+
+    def __init__(self, targets: list[dict], pad_lon: float = _PAD_LON, pad_lat: float = _PAD_LAT):
+        self._lon_step = 2 * abs(pad_lon) or 1.0
+        self._lat_step = 2 * abs(pad_lat) or 1.0
+        self._cells: dict[tuple[int, int], list[dict]] = {}
+        for t in targets:
+            self._cells.setdefault(self._cell(t["lng"], t["lat"]), []).append(t)
+
+    def _cell(self, lng: float, lat: float) -> tuple[int, int]:
+        return math.floor(lng / self._lon_step), math.floor(lat / self._lat_step)
+
+    def count(self, bbox: Bbox) -> int:
+        """How many targets lie inside ``bbox`` (bounds inclusive)."""
+        lon0, lat0, lon1, lat1 = bbox
+        col0, row0 = self._cell(lon0, lat0)
+        col1, row1 = self._cell(lon1, lat1)
+        return sum(
+            lon0 <= t["lng"] <= lon1 and lat0 <= t["lat"] <= lat1
+            for col in range(col0, col1 + 1)
+            for row in range(row0, row1 + 1)
+            for t in self._cells.get((col, row), ())
+        )
 
 
 def run_sold_sweep(
@@ -429,12 +457,13 @@ def run_sold_sweep(
     # the existing fewest-attempts-then-density ordering applies.
     tier = lambda t: 0 if t.get("status", "solgt") == "solgt" else 1  # noqa: E731
     if order_by_density:
+        grid = _TargetGrid(targets, pad_lon, pad_lat)
         order = sorted(
             targets,
             key=lambda t: (
                 tier(t),
                 t.get("attempts", 0),
-                -len(_targets_in_bbox(targets, target_bbox(t, pad_lon, pad_lat))),
+                -grid.count(target_bbox(t, pad_lon, pad_lat)),
             ),
         )
     else:
@@ -28,9 +28,11 @@ adds the column -- no further change needed here.
 
 FETCH DISCIPLINE: mirrors ``skannonser.pipeline``'s DNB per-listing fetch
 discipline (``_default_dnb_listing_fetch``) -- a fixed User-Agent and a 15s
-timeout on every network fetch. ``fetch_delay`` (default: ``time.sleep(0.1)``,
-injectable for tests) runs before every fetch, a light pacing measure since
-this hits an external image host once per candidate.
+timeout on every network fetch, over the shared keep-alive session
+(``skannonser.http.pooled_get``) so one image host costs one handshake.
+``fetch_delay`` (default: ``time.sleep(0.1)``, injectable for tests) runs
+before every fetch, a light pacing measure since this hits an external image
+host once per candidate.
 
 FAILURE HANDLING: a non-200 response or any exception during fetch/write is
 recorded in ``stats["failed"]`` and the candidate is simply skipped -- no
@@ -55,8 +57,7 @@ import sqlite3
 import time
 from pathlib import Path
 
-import requests
-
+from skannonser.http import pooled_get
 from skannonser.ids import dnb_identifier
 
 # Mirrors skannonser/pipeline.py's `_DNB_LISTING_USER_AGENT`/
@@ -102,7 +103,7 @@ def _dnb_candidates(conn: sqlite3.Connection) -> list[tuple[str, str]]:
 def cache_thumbnails(
     conn: sqlite3.Connection,
     dest_dir: Path,
-    fetch=requests.get,
+    fetch=pooled_get,
     fetch_delay=None,
     limit: int = 0,
 ) -> dict:
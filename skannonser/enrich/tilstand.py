@@ -10,6 +10,7 @@ import sqlite3
 
 from pydantic import BaseModel, field_validator
 
+from skannonser.ingest.finn.parsed_ad import ParsedAd
 from skannonser.ingest.finn.payload import Section, decode_ad, sections
 
 # The only legal kostnad values (design spec: coarse grid; 1_000_000 = "1M+").
@@ -58,13 +59,15 @@ def select_sections(secs: list[Section]) -> list[Section]:
     return [s for s in secs if _KEEP_HEADING.search(s.heading) or _BODY_MARKER.search(s.text)]
 
 
-def classify_input(html: str) -> str | None:
+def classify_input(html: "str | ParsedAd") -> str | None:
     """The text one classification call operates on, or None when the ad has
-    nothing to classify (new-builds, undecodable payloads)."""
+    nothing to classify (new-builds, undecodable payloads). Takes the HTML
+    string or a shared `ParsedAd`."""
     ad = decode_ad(html)
     if not ad:
         return None
-    sel = select_sections(sections(ad))
+    secs = html.sections if isinstance(html, ParsedAd) else sections(ad)
+    sel = select_sections(secs)
     text = "\n\n".join(f"## {s.heading}\n{s.text}" for s in sel).strip()
     return text if len(text) >= _MIN_INPUT_CHARS else None
 
@@ -6,18 +6,32 @@ Mirrors `backfill_salgsoppgave`'s walk, plus the cache/spend logic:
   has none of its own) unless `cache_only`.
 Responses are validated BEFORE caching so a malformed response never poisons
 the cache. Purely local: reads the on-disk HTML cache, never FINN.
+
+Building the classifier input (a soup + payload decode per ad) is the CPU
+cost of a walk; it runs through `backfill_engine.iter_parsed`, so `workers`
+fans it out to a process pool while the API calls, cache and writes stay
+in this process, in priority order. No checkpoint is needed here: every
+paid response lands in `salgsoppgave_llm_cache` first, so an interrupted
+run replays for free.
 """
 import sqlite3
 import time
+from functools import partial
 from pathlib import Path
 
 from skannonser.enrich.tilstand import (
     TilstandResponse, _MODEL, _SYSTEM_PROMPT, TILSTAND_SCHEMA, _anthropic_call,
     cache_get, cache_put, classify_input, compute_rollup, content_sha,
 )
+from skannonser.ingest.finn.backfill_engine import MISSING, SKIPPED, iter_parsed
 from skannonser.store.repositories.tilstand import TilstandRepo
 
 
+def _input_text(input_fn, html: str, finnkode: str) -> str | None:
+    """`iter_parsed` adapter: the input builders take the HTML only."""
+    return input_fn(html)
+
+
 def classify_tilstand(
     conn: sqlite3.Connection,
     project_dir: Path,
@@ -25,6 +39,7 @@ def classify_tilstand(
     limit: int | None = None,
     wipe: bool = False,
     cache_only: bool = False,
+    workers: int = 1,
     _call=None,
     _input_fn=None,
 ) -> dict:
@@ -40,14 +55,12 @@ def classify_tilstand(
         "cached": 0, "called": 0, "limit_skipped": 0, "uncached_skipped": 0,
         "errors": 0, "upserted": 0,
     }
-    for finnkode in finnkodes:
-        path = Path(project_dir) / "html_extracted" / f"{finnkode}.html"
-        if not path.is_file():
+    inputs = iter_parsed(project_dir, finnkodes, partial(_input_text, input_fn), workers)
+    for finnkode, text, _ in inputs:
+        if text is MISSING:
             counts["missing_html"] += 1
             continue
-        try:
-            text = input_fn(path.read_text(encoding="utf-8", errors="replace"))
-        except Exception:
+        if text is SKIPPED:
             counts["errors"] += 1
             continue
         if text is None:
@@ -94,23 +107,20 @@ def _default_client():
     return anthropic.Anthropic()
 
 
-def _pending_inputs(conn, project_dir, input_fn, limit) -> dict[str, str]:
+def _pending_inputs(conn, project_dir, input_fn, limit, workers=1) -> dict[str, str]:
     """sha -> input text for every ad whose input is not yet cached.
     Dedup by sha is automatic (dict key); `limit` bounds the request count.
     Walks in classification priority order, so a bounded batch buys the
     highest-priority ads -- the same ones the sync driver would pick."""
     pending: dict[str, str] = {}
-    for finnkode in TilstandRepo(conn).candidate_finnkodes():
+    inputs = iter_parsed(
+        project_dir, TilstandRepo(conn).candidate_finnkodes(),
+        partial(_input_text, input_fn), workers,
+    )
+    for _, text, _ in inputs:
         if limit is not None and len(pending) >= limit:
             break
-        path = Path(project_dir) / "html_extracted" / f"{finnkode}.html"
-        if not path.is_file():
-            continue
-        try:
-            text = input_fn(path.read_text(encoding="utf-8", errors="replace"))
-        except Exception:
-            continue
-        if text is None:
+        if text is None or text is MISSING or text is SKIPPED:
             continue
         sha = content_sha(text)
         if sha not in pending and cache_get(conn, sha) is None:
@@ -123,6 +133,7 @@ def classify_tilstand_batch(
     project_dir: Path,
     *,
     limit: int | None = None,
+    workers: int = 1,
     _client=None,
     _sleep=None,
     _input_fn=None,
@@ -132,7 +143,7 @@ def classify_tilstand_batch(
     already paid for."""
     input_fn = _input_fn or classify_input
     sleep = _sleep or time.sleep
-    pending = _pending_inputs(conn, project_dir, input_fn, limit)
+    pending = _pending_inputs(conn, project_dir, input_fn, limit, workers)
     counts = {"submitted": len(pending), "succeeded": 0, "failed": 0}
     if pending:
         client = _client or _default_client()
@@ -188,6 +199,8 @@ def classify_tilstand_batch(
                 continue
             cache_put(conn, result.custom_id, raw)
             counts["succeeded"] += 1
-    derive = classify_tilstand(conn, project_dir, cache_only=True, _input_fn=_input_fn)
+    derive = classify_tilstand(
+        conn, project_dir, cache_only=True, workers=workers, _input_fn=_input_fn
+    )
     counts.update({f"derive_{k}": v for k, v in derive.items()})
     return counts
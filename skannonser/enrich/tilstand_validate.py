@@ -9,6 +9,7 @@ import sqlite3
 from pathlib import Path
 
 from skannonser.enrich.tilstand import GRID, classify_input, classify_one
+from skannonser.ingest.finn import html_cache
 
 # The label vocabulary measured over 500 ads (design spec 'Measurements').
 _COST_LABEL = re.compile(
@@ -98,10 +99,10 @@ def validate_estimates(
         # toward the limit.
         if report["attempts"] >= limit:
             break
-        path = Path(project_dir) / "html_extracted" / f"{finnkode}.html"
-        if not path.is_file():
+        html = html_cache.read_cached(project_dir, finnkode, errors="replace")
+        if html is None:
             continue
-        text = input_fn(path.read_text(encoding="utf-8", errors="replace"))
+        text = input_fn(html)
         if text is None:
             continue
         stated = sorted(stated_bands(text), key=lambda b: b[0] + b[1])
@@ -30,7 +30,9 @@ Design notes (legacy line refs are to ``post_process.py``):
     (485) so known failures aren't retried.
   * ``BudgetExceeded`` from ``.minutes()`` propagates BEFORE any write for that
     row; the loop halts and stats carry ``budget_exhausted=True`` (already-
-    written rows persist -- every write commits immediately).
+    written rows persist -- the ``eiendom_processed`` writes run under
+    ``ProcessedRepo.write_behind``, whose open window is committed on the
+    way out of the run, whether it ends normally, on the budget, or raising).
   * Price eligibility (``eligible_mask``, 589-591): candidacy/run scanning
     (``_estimate_plain``/``_estimate_uni``/``_run_destination``'s row loop)
     is restricted to ``pris <= domain.filters.sheets_max_price`` (missing
@@ -534,20 +536,21 @@ def run_enrich(
     reuse = float(domain.travel.reuse_within_meters)
     max_price = domain.filters.sheets_max_price
 
-    try:
-        for dest in selected:
-            _run_destination(
-                dest, prep, processed, gateway, api_key, post, force_api,
-                max_min, reuse, max_price, stats,
-            )
-    except BudgetExceeded:
-        stats["budget_exhausted"] = True
-
-    # 5. End-of-run metadata refresh (legacy bulk-write parity, see the
-    # function docstring). No API calls -- runs unconditionally, even after
-    # BudgetExceeded, mirroring legacy's bulk write happening after
-    # post-processing completes regardless of how far the API loop got.
-    _refresh_processed_metadata(prep, processed, stats)
+    with processed.write_behind():
+        try:
+            for dest in selected:
+                _run_destination(
+                    dest, prep, processed, gateway, api_key, post, force_api,
+                    max_min, reuse, max_price, stats,
+                )
+        except BudgetExceeded:
+            stats["budget_exhausted"] = True
+
+        # 5. End-of-run metadata refresh (legacy bulk-write parity, see the
+        # function docstring). No API calls -- runs unconditionally, even after
+        # BudgetExceeded, mirroring legacy's bulk write happening after
+        # post-processing completes regardless of how far the API loop got.
+        _refresh_processed_metadata(prep, processed, stats)
 
     return stats
 
@@ -37,6 +37,14 @@ Heuristics ported (legacy line refs):
     min_rel_diff``. Used identically by both the local and postcode checks
     (only the group and the abs-diff floor differ).
 
+Evaluation is columnar: the scan set is read once into NumPy arrays (one
+value column per destination), neighbor pairs within ``radius_m`` are found
+once for all destinations, and the median/MAD scoring runs per destination
+over whole arrays. Legacy's per-destination quirks -- the dedup order, the
+bucket window sized from the scan set's mean latitude -- are applied as
+masks on that shared work, so the findings are the same ones the row-by-row
+loop produced (``tests/rebuild/fixtures/validate`` pins them).
+
 Donor-resolved read (legacy line 315-393, ``_prepare_source_dataframe`` ->
 ``db.get_eiendom_for_sheets()``): legacy validates the SAME donor-resolved
 value sheets/exports show, NOT each row's own raw stored column -- when
@@ -80,8 +88,8 @@ this is not a line-for-line shell port):
     filtering) -- no rebuild equivalent exists; this always validates every
     DB-tracked active row, which is a superset of legacy's default live-scope-
     filtered run.
-  * No ``--include-inactive`` -- always scoped to ``active = 1``, matching the
-    legacy CLI's own default (``args.include_inactive`` defaults to False).
+  * ``--include-inactive`` is kept with legacy's default (off: ``active =
+    1`` only); turned on, every tracked listing is scanned.
   * No ``--target`` selector -- always validates the non-exclusive
     destinations (brj, mvv), matching legacy's own default
     ``--target all`` -> ``TARGET_COLUMNS["all"] = ["PENDL RUSH BRJ", "PENDL
@@ -103,14 +111,18 @@ import sqlite3
 import statistics
 from typing import Optional
 
+import numpy as np
+
 from skannonser.config.domain import DomainConfig
-from skannonser.enrich.donor import _clean, _haversine_meters
+from skannonser.enrich.donor import _clean
+from skannonser.geo import haversine_array, pairs_within_radius
 from skannonser.store.repositories.processed import ProcessedRepo
 
 # Bulk equivalent of `ProcessedRepo.sheet_travel_values`'s single-finnkode
 # CASE/COALESCE donor-resolution query (processed.py:390-416), which is
 # itself the port of `main/database/db.py:get_eiendom_for_sheets` (829-852).
-# Scoped to active listings only (legacy CLI default: `include_inactive=False`).
+# Scoped to active listings unless `include_inactive` (legacy CLI's
+# `--include-inactive`, default off) binds the parameter to 1.
 _SHEET_QUERY = """
     SELECT
         e.finnkode as finnkode,
@@ -139,7 +151,7 @@ _SHEET_QUERY = """
     FROM eiendom e
     LEFT JOIN eiendom_processed ep ON e.finnkode = ep.finnkode
     LEFT JOIN eiendom_processed ep_src ON ep_src.finnkode = ep.travel_copy_from_finnkode
-    WHERE e.active = 1
+    WHERE (? OR e.active = 1)
     ORDER BY e.finnkode
 """
 
@@ -242,50 +254,77 @@ def _score_against_group(
 
 
 # ---------------------------------------------------------------------------
-# Spatial bucketing (port of _build_spatial_buckets / _candidate_positions,
-# 396-437) -- a radius-search performance optimization; same neighbor RESULTS
-# as brute-force haversine over the whole scan set, much cheaper.
+# Vectorized group scoring. A row's peer groups (local neighbors, postcode
+# peers) are ragged, so they are flattened into parallel (group, value)
+# arrays; one stable sort by (group, value) then lays every group's values
+# out in order, and the median is read off the middle exactly the way
+# `statistics.median` does (middle element, or the mean of the middle two)
+# -- same floats, same results as `_score_against_group` row by row.
 # ---------------------------------------------------------------------------
 
 
-def _build_spatial_buckets(
-    rows: list[dict], radius_m: float
-) -> tuple[dict[tuple[int, int], list[int]], float, float]:
-    if radius_m <= 0:
-        return {}, 1.0, 1.0
+def _ragged_median(
+    groups: np.ndarray, values: np.ndarray, n_groups: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Median of `values` per group id in `groups` (NaN for an empty group),
+    and each group's size."""
+    counts = np.bincount(groups, minlength=n_groups)
+    medians = np.full(n_groups, np.nan)
+    if not len(values):
+        return medians, counts
+    ordered = values[np.lexsort((values, groups))]
+    mid = np.cumsum(counts) - counts + counts // 2
+    odd = counts % 2 == 1
+    even = (counts > 0) & ~odd
+    medians[odd] = ordered[mid[odd]]
+    medians[even] = (ordered[mid[even] - 1] + ordered[mid[even]]) / 2
+    return medians, counts
+
+
+def _score_groups(
+    values: np.ndarray,
+    medians: np.ndarray,
+    peer_group: np.ndarray,
+    peer_value: np.ndarray,
+    eligible: np.ndarray,
+    min_abs_diff: float,
+    min_rel_diff: float,
+    mad_mult: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """`_score_against_group` for every `eligible` row at once; rows' peers
+    are the `peer_value`s tagged with their index in `peer_group`. Returns
+    (suspicious, diff). The MAD is only computed for rows that already clear
+    the abs/rel floors -- it can only veto those."""
+    with np.errstate(invalid="ignore"):
+        diff = np.abs(values - medians)
+        rel = diff / np.maximum(np.abs(medians), 1.0)
+        maybe = eligible & (diff >= min_abs_diff) & (rel >= min_rel_diff)
+        needed = maybe[peer_group]
+        groups = peer_group[needed]
+        mads, _ = _ragged_median(groups, np.abs(peer_value[needed] - medians[groups]), len(values))
+        suspicious = maybe & (diff >= mad_mult * np.maximum(mads, 1.0))
+    return suspicious, diff
+
+
+# ---------------------------------------------------------------------------
+# Neighbor search (port of _build_spatial_buckets / _candidate_positions,
+# 396-437). Legacy bucketed rows into a lat/lng grid and measured haversine
+# only against the 3x3 buckets around each row. Here `pairs_within_radius`
+# finds every pair within radius_m once, over all rows, and each destination
+# keeps the pairs inside its own scan set and legacy's bucket window --
+# legacy's lng bucket width comes from the scan set's MEAN latitude, so on a
+# wide enough set it can miss a true neighbor, and the findings must match
+# it exactly.
+# ---------------------------------------------------------------------------
+
 
-    lats = [r["lat"] for r in rows if r["lat"] is not None]
+def _bucket_steps(lats: list[float], radius_m: float) -> tuple[float, float]:
+    """Legacy's bucket sizes in degrees (`_build_spatial_buckets`), from the
+    scan set's latitudes in scan order."""
     mean_lat = sum(lats) / len(lats) if lats else 60.0
     lat_step = max(radius_m / 111320.0, 0.0001)
     lng_step = max(radius_m / (111320.0 * max(0.1, math.cos(math.radians(mean_lat)))), 0.0001)
-
-    buckets: dict[tuple[int, int], list[int]] = {}
-    for pos, row in enumerate(rows):
-        lat, lng = row["lat"], row["lng"]
-        if lat is None or lng is None:
-            continue
-        key = (int(lat / lat_step), int(lng / lng_step))
-        buckets.setdefault(key, []).append(pos)
-
-    return buckets, lat_step, lng_step
-
-
-def _candidate_positions(
-    lat: Optional[float],
-    lng: Optional[float],
-    buckets: dict[tuple[int, int], list[int]],
-    lat_step: float,
-    lng_step: float,
-) -> list[int]:
-    if lat is None or lng is None or not buckets:
-        return []
-    lat_bucket = int(lat / lat_step)
-    lng_bucket = int(lng / lng_step)
-    positions: list[int] = []
-    for dlat in (-1, 0, 1):
-        for dlng in (-1, 0, 1):
-            positions.extend(buckets.get((lat_bucket + dlat, lng_bucket + dlng), []))
-    return positions
+    return lat_step, lng_step
 
 
 # ---------------------------------------------------------------------------
@@ -340,6 +379,99 @@ def _resolve_representative(finnkode: str, donor_links: dict[str, str], cache: d
     return representative
 
 
+# ---------------------------------------------------------------------------
+# The scan set, columnar: one row per sheet row, one value column per
+# destination (NaN where the value fails `_is_valid_travel`).
+# ---------------------------------------------------------------------------
+
+
+class _TravelTable:
+    __slots__ = (
+        "finnkodes", "links", "lat", "lng", "has_coords", "postcode_ids",
+        "values", "representatives", "rep_ids", "fk_ids", "is_rep", "donor_m",
+    )
+
+    def __init__(self, sheet_rows, columns: list[str], max_travel_minutes: float):
+        n = len(sheet_rows)
+        self.finnkodes = [_clean(r["finnkode"]) for r in sheet_rows]
+        self.links = [_clean(r["travel_copy_from_finnkode"]) for r in sheet_rows]
+        lat = [_to_float_or_none(r["lat"]) for r in sheet_rows]
+        lng = [_to_float_or_none(r["lng"]) for r in sheet_rows]
+        self.lat = np.array([np.nan if v is None else v for v in lat], dtype=float)
+        self.lng = np.array([np.nan if v is None else v for v in lng], dtype=float)
+        self.has_coords = ~np.isnan(self.lat) & ~np.isnan(self.lng)
+        raw_postcodes = [r["postnummer"] for r in sheet_rows]
+        normalized = {raw: _normalize_postnummer(raw) for raw in set(raw_postcodes)}
+        postcodes = [normalized[raw] for raw in raw_postcodes]
+        # id 0 is "no postnummer": never grouped
+        labels = {pc: i for i, pc in enumerate(sorted(set(postcodes) - {""}), start=1)}
+        self.postcode_ids = np.array([labels.get(pc, 0) for pc in postcodes], dtype=np.intp)
+        self.values = np.full((n, len(columns)), np.nan)
+        for k, col in enumerate(columns):
+            for i, r in enumerate(sheet_rows):
+                if _is_valid_travel(r[col], max_travel_minutes):
+                    self.values[i, k] = _to_float_or_none(r[col])
+        fk_labels = {fk: i for i, fk in enumerate(sorted(set(self.finnkodes)))}
+        self.fk_ids = np.array([fk_labels[fk] for fk in self.finnkodes], dtype=np.intp)
+        self.representatives: list[Optional[str]] = [None] * n
+        self.rep_ids = np.zeros(n, dtype=np.intp)
+        self.is_rep = np.zeros(n, dtype=bool)
+        self.donor_m = np.full(n, np.nan)
+
+    def scan_rows(self, k: int) -> np.ndarray:
+        """Rows with a finnkode and a valid value in column `k`, sheet order."""
+        has_fk = np.array([bool(fk) for fk in self.finnkodes], dtype=bool)
+        return np.flatnonzero(has_fk & ~np.isnan(self.values[:, k]))
+
+    def resolve_representatives(self, donor_links: dict[str, str], scans: list[np.ndarray]) -> None:
+        """Representative per scanned row, resolved in legacy's call order
+        (column by column, sheet order) -- `_resolve_representative`'s memo
+        makes the answer inside a donor cycle depend on where the walk
+        started, so the first call for each finnkode must happen in the same
+        order as before."""
+        cache: dict[str, str] = {}
+        for rows in scans:
+            for i in rows.tolist():
+                if self.representatives[i] is None:
+                    self.representatives[i] = _resolve_representative(
+                        self.finnkodes[i], donor_links, cache
+                    )
+        reps = [rep or "" for rep in self.representatives]
+        labels = {rep: i for i, rep in enumerate(sorted(set(reps)))}
+        self.rep_ids = np.array([labels[rep] for rep in reps], dtype=np.intp)
+        self.is_rep = np.array([fk == rep for fk, rep in zip(self.finnkodes, reps)], dtype=bool)
+
+    def dedup(self, rows: np.ndarray) -> np.ndarray:
+        """Donor-chain group dedup (port of 475-483): one row per
+        representative, preferring the representative's own row, then the
+        lowest finnkode -- in (representative, that preference) order."""
+        ordered = rows[np.lexsort((self.fk_ids[rows], ~self.is_rep[rows], self.rep_ids[rows]))]
+        first = np.ones(len(ordered), dtype=bool)
+        first[1:] = self.rep_ids[ordered[1:]] != self.rep_ids[ordered[:-1]]
+        return ordered[first]
+
+    def resolve_donor_distances(
+        self, donor_coords: dict[str, tuple[Optional[float], Optional[float]]]
+    ) -> None:
+        """Meters from each row to its direct donor, where both ends have
+        coordinates (one `haversine_array` batch); NaN elsewhere."""
+        rows, donor_lat, donor_lng = [], [], []
+        for i, link in enumerate(self.links):
+            if not link or not self.has_coords[i]:
+                continue
+            lat, lng = donor_coords.get(link, (None, None))
+            if lat is None or lng is None:
+                continue
+            rows.append(i)
+            donor_lat.append(lat)
+            donor_lng.append(lng)
+        if rows:
+            index = np.array(rows)
+            self.donor_m[index] = haversine_array(
+                self.lat[index], self.lng[index], donor_lat, donor_lng
+            )
+
+
 # ---------------------------------------------------------------------------
 # Main entry point
 # ---------------------------------------------------------------------------
@@ -356,10 +488,17 @@ def validate_travel(
     min_neighbors: int = 5,
     min_postcode_group: int = 6,
     max_travel_minutes: float = 360.0,
+    include_inactive: bool = False,
 ) -> list[dict]:
     """Score active listings' donor-resolved travel values for suspicious
     outliers. Read-only -- no writes, no external calls. See the module
     docstring for the full heuristic/default-verification writeup.
+    `include_inactive` widens the scan to every listing ever tracked.
+
+    Columnar: the donor-resolved values of every destination are loaded
+    once, neighbor pairs are found once for all destinations, and the
+    local/postcode median+MAD scoring runs over NumPy arrays -- with the
+    same findings the row-by-row legacy port produced.
 
     Returns findings sorted worst-first (score desc, column asc, value desc
     -- port of the legacy sort at ``_build_findings`` 592-596), each a dict:
@@ -369,136 +508,200 @@ def validate_travel(
     table -- not part of the legacy finding's minimum contract but present
     in its output columns too).
     """
+    # mvv_uni excluded from the default scope -- matches legacy's own
+    # TARGET_COLUMNS["all"], which never includes MVV-UNI either.
+    destinations = [d for d in domain.destinations if not d.exclusive]
     donor_links, donor_coords = _global_donor_maps(conn)
-    rep_cache: dict[str, str] = {}
-    sheet_rows = conn.execute(_SHEET_QUERY).fetchall()
+    table = _TravelTable(
+        conn.execute(_SHEET_QUERY, (int(include_inactive),)).fetchall(),
+        [d.db_column for d in destinations],
+        max_travel_minutes,
+    )
+    scans = [table.scan_rows(k) for k in range(len(destinations))]
+    table.resolve_representatives(donor_links, scans)
+    table.resolve_donor_distances(donor_coords)
+    if radius_m > 0:
+        pair_a, pair_b, _ = pairs_within_radius(table.lat, table.lng, radius_m)
+    else:
+        pair_a = pair_b = np.empty(0, dtype=np.intp)
 
     findings: list[dict] = []
-
-    for dest in domain.destinations:
-        if dest.exclusive:
-            # mvv_uni excluded from the default scope -- matches legacy's
-            # own TARGET_COLUMNS["all"], which never includes MVV-UNI either.
+    for k, dest in enumerate(destinations):
+        rows = table.dedup(scans[k])
+        if not len(rows):
             continue
-        col = dest.db_column
-
-        candidates: list[dict] = []
-        for r in sheet_rows:
-            finnkode = _clean(r["finnkode"])
-            value = _to_float_or_none(r[col])
-            if not finnkode or not _is_valid_travel(value, max_travel_minutes):
-                continue
-            candidates.append(
-                {
-                    "finnkode": finnkode,
-                    "value": float(value),
-                    "lat": _to_float_or_none(r["lat"]),
-                    "lng": _to_float_or_none(r["lng"]),
-                    "postnummer": _normalize_postnummer(r["postnummer"]),
-                    "travel_copy_from_finnkode": _clean(r["travel_copy_from_finnkode"]),
-                }
+        findings.extend(
+            _score_destination(
+                table, k, dest.db_column, rows, pair_a, pair_b,
+                score_threshold=score_threshold,
+                min_abs_diff=min_abs_diff,
+                min_rel_diff=min_rel_diff,
+                mad_mult=mad_mult,
+                radius_m=radius_m,
+                min_neighbors=min_neighbors,
+                min_postcode_group=min_postcode_group,
             )
+        )
 
-        if not candidates:
-            continue
+    findings.sort(key=lambda f: (-f["score"], f["column"], -f["value"]))
+    return findings
 
-        # Donor-chain group dedup (port of 475-483): one row per resolved
-        # representative, preferring the row that IS the representative.
-        for c in candidates:
-            c["_representative"] = _resolve_representative(c["finnkode"], donor_links, rep_cache)
-            c["_is_representative"] = c["finnkode"] == c["_representative"]
 
-        candidates.sort(
-            key=lambda c: (c["_representative"], not c["_is_representative"], c["finnkode"])
+def _score_destination(
+    table: _TravelTable,
+    k: int,
+    col: str,
+    rows: np.ndarray,
+    pair_a: np.ndarray,
+    pair_b: np.ndarray,
+    *,
+    score_threshold: int,
+    min_abs_diff: float,
+    min_rel_diff: float,
+    mad_mult: float,
+    radius_m: float,
+    min_neighbors: int,
+    min_postcode_group: int,
+) -> list[dict]:
+    """Findings for one destination column over its deduped scan `rows`
+    (table indices, in dedup order), in that order."""
+    m = len(rows)
+    values = table.values[rows, k]
+    fk_ids = table.fk_ids[rows]
+    position = np.full(len(table.finnkodes), -1, dtype=np.intp)
+    position[rows] = np.arange(m)
+
+    # Local/neighbor check: the global pairs inside this scan set, within
+    # legacy's bucket window, between different finnkodes.
+    local_flag = np.zeros(m, dtype=bool)
+    local_median, local_diff = np.full(m, np.nan), np.full(m, np.nan)
+    neighbor_count = np.zeros(m, dtype=np.intp)
+    if radius_m > 0:
+        a, b = position[pair_a], position[pair_b]
+        inside = (a >= 0) & (b >= 0)
+        a, b = a[inside], b[inside]
+        scan_lat = table.lat[rows]
+        lat_step, lng_step = _bucket_steps(scan_lat[~np.isnan(scan_lat)].tolist(), radius_m)
+        lat_key = np.trunc(table.lat[rows] / lat_step)
+        lng_key = np.trunc(table.lng[rows] / lng_step)
+        near = (
+            (np.abs(lat_key[a] - lat_key[b]) <= 1)
+            & (np.abs(lng_key[a] - lng_key[b]) <= 1)
+            & (fk_ids[a] != fk_ids[b])
+        )
+        a, b = a[near], b[near]
+        peer_group = np.concatenate([a, b])
+        peer_value = values[np.concatenate([b, a])]
+        local_median, neighbor_count = _ragged_median(peer_group, peer_value, m)
+        local_flag, local_diff = _score_groups(
+            values, local_median, peer_group, peer_value, neighbor_count >= min_neighbors,
+            min_abs_diff, min_rel_diff, mad_mult,
         )
-        deduped: list[dict] = []
-        seen_reps: set[str] = set()
-        for c in candidates:
-            rep = c["_representative"]
-            if rep in seen_reps:
-                continue
-            seen_reps.add(rep)
-            deduped.append(c)
-
-        buckets, lat_step, lng_step = _build_spatial_buckets(deduped, radius_m)
-
-        postcode_groups: dict[str, list[tuple[str, float]]] = {}
-        for c in deduped:
-            if not c["postnummer"]:
-                continue
-            postcode_groups.setdefault(c["postnummer"], []).append((c["finnkode"], c["value"]))
-
-        for pos, c in enumerate(deduped):
-            value = c["value"]
-            lat, lng = c["lat"], c["lng"]
-            score = 0
-            reasons: list[str] = []
-            neighbor_count = 0
-            postcode_group_size = 0
-
-            if lat is not None and lng is not None and radius_m > 0:
-                local_values: list[float] = []
-                for peer_pos in _candidate_positions(lat, lng, buckets, lat_step, lng_step):
-                    if peer_pos == pos:
-                        continue
-                    peer = deduped[peer_pos]
-                    if peer["finnkode"] == c["finnkode"]:
-                        continue
-                    p_lat, p_lng = peer["lat"], peer["lng"]
-                    if p_lat is None or p_lng is None:
-                        continue
-                    if _haversine_meters(lat, lng, p_lat, p_lng) <= radius_m:
-                        local_values.append(peer["value"])
-
-                neighbor_count = len(local_values)
-                if neighbor_count >= min_neighbors:
-                    suspicious, median, diff = _score_against_group(
-                        value, local_values, min_abs_diff, min_rel_diff, mad_mult
-                    )
-                    if suspicious:
-                        score += 3
-                        reasons.append(_format_reason("local", value, median, diff, neighbor_count))
-
-            if c["postnummer"]:
-                postcode_values = [
-                    v for fk, v in postcode_groups.get(c["postnummer"], []) if fk != c["finnkode"]
-                ]
-                postcode_group_size = len(postcode_values)
-                if postcode_group_size >= min_postcode_group:
-                    suspicious, median, diff = _score_against_group(
-                        value, postcode_values, min_abs_diff + 5.0, min_rel_diff, mad_mult
-                    )
-                    if suspicious:
-                        score += 2
-                        reasons.append(
-                            _format_reason("postcode", value, median, diff, postcode_group_size)
-                        )
-
-            donor_fk = c["travel_copy_from_finnkode"]
-            if donor_fk and lat is not None and lng is not None:
-                donor_lat, donor_lng = donor_coords.get(donor_fk, (None, None))
-                if donor_lat is not None and donor_lng is not None:
-                    donor_distance_m = _haversine_meters(lat, lng, donor_lat, donor_lng)
-                    if donor_distance_m > radius_m:
-                        score += 3
-                        reasons.append(
-                            f"Donor: {int(round(donor_distance_m))}m > {int(round(radius_m))}m ({donor_fk})"
-                        )
-
-            if score < score_threshold:
-                continue
 
-            findings.append(
-                {
-                    "finnkode": c["finnkode"],
-                    "column": col,
-                    "value": int(round(value)),
-                    "score": score,
-                    "reasons": reasons,
-                    "neighbor_count": neighbor_count,
-                    "postcode_group_size": postcode_group_size,
-                }
+    # Postcode-group check: peers are the other same-postnummer rows. Each
+    # row's leave-one-out median comes from its rank in the group's sorted
+    # values; rows whose finnkode repeats inside their group (several peers
+    # to drop) are scored by the scalar path instead.
+    postcode = table.postcode_ids[rows]
+    grouped = np.flatnonzero(postcode > 0)
+    pc_flag = np.zeros(m, dtype=bool)
+    pc_median, pc_diff = np.full(m, np.nan), np.full(m, np.nan)
+    pc_size = np.zeros(m, dtype=np.intp)
+    scalar_rows: list[int] = []
+    if len(grouped):
+        order = grouped[np.lexsort((values[grouped], postcode[grouped]))]
+        sorted_pc, sorted_values = postcode[order], values[order]
+        starts = np.flatnonzero(np.r_[True, sorted_pc[1:] != sorted_pc[:-1]])
+        sizes = np.diff(np.r_[starts, len(order)])
+        group_start = np.repeat(starts, sizes)
+        group_size = np.repeat(sizes, sizes)
+        # Leaving out the member at `rank`, the t-th smallest of the rest
+        # sits at t (below it) or t + 1 (at or above it).
+        rank = np.arange(len(order)) - group_start
+        remaining = group_size - 1
+        median = np.full(len(order), np.nan)
+        has_peers = np.flatnonzero(remaining > 0)
+        hi = remaining[has_peers] // 2
+        lo = np.where(remaining[has_peers] % 2 == 1, hi, hi - 1)
+        at = group_start[has_peers]
+        r = rank[has_peers]
+        median[has_peers] = (
+            sorted_values[at + lo + (lo >= r)] + sorted_values[at + hi + (hi >= r)]
+        ) / 2
+        pc_median[order] = median
+        pc_size[order] = remaining
+
+        pair_key = postcode[grouped].astype(np.int64) * (int(fk_ids.max()) + 1) + fk_ids[grouped]
+        _, inverse, repeats = np.unique(pair_key, return_inverse=True, return_counts=True)
+        repeated = grouped[repeats[inverse] > 1]
+        scalar_rows = repeated.tolist()
+        eligible = pc_size >= min_postcode_group
+        eligible[repeated] = False
+
+        # Peer lists (for the MAD) are only expanded for rows that clear the
+        # abs/rel floors; everything else is settled by the median alone.
+        with np.errstate(invalid="ignore"):
+            diff = np.abs(values - pc_median)
+            rel = diff / np.maximum(np.abs(pc_median), 1.0)
+            maybe = np.flatnonzero(
+                eligible & (diff >= min_abs_diff + 5.0) & (rel >= min_rel_diff)
             )
+        member_at = np.empty(m, dtype=np.intp)
+        member_at[order] = np.arange(len(order))
+        slots = member_at[maybe]
+        counts = group_size[slots]
+        owner = np.repeat(maybe, counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        peer = order[np.repeat(group_start[slots], counts) + offset]
+        not_self = peer != owner
+        pc_flag, pc_diff = _score_groups(
+            values, pc_median, owner[not_self], values[peer[not_self]], eligible,
+            min_abs_diff + 5.0, min_rel_diff, mad_mult,
+        )
 
-    findings.sort(key=lambda f: (-f["score"], f["column"], -f["value"]))
+    for pos in scalar_rows:
+        same = np.flatnonzero((postcode == postcode[pos]) & (fk_ids != fk_ids[pos]))
+        peers = values[same].tolist()
+        pc_size[pos] = len(peers)
+        if len(peers) >= min_postcode_group:
+            suspicious, median, diff = _score_against_group(
+                float(values[pos]), peers, min_abs_diff + 5.0, min_rel_diff, mad_mult
+            )
+            pc_flag[pos], pc_median[pos], pc_diff[pos] = suspicious, median, diff
+
+    # Donor-distance check.
+    with np.errstate(invalid="ignore"):
+        donor_flag = table.donor_m[rows] > radius_m
+
+    score = 3 * local_flag + 2 * pc_flag + 3 * donor_flag
+    findings = []
+    for pos in np.flatnonzero(score >= score_threshold).tolist():
+        value = float(values[pos])
+        reasons: list[str] = []
+        if local_flag[pos]:
+            reasons.append(_format_reason(
+                "local", value, float(local_median[pos]), float(local_diff[pos]),
+                int(neighbor_count[pos]),
+            ))
+        if pc_flag[pos]:
+            reasons.append(_format_reason(
+                "postcode", value, float(pc_median[pos]), float(pc_diff[pos]), int(pc_size[pos]),
+            ))
+        if donor_flag[pos]:
+            i = int(rows[pos])
+            reasons.append(
+                f"Donor: {int(round(float(table.donor_m[i])))}m > {int(round(radius_m))}m "
+                f"({table.links[i]})"
+            )
+        findings.append(
+            {
+                "finnkode": table.finnkodes[int(rows[pos])],
+                "column": col,
+                "value": int(round(value)),
+                "score": int(score[pos]),
+                "reasons": reasons,
+                "neighbor_count": int(neighbor_count[pos]),
+                "postcode_group_size": int(pc_size[pos]),
+            }
+        )
     return findings
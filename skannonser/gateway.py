@@ -1,14 +1,40 @@
 """Single choke point for paid Google APIs: rate limiting, monthly budget
-enforcement, warn-threshold notifications, and a call ledger in api_usage."""
+enforcement, warn-threshold notifications, and a call ledger in api_usage.
+
+Budget checks read the per-(api, month) counters in api_usage_monthly
+(migration 024, kept by triggers on the ledger), a primary-key lookup however
+long the ledger grows. `ledger_batch` > 1 (default: the budget's
+`ledger_batch`) buffers ledger rows in memory and writes them in one
+transaction per batch; buffered rows count toward the budget immediately.
+`close()` -- run on the way out of a `with Gateway(...)` block, exceptions
+included -- flushes the buffer, so only a hard kill can lose rows (at most
+`ledger_batch - 1`).
+
+The per-minute rate is a `TokenBucket` kept in the same DB (`*_rpm` refill,
+`*_burst` capacity), so concurrent processes enriching against one DB share
+it rather than each spending it in full. The bucket is drawn on a second
+connection the Gateway owns -- `close()` it, or use the Gateway as a context
+manager -- because each draw commits and must not commit the caller's work.
+While the caller's connection has a transaction open, though, that second
+connection would wait on the caller's own write lock until it timed out, so
+`call` then draws on the caller's connection inside its transaction instead
+and commits it straight away -- with any buffered ledger rows, and with the
+caller's pending work, as a ledger write always has -- before sleeping out
+the wait or making the paid call. Neither the write lock nor the draw is
+held across the call, whatever `ledger_batch` is. An in-memory DB gets a
+private in-memory bucket: no other process can share it."""
 import sqlite3
 import subprocess
 import time
 from collections.abc import Callable
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import TypeVar
 
 from skannonser.config.domain import Budget
 from skannonser.config.settings import get_secrets
+from skannonser.ratelimit import TokenBucket
+from skannonser.store import connection
 
 T = TypeVar("T")
 
@@ -37,6 +63,26 @@ def _default_clock() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m")
 
 
+def _now_stamp() -> str:
+    # Same format and zone as the api_usage.called_at SQL default.
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _db_file(conn: sqlite3.Connection) -> str:
+    """The file behind `conn`'s main database ("" for an in-memory DB)."""
+    return conn.execute("PRAGMA database_list").fetchone()[2]
+
+
+def _month_bounds(month: str) -> tuple[str, str]:
+    """("YYYY-MM", "YYYY-MM" of the next month): a half-open called_at range.
+    Text comparison against bare month prefixes is exact for datetime('now')
+    stamps ("2026-07-31 23:59:59" < "2026-08"), and unlike
+    strftime('%Y-%m', called_at) = ? it can use an index."""
+    year, mon = int(month[:4]), int(month[5:7])
+    year, mon = (year + 1, 1) if mon == 12 else (year, mon + 1)
+    return month, f"{year:04d}-{mon:02d}"
+
+
 class Gateway:
     def __init__(
         self,
@@ -45,13 +91,37 @@ class Gateway:
         notify: Callable[[str], None] | None = None,
         sleeper: Callable[[float], None] = time.sleep,
         clock: Callable[[], str] | None = None,
+        ledger_batch: int | None = None,
+        limiter: TokenBucket | None = None,
     ):
+        if ledger_batch is None:
+            ledger_batch = budget.ledger_batch
+        if ledger_batch < 1:
+            raise ValueError(f"ledger_batch must be >= 1 (got {ledger_batch})")
         self.conn = conn
         self.budget = budget
         self.notify = notify or _default_notify
         self.sleeper = sleeper
         self.clock = clock or _default_clock
-        self._last_call: dict[str, float] = {}
+        # The limiter connection this Gateway opened (closed by `close()`),
+        # and whether the bucket lives in `conn`'s own database.
+        self._limiter_conn: sqlite3.Connection | None = None
+        self._limiter_shares_db = False
+        if limiter is None:
+            path = _db_file(conn)
+            if path:
+                self._limiter_conn = connection.connect(
+                    Path(path), check_same_thread=False, profile="batch-writer"
+                )
+                limiter = TokenBucket(self._limiter_conn, sleeper=sleeper)
+                self._limiter_shares_db = True
+            else:
+                limiter = TokenBucket.private(sleeper=sleeper)
+                self._limiter_conn = limiter.conn
+        self.limiter = limiter
+        self.ledger_batch = ledger_batch
+        # (called_at, api, outcome, finnkode) rows not yet written to api_usage.
+        self._pending: list[tuple[str, str, str, str | None]] = []
 
     def call(self, api: str, fn: Callable[[], T], finnkode: str | None = None) -> T:
         self._check_known(api)
@@ -61,6 +131,7 @@ class Gateway:
         usage = self.month_usage(api)
         if usage >= cap:
             self._record(api, "blocked", finnkode)
+            self.flush()  # the caller stops on this; don't strand the buffer
             raise BudgetExceeded(api, usage, cap)
 
         self._maybe_warn(api, usage, cap)
@@ -77,26 +148,60 @@ class Gateway:
         self._check_known(api)
         month = self.clock()
         row = self.conn.execute(
-            "SELECT COUNT(*) AS c FROM api_usage "
-            "WHERE api = ? AND outcome IN ('ok', 'error') "
-            "AND strftime('%Y-%m', called_at) = ?",
+            "SELECT ok + error AS c FROM api_usage_monthly WHERE api = ? AND month = ?",
             (api, month),
         ).fetchone()
-        return row["c"]
+        buffered = sum(
+            1
+            for called_at, p_api, outcome, _ in self._pending
+            if p_api == api and outcome in ("ok", "error") and called_at.startswith(month)
+        )
+        return (row["c"] if row else 0) + buffered
+
+    def flush(self) -> None:
+        """Write the buffered ledger rows (and, via the triggers, their
+        counters) in one transaction."""
+        if not self._pending:
+            return
+        self.conn.executemany(
+            "INSERT INTO api_usage (called_at, api, outcome, finnkode) VALUES (?, ?, ?, ?)",
+            self._pending,
+        )
+        self.conn.commit()
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Write any buffered ledger rows, then close the limiter connection
+        this Gateway opened. Idempotent."""
+        try:
+            self.flush()
+        finally:
+            if self._limiter_conn is not None:
+                self._limiter_conn.close()
+                self._limiter_conn = None
+
+    def __enter__(self) -> "Gateway":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def _check_known(self, api: str) -> None:
         if api not in _APIS:
             raise ValueError(f"unknown api: {api!r} (expected one of {sorted(_APIS)})")
 
     def _rate_limit(self, api: str) -> None:
-        rpm = getattr(self.budget, f"{api}_rpm")
-        min_interval = 60.0 / rpm
-        last = self._last_call.get(api)
-        if last is not None:
-            remaining = min_interval - (time.monotonic() - last)
-            if remaining > 0:
-                self.sleeper(remaining)
-        self._last_call[api] = time.monotonic()
+        rate = (getattr(self.budget, f"{api}_rpm"), getattr(self.budget, f"{api}_burst"))
+        if self._limiter_shares_db and self.conn.in_transaction:
+            # See the module docstring: the limiter's own connection would
+            # block on this transaction's write lock, so draw here and commit.
+            wait = self.limiter.reserve(api, *rate, conn=self.conn)
+            self.flush()
+            self.conn.commit()
+            if wait > 0:
+                self.limiter.sleeper(wait)
+        else:
+            self.limiter.acquire(api, *rate)
 
     def _maybe_warn(self, api: str, usage: int, cap: int) -> None:
         month = self.clock()
@@ -109,10 +214,16 @@ class Gateway:
             self._safe_notify(f"{api}: {usage}/{cap} calls this month ({pct}% of budget)")
 
     def _already_warned(self, api: str, pct: int, month: str) -> bool:
+        outcome = f"warn:{pct}"
+        if any(
+            p_api == api and p_outcome == outcome and called_at.startswith(month)
+            for called_at, p_api, p_outcome, _ in self._pending
+        ):
+            return True
         row = self.conn.execute(
             "SELECT 1 FROM api_usage "
-            "WHERE api = ? AND outcome = ? AND strftime('%Y-%m', called_at) = ? LIMIT 1",
-            (api, f"warn:{pct}", month),
+            "WHERE api = ? AND outcome = ? AND called_at >= ? AND called_at < ? LIMIT 1",
+            (api, outcome, *_month_bounds(month)),
         ).fetchone()
         return row is not None
 
@@ -123,8 +234,26 @@ class Gateway:
             pass
 
     def _record(self, api: str, outcome: str, finnkode: str | None) -> None:
-        self.conn.execute(
-            "INSERT INTO api_usage (api, outcome, finnkode) VALUES (?, ?, ?)",
-            (api, outcome, finnkode),
-        )
-        self.conn.commit()
+        self._pending.append((_now_stamp(), api, outcome, finnkode))
+        if len(self._pending) >= self.ledger_batch:
+            self.flush()
+
+
+def usage_drift(conn: sqlite3.Connection) -> list[tuple]:
+    """(api, month, ok, error, blocked) rows where api_usage_monthly and a
+    recount of the raw ledger disagree -- from either side, so a stale and a
+    missing counter row both show. Empty when the counters are exact."""
+    rows = conn.execute(
+        "WITH ledger AS ("
+        " SELECT api, substr(called_at, 1, 7) AS month, SUM(outcome = 'ok') AS ok,"
+        " SUM(outcome = 'error') AS error, SUM(outcome = 'blocked') AS blocked"
+        " FROM api_usage WHERE outcome IN ('ok', 'error', 'blocked')"
+        " GROUP BY api, month),"
+        " counters AS ("
+        " SELECT api, month, ok, error, blocked FROM api_usage_monthly"
+        " WHERE ok OR error OR blocked)"
+        " SELECT * FROM (SELECT * FROM ledger EXCEPT SELECT * FROM counters)"
+        " UNION SELECT * FROM (SELECT * FROM counters EXCEPT SELECT * FROM ledger)"
+        " ORDER BY 1, 2"
+    )
+    return [tuple(r) for r in rows]
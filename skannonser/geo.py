@@ -1,6 +1,116 @@
-"""Shared geometry utilities."""
+"""Shared geometry utilities.
+
+Scalar helpers (`haversine_meters`, `is_point_in_polygon`) for one point at
+a time, and NumPy kernels with the same arithmetic for batches:
+`haversine_array` (broadcasting: one point against many, or pairwise
+elementwise), `pairs_within_radius` (every pair of points within a radius,
+via a grid) and `points_in_polygon`. The kernels agree with the scalar
+versions to float rounding (well under 1e-6 m / exactly for containment).
+"""
 import math
 
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+
+
+def haversine_meters(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in meters. Byte-for-byte port of legacy
+    `_haversine_meters` (post_process.py:81-93)."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lng2 - lng1)
+
+    a = (
+        math.sin(d_phi / 2.0) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2.0) ** 2
+    )
+    return 2.0 * EARTH_RADIUS_M * math.atan2(math.sqrt(a), math.sqrt(1.0 - a))
+
+
+def haversine_array(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """`haversine_meters` over NumPy-broadcast inputs, e.g. a scalar point
+    against arrays of points, or two equal-length arrays pairwise."""
+    lat1 = np.asarray(lat1, dtype=float)
+    lat2 = np.asarray(lat2, dtype=float)
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    d_phi = np.radians(lat2 - lat1)
+    d_lambda = np.radians(np.asarray(lng2, dtype=float) - np.asarray(lng1, dtype=float))
+
+    a = np.sin(d_phi / 2.0) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_M * np.arctan2(np.sqrt(a), np.sqrt(1.0 - a))
+
+
+def pairs_within_radius(lats, lngs, radius_m: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Every unordered pair of points at most `radius_m` apart.
+
+    Returns `(i, j, meters)` arrays with `i < j`, indices into the inputs,
+    sorted by `(i, j)`. Points are bucketed into cells one radius tall and
+    wide enough at the data's highest latitude, so only pairs in the same or
+    adjacent cells are measured. NaN coordinates never pair. Longitudes are
+    not wrapped at +-180. Falls back to measuring all pairs when the radius
+    reaches a pole.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    empty = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0))
+    valid = np.flatnonzero(np.isfinite(lats) & np.isfinite(lngs))
+    if radius_m < 0 or len(valid) < 2:
+        return empty
+
+    # Slightly wider than the radius: rounding can only add candidates.
+    delta = radius_m / EARTH_RADIUS_M * (1 + 1e-9) + 1e-12
+    max_phi = float(np.radians(np.abs(lats[valid]).max()))
+    if max_phi + delta >= math.pi / 2:
+        ci = np.zeros(len(valid), dtype=np.int64)
+        cj = ci
+    else:
+        cell_lat = math.degrees(delta)
+        cell_lng = math.degrees(math.asin(min(1.0, math.sin(delta) / math.cos(max_phi))))
+        ci = np.floor(lats[valid] / cell_lat).astype(np.int64)
+        cj = np.floor(lngs[valid] / cell_lng).astype(np.int64)
+
+    ci = ci - ci.min() + 1
+    cj = cj - cj.min() + 1
+    width = int(cj.max()) + 2
+    cell = ci * width + cj
+    order = np.argsort(cell, kind="stable")
+    points = valid[order]
+    cells, starts, counts = np.unique(cell[order], return_index=True, return_counts=True)
+
+    found_i, found_j, found_d = [], [], []
+    # Half of the 3x3 neighbourhood: each pair of cells is visited once.
+    for d_i, d_j in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        target = cells + d_i * width + d_j
+        pos = np.minimum(np.searchsorted(cells, target), len(cells) - 1)
+        hit = np.flatnonzero(cells[pos] == target)
+        if not len(hit):
+            continue
+        a_start, a_count = starts[hit], counts[hit]
+        b_start, b_count = starts[pos[hit]], counts[pos[hit]]
+        sizes = a_count * b_count
+        group = np.repeat(np.arange(len(hit)), sizes)
+        within = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        left = points[a_start[group] + within // b_count[group]]
+        right = points[b_start[group] + within % b_count[group]]
+        if d_i == 0 and d_j == 0:
+            keep = left < right
+            left, right = left[keep], right[keep]
+        meters = haversine_array(lats[left], lngs[left], lats[right], lngs[right])
+        close = meters <= radius_m
+        left, right, meters = left[close], right[close], meters[close]
+        found_i.append(np.minimum(left, right))
+        found_j.append(np.maximum(left, right))
+        found_d.append(meters)
+
+    if not found_i:
+        return empty
+    i, j, meters = np.concatenate(found_i), np.concatenate(found_j), np.concatenate(found_d)
+    order = np.lexsort((j, i))
+    return i[order], j[order], meters[order]
+
 
 def is_point_in_polygon(lat: float, lng: float, polygon: list[tuple[float, float]]) -> bool:
     inside = False
@@ -23,3 +133,28 @@ def is_point_in_polygon(lat: float, lng: float, polygon: list[tuple[float, float
             inside = not inside
 
     return inside
+
+
+def points_in_polygon(lats, lngs, polygon: list[tuple[float, float]]) -> np.ndarray:
+    """`is_point_in_polygon` for arrays of points: the same ray cast, edge by
+    edge, over all points at once. Returns a bool array."""
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    inside = np.zeros(lats.shape, dtype=bool)
+    n = len(polygon)
+    if n < 3:
+        return inside
+
+    for i in range(n):
+        j = (i - 1) % n
+        xi, yi = polygon[i][0], polygon[i][1]
+        xj, yj = polygon[j][0], polygon[j][1]
+
+        if not (math.isfinite(xi) and math.isfinite(yi) and math.isfinite(xj) and math.isfinite(yj)):
+            continue
+
+        crosses = (yi > lats) != (yj > lats)
+        intersects = crosses & (lngs < ((xj - xi) * (lats - yi)) / ((yj - yi) or 1e-12) + xi)
+        inside ^= intersects
+
+    return inside
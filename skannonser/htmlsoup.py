@@ -0,0 +1,73 @@
+"""Configurable BeautifulSoup tree builder for the extractors.
+
+Every extractor (`finn/parse.py`, `parse_details.py` and
+`parse_salgsoppgave.py` through the shared `ParsedAd`, `payload`,
+`finn/crawl.extract_ad_urls`, `dnb/parse.py`, `dnb/crawl.py`) builds its
+soup through `make_soup`, so the tree builder is one setting:
+`SKANNONSER_HTML_PARSER`.
+
+- `html.parser` (default) -- the pure-Python builder every golden fixture
+  was frozen against. It is the REFERENCE: the legacy byte-identical
+  guarantee is a statement about this backend.
+- `lxml` -- libxml2 in C, several times faster per soup. Optional: install
+  the `fast` extra from pyproject.toml's optional-dependencies. Selecting it
+  without lxml installed fails every parse loudly (bs4's
+  `FeatureNotFound`), which ingest's failure-rate guard turns into an
+  aborted run rather than a silently degraded one.
+
+Callers that tolerate unparseable markup catch `ParserRejectedMarkup` (what
+bs4 raises when a builder gives up on the input) and nothing broader, so a
+missing or unknown backend is never mistaken for a bad page.
+
+Before switching a machine to `lxml`, run
+`skannonser tools parser-equivalence --backend lxml`: it parses the golden
+fixtures and the whole `html_extracted` corpus under both backends and
+reports every field that differs (`skannonser.ingest.finn.equivalence`).
+
+`html_cache.load_or_fetch` deliberately does NOT go through here: its
+`str(soup)` re-serialisation defines the bytes of the on-disk cache, and
+must stay `html.parser` so change detection against the existing files
+stays apples-to-apples whichever backend parses them.
+"""
+from contextlib import contextmanager
+from typing import Iterator
+
+from bs4 import BeautifulSoup
+from bs4.exceptions import ParserRejectedMarkup
+
+from skannonser.config.settings import get_secrets
+
+__all__ = ["BACKENDS", "REFERENCE", "ParserRejectedMarkup", "backend", "make_soup", "using"]
+
+BACKENDS = ("html.parser", "lxml")
+REFERENCE = "html.parser"
+
+# Set only by `using` (the equivalence harness); None means "use the setting".
+_override: str | None = None
+
+
+def _checked(name: str) -> str:
+    if name not in BACKENDS:
+        raise ValueError(f"unknown HTML parser backend {name!r} (expected one of {BACKENDS})")
+    return name
+
+
+def backend() -> str:
+    """The tree builder `make_soup` uses right now."""
+    return _checked(_override or get_secrets().html_parser)
+
+
+def make_soup(markup) -> BeautifulSoup:
+    return BeautifulSoup(markup, backend())
+
+
+@contextmanager
+def using(name: str) -> Iterator[None]:
+    """Parse with `name` for the duration of the block, in this process only
+    -- worker processes started by `skannonser.parallel` read the setting."""
+    global _override
+    previous, _override = _override, _checked(name)
+    try:
+        yield
+    finally:
+        _override = previous
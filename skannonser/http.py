@@ -8,9 +8,22 @@ sites (FINN, DNB) rather than *what* it fetches:
   bot-identifying signal a low-volume personal scraper emits; a residential
   IP plus a browser UA plus slow, jittered pacing is what makes the traffic
   read as a person rather than a script. `browser_get` is signature-
-  compatible with `requests.get` (forwards `params`/`timeout`/etc.), so it
-  drops in as the default `fetch` on any path that currently uses
-  `requests.get`.
+  compatible with `requests.get` (forwards `params`/`timeout`/etc.), and is
+  the default `fetch` on every FINN path: the result-page `crawl`,
+  `html_cache.load_or_fetch`, ingest, refresh and the sold sweeps.
+
+- `PooledTransport` is the connection layer underneath: one shared
+  keep-alive `requests.Session` (`default_transport()`) with a connection
+  pool per host, so a night of FINN crawl pages, ad pages, refreshes, sold
+  cards and thumbnails pays one TCP+TLS handshake per host instead of one
+  per request. `pooled_get` is its `requests.get`-shaped entry point and the
+  default under `browser_get`, DNB's listing fetch and the thumbnail fetch;
+  every `fetch=` seam still accepts anything `requests.get`-shaped.
+  Responses are decoded transparently (gzip/deflate always, br when the
+  `brotli` package from the `fast` extra is installed -- urllib3 advertises
+  it only then). Pooling changes only the socket reuse: the session keeps
+  no cookies, so each request carries exactly what a bare `requests.get`
+  did, and pacing is still entirely the callers' `jittered_delay`s.
 
 - `jittered_delay` builds the inter-request pacing callables (`page_delay`,
   `fetch_delay`, `listing_delay`) the crawl/refresh code already accepts,
@@ -20,10 +33,13 @@ sites (FINN, DNB) rather than *what* it fetches:
 """
 
 import random
+import threading
 import time
+from http.cookiejar import DefaultCookiePolicy
 from typing import Callable
 
 import requests
+from requests.adapters import HTTPAdapter
 
 # A current, ordinary desktop-Chrome UA. Kept deliberately unremarkable --
 # the goal is to look like a normal browser, not to fingerprint-evade.
@@ -36,7 +52,72 @@ BROWSER_USER_AGENT = (
 BROWSER_TIMEOUT = 30.0
 
 
-def browser_get(url, *, _transport=requests.get, **kwargs):
+# Distinct hosts kept pooled at once (FINN, its image CDN, DNB, ...); a host
+# beyond this evicts the least recently used pool and its metrics.
+POOL_HOSTS = 16
+# Idle keep-alive connections kept per host. Fetches are single-stream and
+# paced, so one is normally in use; the rest is headroom.
+POOL_PER_HOST = 4
+
+
+class PooledTransport:
+    """A keep-alive `requests.Session` with a bounded connection pool per
+    host and per-host reuse metrics. Not shared across processes -- each
+    process (and each `ordered_map` worker, which never fetches) builds
+    its own."""
+
+    def __init__(self, pool_hosts: int = POOL_HOSTS, pool_per_host: int = POOL_PER_HOST):
+        self.session = requests.Session()
+        # Stateless like a bare `requests.get`: never store or replay cookies.
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self._adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_per_host)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+    def get(self, url, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """`{host: {"requests", "connections", "reused"}}` -- `connections`
+        is how many TCP(+TLS) connections were opened, `reused` the requests
+        that rode an already-open one."""
+        pools = self._adapter.poolmanager.pools
+        out: dict[str, dict[str, int]] = {}
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:  # evicted between keys() and the lookup
+                continue
+            host = out.setdefault(key.key_host, {"requests": 0, "connections": 0, "reused": 0})
+            host["requests"] += pool.num_requests
+            host["connections"] += pool.num_connections
+        for host in out.values():
+            host["reused"] = max(0, host["requests"] - host["connections"])
+        return out
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_default: PooledTransport | None = None
+_default_lock = threading.Lock()
+
+
+def default_transport() -> PooledTransport:
+    """The process-wide transport, created on first use."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = PooledTransport()
+        return _default
+
+
+def pooled_get(url, **kwargs):
+    """Drop-in for `requests.get` over the shared keep-alive session."""
+    return default_transport().get(url, **kwargs)
+
+
+def browser_get(url, *, _transport=pooled_get, **kwargs):
     """GET `url` with a browser `User-Agent`, forwarding any `requests.get`
     kwargs (`params`, `timeout`, ...).
 
@@ -20,9 +20,8 @@ page-fetch loop but is not exercised by this module's functions.
 import json
 from urllib.parse import urlencode, urljoin, urlparse
 
-from bs4 import BeautifulSoup
-
 from skannonser.config.domain import DomainConfig
+from skannonser.htmlsoup import make_soup
 
 LISTING_PATH_PREFIX = "/bolig/"
 
@@ -68,7 +67,7 @@ def extract_listing_urls(html: str) -> list[str]:
     entries are found. Returns a sorted list rather than legacy's set, for a
     stable, testable interface.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     found: set[str] = set()
 
     for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
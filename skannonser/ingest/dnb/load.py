@@ -18,23 +18,36 @@ controller ruling.
 """
 
 import sqlite3
+from typing import Optional
 
 from skannonser.config.domain import DomainConfig
-from skannonser.geo import is_point_in_polygon
+from skannonser.geo import points_in_polygon
 from skannonser.textnorm import normalize_addr, normalize_pc
 
 
-def _row_ok(row: dict, polygon: list[tuple[float, float]]) -> bool:
-    """Port of ``main()``'s ``row_ok`` closure (lines 71-79): drop rows with
-    missing/non-numeric coordinates or coordinates outside the polygon."""
+def _coords(row: dict) -> Optional[tuple[float, float]]:
+    """The coordinate half of ``main()``'s ``row_ok`` closure (lines 71-79):
+    None for missing/non-numeric coordinates, else ``(lat, lng)``."""
     lat = row.get("Latitude")
     lng = row.get("Longitude")
     if lat is None or lng is None:
-        return False
+        return None
     try:
-        return is_point_in_polygon(float(lat), float(lng), polygon)
+        return float(lat), float(lng)
     except (TypeError, ValueError):
-        return False
+        return None
+
+
+def _rows_inside(rows: list[dict], polygon: list[tuple[float, float]]) -> list[dict]:
+    """Rows ``row_ok`` keeps: usable coordinates strictly inside `polygon`,
+    tested in one `points_in_polygon` batch. Input order is preserved."""
+    usable = [(row, coords) for row in rows if (coords := _coords(row)) is not None]
+    if not usable:
+        return []
+    inside = points_in_polygon(
+        [lat for _, (lat, _) in usable], [lng for _, (_, lng) in usable], polygon
+    )
+    return [row for (row, _), ok in zip(usable, inside) if ok]
 
 
 def filter_and_match(
@@ -52,8 +65,7 @@ def filter_and_match(
     CSV-side default was ``''``, which the repository layer treats
     identically to ``None`` -- see ``DnbRepo``).
     """
-    polygon = domain.polygon_points
-    kept = [row for row in rows if _row_ok(row, polygon)]
+    kept = _rows_inside(rows, domain.polygon_points)
 
     lookup: dict[tuple[str, str], str] = {}
     for eiendom_row in conn.execute(
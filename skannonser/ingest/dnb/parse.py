@@ -21,6 +21,8 @@ import json
 
 from bs4 import BeautifulSoup
 
+from skannonser.htmlsoup import make_soup
+
 _TYPE_MAP = {
     "Apartment": "Leilighet",
     "House": "Enebolig",
@@ -112,7 +114,7 @@ def parse_listing(html: str, url: str) -> dict | None:
     present (mirrors legacy's "no JSON-LD" failure path in `extract_all`).
     """
     del url  # unused -- see module docstring
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     entry = _parse_listing_jsonld(soup)
     if entry is None:
         return None
@@ -2,47 +2,38 @@
 
 The recovery/bootstrap path for the details cache (2026-07-23 design spec):
 iterate every `eiendom` finnkode, read
-`{project_dir}/html_extracted/{finnkode}.html` where present, `parse_details`
+its cached HTML (`html_cache.read_cached`) where present, `parse_details`
 it, upsert. Purely offline -- reads only the on-disk cache, never FINN.
+
+The walk itself (process-pool parsing, batched writes, resume checkpoint,
+parse-ledger skip of ads unchanged since their last parse at the current
+`PARSER_VERSION`) is `backfill_engine.run_backfill`, shared with
+`backfill_salgsoppgave`.
 """
 import sqlite3
 from pathlib import Path
 
-from skannonser.ingest.finn.parse_details import parse_details
+from skannonser.ingest.finn.backfill_engine import run_backfill
+from skannonser.ingest.finn.parse_details import PARSER_VERSION, parse_details
 from skannonser.store.repositories.details import DetailsRepo
-
-_BATCH_SIZE = 200
+from skannonser.store.repositories.parse_ledger import ParseLedgerRepo
 
 
 def backfill_details(
-    conn: sqlite3.Connection, project_dir: Path, wipe: bool = False
+    conn: sqlite3.Connection,
+    project_dir: Path,
+    wipe: bool = False,
+    *,
+    workers: int = 1,
+    resume: bool = True,
 ) -> dict:
     repo = DetailsRepo(conn)
     if wipe:
         repo.wipe()
-
-    finnkodes = [
-        str(r[0]) for r in conn.execute("SELECT finnkode FROM eiendom")
-    ]
-    parsed = missing = upserted = 0
-    batch = []
-    for finnkode in finnkodes:
-        path = Path(project_dir) / "html_extracted" / f"{finnkode}.html"
-        if not path.is_file():
-            missing += 1
-            continue
-        html = path.read_text(encoding="utf-8", errors="replace")
-        batch.append(parse_details(html, finnkode))
-        parsed += 1
-        if len(batch) >= _BATCH_SIZE:
-            upserted += repo.upsert_details(batch)["upserted"]
-            batch = []
-    if batch:
-        upserted += repo.upsert_details(batch)["upserted"]
-
-    return {
-        "eiendom_rows": len(finnkodes),
-        "parsed": parsed,
-        "missing_html": missing,
-        "upserted": upserted,
-    }
+        ParseLedgerRepo(conn).wipe("details")
+    # A wipe invalidates whatever an interrupted run had committed.
+    return run_backfill(
+        conn, "details", project_dir, parse_details, repo.upsert_details,
+        workers=workers, resume=resume and not wipe,
+        ledger=("details", PARSER_VERSION),
+    )
@@ -0,0 +1,172 @@
+"""Shared engine for the offline re-parse backfills over cached ad HTML.
+
+`backfill_details`, `backfill_salgsoppgave` and the tilstand input walk all
+share one shape: for each finnkode, read its cached ad HTML
+(`html_cache.read_cached`) if it exists, run one pure
+parser over it, and hand the result to a writer. On a full corpus that is
+~10^5 soups, all in one process and one thread -- hours of CPU for what is
+an embarrassingly parallel job. This module is that loop, once:
+
+- **Fan-out.** `iter_parsed` runs read + parse through
+  `skannonser.parallel.ordered_map`, so `workers > 1` spreads it over a
+  process pool while results still arrive in finnkode order. `workers=1` is
+  the in-process serial path -- including whatever parser a test has
+  monkeypatched onto the calling module, which is why callers pass the
+  parser in rather than this module importing it.
+- **Single writer, large transactions.** Only the calling process touches
+  SQLite. `run_backfill` buffers `batch_size` results and hands each buffer
+  to `write` (a repository upsert: one `BEGIN IMMEDIATE` per call), so a
+  100k-ad rebuild is ~100 commits, not 100k.
+- **Resumable.** The walk is in ascending finnkode order and, after every
+  committed batch, the last finnkode is recorded in `backfill_checkpoint`
+  (migration 019). An interrupted run picks up after it; a completed run
+  clears it. The checkpoint is written after the batch commit, so a crash
+  between the two redoes exactly one batch -- harmless, every writer is
+  full-row REPLACE. `wipe` always starts over.
+- **Incremental.** Given a `ledger` (parser name, `PARSER_VERSION`), an ad
+  whose cached HTML hashes to what `parse_ledger` (migration 020) recorded
+  for that parser version is counted `unchanged` and not parsed at all. For
+  a compressed cache entry the hash is its sidecar, so the body is not even
+  read; a legacy plain entry is read and hashed. Every written row is recorded back into
+  the ledger after its batch commits.
+
+One unreadable or unparseable ad is counted in `skipped` and never aborts
+the run, nor discards the already-parsed rows buffered around it.
+"""
+import sqlite3
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from skannonser.ingest.finn import html_cache
+from skannonser.parallel import ordered_map
+from skannonser.store.repositories.checkpoints import CheckpointRepo
+from skannonser.store.repositories.parse_ledger import ParseLedgerRepo
+
+__all__ = [
+    "MISSING", "SKIPPED", "UNCHANGED", "iter_parsed", "run_backfill",
+]
+
+# Results per writer transaction. Large on purpose: the writer is the only
+# serial stage once parsing fans out, and its cost is per-commit.
+_BATCH_SIZE = 1000
+
+# Sentinels `iter_parsed` yields in place of a parsed value.
+MISSING = object()  # no cached HTML for this finnkode
+SKIPPED = object()  # read or parse raised
+UNCHANGED = object()  # HTML hash matches `known`: not parsed
+
+
+def _read_and_parse(
+    parse: Callable, project_dir: Path, finnkode: str, known: str | None
+) -> tuple[str, object, str | None]:
+    """(status, value, html sha) -- module-level so it pickles to a worker.
+    Status is a plain string, not one of the sentinels below: those are only
+    unique within one process. A missing file is reported rather than
+    raised, so it is never confused with a failed parse."""
+    if known is not None and html_cache.stored_sha256(project_dir, finnkode) == known:
+        return "unchanged", None, known
+    html = html_cache.read_cached(project_dir, finnkode, errors="replace")
+    if html is None:
+        return "missing", None, None
+    sha = html_cache.html_sha256(html)
+    if sha == known:
+        return "unchanged", None, sha
+    return "parsed", parse(html, finnkode), sha
+
+
+def iter_parsed(
+    project_dir: Path,
+    finnkodes: Iterable[str],
+    parse: Callable,
+    workers: int = 1,
+    known: dict[str, str] | None = None,
+) -> Iterator[tuple[str, object, str | None]]:
+    """Yield `(finnkode, value, html_sha256)` in input order, where value is
+    `parse(html, finnkode)`, `MISSING`, `SKIPPED` or -- for an ad whose hash
+    equals `known[finnkode]` -- `UNCHANGED`. `parse` must be module-level
+    (picklable) once `workers > 1`."""
+    known = known or {}
+    work = partial(_read_and_parse, parse, project_dir)
+    items = ((fk, known.get(fk)) for fk in finnkodes)
+    for (finnkode, _), result, error in ordered_map(work, items, workers):
+        if error is not None:
+            yield finnkode, SKIPPED, None
+            continue
+        status, value, sha = result
+        if status == "missing":
+            value = MISSING
+        elif status == "unchanged":
+            value = UNCHANGED
+        yield finnkode, value, sha
+
+
+def run_backfill(
+    conn: sqlite3.Connection,
+    name: str,
+    project_dir: Path,
+    parse: Callable,
+    write: Callable[[list], dict],
+    *,
+    workers: int = 1,
+    batch_size: int = _BATCH_SIZE,
+    resume: bool = True,
+    ledger: tuple[str, int] | None = None,
+) -> dict:
+    """Parse every cached `eiendom` ad with `parse` and persist the rows via
+    `write` (returns `{"upserted": n}`), checkpointed under `name`.
+
+    `resume=False` ignores (and replaces) an existing checkpoint. `ledger`
+    is `(parser, version)` to skip and record ads through `parse_ledger`.
+    Counts cover this run only; `resumed` is how many finnkodes an earlier,
+    interrupted run had already committed and this one skipped."""
+    checkpoints = CheckpointRepo(conn)
+    ledger_repo = ParseLedgerRepo(conn)
+    known = ledger_repo.fingerprints(*ledger) if ledger else None
+    total = conn.execute("SELECT COUNT(*) FROM eiendom").fetchone()[0]
+    checkpoint = checkpoints.get(name) if resume else None
+    if checkpoint is None:
+        checkpoints.clear(name)
+        after, resumed = "", 0
+    else:
+        after, resumed = checkpoint
+    finnkodes = [
+        str(r[0])
+        for r in conn.execute(
+            "SELECT finnkode FROM eiendom WHERE finnkode > ? ORDER BY finnkode",
+            (after,),
+        )
+    ]
+
+    counts = {"parsed": 0, "missing_html": 0, "upserted": 0, "skipped": 0, "unchanged": 0}
+    batch: list = []
+    shas: list[tuple[str, str]] = []
+
+    def flush() -> None:
+        nonlocal batch, shas
+        counts["upserted"] += write(batch)["upserted"]
+        if ledger:
+            ledger_repo.record(*ledger, shas)
+        batch, shas = [], []
+
+    done = resumed
+    for finnkode, value, sha in iter_parsed(project_dir, finnkodes, parse, workers, known):
+        done += 1
+        if value is MISSING:
+            counts["missing_html"] += 1
+        elif value is SKIPPED:
+            counts["skipped"] += 1
+        elif value is UNCHANGED:
+            counts["unchanged"] += 1
+        else:
+            batch.append(value)
+            shas.append((finnkode, sha))
+            counts["parsed"] += 1
+            if len(batch) >= batch_size:
+                flush()
+                checkpoints.save(name, finnkode, done)
+    if batch:
+        flush()
+    checkpoints.clear(name)
+
+    return {"eiendom_rows": total, **counts, "resumed": resumed}
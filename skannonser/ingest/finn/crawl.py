@@ -23,9 +23,9 @@ from pathlib import Path
 from typing import Callable
 from urllib.parse import parse_qs, urlencode, urlparse
 
-import requests
-
 from skannonser.config.domain import DomainConfig
+from skannonser.htmlsoup import make_soup
+from skannonser.http import browser_get
 
 # Matches FINN homes ad links, e.g.
 # /realestate/homes/ad.html?finnkode=123456789&some=other&params=too
@@ -102,9 +102,7 @@ def extract_ad_urls(html: str) -> list[tuple[str, str]]:
     (explicit ad-link pattern instead of `len(href) <= 100`) and sanctioned
     fix #1 for finnkode parsing.
     """
-    from bs4 import BeautifulSoup
-
-    soup = BeautifulSoup(html, "html.parser")
+    soup = make_soup(html)
     hrefs = [a.get("href") for a in soup.find_all("a", href=True)]
 
     # search() rather than legacy's match(): FINN result pages link ads with
@@ -135,7 +133,7 @@ def extract_ad_urls(html: str) -> list[tuple[str, str]]:
 
 def crawl(
     domain: DomainConfig,
-    fetch=requests.get,
+    fetch=browser_get,
     archive_dir: Path | None = None,
     max_pages: int = 50,  # Safety cap only (legacy unbounded); observed depth ~20 pages.
     page_delay: Callable[[], None] | None = None,
@@ -0,0 +1,118 @@
+"""Golden-equivalence harness for the HTML parser backends.
+
+`skannonser.htmlsoup` lets the extractors run on a faster tree builder, but
+the legacy byte-identical guarantee is only proven for `html.parser` -- the
+golden fixtures were frozen against it. This module is the proof obligation
+for any other backend: parse each ad under the reference and the candidate
+and report every field of every extractor output that differs.
+
+An ad is compared on exactly what ingest persists from it: the
+`NormalizedListing.to_row()` dict, the `ListingDetails` row and the
+`Salgsoppgave` row. An extractor that raises under one backend and not the
+other is a difference too (field `<error>`). Wall time per backend is
+accumulated alongside, so one run answers both "is it identical?" and "is it
+faster?".
+
+Runs serially, in-process: `htmlsoup.using` only switches this process.
+"""
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from skannonser import htmlsoup
+from skannonser.ingest.finn import html_cache
+from skannonser.ingest.finn.parse import parse_ad
+from skannonser.ingest.finn.parse_details import parse_details
+from skannonser.ingest.finn.parse_salgsoppgave import parse_salgsoppgave
+from skannonser.ingest.finn.parsed_ad import ParsedAd
+
+__all__ = ["EquivalenceReport", "FieldDiff", "ad_files", "compare_ad", "compare_corpus"]
+
+
+@dataclass(frozen=True)
+class FieldDiff:
+    finnkode: str
+    extractor: str  # "listing" | "details" | "salgsoppgave"
+    field: str
+    reference: Any
+    candidate: Any
+
+
+@dataclass
+class EquivalenceReport:
+    backend: str
+    ads: int = 0
+    differing_ads: int = 0
+    diffs: list[FieldDiff] = field(default_factory=list)
+    seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def identical(self) -> bool:
+        return not self.diffs
+
+
+def _extract(html: str, finnkode: str) -> dict[str, dict]:
+    """Every persisted extractor output for one ad, under the current backend."""
+    doc = ParsedAd(html)
+    url = f"https://www.finn.no/realestate/homes/ad.html?finnkode={finnkode}"
+    out: dict[str, dict] = {}
+    for name, run in (
+        ("listing", lambda: parse_ad(doc, finnkode, url).to_row()),
+        ("details", lambda: parse_details(doc, finnkode).model_dump()),
+        ("salgsoppgave", lambda: parse_salgsoppgave(doc, finnkode).model_dump()),
+    ):
+        try:
+            out[name] = run()
+        except Exception as exc:  # noqa: BLE001 -- a raise is a reportable difference
+            out[name] = {"<error>": type(exc).__name__}
+    return out
+
+
+def _timed(backend: str, html: str, finnkode: str, seconds: dict[str, float]) -> dict:
+    started = time.perf_counter()
+    with htmlsoup.using(backend):
+        result = _extract(html, finnkode)
+    seconds[backend] = seconds.get(backend, 0.0) + time.perf_counter() - started
+    return result
+
+
+def compare_ad(
+    html: str, finnkode: str, candidate: str, seconds: dict[str, float] | None = None
+) -> list[FieldDiff]:
+    """Field-level differences between `candidate` and the reference backend."""
+    seconds = {} if seconds is None else seconds
+    want = _timed(htmlsoup.REFERENCE, html, finnkode, seconds)
+    got = _timed(candidate, html, finnkode, seconds)
+    diffs = []
+    for extractor, ref_row in want.items():
+        cand_row = got[extractor]
+        for name in sorted(set(ref_row) | set(cand_row)):
+            if ref_row.get(name) != cand_row.get(name):
+                diffs.append(
+                    FieldDiff(finnkode, extractor, name, ref_row.get(name), cand_row.get(name))
+                )
+    return diffs
+
+
+def ad_files(*dirs: Path) -> Iterator[Path]:
+    """Cached ad pages (`{finnkode}.html`, or the compressed
+    `{finnkode}.html.gz`) under each existing dir, sorted."""
+    for d in dirs:
+        yield from (p for p in html_cache.cached_files(d) if p.name.split(".")[0].isdigit())
+
+
+def compare_corpus(
+    paths: Iterable[Path], candidate: str, limit: int | None = None
+) -> EquivalenceReport:
+    report = EquivalenceReport(backend=candidate)
+    for path in paths:
+        if limit is not None and report.ads >= limit:
+            break
+        html = html_cache.read_path(path, errors="replace")
+        diffs = compare_ad(html, path.name.split(".")[0], candidate, report.seconds)
+        report.ads += 1
+        if diffs:
+            report.differing_ads += 1
+            report.diffs.extend(diffs)
+    return report
@@ -0,0 +1,105 @@
+"""Every FINN extractor over one ad, as a single picklable unit of work.
+
+`run_finn_ingest` and `refresh_listings` both derive the same three rows from
+an ad's HTML -- the legacy `NormalizedListing`, the `ListingDetails` and the
+`Salgsoppgave` -- over one shared `ParsedAd`. `extract_ad` is that step as a
+module-level function, so `skannonser.parallel.ordered_map` can run it in a
+worker process as readily as in-process.
+
+Failure semantics are the callers' long-standing ones: `parse_ad` failing
+fails the ad (the exception propagates), while details and salgsoppgave are
+best-effort enrichment -- a failure there yields None for that part and
+never fails the listing. The extractors are looked up through their modules
+at call time, so a test's `monkeypatch` of e.g. `parse_details.parse_details`
+still takes effect on the serial path.
+
+`ParseLedger` is the main-process side of the parse ledger (migration 020):
+it hashes each ad's HTML and switches off the details/salgsoppgave parse for
+ads already parsed from that exact HTML at the current `PARSER_VERSION`.
+`parse_ad` itself always runs -- `ListingsRepo.upsert`, `mark_inactive`, the
+status refresh and the drift canary all need tonight's listing row for every
+ad, changed or not.
+"""
+import sqlite3
+from typing import NamedTuple
+
+from skannonser.ingest.base import NormalizedListing
+from skannonser.ingest.finn import parse as finn_parse
+from skannonser.ingest.finn import parse_details as finn_parse_details
+from skannonser.ingest.finn import parse_salgsoppgave as finn_parse_salgsoppgave
+from skannonser.ingest.finn.html_cache import html_sha256
+from skannonser.ingest.finn.parse_details import ListingDetails
+from skannonser.ingest.finn.parse_salgsoppgave import Salgsoppgave
+from skannonser.ingest.finn.parsed_ad import ParsedAd
+from skannonser.store.repositories.parse_ledger import ParseLedgerRepo
+
+__all__ = ["AdExtract", "ParseLedger", "extract_ad"]
+
+
+class AdExtract(NamedTuple):
+    listing: NormalizedListing
+    details: ListingDetails | None
+    salgsoppgave: Salgsoppgave | None
+
+
+def extract_ad(
+    finnkode: str, url: str, html: str, details: bool = True, salgsoppgave: bool = True
+) -> AdExtract:
+    """`details`/`salgsoppgave` False skips that extractor (None in the
+    result) -- set by `ParseLedger.item` for ads whose rows are current."""
+    # One soup/payload decode shared by all three extractors below.
+    doc = ParsedAd(html)
+    listing = finn_parse.parse_ad(doc, finnkode, url)
+    # Details are best-effort enrichment: a failure here (parser bug,
+    # markup drift) must never fail the listing itself.
+    details_row = None
+    if details:
+        try:
+            details_row = finn_parse_details.parse_details(doc, finnkode)
+        except Exception:
+            details_row = None
+    # Salgsoppgave is the same kind of best-effort enrichment as details
+    # above -- a failure here must never fail the listing itself.
+    salgsoppgave_row = None
+    if salgsoppgave:
+        try:
+            salgsoppgave_row = finn_parse_salgsoppgave.parse_salgsoppgave(doc, finnkode)
+        except Exception:
+            salgsoppgave_row = None
+    return AdExtract(listing, details_row, salgsoppgave_row)
+
+
+class ParseLedger:
+    """One run's view of `parse_ledger` for the two derived extractors.
+
+    Loaded once up front, so the per-ad check is a dict lookup plus one
+    sha256 of the HTML. `record` is called by the run AFTER the derived rows
+    are committed, with the finnkodes whose rows it actually wrote."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._repo = ParseLedgerRepo(conn)
+        self._versions = {
+            "details": finn_parse_details.PARSER_VERSION,
+            "salgsoppgave": finn_parse_salgsoppgave.PARSER_VERSION,
+        }
+        self._known = {
+            parser: self._repo.fingerprints(parser, version)
+            for parser, version in self._versions.items()
+        }
+        self._shas: dict[str, str] = {}
+
+    def item(self, finnkode: str, url: str, html: str) -> tuple:
+        """`extract_ad` arguments for this ad, with each derived parse
+        switched off when its ledger entry matches the HTML."""
+        sha = html_sha256(html)
+        self._shas[finnkode] = sha
+        return (
+            finnkode, url, html,
+            self._known["details"].get(finnkode) != sha,
+            self._known["salgsoppgave"].get(finnkode) != sha,
+        )
+
+    def record(self, parser: str, finnkodes: list[str]) -> None:
+        entries = [(fk, self._shas[fk]) for fk in finnkodes]
+        self._repo.record(parser, self._versions[parser], entries)
+        self._known[parser].update(entries)
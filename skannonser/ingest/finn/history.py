@@ -0,0 +1,147 @@
+"""Price/status history extracted from the dated ad-HTML snapshots.
+
+The snapshot archive (`snapshot_archive.SnapshotArchive`) is the only record
+of how an ad's asking price, costs and status moved over time. This walks it
+with the production extractors (`parse_ad`, `parse_details`) and folds each
+ad's snapshots into `listing_history`: one `(finnkode, snapshot_day, field,
+value)` row per tracked field per change.
+
+- **Parallel, streaming.** The unit of work is one finnkode: a worker
+  (`skannonser.parallel.ordered_map`) decodes that ad's delta chain and
+  parses each new snapshot, returning only the handful of tracked values
+  per snapshot. The main process diffs them against the ad's last recorded
+  values and writes in batches. At most the pool window's worth of ads is
+  in flight, whatever the archive size.
+- **Incremental.** `listing_history_progress` records, per finnkode, the
+  newest snapshot day already folded in. A later run parses only newer
+  snapshots (and never opens packs older than that day's month); an ad
+  whose snapshot count no longer matches -- a snapshot arrived out of
+  order -- is rebuilt from its first snapshot.
+- **Failure policy** matches the backfills: a snapshot that fails to parse
+  is counted and skipped, never fatal.
+"""
+import sqlite3
+from functools import partial
+from pathlib import Path
+
+from skannonser.ingest.finn.parse import parse_ad
+from skannonser.ingest.finn.parse_details import parse_details
+from skannonser.ingest.finn.parsed_ad import ParsedAd
+from skannonser.ingest.finn.snapshot_archive import SnapshotArchive
+from skannonser.parallel import ordered_map
+from skannonser.store.repositories.history import ListingHistoryRepo
+
+__all__ = ["TRACKED", "changes", "extract_history", "snapshot_fields"]
+
+# history field -> (extractor, key in that extractor's persisted row)
+TRACKED: dict[str, tuple[str, str]] = {
+    "pris": ("listing", "Pris"),
+    "status": ("listing", "Tilgjengelighet"),
+    "totalpris": ("details", "totalpris"),
+    "felleskost_mnd": ("details", "felleskost_mnd"),
+    "fellesgjeld": ("details", "fellesgjeld"),
+}
+
+_BATCH_SIZE = 500
+
+
+def snapshot_fields(html: str, finnkode: str) -> dict[str, object]:
+    """The tracked values of one snapshot."""
+    doc = ParsedAd(html)
+    url = f"https://www.finn.no/realestate/homes/ad.html?finnkode={finnkode}"
+    rows = {
+        "listing": parse_ad(doc, finnkode, url).to_row(),
+        "details": parse_details(doc, finnkode).model_dump(),
+    }
+    return {name: rows[extractor][key] for name, (extractor, key) in TRACKED.items()}
+
+
+def _extract_one(root: Path, finnkode: str, after: str) -> tuple[list[tuple[str, dict]], int]:
+    """([(day, fields)], failed snapshots) for `finnkode`'s snapshots after
+    `after` -- module-level so it pickles to a worker."""
+    states, failed = [], 0
+    for day, html in SnapshotArchive(root).history(finnkode, after):
+        try:
+            states.append((day, snapshot_fields(html, finnkode)))
+        except Exception:  # noqa: BLE001 -- one bad snapshot is counted, not fatal
+            failed += 1
+    return states, failed
+
+
+def _iso(day: str) -> str:
+    return f"{day[:4]}-{day[4:6]}-{day[6:]}"
+
+
+def changes(previous: dict[str, object], states: list[tuple[str, dict]]) -> list[tuple]:
+    """`(snapshot_day, field, value)` for every tracked value that differs
+    from the one before it. A field's first appearance is a change; a field
+    that was never seen and is still None is not."""
+    current = dict(previous)
+    rows = []
+    for day, fields in states:
+        for name, value in fields.items():
+            if (name in current and current[name] != value) or (
+                name not in current and value is not None
+            ):
+                rows.append((_iso(day), name, value))
+                current[name] = value
+    return rows
+
+
+def extract_history(
+    conn: sqlite3.Connection,
+    project_dir: Path,
+    *,
+    workers: int = 1,
+    rebuild: bool = False,
+    batch_size: int = _BATCH_SIZE,
+) -> dict:
+    """Fold every not-yet-processed snapshot under
+    `{project_dir}/html_snapshots` into `listing_history`. `rebuild=True`
+    forgets all history first (e.g. after an extractor fix)."""
+    root = Path(project_dir) / "html_snapshots"
+    repo = ListingHistoryRepo(conn)
+    if rebuild:
+        repo.wipe()
+    progress = repo.progress()
+    index = SnapshotArchive(root).index()
+
+    counts = {
+        "listings": len(index), "up_to_date": 0, "processed": 0, "rebuilt": 0,
+        "snapshots": 0, "failed_snapshots": 0, "failed_listings": 0, "rows": 0,
+    }
+    work: list[tuple[str, str]] = []
+    resets: set[str] = set()
+    for finnkode, days in index.items():
+        done = progress.get(finnkode)
+        if done is None:
+            work.append((finnkode, ""))
+            continue
+        last_day, snapshots = done
+        if sum(day <= last_day for day in days) != snapshots:
+            resets.add(finnkode)
+            work.append((finnkode, ""))
+        elif days[-1] > last_day:
+            work.append((finnkode, last_day))
+        else:
+            counts["up_to_date"] += 1
+
+    batch: list = []
+    for (finnkode, _), result, error in ordered_map(partial(_extract_one, root), work, workers):
+        if error is not None:
+            counts["failed_listings"] += 1
+            continue
+        states, failed = result
+        reset = finnkode in resets
+        previous = {} if reset else repo.latest(finnkode)
+        days = index[finnkode]
+        batch.append((finnkode, changes(previous, states), days[-1], len(days), reset))
+        counts["processed"] += 1
+        counts["rebuilt"] += reset
+        counts["snapshots"] += len(states)
+        counts["failed_snapshots"] += failed
+        if len(batch) >= batch_size:
+            counts["rows"] += repo.write(batch)
+            batch = []
+    counts["rows"] += repo.write(batch)
+    return counts
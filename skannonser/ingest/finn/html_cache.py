@@ -1,20 +1,35 @@
-"""Ad HTML cache: canonical per-uid file + gzipped dated snapshots.
+"""Ad HTML cache: canonical per-uid file + packed dated snapshots.
 
 Port of `main/extractors/ad_html_loader.py` (lines 19-113): `_atomic_write`,
 `save_ad_html`, `download_and_save_ad_html`, `load_or_fetch_ad_html`.
 
-Path layout is unchanged from legacy so the ~7,731 existing cached files
-remain readable as-is:
+Path layout:
 
-- canonical: `{project_dir}/html_extracted/{uid}.html`
-- snapshot:  `{project_dir}/html_snapshots/{uid}.{YYYYMMDD}.html.gz`
-  (written only when the canonical content actually changes; an unchanged
-  re-save produces no snapshot)
+- canonical: `{project_dir}/html_extracted/{uid}.html.gz` -- the page,
+  gzipped (FINN markup compresses ~6-8x) -- plus the sidecar
+  `{uid}.sha256`, the hex sha256 of the uncompressed HTML. Change detection
+  is one compare against the sidecar; nothing is read or decompressed. The
+  sidecar doubles as the parse ledger's fingerprint (`html_sha256`), so an
+  unchanged ad is skipped by the backfills without opening its body.
+- legacy canonical: `{project_dir}/html_extracted/{uid}.html`, plain text
+  and sidecar-less, as legacy wrote all ~7,731 existing files. Still read
+  transparently wherever no `.html.gz` exists; the next save of that uid
+  replaces it, and `compact_cache` (`skannonser tools compact-html-cache`)
+  converts a whole directory in one pass.
+- snapshots: `{project_dir}/html_snapshots/{YYYYMM}.pack`, one per month,
+  each version stored as a delta against the uid's previous version
+  (`snapshot_archive.SnapshotArchive`; written only when the canonical
+  content actually changes -- an unchanged re-save produces no snapshot).
+  Legacy loose `{uid}.{YYYYMMDD}.html.gz` snapshots are still read by the
+  archive until `skannonser tools pack-snapshots` folds them in.
+
+Every reader goes through `read_cached` / `is_cached` / `stored_sha256`
+rather than building paths itself, so the layout lives in this module alone.
 
 Two behavioral simplifications versus legacy, both driven by the brief's
 signatures:
 
-- `load_or_fetch(url, project_dir, uid, fetch=requests.get)` takes `uid`
+- `load_or_fetch(url, project_dir, uid, fetch=browser_get)` takes `uid`
   explicitly instead of parsing it out of `url` via regex -- callers (e.g.
   the new crawler) already have the finnkode from `extract_ad_urls`, so the
   legacy `isNAV`-branching regex parse is dead weight here. `isNAV` itself
@@ -35,6 +50,7 @@ and always fetches + saves, mirroring legacy's `force_save` branch exactly.
 """
 
 import gzip
+import hashlib
 import os
 import tempfile
 import time
@@ -42,9 +58,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Callable
 
-import requests
 from bs4 import BeautifulSoup
 
+from skannonser.http import browser_get
+from skannonser.ingest.finn.snapshot_archive import SnapshotArchive
+
 
 def _atomic_write(path: Path, data, *, binary: bool = False) -> None:
     """Write ``data`` to ``path`` atomically.
@@ -71,6 +89,80 @@ def _atomic_write(path: Path, data, *, binary: bool = False) -> None:
         raise
 
 
+def html_sha256(html: str) -> str:
+    """Content fingerprint of a canonical HTML string -- the parse ledger's
+    key for "this ad has not changed since it was last parsed", and the
+    content of each canonical entry's `.sha256` sidecar."""
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def _canonical_paths(project_dir: Path, uid: str) -> tuple[Path, Path, Path]:
+    """(compressed body, sha256 sidecar, legacy plain file) for `uid`."""
+    base = Path(project_dir) / "html_extracted"
+    return base / f"{uid}.html.gz", base / f"{uid}.sha256", base / f"{uid}.html"
+
+
+def read_path(path: Path, errors: str = "strict") -> str:
+    """Decode one canonical file of either layout."""
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.decompress(path.read_bytes()).decode("utf-8", errors=errors)
+    return path.read_text(encoding="utf-8", errors=errors)
+
+
+def is_cached(project_dir: Path, uid: str) -> bool:
+    body, _, legacy = _canonical_paths(project_dir, uid)
+    return body.is_file() or legacy.is_file()
+
+
+def read_cached(project_dir: Path, uid: str, errors: str = "strict") -> str | None:
+    """The cached HTML for `uid`, or None when it is not cached."""
+    body, _, legacy = _canonical_paths(project_dir, uid)
+    for path in (body, legacy):
+        if path.is_file():
+            return read_path(path, errors)
+    return None
+
+
+def stored_sha256(project_dir: Path, uid: str) -> str | None:
+    """The sidecar hash, WITHOUT reading the body -- None for a legacy entry
+    (or one whose save was interrupted). A present sidecar always matches
+    its body: `save_ad_html` removes it before rewriting the body and only
+    writes the new one afterwards."""
+    body, sidecar, _ = _canonical_paths(project_dir, uid)
+    if not body.is_file():
+        return None
+    try:
+        return sidecar.read_text(encoding="ascii").strip() or None
+    except OSError:
+        return None
+
+
+def cached_files(base: Path) -> list[Path]:
+    """Every canonical body in an `html_extracted`-style directory, one per
+    uid (the compressed one where both exist), sorted by uid."""
+    base = Path(base)
+    if not base.is_dir():
+        return []
+    by_uid: dict[str, Path] = {}
+    for path in base.glob("*.html"):
+        by_uid.setdefault(path.name[: -len(".html")], path)
+    for path in base.glob("*.html.gz"):
+        by_uid[path.name[: -len(".html.gz")]] = path
+    return [by_uid[uid] for uid in sorted(by_uid)]
+
+
+def _write_canonical(project_dir: Path, uid: str, html: str, sha: str) -> Path:
+    body, sidecar, legacy = _canonical_paths(project_dir, uid)
+    # Sidecar out first, back last: a crash anywhere in between leaves a body
+    # with no sidecar (re-hashed on the next save), never a stale one.
+    sidecar.unlink(missing_ok=True)
+    _atomic_write(body, gzip.compress(html.encode("utf-8"), compresslevel=6, mtime=0), binary=True)
+    _atomic_write(sidecar, sha)
+    legacy.unlink(missing_ok=True)
+    return body
+
+
 def save_ad_html(
     project_dir: Path,
     uid: str,
@@ -80,40 +172,77 @@ def save_ad_html(
 ) -> Path:
     """Persist ad HTML for ``uid``.
 
-    The canonical copy ``{project_dir}/html_extracted/{uid}.html`` is written
-    atomically. When the content differs from the previous canonical (or none
-    existed yet), a gzipped, date-stamped snapshot is also archived under
-    ``{project_dir}/html_snapshots/{uid}.{YYYYMMDD}.html.gz`` so prior
-    versions are never overwritten. Unchanged re-downloads produce no
-    snapshot.
+    The canonical entry (``{project_dir}/html_extracted/{uid}.html.gz`` and
+    its ``.sha256`` sidecar) is written atomically, and only when the content
+    differs from the previous canonical -- judged by hash: the sidecar when
+    there is one, else the legacy plain file's content. A changed (or
+    brand-new) page is also archived as the uid's snapshot for today in the
+    monthly pack under ``{project_dir}/html_snapshots`` so prior versions are
+    never overwritten. Unchanged re-downloads write nothing.
 
     Returns the canonical file path.
     """
     project_dir = Path(project_dir)
-    canonical_path = project_dir / "html_extracted" / f"{uid}.html"
+    sha = html_sha256(html)
 
-    previous = None
-    if canonical_path.exists():
-        previous = canonical_path.read_text(encoding="utf-8")
-    changed = previous is None or previous != html
+    stored = stored_sha256(project_dir, uid)
+    previous = stored
+    if previous is None:
+        old = read_cached(project_dir, uid, errors="replace")
+        previous = html_sha256(old) if old is not None else None
+    changed = previous != sha
 
-    _atomic_write(canonical_path, html)
+    # An unchanged entry is still rewritten when it is in the legacy layout
+    # (or lost its sidecar), so every save leaves a compact, hashed entry.
+    body = _canonical_paths(project_dir, uid)[0]
+    if changed or stored is None:
+        body = _write_canonical(project_dir, uid, html, sha)
 
     if changed:
         if snapshot_dir is None:
             snapshot_dir = project_dir / "html_snapshots"
         day = today or datetime.now().strftime("%Y%m%d")
-        snapshot_path = Path(snapshot_dir) / f"{uid}.{day}.html.gz"
-        _atomic_write(snapshot_path, gzip.compress(html.encode("utf-8")), binary=True)
+        SnapshotArchive(snapshot_dir).add(uid, day, html, sha)
+
+    return body
+
 
-    return canonical_path
+def compact_cache(project_dir: Path) -> dict:
+    """One-shot migration of a legacy `html_extracted/` directory: every
+    plain `{uid}.html` becomes `{uid}.html.gz` + `{uid}.sha256`, and any
+    compressed entry missing its sidecar gets one. Idempotent; an
+    interrupted run is simply re-run. Writes no snapshots -- the content
+    did not change, only its encoding."""
+    converted = hashed = 0
+    bytes_before = bytes_after = 0
+    for path in cached_files(Path(project_dir) / "html_extracted"):
+        uid = path.name.split(".")[0]
+        legacy = path.suffix != ".gz"
+        if not legacy and stored_sha256(project_dir, uid) is not None:
+            _canonical_paths(project_dir, uid)[2].unlink(missing_ok=True)
+            continue
+        size = path.stat().st_size
+        html = read_path(path, errors="strict")
+        body = _write_canonical(project_dir, uid, html, html_sha256(html))
+        if legacy:
+            converted += 1
+            bytes_before += size
+            bytes_after += body.stat().st_size
+        else:
+            hashed += 1
+    return {
+        "converted": converted,
+        "hashed": hashed,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+    }
 
 
 def load_or_fetch(
     url: str,
     project_dir: Path,
     uid: str,
-    fetch=requests.get,
+    fetch=browser_get,
     fetch_delay: Callable[[], None] | None = None,
     force: bool = False,
 ) -> str:
@@ -138,9 +267,10 @@ def load_or_fetch(
     under `force=True`.
     """
     project_dir = Path(project_dir)
-    canonical_path = project_dir / "html_extracted" / f"{uid}.html"
-    if not force and canonical_path.exists():
-        return canonical_path.read_text(encoding="utf-8")
+    if not force:
+        cached = read_cached(project_dir, uid)
+        if cached is not None:
+            return cached
 
     # Apply fetch delay before network request (legacy behavior: 0.1s per fetch)
     if fetch_delay is not None:
@@ -150,6 +280,8 @@ def load_or_fetch(
 
     response = fetch(url)
     response.raise_for_status()
+    # Always html.parser, never the configurable extractor backend
+    # (`skannonser.htmlsoup`): this serialisation IS the cache's bytes.
     soup = BeautifulSoup(response.content, "html.parser")
     html = str(soup)
     save_ad_html(project_dir, uid, html)
@@ -12,13 +12,16 @@ longer carries a `data-testid="info-primary-area"` block (post NS 3940:2023)
 `Finnkode` out of its own `url` argument via `url.split('finnkode=')[1]`,
 line 29 of `extraction_eiendom.py`) -- the caller (the crawler) already has
 both, robustly parsed, so `parse_ad` just takes them as arguments.
+
+`parse_ad` accepts either the HTML string or a `ParsedAd` (see
+`parsed_ad.py`), so a caller running several extractors over one ad pays for
+a single soup.
 """
 import re
 
-from bs4 import BeautifulSoup
-
 from skannonser.ingest.base import NormalizedListing
 from skannonser.ingest.finn.gam import gam_targeting
+from skannonser.ingest.finn.parsed_ad import ParsedAd
 
 # ---------------------------------------------------------------------------
 # Field extractors -- ports of main/extractors/parsing_helpers_common.py
@@ -68,7 +71,7 @@ def _get_all_sizes(soup) -> dict:
     return sizes
 
 
-def _get_primary_area(soup) -> str:
+def _get_primary_area(soup, targeting: dict | None = None) -> str:
     """P-ROM, as a bare digit string like every other size extractor ("" when
     unavailable).
 
@@ -84,11 +87,16 @@ def _get_primary_area(soup) -> str:
     both, 68 disagreed (BRA-i larger by ~5.6% at the median). It leads the
     `compute_pris_kvm` priority chain, so an empty P-ROM silently pushed
     every kr/m² onto a larger denominator.
+
+    `targeting` is the already-extracted GAM map when the caller has one;
+    otherwise it is read from `soup`.
     """
     size = _get_size_helper(soup.find("div", {"data-testid": "info-primary-area"}))
     if size:
         return size
-    values = gam_targeting(soup).get("primary_size") or []
+    if targeting is None:
+        targeting = gam_targeting(soup)
+    values = targeting.get("primary_size") or []
     if not values:
         return ""
     return re.sub(r"\D", "", str(values[0]))
@@ -231,8 +239,9 @@ def _get_image_url(soup):
 # ---------------------------------------------------------------------------
 
 
-def parse_ad(html: str, finnkode: str, url: str) -> NormalizedListing:
-    soup = BeautifulSoup(html, "html.parser")
+def parse_ad(html: "str | ParsedAd", finnkode: str, url: str) -> NormalizedListing:
+    doc = ParsedAd.of(html)
+    soup = doc.soup
 
     address, area = _get_address(soup)
     sizes = _get_all_sizes(soup)
@@ -251,7 +260,7 @@ def parse_ad(html: str, finnkode: str, url: str) -> NormalizedListing:
         "Pris": buy_price,
         "URL": url,
         "IMAGE_URL": image_url,
-        "Primærrom": _get_primary_area(soup),
+        "Primærrom": _get_primary_area(soup, doc.targeting),
         "Internt bruksareal (BRA-i)": sizes.get("info-usable-i-area"),
         "Bruksareal": sizes.get("info-usable-area"),
         "Eksternt bruksareal (BRA-e)": sizes.get("info-usable-e-area"),
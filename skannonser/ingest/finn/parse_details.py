@@ -6,13 +6,20 @@ frozen legacy contract (AST-pinned by test). This module owns everything
 new. Every field is optional and every extractor is null-tolerant -- a
 parse failure on any field yields None for that field, and `parse_details`
 itself never raises on arbitrary HTML (worst case: an all-NULL row).
+
+Like `parse.parse_ad`, `parse_details` takes the HTML string or a shared
+`ParsedAd`.
 """
 import re
 
-from bs4 import BeautifulSoup
 from pydantic import BaseModel, Field
 
-from skannonser.ingest.finn.gam import gam_targeting
+from skannonser.ingest.finn.parsed_ad import ParsedAd
+
+# Bump on ANY change to what `parse_details` extracts from the same HTML: the
+# parse ledger (migration 020) then re-parses exactly the ads parsed under an
+# older version, and skips every other ad whose cached HTML is unchanged.
+PARSER_VERSION = 1
 
 
 class ListingDetails(BaseModel):
@@ -244,9 +251,10 @@ def _cadastre(soup) -> dict:
     return out
 
 
-def parse_details(html: str, finnkode: str) -> ListingDetails:
-    soup = BeautifulSoup(html, "html.parser")
-    targeting = gam_targeting(soup)
+def parse_details(html: "str | ParsedAd", finnkode: str) -> ListingDetails:
+    doc = ParsedAd.of(html)
+    soup = doc.soup
+    targeting = doc.targeting
     energimerke, energifarge = _energy(soup)
     return ListingDetails(
         finnkode=finnkode,
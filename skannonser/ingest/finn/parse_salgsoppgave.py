@@ -13,8 +13,12 @@ import re
 
 from pydantic import BaseModel
 
+from skannonser.ingest.finn.parsed_ad import ParsedAd
 from skannonser.ingest.finn.payload import Section, decode_ad, sections
 
+# Bump on any change to the extracted values -- see `parse_details.PARSER_VERSION`.
+PARSER_VERSION = 1
+
 
 class Salgsoppgave(BaseModel):
     finnkode: str
@@ -343,24 +347,25 @@ def _flat_text(secs: list[Section]) -> str:
     return "\n".join(f"{s.heading}\n{s.text}" for s in secs)
 
 
-def parse_salgsoppgave(html: str, finnkode: str) -> Salgsoppgave:
+def parse_salgsoppgave(html: "str | ParsedAd", finnkode: str) -> Salgsoppgave:
     """Never raises. An unrecognisable page -- or one that blows the
-    extraction up, e.g. a pathologically nested turbo-stream payload that
-    exhausts the recursion budget `payload._MAX_DEPTH` only bounds `_resolve`'s
-    own frames, not the ambient stack already spent getting here -- yields an
-    all-NULL row rather than propagating. A single bad page must never abort
-    a batch of thousands."""
+    extraction up in some way no extractor anticipated -- yields an all-NULL
+    row rather than propagating. A single bad page must never abort
+    a batch of thousands.
+
+    Accepts the HTML string or a shared `ParsedAd`; the latter reuses its
+    memoised payload decode and section list."""
     try:
         return _parse_salgsoppgave(html, finnkode)
     except Exception:
         return Salgsoppgave(finnkode=finnkode)
 
 
-def _parse_salgsoppgave(html: str, finnkode: str) -> Salgsoppgave:
+def _parse_salgsoppgave(html: "str | ParsedAd", finnkode: str) -> Salgsoppgave:
     ad = decode_ad(html)
     if ad is None:
         return Salgsoppgave(finnkode=finnkode)
-    secs = sections(ad)
+    secs = html.sections if isinstance(html, ParsedAd) else sections(ad)
     text = _flat_text(secs)
     if not text.strip():
         return Salgsoppgave(finnkode=finnkode)
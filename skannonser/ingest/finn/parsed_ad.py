@@ -0,0 +1,69 @@
+"""One ad page, parsed once, shared by every extractor.
+
+`parse.parse_ad`, `parse_details.parse_details`,
+`parse_salgsoppgave.parse_salgsoppgave` and `tilstand.classify_input` each
+used to build their own `BeautifulSoup` from the same HTML string (and
+`payload.decode_ad` a fourth), so a single ingested ad paid the
+`html.parser` cost three or four times over -- the dominant CPU cost of the
+nightly ingest and of every full-corpus backfill.
+
+`ParsedAd` wraps the HTML string and derives each representation lazily, at
+most once: the soup, the GAM targeting map, the decoded turbo-stream/remix
+`objectData.ad` payload and its plaintext section list. Every extractor
+accepts either a plain HTML string (unchanged behaviour, tests and one-off
+callers) or a `ParsedAd`; `ParsedAd.of` normalises the two. Callers that run
+more than one extractor over the same ad (`run_finn_ingest`,
+`refresh_listings`) build the `ParsedAd` themselves and pass it to each.
+
+The soup's tree builder is the configured one (`skannonser.htmlsoup`).
+The extractors only ever read the soup (`find`/`find_all`/`get_text`), never
+mutate it, so sharing one tree between them is safe.
+"""
+from functools import cached_property
+
+from bs4 import BeautifulSoup
+
+from skannonser.htmlsoup import ParserRejectedMarkup, make_soup
+from skannonser.ingest.finn.gam import gam_targeting
+from skannonser.ingest.finn.payload import Section, decode_script, largest_script, sections
+
+__all__ = ["ParsedAd"]
+
+
+class ParsedAd:
+    """Lazily-parsed views of one ad page's HTML."""
+
+    def __init__(self, html: str):
+        self.html = html
+
+    @classmethod
+    def of(cls, source: "str | ParsedAd") -> "ParsedAd":
+        """`source` itself when it is already parsed, else a fresh wrapper."""
+        return source if isinstance(source, ParsedAd) else cls(source)
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return make_soup(self.html)
+
+    @cached_property
+    def targeting(self) -> dict[str, list]:
+        """`gam.gam_targeting` over the shared soup."""
+        return gam_targeting(self.soup)
+
+    @cached_property
+    def ad(self) -> dict | None:
+        """The page's `objectData.ad` mapping -- exactly `payload.decode_ad`'s
+        result, without the second soup."""
+        if not self.html:
+            return None
+        try:
+            script = largest_script(self.soup)
+        except ParserRejectedMarkup:
+            return None
+        if not script:
+            return None
+        return decode_script(script)
+
+    @cached_property
+    def sections(self) -> list[Section]:
+        return sections(self.ad)
@@ -13,13 +13,20 @@ Two formats live side by side in the on-disk cache:
 Both land at ``objectData.ad``. Every entry point returns ``None`` rather than
 raising, so an unfamiliar third format degrades to "no data" instead of
 breaking the backfill.
+
+`largest_script` and `decode_script` are the two halves of `decode_ad`, split
+so `parsed_ad.ParsedAd` can run them over the soup it shares with the DOM
+extractors instead of building one of its own.
 """
 import html as html_mod
 import json
 import re
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
+
+from skannonser.htmlsoup import ParserRejectedMarkup, make_soup
 
-from bs4 import BeautifulSoup
+if TYPE_CHECKING:
+    from skannonser.ingest.finn.parsed_ad import ParsedAd
 
 # Turbo-stream encodes a few JS values as negative pseudo-indices. Only the
 # two booleans carry meaning for us; everything else collapses to None.
@@ -31,11 +38,11 @@ _REMIX = re.compile(r"window\.__remixContext\s*=\s*(\{.*\})", re.S)
 _BREAK = re.compile(r"<br\s*/?>|</p>|</li>|</h\d>", re.I)
 _TAG = re.compile(r"<[^>]+>")
 
-# `seen` only stops cyclic references (the same index revisited); a plain
-# chain of ~5000 distinct nested lists/dicts never revisits an index, so it
-# sails past that guard and blows the interpreter's call stack instead. Cap
-# recursion depth explicitly -- deeper than this is not a payload FINN would
-# ever produce, only a hostile or corrupt one.
+# Deeper than any payload FINN produces -- only a hostile or corrupt one
+# nests this far. The resolver is iterative, so this is no longer a stack
+# guard: it bounds the depth of the VALUE handed to callers, which still
+# walk it recursively (pydantic, json.dumps, ==), and keeps the output of a
+# pathological payload what it always was.
 _MAX_DEPTH = 500
 
 
@@ -44,47 +51,164 @@ class Section(NamedTuple):
     text: str
 
 
-def _largest_script(html: str) -> str:
+def largest_script(soup) -> str:
     """The payload always lives in the page's biggest inline <script>."""
-    try:
-        soup = BeautifulSoup(html, "html.parser")
-    except Exception:
-        return ""
     bodies = [s.string or "" for s in soup.find_all("script")]
     return max(bodies, key=len) if bodies else ""
 
 
-def _resolve(arr: list, index, seen: frozenset, depth: int = 0) -> object:
-    """Walk the turbo-stream index graph into ordinary Python values."""
-    # bool is a subclass of int; True/False are never valid indices.
-    if isinstance(index, bool) or not isinstance(index, int):
-        return None
-    if index < 0:
-        return _NEGATIVE.get(index)
-    if index in seen or index >= len(arr):
-        return None
-    if depth >= _MAX_DEPTH:
-        return None
-    value = arr[index]
-    if isinstance(value, dict):
-        seen = seen | {index}
-        out = {}
+def _largest_script(html: str) -> str:
+    try:
+        soup = make_soup(html)
+    except ParserRejectedMarkup:
+        return ""
+    return largest_script(soup)
+
+
+class _Resolver:
+    """Turbo-stream index graph -> ordinary Python values, without recursion.
+
+    The same index is routinely referenced from many places (turbo-stream
+    dedupes repeated objects), so finished values are memoised per index and
+    a shared sub-object is built once; callers must treat the result as
+    read-only, since shared references now alias the same object. Semantics
+    are exactly the old recursive walk's:
+
+    - a reference back to an index on the current path (a cycle) is None;
+    - a node at depth >= `_MAX_DEPTH` is None;
+    - dict keys are indices too; an entry whose key resolves to None is
+      dropped.
+
+    Both cut-offs depend on the path a node was reached by, so a value whose
+    subtree hit either is never memoised, and a memoised value is only
+    reused where its subtree height still fits under `_MAX_DEPTH`.
+    """
+
+    def __init__(self, arr: list):
+        self.arr = arr
+        # index -> (value, subtree height), path-independent values only.
+        self.memo: dict[int, tuple[object, int]] = {}
+
+    def resolve(self, index, seen: frozenset = frozenset(), depth: int = 0) -> object:
+        return self._run(index, set(seen), depth)[0]
+
+    def _leaf(self, index, on_path: set, depth: int):
+        """(value, height, cut) for anything needing no frame, else None."""
+        if isinstance(index, bool) or not isinstance(index, int):
+            return None, 0, False
+        if index < 0:
+            return _NEGATIVE.get(index), 0, False
+        if index in on_path:
+            return None, 0, True
+        if index >= len(self.arr):
+            return None, 0, False
+        if depth >= _MAX_DEPTH:
+            return None, 0, True
+        hit = self.memo.get(index)
+        if hit is not None and depth + hit[1] < _MAX_DEPTH:
+            return hit[0], hit[1], False
+        value = self.arr[index]
+        if isinstance(value, (dict, list)):
+            return None
+        return value, 0, False
+
+    def _run(self, index, on_path: set, depth: int) -> tuple[object, int, bool]:
+        leaf = self._leaf(index, on_path, depth)
+        if leaf is not None:
+            return leaf
+        # Frame: [index, depth, children, pos, out, height, cut, pending_key]
+        # `children` is the flat list of raw refs still to resolve: list
+        # items, or alternating key/value refs for a dict.
+        stack = [self._frame(index, depth, on_path)]
+        result = None
+        while stack:
+            frame = stack[-1]
+            if result is not None:
+                self._accept(frame, *result)
+                result = None
+            children, pos = frame[2], frame[3]
+            if pos < len(children):
+                frame[3] = pos + 1
+                child = children[pos]
+                if isinstance(frame[4], dict) and pos % 2 == 1 and frame[7] is None:
+                    continue  # key resolved to None: the value is never built
+                leaf = self._leaf(child, on_path, frame[1] + 1)
+                if leaf is not None:
+                    self._accept(frame, *leaf)
+                else:
+                    stack.append(self._frame(child, frame[1] + 1, on_path))
+                continue
+            stack.pop()
+            on_path.discard(frame[0])
+            value, height, cut = frame[4], frame[5], frame[6]
+            if not cut:
+                self.memo[frame[0]] = (value, height)
+            result = (value, height, cut)
+        return result
+
+    def _frame(self, index: int, depth: int, on_path: set) -> list:
+        on_path.add(index)
+        value = self.arr[index]
+        if isinstance(value, list):
+            return [index, depth, value, 0, [], 0, False, None]
+        children = []
         for raw_key, raw_val in value.items():
             try:
                 key_index = int(str(raw_key).lstrip("_"))
             except ValueError:
                 continue
-            key = _resolve(arr, key_index, seen, depth + 1)
+            children += (key_index, raw_val)
+        return [index, depth, children, 0, {}, 0, False, None]
+
+    @staticmethod
+    def _accept(frame: list, value, height: int, cut: bool) -> None:
+        frame[5] = max(frame[5], height + 1)
+        frame[6] = frame[6] or cut
+        out = frame[4]
+        if isinstance(out, list):
+            out.append(value)
+        elif frame[3] % 2 == 1:  # just resolved a key
+            frame[7] = value
+        else:  # just resolved the value for frame[7]
+            out[str(frame[7])] = value
+            frame[7] = None
+
+    def member(self, index: int, name: str, path: frozenset) -> int | None:
+        """Raw ref of `name` in the dict at `index`, resolving only its keys
+        (last duplicate key wins, as in the materialised dict)."""
+        found = None
+        seen = path | {index}
+        for raw_key, raw_val in self.arr[index].items():
+            try:
+                key_index = int(str(raw_key).lstrip("_"))
+            except ValueError:
+                continue
+            key = self.resolve(key_index, seen, len(path) + 1)
+            if key is not None and str(key) == name:
+                found = raw_val
+        return found
+
+    def keys(self, index: int, path: frozenset) -> dict[str, object]:
+        """str(key) -> raw value ref for the dict at `index`, in order."""
+        out: dict[str, object] = {}
+        seen = path | {index}
+        for raw_key, raw_val in self.arr[index].items():
+            try:
+                key_index = int(str(raw_key).lstrip("_"))
+            except ValueError:
+                continue
+            key = self.resolve(key_index, seen, len(path) + 1)
             if key is not None:
-                out[str(key)] = _resolve(arr, raw_val, seen, depth + 1)
+                out[str(key)] = raw_val
         return out
-    if isinstance(value, list):
-        seen = seen | {index}
-        return [_resolve(arr, i, seen, depth + 1) for i in value]
-    return value
 
 
-def _from_turbostream(script: str) -> dict | None:
+def _resolve(arr: list, index, seen: frozenset, depth: int = 0) -> object:
+    """Walk the turbo-stream index graph into ordinary Python values."""
+    return _Resolver(arr).resolve(index, seen, depth)
+
+
+def _turbostream_array(script: str) -> list | None:
     match = _ENQUEUE.search(script)
     if not match:
         return None
@@ -94,10 +218,59 @@ def _from_turbostream(script: str) -> dict | None:
         return None
     if not isinstance(arr, list) or not arr:
         return None
+    return arr
+
+
+def _from_turbostream(script: str) -> dict | None:
+    """The whole materialised root -- see `_turbostream_ad` for the hot path."""
+    arr = _turbostream_array(script)
+    if arr is None:
+        return None
     root = _resolve(arr, 0, frozenset())
     return root if isinstance(root, dict) else None
 
 
+def _turbostream_ad(arr: list) -> dict | None:
+    """`_ad_from_root(root)` without materialising the root.
+
+    A payload carries the whole route tree -- header, footer, recommendations,
+    tracking -- of which only `loaderData -> <ad route> -> objectData -> ad`
+    is ever read. This walks just that path, resolving nothing but the keys
+    along it, then materialises the `ad` subtree alone. The result is
+    identical to the eager walk's, cycles and depth bound included: each
+    step is taken only where the eager walk would have built a dict."""
+    r = _Resolver(arr)
+
+    def dict_at(ref, path: frozenset) -> bool:
+        return (
+            isinstance(ref, int) and not isinstance(ref, bool) and 0 <= ref < len(arr)
+            and ref not in path and len(path) < _MAX_DEPTH
+            and isinstance(arr[ref], dict)
+        )
+
+    if not dict_at(0, frozenset()):
+        return None
+    path = frozenset({0})
+    loader = r.member(0, "loaderData", frozenset())
+    if not dict_at(loader, path):
+        return None
+    path |= {loader}
+    for key, route in r.keys(loader, path - {loader}).items():
+        if "ad[.html]" not in key and "homes.ad" not in key:
+            continue
+        if not dict_at(route, path):
+            continue
+        route_path = path | {route}
+        object_data = r.member(route, "objectData", path)
+        if not dict_at(object_data, route_path):
+            continue
+        ad_ref = r.member(object_data, "ad", route_path)
+        ad = r.resolve(ad_ref, route_path | {object_data}, len(route_path) + 1)
+        if isinstance(ad, dict):
+            return ad
+    return None
+
+
 def _from_remix(script: str) -> dict | None:
     match = _REMIX.search(script)
     if not match:
@@ -112,15 +285,32 @@ def _from_remix(script: str) -> dict | None:
     return state if isinstance(state, dict) else root
 
 
-def decode_ad(html: str) -> dict | None:
+def decode_ad(html: "str | ParsedAd") -> dict | None:
     """The ad's ``objectData.ad`` mapping, or None if the page has no
-    recognisable payload."""
+    recognisable payload. An already-parsed `ParsedAd` answers from its own
+    (memoised) decode."""
     if not html:
         return None
+    if not isinstance(html, str):
+        return html.ad
     script = _largest_script(html)
     if not script:
         return None
-    root = _from_turbostream(script) or _from_remix(script)
+    return decode_script(script)
+
+
+def decode_script(script: str) -> dict | None:
+    """`decode_ad` for the payload script's text, already extracted."""
+    arr = _turbostream_array(script)
+    # The eager walk tried remix whenever the turbo-stream root did not
+    # resolve to a non-empty dict; resolving the root's keys is enough to
+    # tell, without building any of its values.
+    if arr is not None and isinstance(arr[0], dict) and _Resolver(arr).keys(0, frozenset()):
+        return _turbostream_ad(arr)
+    return _ad_from_root(_from_remix(script))
+
+
+def _ad_from_root(root) -> dict | None:
     if not isinstance(root, dict):
         return None
     loader = root.get("loaderData")
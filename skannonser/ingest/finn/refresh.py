@@ -42,10 +42,9 @@ from typing import Callable
 
 from skannonser.config.domain import DomainConfig
 from skannonser.http import browser_get
+from skannonser.ingest.finn import extract as finn_extract
 from skannonser.ingest.finn import html_cache
-from skannonser.ingest.finn import parse as finn_parse
-from skannonser.ingest.finn import parse_details as finn_parse_details
-from skannonser.ingest.finn import parse_salgsoppgave as finn_parse_salgsoppgave
+from skannonser.parallel import ordered_map
 from skannonser.store.repositories.details import DetailsRepo
 from skannonser.store.repositories.listings import ListingsRepo
 from skannonser.store.repositories.salgsoppgave import SalgsoppgaveRepo
@@ -53,7 +52,8 @@ from skannonser.store.repositories.salgsoppgave import SalgsoppgaveRepo
 MODES: tuple[str, ...] = ("all", "inactive", "stale-open")
 
 # Case-insensitive, matching db.py:1074's
-# `LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) IN ('solgt', 'inaktiv')`.
+# `LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) IN ('solgt', 'inaktiv')` --
+# which is exactly the `status_norm` generated column (migration 022).
 _CLOSED_STATUSES_SQL = "('solgt', 'inaktiv')"
 
 
@@ -84,7 +84,7 @@ def _select_rows(conn: sqlite3.Connection, domain: DomainConfig, mode: str):
 
     if mode == "stale-open":
         query += (
-            f" AND LOWER(TRIM(COALESCE(tilgjengelighet, ''))) NOT IN {_CLOSED_STATUSES_SQL}"
+            f" AND status_norm NOT IN {_CLOSED_STATUSES_SQL}"
         )
 
     query += " ORDER BY scraped_at DESC"
@@ -100,6 +100,7 @@ def refresh_listings(
     fetch=browser_get,
     fetch_delay: Callable[[], None] | None = None,
     listing_delay: Callable[[], None] | None = None,
+    workers: int = 1,
 ) -> dict:
     """Re-download every selected listing's ad page, update its
     `tilgjengelighet`, and append to `eiendom_status_history` only where the
@@ -119,6 +120,13 @@ def refresh_listings(
     It fires after every listing except the last, matching legacy's
     `if current_num < total: time.sleep(delay)` placement exactly.
 
+    `workers > 1` parses in that many worker processes
+    (`skannonser.parallel.ordered_map`) while this process keeps fetching at
+    the same paced, single-stream rate; status/details/salgsoppgave writes
+    still happen here, in selection order. Details/salgsoppgave are only
+    re-parsed when the fresh HTML differs from what the parse ledger says
+    they were last derived from (`extract.ParseLedger`).
+
     Returns `{"candidates", "refreshed", "status_changed", "errors"}`.
     """
     project_dir = Path(project_dir)
@@ -132,48 +140,63 @@ def refresh_listings(
     status_changed = 0
     errors = 0
 
-    for i, row in enumerate(rows):
-        finnkode = str(row["finnkode"]).strip()
-        url = row["url"]
-        old_status = row["tilgjengelighet"]
-
-        try:
-            html = html_cache.load_or_fetch(
-                url, project_dir, finnkode, fetch=fetch, fetch_delay=fetch_delay, force=True
-            )
-            listing = finn_parse.parse_ad(html, finnkode, url)
-            new_status = listing.Tilgjengelighet
-        except Exception:
-            errors += 1
-        else:
-            repo.update_status(finnkode, new_status)
-            if repo.record_status_change_if_changed(finnkode, old_status, new_status):
-                status_changed += 1
-            refreshed += 1
-
-            # Re-parse details off the fresh HTML too -- felleskost/totalpris
-            # changes ride along with the status refresh for free. Best-effort.
+    old_statuses: dict[str, object] = {}
+    ledger = finn_extract.ParseLedger(conn)
+
+    def _fetched():
+        # Fetches and both pacing hooks stay here, in this process, strictly
+        # one listing at a time -- only the parse runs in the workers.
+        nonlocal errors
+        for i, row in enumerate(rows):
+            finnkode = str(row["finnkode"]).strip()
+            url = row["url"]
+            old_statuses[finnkode] = row["tilgjengelighet"]
             try:
-                details_repo.upsert_details(
-                    [finn_parse_details.parse_details(html, finnkode)]
+                html = html_cache.load_or_fetch(
+                    url, project_dir, finnkode, fetch=fetch, fetch_delay=fetch_delay,
+                    force=True,
                 )
             except Exception:
-                pass
+                errors += 1
+            else:
+                yield ledger.item(finnkode, url, html)
+
+            if i < candidates - 1:
+                if listing_delay is not None:
+                    listing_delay()
+                else:
+                    time.sleep(0.2)
 
-            # Same for salgsoppgave -- best-effort, must never fail the
-            # refresh for this listing or the run.
+    for item, extract, error in ordered_map(finn_extract.extract_ad, _fetched(), workers):
+        if error is not None:
+            errors += 1
+            continue
+        finnkode = item[0]
+        old_status = old_statuses.pop(finnkode)
+        new_status = extract.listing.Tilgjengelighet
+        repo.update_status(finnkode, new_status)
+        if repo.record_status_change_if_changed(finnkode, old_status, new_status):
+            status_changed += 1
+        refreshed += 1
+
+        # Re-parse details off the fresh HTML too -- felleskost/totalpris
+        # changes ride along with the status refresh for free. Best-effort:
+        # a failed parse (None) or upsert never fails the listing.
+        if extract.details is not None:
             try:
-                salgsoppgave_repo.upsert(
-                    [finn_parse_salgsoppgave.parse_salgsoppgave(html, finnkode)]
-                )
+                details_repo.upsert_details([extract.details])
+                ledger.record("details", [finnkode])
             except Exception:
                 pass
 
-        if i < candidates - 1:
-            if listing_delay is not None:
-                listing_delay()
-            else:
-                time.sleep(0.2)
+        # Same for salgsoppgave -- best-effort, must never fail the
+        # refresh for this listing or the run.
+        if extract.salgsoppgave is not None:
+            try:
+                salgsoppgave_repo.upsert([extract.salgsoppgave])
+                ledger.record("salgsoppgave", [finnkode])
+            except Exception:
+                pass
 
     return {
         "candidates": candidates,
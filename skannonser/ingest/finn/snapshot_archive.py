@@ -0,0 +1,273 @@
+"""Packed, delta-encoded archive of dated ad-HTML snapshots.
+
+`save_ad_html` keeps every changed version of an ad page. Written as one
+standalone `{uid}.{YYYYMMDD}.html.gz` per version, that is tens of thousands
+of small files, each a full copy of a page that usually differs from the
+previous version by a few bytes. Here instead:
+
+- one pack per month, `{project_dir}/html_snapshots/{YYYYMM}.pack` -- a
+  small SQLite file with a single `snapshot` table keyed (uid, day). A
+  uid's history in a month is one index range scan, and a month that has
+  closed is never written again (cheap to back up, or to drop).
+- each row is either a keyframe (`base IS NULL`: the zlib-compressed page)
+  or a delta against an earlier day of the SAME uid in the SAME pack. The
+  first version of a uid in a month is always a keyframe, so every pack
+  decodes on its own and delta chains are bounded by the month.
+- the delta is a copy/insert script against the base, computed over tag /
+  line / comma-delimited tokens with `difflib` (no C dependency), then
+  zlib-compressed. A delta that comes out no smaller than the keyframe is
+  stored as the keyframe.
+
+Legacy loose `{uid}.{YYYYMMDD}.html.gz` files are still listed and read, so
+nothing is lost before `pack_loose` (`skannonser tools pack-snapshots`) has
+folded them in.
+"""
+import difflib
+import gzip
+import re
+import sqlite3
+import struct
+import zlib
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+__all__ = ["SnapshotArchive", "Snapshot", "decode_delta", "encode_delta"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshot (
+    uid    TEXT NOT NULL,
+    day    TEXT NOT NULL,
+    base   TEXT,
+    sha256 TEXT NOT NULL,
+    data   BLOB NOT NULL,
+    PRIMARY KEY (uid, day)
+)
+"""
+
+# Token boundaries for the diff: FINN pages are a few hundred very long
+# lines, so lines alone are too coarse; splitting after every '>' ',' and
+# newline gives ~5k tokens per page, which difflib aligns in milliseconds.
+_TOKEN = re.compile(rb"(?<=[>\n,])")
+_COPY = b"C"
+_INSERT = b"I"
+_OP = struct.Struct(">cII")
+
+_LOOSE = re.compile(r"^(?P<uid>[^.]+)\.(?P<day>\d{8})\.html\.gz$")
+
+
+def encode_delta(old: bytes, new: bytes) -> bytes:
+    """Copy/insert script turning `old` into `new` (uncompressed)."""
+    a, b = _TOKEN.split(old), _TOKEN.split(new)
+    offsets = [0]
+    for token in a:
+        offsets.append(offsets[-1] + len(token))
+    out = bytearray()
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            out += _OP.pack(_COPY, offsets[i1], offsets[i2] - offsets[i1])
+        elif j2 > j1:
+            chunk = b"".join(b[j1:j2])
+            out += _OP.pack(_INSERT, 0, len(chunk)) + chunk
+    return bytes(out)
+
+
+def decode_delta(old: bytes, delta: bytes) -> bytes:
+    out = bytearray()
+    pos = 0
+    while pos < len(delta):
+        op, start, length = _OP.unpack_from(delta, pos)
+        pos += _OP.size
+        if op == _COPY:
+            out += old[start:start + length]
+        else:
+            out += delta[pos:pos + length]
+            pos += length
+    return bytes(out)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    uid: str
+    day: str  # YYYYMMDD
+    sha256: str | None  # None for a legacy loose file (not hashed at write time)
+    packed: bool
+
+
+class SnapshotArchive:
+    """All snapshots under one `html_snapshots` directory."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    # -- layout ------------------------------------------------------------
+
+    def pack_path(self, day: str) -> Path:
+        return self.root / f"{day[:6]}.pack"
+
+    def packs(self) -> list[Path]:
+        return sorted(self.root.glob("*.pack")) if self.root.is_dir() else []
+
+    def _loose(self, uid: str | None = None) -> list[tuple[str, str, Path]]:
+        if not self.root.is_dir():
+            return []
+        found = []
+        for path in self.root.glob(f"{uid}.*.html.gz" if uid else "*.html.gz"):
+            m = _LOOSE.match(path.name)
+            if m:
+                found.append((m["uid"], m["day"], path))
+        return sorted(found)
+
+    def _connect(self, path: Path) -> sqlite3.Connection:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.execute(_SCHEMA)
+        return conn
+
+    # -- writing -----------------------------------------------------------
+
+    def add(self, uid: str, day: str, html: str, sha256: str) -> None:
+        """Store `html` as `uid`'s snapshot for `day`, replacing any earlier
+        snapshot of the same day (as the loose layout overwrote its file).
+        Deltas against a replaced row are re-keyed first, so no stored
+        version ever changes underneath another."""
+        raw = html.encode("utf-8")
+        with closing(self._connect(self.pack_path(day))) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for (dependent,) in conn.execute(
+                    "SELECT day FROM snapshot WHERE uid = ? AND base = ?", (uid, day)
+                ).fetchall():
+                    full = self._decode(conn, uid, dependent)
+                    conn.execute(
+                        "UPDATE snapshot SET base = NULL, data = ? WHERE uid = ? AND day = ?",
+                        (zlib.compress(full, 9), uid, dependent),
+                    )
+                base_row = conn.execute(
+                    "SELECT day FROM snapshot WHERE uid = ? AND day < ? ORDER BY day DESC LIMIT 1",
+                    (uid, day),
+                ).fetchone()
+                base, data = None, zlib.compress(raw, 9)
+                if base_row is not None:
+                    delta = zlib.compress(
+                        encode_delta(self._decode(conn, uid, base_row[0]), raw), 9
+                    )
+                    if len(delta) < len(data):
+                        base, data = base_row[0], delta
+                conn.execute(
+                    "INSERT OR REPLACE INTO snapshot (uid, day, base, sha256, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (uid, day, base, sha256, data),
+                )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    # -- reading -----------------------------------------------------------
+
+    @staticmethod
+    def _rows(conn: sqlite3.Connection, uid: str) -> dict[str, tuple[str | None, bytes]]:
+        return {
+            day: (base, data)
+            for day, base, data in conn.execute(
+                "SELECT day, base, data FROM snapshot WHERE uid = ? ORDER BY day", (uid,)
+            )
+        }
+
+    @classmethod
+    def _decode(cls, conn: sqlite3.Connection, uid: str, day: str) -> bytes:
+        return cls._materialise(cls._rows(conn, uid))[day]
+
+    @staticmethod
+    def _materialise(rows: dict[str, tuple[str | None, bytes]]) -> dict[str, bytes]:
+        """Every version in `rows`, decoded. A base is always an earlier day,
+        so one pass in day order has each base ready before its deltas."""
+        out: dict[str, bytes] = {}
+        for day in sorted(rows):
+            base, data = rows[day]
+            payload = zlib.decompress(data)
+            out[day] = payload if base is None else decode_delta(out[base], payload)
+        return out
+
+    def snapshots(self, uid: str) -> list[Snapshot]:
+        """`uid`'s snapshots, oldest first -- index reads only, nothing is
+        decompressed."""
+        found: dict[str, Snapshot] = {}
+        for _, day, _ in self._loose(uid):
+            found[day] = Snapshot(uid, day, None, packed=False)
+        for pack in self.packs():
+            with closing(sqlite3.connect(pack)) as conn:
+                for day, sha in conn.execute(
+                    "SELECT day, sha256 FROM snapshot WHERE uid = ?", (uid,)
+                ):
+                    found[day] = Snapshot(uid, day, sha, packed=True)
+        return [found[day] for day in sorted(found)]
+
+    def history(self, uid: str, after: str = "") -> Iterator[tuple[str, str]]:
+        """(day, html) for every snapshot of `uid` later than `after`
+        (YYYYMMDD; "" for all), oldest first. One range read per monthly
+        pack; packs wholly before `after` are not opened."""
+        loose = {day: path for _, day, path in self._loose(uid) if day > after}
+        packed: dict[str, bytes] = {}
+        for pack in self.packs():
+            if pack.stem < after[:6]:
+                continue
+            with closing(sqlite3.connect(pack)) as conn:
+                packed.update(self._materialise(self._rows(conn, uid)))
+        for day in sorted(set(loose) | {d for d in packed if d > after}):
+            raw = packed[day] if day in packed else gzip.decompress(loose[day].read_bytes())
+            yield day, raw.decode("utf-8", errors="replace")
+
+    def read(self, uid: str, day: str) -> str | None:
+        pack = self.pack_path(day)
+        if pack.is_file():
+            with closing(sqlite3.connect(pack)) as conn:
+                rows = self._rows(conn, uid)
+            if day in rows:
+                return self._materialise(rows)[day].decode("utf-8", errors="replace")
+        loose = self.root / f"{uid}.{day}.html.gz"
+        if loose.is_file():
+            return gzip.decompress(loose.read_bytes()).decode("utf-8", errors="replace")
+        return None
+
+    def index(self) -> dict[str, list[str]]:
+        """uid -> its snapshot days (sorted), for the whole archive: one
+        index scan per pack plus one directory listing, nothing decoded."""
+        found: dict[str, set[str]] = {}
+        for uid, day, _ in self._loose():
+            found.setdefault(uid, set()).add(day)
+        for pack in self.packs():
+            with closing(sqlite3.connect(pack)) as conn:
+                for uid, day in conn.execute("SELECT uid, day FROM snapshot"):
+                    found.setdefault(uid, set()).add(day)
+        return {uid: sorted(found[uid]) for uid in sorted(found)}
+
+    def uids(self) -> list[str]:
+        """Every uid with at least one snapshot, sorted."""
+        return list(self.index())
+
+    # -- migration ---------------------------------------------------------
+
+    def pack_loose(self) -> dict:
+        """One-shot: fold every loose `{uid}.{day}.html.gz` into its monthly
+        pack (in day order per uid, so each becomes a delta where it can),
+        deleting each file only once its row is committed. Idempotent."""
+        from skannonser.ingest.finn.html_cache import html_sha256
+
+        packed = 0
+        bytes_before = 0
+        for uid, day, path in self._loose():
+            html = gzip.decompress(path.read_bytes()).decode("utf-8", errors="replace")
+            self.add(uid, day, html, html_sha256(html))
+            bytes_before += path.stat().st_size
+            path.unlink()
+            packed += 1
+        return {
+            "packed": packed,
+            "bytes_before": bytes_before,
+            "bytes_after": sum(p.stat().st_size for p in self.packs()),
+            "packs": len(self.packs()),
+        }
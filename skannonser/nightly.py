@@ -54,6 +54,7 @@ steps" logic is needed here, because no later nightly step reads
 
 from __future__ import annotations
 
+import logging
 import sqlite3
 from pathlib import Path
 from typing import Callable
@@ -66,16 +67,19 @@ from skannonser.enrich.geocode import run_geocode
 from skannonser.enrich.thumbs import cache_thumbnails
 from skannonser.enrich.travel import run_enrich
 from skannonser.gateway import BudgetExceeded, Gateway
-from skannonser.http import browser_get, jittered_delay
+from skannonser.http import browser_get, default_transport, jittered_delay
 from skannonser.ingest.finn.refresh import refresh_listings
 from skannonser.pipeline import FAILURE_RATE_THRESHOLD, run_dnb_ingest, run_finn_ingest
 from skannonser.publish.export import dnb_rows, eie_rows, sold_rows, stations_rows
+from skannonser.store.repositories.listing_view import ListingViewRepo
 
 # Matches skannonser/commands/run_cmd.py's `ingest` command defaults exactly
 # (separate archive dir from legacy's own, see that module's docstring).
 _FINN_PROJECT_DIR = Path("data/eiendom")
 _FINN_ARCHIVE_DIR = _FINN_PROJECT_DIR / "html_crawled_rebuild"
 
+log = logging.getLogger(__name__)
+
 # ---------------------------------------------------------------------------
 # run_sheets / the shared publish step
 # ---------------------------------------------------------------------------
@@ -102,7 +106,19 @@ def _publish(conn: sqlite3.Connection, *, client=None, sheets_writer=None) -> di
     "error": str, "unattempted": [names not yet tried]}` -- `_run_step`
     recognizes this shape and records the step as failed while still
     surfacing exactly what did and didn't get published.
+
+    First folds the listings changed since the last publish into
+    ``listing_view`` (migration 023), so the Eie/Sold builders -- and the
+    web API until the next writes -- read them off the table. The fold is
+    an optimization only (readers route dirty rows through the join), so
+    if it fails -- an earlier step left `conn` inside a transaction, or
+    another writer holds the lock -- that is logged and the tabs publish
+    from the join regardless.
     """
+    try:
+        ListingViewRepo(conn).refresh()
+    except sqlite3.Error as exc:
+        log.warning("listing_view refresh skipped, publishing from the join: %s", exc)
     builders: list[tuple[str, Callable[[sqlite3.Connection], tuple[list[str], list[list]]]]] = [
         ("Eie", eie_rows),
         ("Sold", sold_rows),
@@ -229,6 +245,7 @@ def run_nightly(
     post=requests.post,
     sheets_writer=None,
     thumbs_dir: Path = Path("data/thumbs/"),
+    workers: int = 1,
 ) -> dict:
     """The legacy `make full` replacement: ingest finn -> ingest dnb ->
     geocode -> enrich(all) -> enrich(mvv_uni) -> enrich_dnb ->
@@ -246,8 +263,15 @@ def run_nightly(
     `GET /thumbs/{identifier}.jpg` from (`skannonser.web.app.create_app`'s
     own `thumbs_dir` default).
 
+    `workers` is the parse-stage process count for the two FINN steps that
+    parse ad HTML (`ingest_finn`, `refresh`); fetching stays single-stream
+    and paced regardless (see `skannonser.parallel`).
+
     Returns `{"steps": {name: {"ok": bool, "stats": {...}} | {"ok": False,
-    "error": str}}, "failed": [names], "budget_exhausted": [names]}`.
+    "error": str}}, "failed": [names], "budget_exhausted": [names], "http":
+    {host: {"requests", "connections", "reused"}}}` -- `http` is the shared
+    keep-alive transport's reuse metrics (`skannonser.http.PooledTransport`),
+    empty when every step ran on an injected `fetch`.
     """
     steps: dict = {}
     failed: list = []
@@ -273,6 +297,7 @@ def run_nightly(
             archive_dir=_FINN_ARCHIVE_DIR,
             page_delay=page_delay,
             fetch_delay=fetch_delay,
+            workers=workers,
         ),
     )
     _run_ingest_step(
@@ -322,6 +347,7 @@ def run_nightly(
             fetch=fetch,
             fetch_delay=fetch_delay,
             listing_delay=listing_delay,
+            workers=workers,
         ),
     )
     _run_step(
@@ -341,4 +367,9 @@ def run_nightly(
         lambda: _publish(conn, client=client, sheets_writer=sheets_writer),
     )
 
-    return {"steps": steps, "failed": failed, "budget_exhausted": budget_exhausted}
+    return {
+        "steps": steps,
+        "failed": failed,
+        "budget_exhausted": budget_exhausted,
+        "http": default_transport().stats(),
+    }
@@ -48,19 +48,16 @@ from pathlib import Path
 from typing import Callable
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
-import requests
-
 from skannonser.config.domain import DomainConfig
-from skannonser.http import browser_get
+from skannonser.http import browser_get, pooled_get
 from skannonser.ingest.dnb import crawl as dnb_crawl
 from skannonser.ingest.dnb import load as dnb_load
 from skannonser.ingest.dnb import parse as dnb_parse
 from skannonser.ingest.drift import check as drift_check
 from skannonser.ingest.finn import crawl as finn_crawl
 from skannonser.ingest.finn import html_cache
-from skannonser.ingest.finn import parse as finn_parse
-from skannonser.ingest.finn import parse_details as finn_parse_details
-from skannonser.ingest.finn import parse_salgsoppgave as finn_parse_salgsoppgave
+from skannonser.ingest.finn import extract as finn_extract
+from skannonser.parallel import ordered_map
 from skannonser.store.repositories.details import DetailsRepo
 from skannonser.store.repositories.dnb import DnbRepo
 from skannonser.store.repositories.listings import ListingsRepo
@@ -85,11 +82,24 @@ def run_finn_ingest(
     page_delay: Callable[[], None] | None = None,
     fetch_delay: Callable[[], None] | None = None,
     skip_crawl_urls: list[tuple[str, str]] | None = None,
+    workers: int = 1,
 ) -> dict:
     """Run the full FINN ingest pipeline once: crawl result pages for
     (finnkode, url) pairs, fetch+parse each ad, upsert into `eiendom`, then
     mark absent finnkodes inactive.
 
+    The parse ledger (`extract.ParseLedger`) skips the details and
+    salgsoppgave parses for ads whose HTML is unchanged since those rows were
+    last derived; `details_upserted`/`salgsoppgave_upserted` then count only
+    the ads actually re-parsed.
+
+    `workers > 1` moves the parse stage (`extract.extract_ad`) into that many
+    worker processes via `skannonser.parallel.ordered_map`. This process
+    still does every cache lookup and paced fetch, one at a time, and
+    results come back in crawl order -- so the drift canary, `upsert` and
+    the failure-rate guard see exactly what a serial run (`workers=1`, the
+    default) would.
+
     `skip_crawl_urls`, when given, bypasses `finn_crawl.crawl` entirely --
     `fetch` is then never invoked for the crawl phase (only for any ad page
     not already cached under `project_dir/html_extracted`). Used by the
@@ -97,7 +107,8 @@ def run_finn_ingest(
     fixtures.
 
     Returns counts: `crawled`, `parsed`, `failed`, `upserted`, `deactivated`,
-    `details_upserted`, `salgsoppgave_upserted`, plus `drift` (a list of
+    `details_upserted`, `salgsoppgave_upserted`, plus `deactivated_keys` (the
+    finnkodes `mark_inactive` deactivated), `drift` (a list of
     `DriftFinding`) and `drift_status` (per-table "checked"/"skipped:.../"error"
     -- disambiguates an empty `drift` list between healthy, skipped, and a
     crashed canary; see `skannonser/ingest/drift.py`).
@@ -121,30 +132,35 @@ def run_finn_ingest(
     listings = []
     details = []
     salgsoppgaver = []
-    for finnkode, url in pairs:
-        try:
-            html = html_cache.load_or_fetch(
-                url, project_dir, finnkode, fetch=fetch, fetch_delay=fetch_delay
-            )
-            listings.append(finn_parse.parse_ad(html, finnkode, url))
-            parsed += 1
-        except Exception:
+    ledger = finn_extract.ParseLedger(conn)
+
+    def _fetched():
+        # Runs in THIS process, one ad at a time: cache reads and the paced
+        # network fetches stay single-stream however many parse workers
+        # there are.
+        nonlocal failed
+        for finnkode, url in pairs:
+            try:
+                html = html_cache.load_or_fetch(
+                    url, project_dir, finnkode, fetch=fetch, fetch_delay=fetch_delay
+                )
+            except Exception:
+                failed += 1
+                continue
+            # Cache hits whose details/salgsoppgave rows were already parsed
+            # from this exact HTML (same PARSER_VERSION) only re-run parse_ad.
+            yield ledger.item(finnkode, url, html)
+
+    for _, extract, error in ordered_map(finn_extract.extract_ad, _fetched(), workers):
+        if error is not None:
             failed += 1
             continue
-        # Details are best-effort enrichment: a failure here (parser bug,
-        # markup drift) must never fail the listing itself.
-        try:
-            details.append(finn_parse_details.parse_details(html, finnkode))
-        except Exception:
-            pass
-        # Salgsoppgave is the same kind of best-effort enrichment as details
-        # above -- a failure here must never fail the listing itself.
-        try:
-            salgsoppgaver.append(
-                finn_parse_salgsoppgave.parse_salgsoppgave(html, finnkode)
-            )
-        except Exception:
-            pass
+        listings.append(extract.listing)
+        parsed += 1
+        if extract.details is not None:
+            details.append(extract.details)
+        if extract.salgsoppgave is not None:
+            salgsoppgaver.append(extract.salgsoppgave)
 
     repo = ListingsRepo(conn)
 
@@ -170,16 +186,18 @@ def run_finn_ingest(
     details_upserted = 0
     try:
         details_upserted = DetailsRepo(conn).upsert_details(details)["upserted"]
+        ledger.record("details", [d.finnkode for d in details])
     except Exception:
         pass  # derived cache only -- never blocks ingest
 
     salgsoppgave_upserted = 0
     try:
         salgsoppgave_upserted = SalgsoppgaveRepo(conn).upsert(salgsoppgaver)["upserted"]
+        ledger.record("salgsoppgave", [s.finnkode for s in salgsoppgaver])
     except Exception:
         pass  # derived cache only -- never blocks ingest
 
-    deactivated = 0
+    deactivated: list[str] = []
     if crawled > 0 and not _failure_rate_too_high(crawled, failed):
         active_finnkodes = [listing.Finnkode for listing in listings]
         deactivated = repo.mark_inactive(active_finnkodes)
@@ -189,7 +207,8 @@ def run_finn_ingest(
         "parsed": parsed,
         "failed": failed,
         "upserted": upsert_stats["inserted"] + upsert_stats["updated"],
-        "deactivated": deactivated,
+        "deactivated": len(deactivated),
+        "deactivated_keys": deactivated,
         "salgsoppgave_upserted": salgsoppgave_upserted,
         "details_upserted": details_upserted,
         "drift": drift_findings,
@@ -218,7 +237,7 @@ def _default_dnb_listing_fetch(url: str):
     caller leaves `fetch` at its default -- an explicit `fetch` override
     (e.g. a test fake) is used as-is for both the crawl and listing
     fetches, matching the pre-existing single-`fetch`-param convention."""
-    return requests.get(
+    return pooled_get(
         url,
         headers={"User-Agent": _DNB_LISTING_USER_AGENT},
         timeout=_DNB_LISTING_TIMEOUT,
@@ -311,17 +330,19 @@ def run_dnb_ingest(
     `project_dir` (default `data/dnbeiendom`, legacy's own output folder --
     see `extract_dnbeiendom_ads.py`'s `--output-folder` default), so a
     cache hit costs no fetch. `fetch`, when left at its default (`None`),
-    resolves to a plain `requests.get` for the search-page crawl and to
-    `_default_dnb_listing_fetch` (legacy's UA + 15s timeout) for listing
-    fetches; an explicit `fetch` override is used as-is for both. Every
+    resolves to a plain `pooled_get` (`requests.get` over the shared
+    keep-alive session, `skannonser.http`) for the search-page crawl and to
+    `_default_dnb_listing_fetch` (legacy's UA + 15s timeout, same session)
+    for listing fetches; an explicit `fetch` override is used as-is for both. Every
     network (non-cached) listing fetch is followed by `post_fetch_delay`
     (default: `random.uniform(200, 800) / 1000` seconds, legacy's pacing) --
     cache hits never pace.
 
-    Returns counts: `crawled`, `parsed`, `failed`, `upserted`, `deactivated`.
+    Returns counts: `crawled`, `parsed`, `failed`, `upserted`, `deactivated`,
+    plus `deactivated_keys` (the urls `deactivate_missing` deactivated).
     """
     project_dir = Path(project_dir)
-    crawl_fetch = fetch if fetch is not None else requests.get
+    crawl_fetch = fetch if fetch is not None else pooled_get
     listing_fetch = fetch if fetch is not None else _default_dnb_listing_fetch
 
     if skip_crawl_urls is not None:
@@ -338,8 +359,7 @@ def run_dnb_ingest(
     for url in urls:
         try:
             uid = _dnb_listing_uid(url)
-            canonical_path = project_dir / "html_extracted" / f"{uid}.html"
-            was_cached = canonical_path.exists()
+            was_cached = html_cache.is_cached(project_dir, uid)
 
             html = html_cache.load_or_fetch(
                 url, project_dir, uid, fetch=listing_fetch, fetch_delay=fetch_delay
@@ -365,7 +385,7 @@ def run_dnb_ingest(
     repo = DnbRepo(conn)
     upsert_stats = repo.upsert(matched)
 
-    deactivated = 0
+    deactivated: list[str] = []
     if crawled > 0 and not _failure_rate_too_high(crawled, failed):
         # Deactivate against the FULL crawled url set (not just the
         # polygon-matched subset), matching legacy: listings outside the
@@ -377,5 +397,6 @@ def run_dnb_ingest(
         "parsed": parsed,
         "failed": failed,
         "upserted": upsert_stats["inserted"] + upsert_stats["updated"],
-        "deactivated": deactivated,
+        "deactivated": len(deactivated),
+        "deactivated_keys": deactivated,
     }
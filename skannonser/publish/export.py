@@ -82,8 +82,11 @@ from skannonser.publish.rows import (
     _EIE_SELECT_HEAD,
     _EIE_SELECT_TAIL,
     _DONOR_TRAVEL_SQL,
+    EIE_KEYS,
+    VIEW_SOLD_VISIBLE,
     _rows_from_cursor,
     _sheet_filters,
+    _view_sql,
     listing_rows,
 )
 
@@ -303,9 +306,10 @@ def _norm_base_cell(header: str, value: Any) -> Any:
 # NOTE: the Eie/Sold shared SQL fragments (_EIE_SELECT_HEAD/_EIE_SELECT_TAIL/
 # _EIE_JOINS/_DONOR_TRAVEL_SQL) and query helpers (_rows_from_cursor,
 # _sheet_filters) now live in ``skannonser.publish.rows`` (imported above) --
-# ``rows.listing_rows`` is the extracted Eie query; ``sold_rows`` below still
+# ``rows.listing_rows`` is the extracted Eie query; ``_SOLD_SQL`` below still
 # composes the same fragments directly (different WHERE/ORDER BY, no
-# annotations join), unchanged.
+# annotations join) as the oracle for the ``listing_view`` read ``sold_rows``
+# actually runs.
 
 def eie_rows(conn: sqlite3.Connection) -> tuple[list[str], list[list]]:
     """Build the ``Eie`` tab payload: ``(header, rows)``.
@@ -322,6 +326,32 @@ def eie_rows(conn: sqlite3.Connection) -> tuple[list[str], list[list]]:
     return list(EIE_HEADER), rows
 
 
+# The Sold tab's query. Production reads `_SOLD_VIEW_SQL` off `listing_view`
+# (migration 023); the direct join `_SOLD_SQL` is the oracle it is tested
+# against.
+_SOLD_SQL = (
+    "SELECT "
+    + _EIE_SELECT_HEAD
+    + _DONOR_TRAVEL_SQL
+    + ", "
+    + _EIE_SELECT_TAIL
+    + _EIE_JOINS
+    + " WHERE e.active = 0"
+    + " AND e.status_norm IN ('solgt', 'inaktiv')"
+    + " AND COALESCE(e.pris, 0) <= ?"
+    + " AND CAST(e.info_usable_i_area AS REAL) >= ?"
+    + " ORDER BY e.scraped_at DESC, e.id"
+)
+
+_SOLD_VIEW_SQL = _view_sql(
+    EIE_KEYS,
+    VIEW_SOLD_VISIBLE
+    + ' AND COALESCE(v."Pris", 0) <= ?1'
+    + ' AND CAST(v."Internt bruksareal (BRA-i)" AS REAL) >= ?2',
+    '"SCRAPED_AT" DESC',
+)
+
+
 def sold_rows(conn: sqlite3.Connection) -> tuple[list[str], list[list]]:
     """Build the ``Sold`` tab payload: ``(header, rows)``.
 
@@ -332,20 +362,7 @@ def sold_rows(conn: sqlite3.Connection) -> tuple[list[str], list[list]]:
     ``CAST(info_usable_i_area AS REAL) >= MIN_BRA_I``.
     """
     max_price, min_bra_i = _sheet_filters()
-    sql = (
-        "SELECT "
-        + _EIE_SELECT_HEAD
-        + _DONOR_TRAVEL_SQL
-        + ", "
-        + _EIE_SELECT_TAIL
-        + _EIE_JOINS
-        + " WHERE e.active = 0"
-        + " AND LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) IN ('solgt', 'inaktiv')"
-        + " AND COALESCE(e.pris, 0) <= ?"
-        + " AND CAST(e.info_usable_i_area AS REAL) >= ?"
-        + " ORDER BY e.scraped_at DESC"
-    )
-    records = _rows_from_cursor(conn.execute(sql, (max_price, min_bra_i)))
+    records = _rows_from_cursor(conn.execute(_SOLD_VIEW_SQL, (max_price, min_bra_i)))
     rows = [[_norm_base_cell(h, rec.get(h)) for h in SOLD_HEADER] for rec in records]
     return list(SOLD_HEADER), rows
 
@@ -39,11 +39,22 @@ migration 018 -- distinct from Phase-1's regex RADON_OMTALT on ``s``),
 per-finding detail (``listing_tg_findings``) isn't joined here -- one row per
 finding would multiply the listing row -- the web API fetches it separately
 (see ``web.api._tg_findings_by_finnkode``).
+
+The readers no longer run that join per request: ``listing_view``
+(migration 023) materializes it, one row per listing
+(``_LISTING_VIEW_SOURCE_SQL``). Triggers on every source table mark the
+finnkodes they touch in ``listing_view_dirty``; ``_view_sql`` reads the clean
+rows off the table and only the dirty ones through the join, and
+``ListingViewRepo.refresh`` folds the dirty set back in. The fragment-built
+queries (``_EIE_SQL``, ``export``'s and ``web.api``'s sold queries) stay as
+the reference the view is tested against
+(``tests/rebuild/test_listing_view.py``).
 """
 
 from __future__ import annotations
 
 import math
+import re
 import sqlite3
 from typing import Any
 
@@ -201,7 +212,8 @@ def _as_float(v: Any) -> float | None:
 # from annotations (NULL when absent).
 # The active/tilgjengelighet half of this WHERE clause is also copied (as
 # `_STATUS_TIER`) in skannonser/store/repositories/tilstand.py -- keep both
-# in sync.
+# in sync. Production reads `_EIE_VIEW_SQL` (below); this direct join is the
+# oracle it is tested against.
 _EIE_SQL = (
     "SELECT "
     + _EIE_SELECT_HEAD
@@ -212,10 +224,89 @@ _EIE_SQL = (
     + _EIE_JOINS
     + " LEFT JOIN annotations a ON a.finnkode = e.finnkode"
     + " WHERE e.active = 1"
-    + " AND LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) NOT IN ('solgt', 'inaktiv')"
+    + " AND e.status_norm NOT IN ('solgt', 'inaktiv')"
     + " AND e.pris <= ?"
     + " AND CAST(e.info_usable_i_area AS REAL) >= ?"
-    + " ORDER BY e.active DESC, e.scraped_at DESC"
+    + " ORDER BY e.active DESC, e.scraped_at DESC, e.id"
+)
+
+
+# ---------------------------------------------------------------------------
+# listing_view (migration 023) readers
+# ---------------------------------------------------------------------------
+
+# The dict keys every Eie-shaped query returns, in SELECT order: exactly the
+# aliases of the shared fragments, so a view-backed read and the direct join
+# produce identical dicts.
+EIE_KEYS: tuple[str, ...] = tuple(
+    re.findall(r'AS "([^"]+)"', _EIE_SELECT_HEAD + _DONOR_TRAVEL_SQL + _EIE_SELECT_TAIL)
+)
+ANNOTATION_KEYS = ("Kommentar", "Tag")
+SOLD_PRICE_KEYS = ("SOLD_PRICE", "SOLD_DATE", "PRICE_SUGGESTION")
+
+# One listing_view row per eiendom row, no visibility filter: the Eie
+# fragments plus the annotation and sold-price columns. `id` is eiendom.id.
+# `ListingViewRepo` materializes this; `_view_sql` runs it for dirty rows.
+LISTING_VIEW_COLUMNS: tuple[str, ...] = (
+    ("id", "status_norm") + EIE_KEYS + ANNOTATION_KEYS + SOLD_PRICE_KEYS
+)
+_LISTING_VIEW_SOURCE_SQL = (
+    "SELECT e.id AS id, e.status_norm AS status_norm, "
+    + _EIE_SELECT_HEAD
+    + _DONOR_TRAVEL_SQL
+    + ", "
+    + _EIE_SELECT_TAIL
+    + ', a.kommentar AS "Kommentar", a.tag AS "Tag"'
+    + ', sp.sold_price AS "SOLD_PRICE", sp.sold_date AS "SOLD_DATE"'
+    + ', sp.price_suggestion AS "PRICE_SUGGESTION"'
+    + _EIE_JOINS
+    + " LEFT JOIN annotations a ON a.finnkode = e.finnkode"
+    + " LEFT JOIN sold_prices sp ON sp.finnkode = e.finnkode"
+)
+
+_DIRTY = "(SELECT finnkode FROM listing_view_dirty)"
+
+# The active/status half of the Eie and Sold visibility filters, over the
+# view's columns (status_norm == LOWER(TRIM(COALESCE(tilgjengelighet, '')))).
+VIEW_EIE_VISIBLE = "v.active = 1 AND v.status_norm NOT IN ('solgt', 'inaktiv')"
+VIEW_SOLD_VISIBLE = "v.active = 0 AND v.status_norm IN ('solgt', 'inaktiv')"
+
+
+def _view_sql(keys: tuple[str, ...], where: str, order_by: str = "") -> str:
+    """``SELECT <keys> ... WHERE <where> [ORDER BY ...]`` over listing_view.
+
+    Clean rows come off the table, dirty ones (``listing_view_dirty``)
+    through the source join, as one UNION ALL; `where` is applied to both
+    arms, so it binds its parameters by number (``?1``, ``?2``). `order_by`
+    names result columns, unqualified; ``id`` (eiendom.id) is appended as
+    the final tiebreaker -- the direct queries end their ORDER BY with
+    ``e.id`` too -- so rows tied on SCRAPED_AT keep one order whichever arm
+    they come from. Both arms are index-ordered that way, so the compound
+    merges rather than sorts; the outer SELECT drops ``id`` again."""
+    cols = ", ".join(f'v."{k}"' for k in keys)
+    if order_by:
+        arm_cols = f"{cols}, v.id"
+    else:
+        arm_cols = cols
+    sql = (
+        f"SELECT {arm_cols} FROM listing_view v"
+        f' WHERE {where} AND v."Finnkode" NOT IN {_DIRTY}'
+        f" UNION ALL SELECT {arm_cols} FROM ({_LISTING_VIEW_SOURCE_SQL}) v"
+        f' WHERE {where} AND v."Finnkode" IN {_DIRTY}'
+    )
+    if not order_by:
+        return sql
+    outer = ", ".join(f'"{k}"' for k in keys)
+    return f'SELECT {outer} FROM ({sql} ORDER BY {order_by}, "id")'
+
+
+_EIE_VIEW_WHERE = (
+    VIEW_EIE_VISIBLE
+    + ' AND v."Pris" <= ?1'
+    + ' AND CAST(v."Internt bruksareal (BRA-i)" AS REAL) >= ?2'
+)
+_EIE_VIEW_SQL = _view_sql(
+    EIE_KEYS + ANNOTATION_KEYS, _EIE_VIEW_WHERE, '"active" DESC, "SCRAPED_AT" DESC'
 )
 
 
@@ -249,8 +340,8 @@ def listing_rows(
     listing-details columns (``SOVEROM``/``EIEFORM``/... -- see
     ``_EIE_SELECT_TAIL``), ``None`` when that listing has no details row.
 
-    Identical SQL/filters/ordering to the query formerly inlined in
-    ``export.eie_rows`` (see ``_EIE_SQL`` above). Each dict's keys are the
+    Identical filters/ordering to the query formerly inlined in
+    ``export.eie_rows`` (``_EIE_SQL`` above), read off ``listing_view``. Each dict's keys are the
     ``EIE_HEADER`` sheet column names (``export.EIE_HEADER``) holding the RAW
     (un-normalized) SQL values -- ``export.eie_rows`` applies
     ``_norm_base_cell`` on top of exactly this to build the sheet payload.
@@ -274,7 +365,7 @@ def listing_rows(
     removed or renamed.
     """
     max_price, min_bra_i = _sheet_filters()
-    records = _rows_from_cursor(conn.execute(_EIE_SQL, (max_price, min_bra_i)))
+    records = _rows_from_cursor(conn.execute(_EIE_VIEW_SQL, (max_price, min_bra_i)))
 
     if not include_hidden_fields:
         return records
@@ -0,0 +1,108 @@
+"""Token-bucket rate limiting shared by every process on one SQLite DB.
+
+`run enrich`, `run geocode` and `run enrich-dnb` each build their own
+`Gateway`, so a limiter held in process memory lets three concurrent runs
+each spend the full per-minute rate. `TokenBucket` keeps the bucket state in
+the `rate_limit_bucket` table (migration 025) instead, one row per key, so
+every process (and every thread) drawing on the same DB drains the same
+bucket.
+
+Each `acquire` is a single UPSERT ... RETURNING, atomic under SQLite's write
+lock: it refills the bucket for the time elapsed since the last draw (capped
+at `burst`), takes one token, and returns the balance. A negative balance is
+a reservation -- the caller sleeps exactly the deficit outside any lock, by
+which time the refill has covered its token -- so contending callers queue
+in arrival order instead of polling. Time is wall-clock seconds (shared
+between processes, unlike each process's own `monotonic()`); a clock step
+backwards refills nothing rather than draining.
+
+A caller already inside a write transaction on the same DB can pass its own
+connection to `reserve`/`acquire`: the draw then joins that transaction
+(and is published by the caller's commit) instead of waiting on the
+caller's own write lock from the limiter's connection.
+"""
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+
+__all__ = ["TokenBucket"]
+
+# Migration 025's table, for `TokenBucket.private` buckets outside any
+# migrated DB.
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS rate_limit_bucket ("
+    " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+)
+
+_ACQUIRE_SQL = (
+    "INSERT INTO rate_limit_bucket (key, tokens, updated_at) VALUES (:key, :burst - 1, :now) "
+    "ON CONFLICT (key) DO UPDATE SET "
+    " tokens = MIN(:burst, tokens + MAX(0, :now - updated_at) * :per_s) - 1,"
+    " updated_at = MAX(updated_at, :now) "
+    "RETURNING tokens"
+)
+
+
+class TokenBucket:
+    """Per-key token buckets stored in `conn`'s database.
+
+    `conn` should be a connection of its own (see `Gateway`), not one the
+    caller also writes through: each acquire commits. Thread-safe -- the
+    statement runs under a lock, the sleep does not."""
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        sleeper: Callable[[float], None] = time.sleep,
+        now: Callable[[], float] = time.time,
+    ):
+        self.conn = conn
+        self.sleeper = sleeper
+        self.now = now
+        self._lock = threading.Lock()
+
+    @classmethod
+    def private(
+        cls,
+        sleeper: Callable[[float], None] = time.sleep,
+        now: Callable[[], float] = time.time,
+    ) -> "TokenBucket":
+        """A bucket only this process sees, on a fresh in-memory DB of its
+        own -- for callers whose DB has no other processes to share with."""
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.execute(_SCHEMA)
+        return cls(conn, sleeper=sleeper, now=now)
+
+    def reserve(
+        self, key: str, per_minute: float, burst: int, conn: sqlite3.Connection | None = None
+    ) -> float:
+        """Take one token from `key`'s bucket; returns the seconds to wait
+        before using it (0.0 when one was available). With `conn` (a
+        connection to the same DB with a transaction open) the draw runs in
+        that transaction and is left for its owner to commit."""
+        if per_minute <= 0 or burst < 1:
+            raise ValueError(f"invalid rate for {key!r}: {per_minute}/min, burst {burst}")
+        per_s = per_minute / 60.0
+        params = {"key": key, "burst": burst, "now": self.now(), "per_s": per_s}
+        if conn is not None:
+            tokens = conn.execute(_ACQUIRE_SQL, params).fetchall()[0][0]
+            return max(0.0, -tokens) / per_s
+        with self._lock:
+            try:
+                # fetchall: the RETURNING statement must finish before commit
+                tokens = self.conn.execute(_ACQUIRE_SQL, params).fetchall()[0][0]
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+        return max(0.0, -tokens) / per_s
+
+    def acquire(
+        self, key: str, per_minute: float, burst: int, conn: sqlite3.Connection | None = None
+    ) -> float:
+        """`reserve`, then sleep out the wait; returns the seconds slept."""
+        wait = self.reserve(key, per_minute, burst, conn)
+        if wait > 0:
+            self.sleeper(wait)
+        return wait
@@ -0,0 +1,374 @@
+"""`skannonser db backup` / `db restore`: stepped, verified, optionally
+compressed and page-incremental backups.
+
+Every backup starts the same way: SQLite's online backup API copies the live
+DB into a scratch file `step_pages` pages at a time, pausing `pause` seconds
+between steps. Each step is its own short read, so writers and WAL
+checkpoints proceed between steps instead of waiting out one long read (a
+write during the copy makes SQLite restart it, which the stepping tolerates).
+`PRAGMA integrity_check` then runs on that scratch snapshot; a snapshot that
+fails it is discarded and reported, never kept. The snapshot becomes one
+*restore point* named `properties-<stamp>`, stored as one of:
+
+- `properties-<stamp>.db`      -- a plain full copy (the original format);
+- `properties-<stamp>.db.gz`   -- a gzip-compressed full copy (`compress`);
+- `properties-<stamp>.delta.gz` -- only the pages that differ from the
+  previous restore point, plus the new page count (`incremental`).
+
+The backup API copies page N of the source to page N of the copy, so two
+snapshots can be compared page by page. Each point therefore also gets a
+`properties-<stamp>.pages` manifest: one JSON header line (kind, parent,
+chain depth, page size and count) and an 8-byte BLAKE2b digest per page. A
+delta is computed against its parent's manifest, without reading the
+parent's data. A chain is cut with a fresh full copy once it reaches
+`full_every` points, or when the page size changed.
+
+`restore` rebuilds any point in one call: it decompresses the chain's full
+copy, writes each delta's pages in order, truncates to the target's page
+count, checks every page digest against the target's manifest and runs
+`integrity_check` before moving the file into place. `prune` keeps the
+newest `keep` points plus every older point their chains still need.
+
+Each backup appends one JSON line to `ledger.jsonl` in the backup directory:
+size, pages written, duration and the integrity result. It lives beside the
+backups rather than in the DB, so it survives losing the DB.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+
+__all__ = ["BackupError", "create_backup", "list_points", "prune", "restore"]
+
+_POINT_RE = re.compile(r"^(properties-\d{8}-\d{6})\.(db|db\.gz|delta\.gz)$")
+_DELTA_FORMAT = "skannonser-delta/1"
+_DIGEST = 8
+_RECORD = struct.Struct(">I")  # page number before each delta page
+
+
+class BackupError(RuntimeError):
+    pass
+
+
+def _stamp() -> str:
+    return datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+def _snapshot(src: Path, dest: Path, step_pages: int, pause: float) -> None:
+    src_conn = sqlite3.connect(f"file:{src}?mode=ro", uri=True)
+    dest_conn = sqlite3.connect(dest)
+    try:
+        with dest_conn:
+            src_conn.backup(dest_conn, pages=step_pages, sleep=pause)
+    finally:
+        src_conn.close()
+        dest_conn.close()
+
+
+def _integrity(path: Path) -> str:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = [r[0] for r in conn.execute("PRAGMA integrity_check")]
+    finally:
+        conn.close()
+    return "ok" if rows == ["ok"] else "; ".join(rows[:5])
+
+
+def _page_size(path: Path) -> int:
+    with open(path, "rb") as f:
+        header = f.read(100)
+    size = int.from_bytes(header[16:18], "big")
+    return 65536 if size == 1 else size
+
+
+def _pages(path: Path, page_size: int):
+    with open(path, "rb") as f:
+        while page := f.read(page_size):
+            yield page
+
+
+def _digest(page: bytes) -> bytes:
+    return hashlib.blake2b(page, digest_size=_DIGEST).digest()
+
+
+def _manifest_path(dest_dir: Path, point: str) -> Path:
+    return dest_dir / f"{point}.pages"
+
+
+def _read_manifest(path: Path) -> tuple[dict, bytes]:
+    with open(path, "rb") as f:
+        header = json.loads(f.readline())
+        return header, f.read()
+
+
+def _write_manifest(path: Path, header: dict, digests: bytes) -> None:
+    tmp = path.with_name(path.name + ".partial")
+    with open(tmp, "wb") as f:
+        f.write(json.dumps(header).encode() + b"\n")
+        f.write(digests)
+    tmp.replace(path)
+
+
+def list_points(dest_dir: Path) -> dict[str, Path]:
+    """Restore point name -> data file, oldest first."""
+    points = {}
+    for path in sorted(dest_dir.glob("properties-*")):
+        match = _POINT_RE.match(path.name)
+        if match:
+            points[match.group(1)] = path
+    return points
+
+
+def _chain(dest_dir: Path, point: str, points: dict[str, Path]) -> list[str]:
+    """`point` and its ancestors back to a full copy, oldest first."""
+    chain = [point]
+    while points[chain[0]].name.endswith(".delta.gz"):
+        manifest = _manifest_path(dest_dir, chain[0])
+        if not manifest.exists():
+            raise BackupError(f"{chain[0]}: manifest missing, chain broken")
+        parent = _read_manifest(manifest)[0]["parent"]
+        if parent not in points:
+            raise BackupError(f"{chain[0]}: parent {parent} missing, chain broken")
+        chain.insert(0, parent)
+    return chain
+
+
+def create_backup(
+    src: Path,
+    dest_dir: Path,
+    *,
+    compress: bool = False,
+    incremental: bool = False,
+    full_every: int = 7,
+    step_pages: int = 2048,
+    pause: float = 0.02,
+) -> dict:
+    """Take one restore point of `src` into `dest_dir`; see the module
+    docstring. `incremental` implies `compress`. Returns the ledger entry.
+    Raises BackupError (after cleaning up) if the snapshot fails
+    integrity_check."""
+    compress = compress or incremental
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    started = time.monotonic()
+    point = f"properties-{_stamp()}"
+    scratch = dest_dir / f".{point}.snapshot"
+    outputs: list[Path] = []
+    try:
+        _snapshot(src, scratch, step_pages, pause)
+        integrity = _integrity(scratch)
+        if integrity != "ok":
+            _append_ledger(dest_dir, {
+                "point": point,
+                "file": None,
+                "seconds": round(time.monotonic() - started, 3),
+                "integrity": integrity,
+            })
+            raise BackupError(f"integrity_check failed on the snapshot: {integrity}")
+
+        page_size = _page_size(scratch)
+        digests = bytearray()
+        for page in _pages(scratch, page_size):
+            digests += _digest(page)
+        page_count = len(digests) // _DIGEST
+
+        parent = _delta_parent(dest_dir, page_size, full_every) if incremental else None
+        if parent is None:
+            kind, depth, changed = "full", 0, page_count
+            data = dest_dir / f"{point}.db.gz" if compress else dest_dir / f"{point}.db"
+        else:
+            kind, depth = "delta", parent[1]["depth"] + 1
+            data = dest_dir / f"{point}.delta.gz"
+        # Written under a name list_points ignores, renamed once complete.
+        partial = data.with_name(data.name + ".partial")
+        outputs += [partial, data]
+        if parent is not None:
+            parent_name, _, parent_digests = parent
+            changed = _write_delta(
+                scratch, partial, page_size, page_count, digests, parent_name, parent_digests
+            )
+        elif compress:
+            with open(scratch, "rb") as f, gzip.open(partial, "wb", compresslevel=6) as out:
+                shutil.copyfileobj(f, out, 1 << 20)
+        else:
+            os.replace(scratch, partial)
+
+        manifest = _manifest_path(dest_dir, point)
+        outputs.append(manifest)
+        _write_manifest(
+            manifest,
+            {
+                "kind": kind,
+                "parent": parent[0] if parent else None,
+                "depth": depth,
+                "page_size": page_size,
+                "page_count": page_count,
+            },
+            bytes(digests),
+        )
+        os.replace(partial, data)
+    except BaseException:
+        for path in outputs:
+            path.unlink(missing_ok=True)
+        raise
+    finally:
+        scratch.unlink(missing_ok=True)
+
+    entry = {
+        "point": point,
+        "file": data.name,
+        "kind": kind,
+        "parent": parent[0] if parent else None,
+        "db_bytes": page_count * page_size,
+        "written_bytes": data.stat().st_size,
+        "pages": page_count,
+        "changed_pages": changed,
+        "seconds": round(time.monotonic() - started, 3),
+        "integrity": integrity,
+    }
+    _append_ledger(dest_dir, entry)
+    return entry
+
+
+def _append_ledger(dest_dir: Path, entry: dict) -> None:
+    with open(dest_dir / "ledger.jsonl", "a", encoding="utf-8") as ledger:
+        ledger.write(json.dumps(entry) + "\n")
+
+
+def _delta_parent(dest_dir: Path, page_size: int, full_every: int):
+    """(name, manifest header, digests) of the newest point to diff against,
+    or None when the next point should be a full copy."""
+    points = list_points(dest_dir)
+    if not points:
+        return None
+    name = next(reversed(points))
+    manifest = _manifest_path(dest_dir, name)
+    if not manifest.exists():  # a plain pre-manifest copy: start a chain
+        return None
+    header, digests = _read_manifest(manifest)
+    if header["page_size"] != page_size or header["depth"] + 1 >= full_every:
+        return None
+    return name, header, digests
+
+
+def _write_delta(
+    scratch: Path,
+    data: Path,
+    page_size: int,
+    page_count: int,
+    digests: bytearray,
+    parent_name: str,
+    parent_digests: bytes,
+) -> int:
+    header = {
+        "format": _DELTA_FORMAT,
+        "parent": parent_name,
+        "page_size": page_size,
+        "page_count": page_count,
+    }
+    changed = 0
+    with gzip.open(data, "wb", compresslevel=6) as out:
+        out.write(json.dumps(header).encode() + b"\n")
+        for index, page in enumerate(_pages(scratch, page_size)):
+            at = index * _DIGEST
+            if digests[at:at + _DIGEST] != parent_digests[at:at + _DIGEST]:
+                out.write(_RECORD.pack(index + 1))
+                out.write(page)
+                changed += 1
+    return changed
+
+
+def prune(dest_dir: Path, keep: int) -> list[str]:
+    """Delete all but the newest `keep` restore points, keeping any older
+    point a kept delta chain still needs. Returns the deleted names."""
+    points = list_points(dest_dir)
+    names = list(points)
+    if keep < 1:
+        return []
+    needed: set[str] = set()
+    for name in names[-keep:]:
+        try:
+            needed.update(_chain(dest_dir, name, points))
+        except BackupError:
+            needed.add(name)  # broken chain: delete nothing it might use
+            needed.update(names[: names.index(name)])
+    removed = []
+    for name in names:
+        if name in needed:
+            continue
+        points[name].unlink()
+        _manifest_path(dest_dir, name).unlink(missing_ok=True)
+        removed.append(name)
+    return removed
+
+
+def restore(dest_dir: Path, point: str, to: Path, *, force: bool = False) -> dict:
+    """Rebuild restore point `point` ("latest" for the newest) at `to`.
+    Refuses to overwrite an existing `to` unless `force`; with `force` the
+    old file's -wal/-shm are removed too, since SQLite would otherwise replay
+    that WAL into the restored file."""
+    points = list_points(dest_dir)
+    if not points:
+        raise BackupError(f"no backups in {dest_dir}")
+    if point == "latest":
+        point = next(reversed(points))
+    if point not in points:
+        raise BackupError(f"no restore point {point!r} in {dest_dir}")
+    if to.exists() and not force:
+        raise BackupError(f"{to} exists (pass force to overwrite)")
+
+    started = time.monotonic()
+    chain = _chain(dest_dir, point, points)
+    partial = to.with_name(to.name + ".partial")
+    try:
+        base = points[chain[0]]
+        if base.name.endswith(".gz"):
+            with gzip.open(base, "rb") as f, open(partial, "wb") as out:
+                shutil.copyfileobj(f, out, 1 << 20)
+        else:
+            shutil.copyfile(base, partial)
+        for name in chain[1:]:
+            _apply_delta(points[name], partial)
+
+        manifest = _manifest_path(dest_dir, point)
+        if manifest.exists():
+            header, digests = _read_manifest(manifest)
+            actual = b"".join(_digest(p) for p in _pages(partial, header["page_size"]))
+            if actual != digests:
+                raise BackupError(f"{point}: restored pages do not match the manifest")
+        integrity = _integrity(partial)
+        if integrity != "ok":
+            raise BackupError(f"{point}: integrity_check failed on the restore: {integrity}")
+        for suffix in ("-wal", "-shm"):
+            Path(f"{to}{suffix}").unlink(missing_ok=True)
+        os.replace(partial, to)
+    finally:
+        partial.unlink(missing_ok=True)
+    return {
+        "point": point,
+        "chain": chain,
+        "bytes": to.stat().st_size,
+        "seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def _apply_delta(data: Path, target: Path) -> None:
+    with gzip.open(data, "rb") as f, open(target, "r+b") as out:
+        header = json.loads(f.readline())
+        if header.get("format") != _DELTA_FORMAT:
+            raise BackupError(f"{data.name}: not a {_DELTA_FORMAT} file")
+        page_size = header["page_size"]
+        while record := f.read(_RECORD.size):
+            (pgno,) = _RECORD.unpack(record)
+            page = f.read(page_size)
+            if len(page) != page_size:
+                raise BackupError(f"{data.name}: truncated at page {pgno}")
+            out.seek((pgno - 1) * page_size)
+            out.write(page)
+        out.truncate(header["page_count"] * page_size)
@@ -1,8 +1,63 @@
+"""SQLite connection helpers and the named per-workload pragma profiles.
+
+Pragmas like `cache_size` and `mmap_size` are per-connection, not stored in
+the DB file, so each kind of caller asks for the profile that fits it:
+
+- **batch-writer** -- nightly/ingest/tools jobs: one long-lived connection
+  doing big write transactions. `synchronous=NORMAL` is durable under WAL
+  except for the last commits before a power cut (never corruption), a large
+  page cache keeps the indexes hot across batches, and a long busy timeout
+  waits out the web app's annotation writes instead of failing the run.
+- **web-reader** -- per-request read-only connections. These are opened and
+  closed per request, so their private page cache is always cold; mmap lets
+  them share the OS page cache instead. `query_only` backs up `mode=ro`, and
+  a short busy timeout keeps a request from hanging behind a checkpoint.
+- **maintenance** -- `db optimize`/VACUUM: `synchronous=FULL`, a big cache,
+  and temp b-trees on disk, since VACUUM's temp copy is the size of the DB.
+"""
 import sqlite3
 from pathlib import Path
 
+__all__ = ["PROFILES", "apply_profile", "connect", "connect_readonly"]
+
+_MB = 1024 * 1024
+
+# profile -> PRAGMA name -> value. cache_size < 0 is KiB (SQLite's convention).
+PROFILES: dict[str, dict[str, object]] = {
+    "batch-writer": {
+        "synchronous": "NORMAL",
+        "cache_size": -64 * 1024,
+        "mmap_size": 256 * _MB,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30_000,
+    },
+    "web-reader": {
+        "synchronous": "NORMAL",
+        "cache_size": -8 * 1024,
+        "mmap_size": 256 * _MB,
+        "temp_store": "MEMORY",
+        "busy_timeout": 2_000,
+        "query_only": 1,
+    },
+    "maintenance": {
+        "synchronous": "FULL",
+        "cache_size": -256 * 1024,
+        "mmap_size": 0,
+        "temp_store": "FILE",
+        "busy_timeout": 60_000,
+    },
+}
+
+
+def apply_profile(conn: sqlite3.Connection, profile: str) -> None:
+    """Set `profile`'s pragmas on `conn`. Unknown names raise KeyError."""
+    for name, value in PROFILES[profile].items():
+        conn.execute(f"PRAGMA {name}={value}")
 
-def connect(db_path: Path, *, check_same_thread: bool = True) -> sqlite3.Connection:
+
+def connect(
+    db_path: Path, *, check_same_thread: bool = True, profile: str | None = None
+) -> sqlite3.Connection:
     # `check_same_thread=False` is opt-in for the web layer only: FastAPI
     # resolves a sync generator dependency and its sync endpoint on
     # potentially different anyio threadpool threads, so a per-request
@@ -14,4 +69,19 @@ def connect(db_path: Path, *, check_same_thread: bool = True) -> sqlite3.Connect
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
+    if profile is not None:
+        apply_profile(conn, profile)
+    return conn
+
+
+def connect_readonly(
+    db_path: Path, *, check_same_thread: bool = True, profile: str = "web-reader"
+) -> sqlite3.Connection:
+    """`mode=ro` connection: can never write, never creates the file, and
+    leaves journal_mode alone (it is persistent, set by the writers)."""
+    conn = sqlite3.connect(
+        f"file:{db_path}?mode=ro", uri=True, check_same_thread=check_same_thread
+    )
+    conn.row_factory = sqlite3.Row
+    apply_profile(conn, profile)
     return conn
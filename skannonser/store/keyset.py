@@ -0,0 +1,25 @@
+"""Temp-table key sets for set-based repository SQL.
+
+A batch of keys (finnkodes, urls) is loaded once into a connection-local
+TEMP table and joined against, instead of one point query per key or one
+bound parameter per key in an `IN (...)` list. The latter also has a hard
+ceiling: SQLITE_MAX_VARIABLE_NUMBER (32766 on current builds, 999 on old
+ones). TEMP tables live in the connection's own temp schema, so they are
+invisible to other connections and never touch the main DB file.
+"""
+import sqlite3
+from typing import Iterable
+
+__all__ = ["load_keys"]
+
+
+def load_keys(conn: sqlite3.Connection, name: str, keys: Iterable[str]) -> str:
+    """(Re)fill the TEMP table `name` with the distinct `keys` and return
+    its qualified name (`temp.{name}`, one TEXT PRIMARY KEY column `k`) for
+    use in a JOIN. Runs inside whatever transaction the caller has open."""
+    conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {name} (k TEXT PRIMARY KEY)")
+    conn.execute(f"DELETE FROM temp.{name}")
+    conn.executemany(
+        f"INSERT OR IGNORE INTO temp.{name} (k) VALUES (?)", ((k,) for k in keys)
+    )
+    return f"temp.{name}"
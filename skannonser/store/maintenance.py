@@ -0,0 +1,118 @@
+"""`skannonser db optimize`: planner statistics, WAL truncation, fragmentation
+report and optional VACUUM.
+
+The DB only ever grows (rows are deactivated, never deleted), so the free
+list stays near empty and VACUUM rarely reclaims space. What does degrade is
+*layout*: pages of one table end up interleaved with every other table's as
+they are appended, so a full-table scan or index range scan hops around the
+file. The report's `fragmentation` is that measure (the share of b-tree
+pages not directly following their predecessor, as sqlite3_analyzer counts
+it), read from the `dbstat` virtual table when the SQLite build has it.
+
+Steps, in order:
+
+1. `ANALYZE` then `PRAGMA optimize` -- without `sqlite_stat1` the planner
+   guesses at index selectivity; we had never run either.
+2. Optionally `VACUUM` (rewrites the file in b-tree order, fixing both free
+   pages and fragmentation; needs free disk equal to the DB size and locks
+   writers out for its duration) or `PRAGMA incremental_vacuum` (only frees
+   pages, and only when the file is in `auto_vacuum=INCREMENTAL` mode --
+   `vacuum=True, incremental=True` switches it into that mode).
+3. `PRAGMA wal_checkpoint(TRUNCATE)` -- folds the WAL (including anything
+   VACUUM just wrote to it) into the DB and shrinks the `-wal` file back to
+   zero; it otherwise stays at its high-water mark.
+"""
+import sqlite3
+import time
+from pathlib import Path
+
+__all__ = ["optimize", "page_stats"]
+
+_AUTO_VACUUM = {0: "none", 1: "full", 2: "incremental"}
+
+
+def _fragmentation(conn: sqlite3.Connection) -> float | None:
+    """Share of b-tree pages whose page number is not the previous page's +
+    1 in b-tree order. None when the build lacks the dbstat table."""
+    try:
+        rows = conn.execute(
+            "SELECT name, pageno FROM dbstat WHERE pagetype != 'overflow' "
+            "ORDER BY name, path"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    if not rows:
+        return 0.0
+    gaps, previous = 0, (None, None)
+    for name, pageno in rows:
+        if name == previous[0] and pageno != previous[1] + 1:
+            gaps += 1
+        previous = (name, pageno)
+    return gaps / len(rows)
+
+
+def page_stats(conn: sqlite3.Connection, db_path: Path) -> dict:
+    """Page counts, file sizes and layout measures for the report."""
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    wal = Path(f"{db_path}-wal")
+    return {
+        "page_size": page_size,
+        "pages": pages,
+        "free_pages": free,
+        "db_bytes": Path(db_path).stat().st_size,
+        "wal_bytes": wal.stat().st_size if wal.exists() else 0,
+        "fragmentation": _fragmentation(conn),
+        "auto_vacuum": _AUTO_VACUUM[conn.execute("PRAGMA auto_vacuum").fetchone()[0]],
+    }
+
+
+def optimize(
+    conn: sqlite3.Connection,
+    db_path: Path,
+    *,
+    vacuum: bool = False,
+    incremental: bool = False,
+) -> dict:
+    """Run the maintenance steps on `conn` (ideally opened with the
+    "maintenance" profile). Returns `{"before", "after", "timings",
+    "checkpoint", "notes"}`; timings are seconds per step."""
+    conn.commit()  # VACUUM and the checkpoint need no open transaction
+    before = page_stats(conn, db_path)
+    timings: dict[str, float] = {}
+    notes: list[str] = []
+
+    def step(name: str, *sql: str):
+        started = time.monotonic()
+        result = None
+        for statement in sql:
+            result = conn.execute(statement).fetchall()
+        conn.commit()
+        timings[name] = time.monotonic() - started
+        return result
+
+    step("analyze", "ANALYZE", "PRAGMA optimize")
+    if vacuum:
+        if incremental and before["auto_vacuum"] != "incremental":
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")  # takes effect via the VACUUM
+            notes.append("auto_vacuum switched to incremental")
+        step("vacuum", "VACUUM")
+    elif incremental:
+        if before["auto_vacuum"] == "incremental":
+            step("incremental_vacuum", "PRAGMA incremental_vacuum")
+        else:
+            notes.append(
+                f"incremental vacuum skipped: auto_vacuum is {before['auto_vacuum']} "
+                "(--vacuum --incremental converts the file once)"
+            )
+    busy, wal_frames, checkpointed = step("checkpoint", "PRAGMA wal_checkpoint(TRUNCATE)")[0]
+    if busy:
+        notes.append("checkpoint blocked by an active reader/writer; WAL not truncated")
+    return {
+        "before": before,
+        "after": page_stats(conn, db_path),
+        "timings": timings,
+        "checkpoint": {"busy": bool(busy), "wal_frames": wal_frames, "checkpointed": checkpointed},
+        "notes": notes,
+    }
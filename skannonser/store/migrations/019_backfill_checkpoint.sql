@@ -0,0 +1,13 @@
+-- 019_backfill_checkpoint.sql
+-- Resume points for the offline re-parse backfills (tools backfill-details,
+-- tools backfill-salgsoppgave). One row per backfill name while a run is in
+-- flight: the last finnkode (in ascending finnkode order) whose batch has
+-- been committed. Deleted when a run completes, so a present row always
+-- means "interrupted -- resume after last_finnkode".
+
+CREATE TABLE IF NOT EXISTS backfill_checkpoint (
+    name TEXT PRIMARY KEY,
+    last_finnkode TEXT NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
@@ -0,0 +1,15 @@
+-- 020_parse_ledger.sql
+-- Which cached HTML each derived row was parsed from, and by which parser
+-- version. One row per (finnkode, parser), parser in ('details',
+-- 'salgsoppgave'). Backfills and nightly ingest skip an ad whose current
+-- html_extracted sha256 and the parser's PARSER_VERSION both match; bumping
+-- the constant re-parses exactly the rows recorded under the old version.
+
+CREATE TABLE IF NOT EXISTS parse_ledger (
+    finnkode TEXT NOT NULL,
+    parser TEXT NOT NULL,
+    parser_version INTEGER NOT NULL,
+    html_sha256 TEXT NOT NULL,
+    parsed_at TEXT NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (finnkode, parser)
+);
@@ -0,0 +1,30 @@
+-- 021_listing_history.sql
+-- Field-level change log of each ad, extracted from the dated HTML
+-- snapshots by `tools extract-history`. A row is written only when a
+-- tracked field's value differs from that ad's previous snapshot (or on the
+-- first snapshot that carries it), so "what was the price on day X" is the
+-- latest row at or before X, and a price reduction is two adjacent rows.
+-- snapshot_day is ISO (YYYY-MM-DD) so julianday() arithmetic works directly.
+--
+-- listing_history_progress makes the extraction incremental: per finnkode,
+-- the newest snapshot day already folded in and how many snapshots that
+-- covered. A later run parses only newer snapshots; a count mismatch (a
+-- snapshot appeared out of order) rebuilds that finnkode from scratch.
+
+CREATE TABLE IF NOT EXISTS listing_history (
+    finnkode TEXT NOT NULL,
+    snapshot_day TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value,
+    PRIMARY KEY (finnkode, field, snapshot_day)
+);
+
+CREATE INDEX IF NOT EXISTS idx_listing_history_field_day
+    ON listing_history (field, snapshot_day);
+
+CREATE TABLE IF NOT EXISTS listing_history_progress (
+    finnkode TEXT PRIMARY KEY,
+    last_day TEXT NOT NULL,
+    snapshots INTEGER NOT NULL,
+    updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
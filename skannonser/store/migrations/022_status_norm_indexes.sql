@@ -0,0 +1,32 @@
+-- 022_status_norm_indexes.sql
+-- Indexes for the hot read paths, which until now all scanned `eiendom`.
+--
+-- Every status filter compared LOWER(TRIM(COALESCE(tilgjengelighet, ''))),
+-- an expression no plain index can serve. `status_norm` is that expression
+-- as a VIRTUAL generated column: SQLite computes it from tilgjengelighet on
+-- every read and index write, so it can never drift from the raw value
+-- whichever code path (repository, sheet import, hand edit) wrote the row,
+-- and it costs no space in the table itself. Queries filter on
+-- `status_norm` directly. (ALTER TABLE can only add VIRTUAL generated
+-- columns; needs SQLite >= 3.31.)
+--
+-- - (status_norm, updated_at): the sold sweep's tiers (`enrich/sold.py`),
+--   which select by one closed status plus an updated_at age window.
+-- - (active, scraped_at DESC): the Eie/Sold exports, the web API and the
+--   status refresh -- each filters on active and orders newest-scraped
+--   first, and `refresh --mode all` orders `active ASC, scraped_at DESC`,
+--   which the DESC column serves without a sort.
+-- - api_usage(api, outcome, called_at): the Gateway's per-month budget
+--   counts, now expressed as a called_at range instead of strftime().
+
+ALTER TABLE eiendom ADD COLUMN status_norm TEXT
+    GENERATED ALWAYS AS (LOWER(TRIM(COALESCE(tilgjengelighet, '')))) VIRTUAL;
+
+CREATE INDEX IF NOT EXISTS idx_eiendom_status_updated
+    ON eiendom (status_norm, updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_eiendom_active_scraped
+    ON eiendom (active, scraped_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_api_usage_api_outcome_called
+    ON api_usage (api, outcome, called_at);
@@ -0,0 +1,266 @@
+-- 023_listing_view.sql
+-- `listing_view`: the Eie/Sold/API row shape, materialized.
+--
+-- Every /api/listings, /api/meta and sheets export ran the seven-way join in
+-- publish/rows.py (eiendom + two eiendom_processed aliases for donor
+-- resolution + listing_details + listing_salgsoppgave + listing_tilstand +
+-- annotations, plus sold_prices for the sold/API shapes) with its per-column
+-- donor CASEs. Readers now scan `listing_view` instead, and run that join
+-- only for the listings changed since the last refresh:
+--
+-- - `listing_view` holds one row per eiendom row, no visibility filter,
+--   under the exact aliases the Python readers key their dicts by. `id` is
+--   eiendom.id. The join that fills it is built in Python from the same
+--   fragments (`rows._LISTING_VIEW_SOURCE_SQL`); it is not stored in the
+--   schema.
+-- - `listing_view_dirty` is the set of finnkodes whose row may be stale.
+--   AFTER INSERT/UPDATE/DELETE triggers on each source table add the
+--   touched finnkodes, inside the writer's own transaction, whichever code
+--   path wrote. A change to a donor's eiendom_processed row also marks every
+--   listing that borrows its travel times.
+-- - Readers (`rows._view_sql`) take the clean rows from the table and the
+--   dirty ones from the join, so they never see a stale row.
+--   `ListingViewRepo.refresh()` folds the dirty set into the table (the
+--   nightly sheets step does it); `rebuild()` /
+--   `skannonser db rebuild-listing-view` re-materializes everything.
+--
+-- The triggers only reference their own table and `listing_view_dirty`, so
+-- the usual rebuild of a source table (create new, copy, drop, rename) still
+-- works. DROP TABLE takes that table's triggers with it, though: such a
+-- migration must re-create them (test_listing_view.py checks they are all
+-- present) and should mark the rows it rewrote dirty. Changing the row
+-- shape means a migration that adds the column here and a `rebuild()`.
+-- tests/rebuild/test_listing_view.py holds the direct queries up against
+-- the view-backed readers as the oracle.
+
+CREATE INDEX IF NOT EXISTS idx_eiendom_processed_copy_from
+    ON eiendom_processed (travel_copy_from_finnkode);
+
+-- Untyped columns: values keep exactly the storage class the join produced.
+CREATE TABLE IF NOT EXISTS listing_view (
+    id INTEGER PRIMARY KEY,
+    status_norm TEXT,
+    "Finnkode" TEXT NOT NULL UNIQUE,
+    "Tilgjengelighet",
+    "active",
+    "ADRESSE",
+    "Postnummer",
+    "Pris",
+    "URL",
+    "IMAGE_URL",
+    "IMAGE_HOSTED_URL",
+    "Bruksareal",
+    "Internt bruksareal (BRA-i)",
+    "Primærrom",
+    "Bruttoareal",
+    "Eksternt bruksareal (BRA-e)",
+    "Innglasset balkong (BRA-b)",
+    "Balkong/Terrasse (TBA)",
+    "Tomteareal",
+    "Eierskap, tomt",
+    "Boligtype",
+    "Byggeår",
+    "LAT",
+    "LNG",
+    "PRIS KVM",
+    "PENDL RUSH BRJ",
+    "PENDL RUSH MVV",
+    "MVV UNI RUSH",
+    "TRAVEL_COPY_FROM_FINNKODE",
+    "GOOGLE_MAPS_URL",
+    "SCRAPED_AT",
+    "UPDATED_AT",
+    "SOVEROM",
+    "ROM",
+    "ETASJE",
+    "EIEFORM",
+    "NABOLAG",
+    "TOTALPRIS",
+    "OMKOSTNINGER",
+    "FELLESGJELD",
+    "FELLESKOST_MND",
+    "FELLESFORMUE",
+    "FORMUESVERDI",
+    "KOMMUNALE_AVG_AAR",
+    "ENERGIMERKE",
+    "ENERGIFARGE",
+    "KOMMUNENR",
+    "GARDSNR",
+    "BRUKSNR",
+    "SEKSJONSNR",
+    "BORETTSLAG_NAVN",
+    "BORETTSLAG_ORGNR",
+    "BORETTSLAG_ANDELSNR",
+    "EIENDOMSSKATT_KR",
+    "VERDITAKST",
+    "BOLIGSELGERFORSIKRING",
+    "FERDIGATTEST",
+    "RADON_OMTALT",
+    "UTLEIE",
+    "HUSDYR",
+    "HEFTELSER",
+    "TG2_COUNT",
+    "TG3_COUNT",
+    "REPARASJON_LAV",
+    "REPARASJON_HOY",
+    "REPARASJON_EST",
+    "ALVORLIGHET",
+    "VERSTE_BYGNINGSDEL",
+    "REPARASJON_KILDE",
+    "RADON_STATUS",
+    "RADONSPERRE",
+    "RADON_BQ",
+    "Kommentar",
+    "Tag",
+    "SOLD_PRICE",
+    "SOLD_DATE",
+    "PRICE_SUGGESTION"
+);
+
+CREATE INDEX IF NOT EXISTS idx_listing_view_active_scraped
+    ON listing_view (active, "SCRAPED_AT" DESC);
+
+CREATE TABLE IF NOT EXISTS listing_view_dirty (
+    finnkode TEXT PRIMARY KEY
+) WITHOUT ROWID;
+
+-- Starts empty with every listing dirty: readers fall back to the join until
+-- the first refresh.
+INSERT OR IGNORE INTO listing_view_dirty (finnkode) SELECT finnkode FROM eiendom;
+
+-- The triggers use an upsert clause, not INSERT OR IGNORE: an outer
+-- statement's conflict policy (e.g. a writer's ON CONFLICT DO UPDATE)
+-- overrides a trigger's OR clause, but not its ON CONFLICT DO NOTHING.
+
+-- eiendom: the listing's own row.
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_eiendom_ins
+AFTER INSERT ON eiendom BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (NEW.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_eiendom_upd
+AFTER UPDATE ON eiendom BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (OLD.finnkode), (NEW.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_eiendom_del
+AFTER DELETE ON eiendom BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (OLD.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+-- eiendom_processed: the listing itself and every listing borrowing its travel times.
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_processed_ins
+AFTER INSERT ON eiendom_processed BEGIN
+    INSERT INTO listing_view_dirty (finnkode) SELECT NEW.finnkode UNION SELECT finnkode FROM eiendom_processed WHERE travel_copy_from_finnkode = NEW.finnkode
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_processed_upd
+AFTER UPDATE ON eiendom_processed BEGIN
+    INSERT INTO listing_view_dirty (finnkode) SELECT OLD.finnkode UNION SELECT finnkode FROM eiendom_processed WHERE travel_copy_from_finnkode = OLD.finnkode
+        UNION SELECT NEW.finnkode UNION SELECT finnkode FROM eiendom_processed WHERE travel_copy_from_finnkode = NEW.finnkode
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_processed_del
+AFTER DELETE ON eiendom_processed BEGIN
+    INSERT INTO listing_view_dirty (finnkode) SELECT OLD.finnkode UNION SELECT finnkode FROM eiendom_processed WHERE travel_copy_from_finnkode = OLD.finnkode
+        ON CONFLICT DO NOTHING;
+END;
+
+-- The one-row-per-finnkode side tables.
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_details_ins
+AFTER INSERT ON listing_details BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (NEW.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_details_upd
+AFTER UPDATE ON listing_details BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (OLD.finnkode), (NEW.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_details_del
+AFTER DELETE ON listing_details BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (OLD.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_salgsoppgave_ins
+AFTER INSERT ON listing_salgsoppgave BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (NEW.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_salgsoppgave_upd
+AFTER UPDATE ON listing_salgsoppgave BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (OLD.finnkode), (NEW.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_salgsoppgave_del
+AFTER DELETE ON listing_salgsoppgave BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (OLD.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_tilstand_ins
+AFTER INSERT ON listing_tilstand BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (NEW.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_tilstand_upd
+AFTER UPDATE ON listing_tilstand BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (OLD.finnkode), (NEW.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_tilstand_del
+AFTER DELETE ON listing_tilstand BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (OLD.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_annotations_ins
+AFTER INSERT ON annotations BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (NEW.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_annotations_upd
+AFTER UPDATE ON annotations BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (OLD.finnkode), (NEW.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_annotations_del
+AFTER DELETE ON annotations BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (OLD.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_sold_ins
+AFTER INSERT ON sold_prices BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (NEW.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_sold_upd
+AFTER UPDATE ON sold_prices BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (OLD.finnkode), (NEW.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_listing_view_sold_del
+AFTER DELETE ON sold_prices BEGIN
+    INSERT INTO listing_view_dirty (finnkode) VALUES (OLD.finnkode)
+        ON CONFLICT DO NOTHING;
+END;
@@ -0,0 +1,71 @@
+-- 024_api_usage_monthly.sql
+-- Per-(api, month) rollup of the api_usage ledger, so the Gateway's budget
+-- check is a primary-key lookup instead of a COUNT(*) over every call of the
+-- month (which grows with the ledger, and ran once per paid call).
+--
+-- `month` is the "YYYY-MM" prefix of called_at -- the same bucket the
+-- Gateway's half-open called_at range selects. Only the budget outcomes are
+-- counted; warn:<pct> bookkeeping rows stay ledger-only (the Gateway looks
+-- those up through idx_api_usage_api_outcome_called, migration 022).
+--
+-- The counters are kept by triggers on api_usage, so they move inside the
+-- transaction that writes the ledger row whoever writes it, and a rolled-back
+-- insert never counts. The ledger stays the source of truth:
+-- `gateway.usage_drift` compares the two.
+
+CREATE TABLE IF NOT EXISTS api_usage_monthly (
+    api TEXT NOT NULL,
+    month TEXT NOT NULL,
+    ok INTEGER NOT NULL DEFAULT 0,
+    error INTEGER NOT NULL DEFAULT 0,
+    blocked INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (api, month)
+) WITHOUT ROWID;
+
+INSERT INTO api_usage_monthly (api, month, ok, error, blocked)
+SELECT api, substr(called_at, 1, 7),
+       SUM(outcome = 'ok'), SUM(outcome = 'error'), SUM(outcome = 'blocked')
+FROM api_usage
+WHERE outcome IN ('ok', 'error', 'blocked')
+GROUP BY api, substr(called_at, 1, 7);
+
+CREATE TRIGGER IF NOT EXISTS trg_api_usage_monthly_ins
+AFTER INSERT ON api_usage
+WHEN NEW.outcome IN ('ok', 'error', 'blocked') BEGIN
+    INSERT INTO api_usage_monthly (api, month, ok, error, blocked)
+    VALUES (NEW.api, substr(NEW.called_at, 1, 7),
+            NEW.outcome = 'ok', NEW.outcome = 'error', NEW.outcome = 'blocked')
+    ON CONFLICT (api, month) DO UPDATE SET
+        ok = ok + excluded.ok,
+        error = error + excluded.error,
+        blocked = blocked + excluded.blocked;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_api_usage_monthly_del
+AFTER DELETE ON api_usage
+WHEN OLD.outcome IN ('ok', 'error', 'blocked') BEGIN
+    UPDATE api_usage_monthly SET
+        ok = ok - (OLD.outcome = 'ok'),
+        error = error - (OLD.outcome = 'error'),
+        blocked = blocked - (OLD.outcome = 'blocked')
+    WHERE api = OLD.api AND month = substr(OLD.called_at, 1, 7);
+END;
+
+-- An UPDATE is the delete of the old row plus the insert of the new one.
+CREATE TRIGGER IF NOT EXISTS trg_api_usage_monthly_upd
+AFTER UPDATE OF api, outcome, called_at ON api_usage BEGIN
+    UPDATE api_usage_monthly SET
+        ok = ok - (OLD.outcome = 'ok'),
+        error = error - (OLD.outcome = 'error'),
+        blocked = blocked - (OLD.outcome = 'blocked')
+    WHERE api = OLD.api AND month = substr(OLD.called_at, 1, 7)
+      AND OLD.outcome IN ('ok', 'error', 'blocked');
+    INSERT INTO api_usage_monthly (api, month, ok, error, blocked)
+    SELECT NEW.api, substr(NEW.called_at, 1, 7),
+           NEW.outcome = 'ok', NEW.outcome = 'error', NEW.outcome = 'blocked'
+    WHERE NEW.outcome IN ('ok', 'error', 'blocked')
+    ON CONFLICT (api, month) DO UPDATE SET
+        ok = ok + excluded.ok,
+        error = error + excluded.error,
+        blocked = blocked + excluded.blocked;
+END;
@@ -0,0 +1,14 @@
+-- 025_rate_limit_bucket.sql
+-- Token-bucket state for `skannonser.ratelimit.TokenBucket`, one row per key
+-- (the Gateway uses the API name). Kept in the DB rather than in process
+-- memory so concurrent `run enrich`/`run geocode`/`run enrich-dnb` processes
+-- share one per-minute rate instead of each spending it in full.
+-- `tokens` may go negative: a caller that found the bucket empty has
+-- reserved a future token and sleeps until the refill covers it.
+-- `updated_at` is unix seconds.
+
+CREATE TABLE IF NOT EXISTS rate_limit_bucket (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
@@ -0,0 +1,37 @@
+"""``backfill_checkpoint`` repository (migration 019).
+
+Progress markers for the resumable offline backfills
+(`skannonser.ingest.finn.backfill_engine`). A row exists only while a run is
+in flight or was interrupted; `clear` on completion removes it. Each `save`
+commits on its own, AFTER the batch it describes has been committed by its
+repository -- a crash between the two redoes that one batch on resume, which
+is harmless because every backfill writer has full-row REPLACE semantics.
+"""
+import sqlite3
+
+
+class CheckpointRepo:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def get(self, name: str) -> tuple[str, int] | None:
+        """(last_finnkode, processed) for an interrupted run, else None."""
+        row = self.conn.execute(
+            "SELECT last_finnkode, processed FROM backfill_checkpoint WHERE name = ?",
+            (name,),
+        ).fetchone()
+        return (row["last_finnkode"], row["processed"]) if row else None
+
+    def save(self, name: str, last_finnkode: str, processed: int) -> None:
+        self.conn.execute(
+            "INSERT INTO backfill_checkpoint (name, last_finnkode, processed, updated_at) "
+            "VALUES (?, ?, ?, datetime('now')) "
+            "ON CONFLICT(name) DO UPDATE SET last_finnkode = excluded.last_finnkode, "
+            "processed = excluded.processed, updated_at = excluded.updated_at",
+            (name, last_finnkode, processed),
+        )
+        self.conn.commit()
+
+    def clear(self, name: str) -> None:
+        self.conn.execute("DELETE FROM backfill_checkpoint WHERE name = ?", (name,))
+        self.conn.commit()
@@ -43,6 +43,8 @@ finnkode from ``MatchedFinn_Finnkode`` first, falling back to
 
 import sqlite3
 
+from skannonser.store.keyset import load_keys
+
 
 def _to_int(value) -> int | None:
     """Pandas-free port of ``db.py:_to_int``: None/NaN/non-numeric -> None."""
@@ -85,6 +87,11 @@ def _to_postnummer(value) -> str:
         return str(value).strip()
 
 
+def _normalize_url(url: str | None) -> str:
+    """Legacy's url identity for deactivation: ``.strip().lower().rstrip('/')``."""
+    return (url or "").strip().lower().rstrip("/")
+
+
 class DnbRepo:
     def __init__(self, conn: sqlite3.Connection) -> None:
         self.conn = conn
@@ -131,40 +138,59 @@ class DnbRepo:
         ``insert_or_update_dnbeiendom`` (db.py:1548-1625): every existing-row
         match is counted as "updated" regardless of whether any field
         actually changed (legacy did no change-detection here, unlike
-        ``ListingsRepo``)."""
+        ``ListingsRepo``).
+
+        Set-based, like ``ListingsRepo.upsert``: the batch's urls and
+        dnb_ids go into TEMP key tables (``skannonser.store.keyset``) and
+        the stored rows they can match are prefetched with one join per key.
+        The batch is then resolved in input order against an in-memory index
+        of those rows, kept current as rows are resolved -- an earlier row's
+        INSERT, or an UPDATE that fills a ``dnb_id``, is visible to later
+        rows exactly as when each row re-queried the table (a ``dnb_id``
+        shared by several rows still resolves to the lowest id). Writes are
+        ``executemany``: the INSERTs in input order, then the UPDATEs in
+        input order, so every row's own writes land in the same sequence as
+        before.
+        """
         conn = self.conn
         conn.execute("BEGIN IMMEDIATE")
         try:
-            inserted = updated = 0
-            for row in rows:
-                data = self._build_data(row)
-                url = data["url"]
-                dnb_id = data["dnb_id"]
-                if not url and not dnb_id:
-                    # Legacy skips rows without an identifier.
-                    continue
-
-                existing = None
-                if url:
-                    existing = conn.execute(
-                        "SELECT id FROM dnbeiendom WHERE url = ?", (url,)
-                    ).fetchone()
-                if existing is None and dnb_id:
-                    existing = conn.execute(
-                        "SELECT id FROM dnbeiendom WHERE dnb_id = ?", (dnb_id,)
-                    ).fetchone()
+            # Legacy skips rows without an identifier.
+            batch = [data for data in map(self._build_data, rows) if data["url"] or data["dnb_id"]]
+
+            urls = load_keys(conn, "_dnb_urls", (d["url"] for d in batch if d["url"]))
+            ids = load_keys(conn, "_dnb_ids", (d["dnb_id"] for d in batch if d["dnb_id"]))
+            # Row handles: (0, id) for a stored row, (1, n) for the batch's
+            # n-th INSERT -- AUTOINCREMENT puts every new id after the stored
+            # ones, so handles order like the ids they stand for.
+            by_url: dict[str, tuple[int, int]] = {}
+            by_dnb_id: dict[str, set[tuple[int, int]]] = {}
+            dnb_id_of: dict[tuple[int, int], str | None] = {}
+            for key_table, column in ((urls, "url"), (ids, "dnb_id")):
+                for r in conn.execute(
+                    f"SELECT d.id, d.url, d.dnb_id FROM dnbeiendom d "
+                    f"JOIN {key_table} k ON k.k = d.{column}"
+                ):
+                    handle = (0, r["id"])
+                    if handle in dnb_id_of:
+                        continue
+                    dnb_id_of[handle] = r["dnb_id"]
+                    if r["url"] is not None:
+                        by_url[r["url"]] = handle
+                    if r["dnb_id"] is not None:
+                        by_dnb_id.setdefault(r["dnb_id"], set()).add(handle)
+
+            inserts: list[tuple] = []
+            updates: list[tuple[tuple[int, int], tuple]] = []
+            for data in batch:
+                url, dnb_id = data["url"], data["dnb_id"]
+                existing = by_url.get(url) if url else None
+                if existing is None and by_dnb_id.get(dnb_id):
+                    existing = min(by_dnb_id[dnb_id])
 
                 if existing is not None:
-                    conn.execute(
-                        """
-                        UPDATE dnbeiendom
-                        SET dnb_id = COALESCE(?, dnb_id), adresse = ?, postnummer = ?, pris = ?,
-                            lat = COALESCE(?, lat), lng = COALESCE(?, lng),
-                            duplicate_of_finnkode = COALESCE(?, duplicate_of_finnkode),
-                            property_type = COALESCE(?, property_type),
-                            active = 1, updated_at = CURRENT_TIMESTAMP
-                        WHERE id = ?
-                        """,
+                    updates.append((
+                        existing,
                         (
                             dnb_id or None,
                             data["adresse"],
@@ -174,36 +200,72 @@ class DnbRepo:
                             data["lng"],
                             data["duplicate_of_finnkode"] or None,
                             data["property_type"] or None,
-                            existing["id"],
                         ),
-                    )
-                    updated += 1
+                    ))
+                    if dnb_id and dnb_id_of[existing] != dnb_id:
+                        # COALESCE(?, dnb_id): a non-empty dnb_id replaces the stored one.
+                        if dnb_id_of[existing] is not None:
+                            by_dnb_id[dnb_id_of[existing]].discard(existing)
+                        dnb_id_of[existing] = dnb_id
+                        by_dnb_id.setdefault(dnb_id, set()).add(existing)
                 else:
-                    conn.execute(
-                        """
-                        INSERT INTO dnbeiendom
-                            (dnb_id, url, adresse, postnummer, pris, lat, lng,
-                             duplicate_of_finnkode, property_type)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            dnb_id or None,
-                            url or None,
-                            data["adresse"],
-                            data["postnummer"],
-                            data["pris"],
-                            data["lat"],
-                            data["lng"],
-                            data["duplicate_of_finnkode"] or None,
-                            data["property_type"] or None,
-                        ),
+                    handle = (1, len(inserts))
+                    inserts.append((
+                        dnb_id or None,
+                        url or None,
+                        data["adresse"],
+                        data["postnummer"],
+                        data["pris"],
+                        data["lat"],
+                        data["lng"],
+                        data["duplicate_of_finnkode"] or None,
+                        data["property_type"] or None,
+                    ))
+                    dnb_id_of[handle] = dnb_id or None
+                    if url:
+                        by_url[url] = handle
+                    if dnb_id:
+                        by_dnb_id.setdefault(dnb_id, set()).add(handle)
+
+            new_ids: list[int] = []
+            if inserts:
+                last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM dnbeiendom").fetchone()[0]
+                conn.executemany(
+                    """
+                    INSERT INTO dnbeiendom
+                        (dnb_id, url, adresse, postnummer, pris, lat, lng,
+                         duplicate_of_finnkode, property_type)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    inserts,
+                )
+                new_ids = [
+                    r[0]
+                    for r in conn.execute(
+                        "SELECT id FROM dnbeiendom WHERE id > ? ORDER BY id", (last_id,)
                     )
-                    inserted += 1
+                ]
+            if updates:
+                conn.executemany(
+                    """
+                    UPDATE dnbeiendom
+                    SET dnb_id = COALESCE(?, dnb_id), adresse = ?, postnummer = ?, pris = ?,
+                        lat = COALESCE(?, lat), lng = COALESCE(?, lng),
+                        duplicate_of_finnkode = COALESCE(?, duplicate_of_finnkode),
+                        property_type = COALESCE(?, property_type),
+                        active = 1, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                    """,
+                    [
+                        params + (new_ids[n] if kind else n,)
+                        for (kind, n), params in updates
+                    ],
+                )
         except Exception:
             conn.rollback()
             raise
         conn.commit()
-        return {"inserted": inserted, "updated": updated}
+        return {"inserted": len(inserts), "updated": len(updates)}
 
     def set_travel(self, url: str, brj: int | None = None, mvv: int | None = None) -> bool:
         """Fill-only write of the two DNB travel columns (migration 004:
@@ -241,10 +303,10 @@ class DnbRepo:
         self.conn.commit()
         return cur.rowcount > 0
 
-    def deactivate_missing(self, active_urls: list[str]) -> int:
+    def deactivate_missing(self, active_urls: list[str]) -> list[str]:
         """Deactivate ``dnbeiendom`` rows whose (normalized) url is absent
-        from ``active_urls``. Never deletes; returns the number of rows
-        deactivated.
+        from ``active_urls``. Never deletes; returns the deactivated urls
+        (as stored, sorted).
 
         Ported from the stale-deactivation block in
         ``filter_and_load_dnbeiendom_no_buffer.main`` (lines 113-138): URLs
@@ -257,21 +319,33 @@ class DnbRepo:
         whole block when the CSV is missing -- but an empty set fed to its
         listcomp would deactivate everything with a url, which is what this
         does).
+
+        Set-based: the normalized crawled urls go into a TEMP key table and
+        the deactivation is an anti-join against it. The stored side is
+        normalized by the same Python function (registered on the
+        connection), so the comparison is exactly legacy's, Unicode
+        whitespace and case folding included.
         """
         conn = self.conn
-        normalized_active = {u.strip().lower().rstrip("/") for u in active_urls if u}
-        rows = conn.execute("SELECT id, url FROM dnbeiendom WHERE active = 1").fetchall()
-        to_deactivate = [
-            r["id"]
-            for r in rows
-            if r["url"] and r["url"].strip().lower().rstrip("/") not in normalized_active
-        ]
-        if not to_deactivate:
-            return 0
-        placeholders = ",".join("?" * len(to_deactivate))
-        conn.execute(
-            f"UPDATE dnbeiendom SET active = 0, updated_at = CURRENT_TIMESTAMP "
-            f"WHERE id IN ({placeholders})",
-            to_deactivate,
-        )
-        return len(to_deactivate)
+        conn.create_function("skannonser_norm_url", 1, _normalize_url, deterministic=True)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            keys = load_keys(conn, "_crawled_urls", {_normalize_url(u) for u in active_urls if u})
+            missing = (
+                "active = 1 AND url IS NOT NULL AND url != '' AND NOT EXISTS "
+                f"(SELECT 1 FROM {keys} k WHERE k.k = skannonser_norm_url(dnbeiendom.url))"
+            )
+            rows = conn.execute(
+                f"SELECT id, url FROM dnbeiendom WHERE {missing} ORDER BY url"
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE dnbeiendom SET active = 0, updated_at = CURRENT_TIMESTAMP "
+                    "WHERE id = ?",
+                    [(r["id"],) for r in rows],
+                )
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+        return [r["url"] for r in rows]
@@ -0,0 +1,72 @@
+"""``listing_history`` / ``listing_history_progress`` repository (migration 021).
+
+Written only by `skannonser.ingest.finn.history.extract_history`. Each
+`write` commits a batch of finnkodes -- their change rows AND their progress
+rows -- in one transaction, so an interrupted run never records progress for
+history it did not store, and the next run picks up exactly where the last
+committed batch ended.
+"""
+import sqlite3
+
+
+class ListingHistoryRepo:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def progress(self) -> dict[str, tuple[str, int]]:
+        """finnkode -> (last snapshot day folded in, YYYYMMDD; snapshot count)."""
+        return {
+            r["finnkode"]: (r["last_day"], r["snapshots"])
+            for r in self.conn.execute(
+                "SELECT finnkode, last_day, snapshots FROM listing_history_progress"
+            )
+        }
+
+    def latest(self, finnkode: str) -> dict[str, object]:
+        """field -> its most recent recorded value for `finnkode`."""
+        return {
+            r["field"]: r["value"]
+            for r in self.conn.execute(
+                "SELECT field, value FROM listing_history h WHERE finnkode = ? "
+                "AND snapshot_day = (SELECT MAX(snapshot_day) FROM listing_history "
+                "WHERE finnkode = h.finnkode AND field = h.field)",
+                (finnkode,),
+            )
+        }
+
+    def write(self, entries: list[tuple[str, list[tuple], str, int, bool]]) -> int:
+        """Persist `(finnkode, rows, last_day, snapshots, reset)` entries,
+        rows being `(snapshot_day, field, value)`. `reset` first drops the
+        finnkode's existing history (a full rebuild of that ad). Returns the
+        number of history rows written."""
+        if not entries:
+            return 0
+        conn = self.conn
+        written = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for finnkode, rows, last_day, snapshots, reset in entries:
+                if reset:
+                    conn.execute("DELETE FROM listing_history WHERE finnkode = ?", (finnkode,))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO listing_history "
+                    "(finnkode, snapshot_day, field, value) VALUES (?, ?, ?, ?)",
+                    [(finnkode, day, field, value) for day, field, value in rows],
+                )
+                written += len(rows)
+                conn.execute(
+                    "INSERT OR REPLACE INTO listing_history_progress "
+                    "(finnkode, last_day, snapshots, updated_at) "
+                    "VALUES (?, ?, ?, datetime('now'))",
+                    (finnkode, last_day, snapshots),
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return written
+
+    def wipe(self) -> None:
+        self.conn.execute("DELETE FROM listing_history")
+        self.conn.execute("DELETE FROM listing_history_progress")
+        self.conn.commit()
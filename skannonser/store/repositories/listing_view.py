@@ -0,0 +1,77 @@
+"""``listing_view`` repository (migration 023).
+
+Triggers on the source tables only mark the finnkodes each write touches in
+``listing_view_dirty``; readers (``rows._view_sql``) already route those
+through the join, so nothing here is needed for correctness on the write
+path. `refresh` folds the dirty set into the table (the nightly sheets step
+runs it), `rebuild` re-materializes every row (after restoring a backup
+taken without the triggers, or a migration that rewrote source rows), and
+`drift` lists the clean finnkodes whose materialized row no longer matches
+the join -- the check `db rebuild-listing-view --check` reports.
+"""
+import sqlite3
+
+from skannonser.publish.rows import LISTING_VIEW_COLUMNS, _LISTING_VIEW_SOURCE_SQL
+
+_COLS = ", ".join(f'"{c}"' for c in LISTING_VIEW_COLUMNS)
+_DIRTY = "(SELECT finnkode FROM listing_view_dirty)"
+
+
+class ListingViewRepo:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def pending(self) -> int:
+        """Finnkodes marked dirty since the last refresh."""
+        return self.conn.execute("SELECT COUNT(*) FROM listing_view_dirty").fetchone()[0]
+
+    def refresh(self) -> int:
+        """Re-materialize just the dirty finnkodes and clear the set;
+        returns how many were folded."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            folded = self.pending()
+            if folded:
+                conn.execute(f'DELETE FROM listing_view WHERE "Finnkode" IN {_DIRTY}')
+                conn.execute(
+                    f"INSERT INTO listing_view ({_COLS})"
+                    f' SELECT * FROM ({_LISTING_VIEW_SOURCE_SQL}) WHERE "Finnkode" IN {_DIRTY}'
+                )
+                conn.execute("DELETE FROM listing_view_dirty")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return folded
+
+    def rebuild(self) -> int:
+        """Replace every row from the source join; returns the row count."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM listing_view")
+            conn.execute("DELETE FROM listing_view_dirty")
+            cur = conn.execute(f"INSERT INTO listing_view ({_COLS}) {_LISTING_VIEW_SOURCE_SQL}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return cur.rowcount
+
+    def drift(self) -> list[str]:
+        """Clean finnkodes missing from, extra in, or different in the
+        materialized table, sorted. Empty when it matches the join."""
+        table = f'SELECT {_COLS} FROM listing_view WHERE "Finnkode" NOT IN {_DIRTY}'
+        source = (
+            f"SELECT {_COLS} FROM ({_LISTING_VIEW_SOURCE_SQL})"
+            f' WHERE "Finnkode" NOT IN {_DIRTY}'
+        )
+        return [
+            r[0]
+            for r in self.conn.execute(
+                f'SELECT "Finnkode" FROM ({table} EXCEPT {source})'
+                f' UNION SELECT "Finnkode" FROM ({source} EXCEPT {table})'
+                " ORDER BY 1"
+            )
+        ]
@@ -18,6 +18,7 @@ stages), so this repository does not write them.
 import sqlite3
 
 from skannonser.ingest.base import NormalizedListing
+from skannonser.store.keyset import load_keys
 
 # A_live extractor key -> eiendom column, reproduced from
 # ``insert_or_update_eiendom``'s ``data`` dict (db.py:423-444). ``Byggeår`` maps
@@ -108,31 +109,43 @@ class ListingsRepo:
             data[col] = _to_int(row.get(key))
         return data
 
-    def _apply_overrides(self, finnkode: str, data: dict) -> dict:
+    def _apply_overrides(self, finnkode: str, data: dict, override) -> dict:
         """Port of ``overrides.apply_overrides_to_data`` (overrides.py:163-183).
 
-        The override tuple is ``(pris, adresse, postnummer, reason)``.
+        ``override`` is the finnkode's prefetched ``manual_overrides`` row
+        (``pris``, ``adresse``, ``postnummer``) or None.
         """
-        row = self.conn.execute(
-            "SELECT pris, adresse, postnummer FROM manual_overrides WHERE finnkode = ?",
-            (finnkode,),
-        ).fetchone()
-        if row is not None:
-            if row["pris"] is not None:
-                data["pris"] = row["pris"]
-            if row["adresse"]:
-                data["adresse"] = row["adresse"]
-            if row["postnummer"]:
-                data["postnummer"] = row["postnummer"]
+        if override is not None:
+            if override["pris"] is not None:
+                data["pris"] = override["pris"]
+            if override["adresse"]:
+                data["adresse"] = override["adresse"]
+            if override["postnummer"]:
+                data["postnummer"] = override["postnummer"]
         return data
 
     # -- public API ------------------------------------------------------
 
     def upsert(self, listings: list[NormalizedListing]) -> dict:
+        """Insert new listings, update changed columns of known ones and
+        reactivate re-appearing ones, in one transaction.
+
+        Set-based: the batch's finnkodes go into a TEMP key table
+        (``skannonser.store.keyset``), and the overrides and existing rows
+        are each prefetched with ONE join against it. The batch is then
+        resolved in memory, in input order, against that prefetch -- which
+        is kept current as rows are resolved, so a finnkode repeated within
+        one batch behaves exactly as it did when each row re-read the
+        table (first occurrence inserts, later ones update). Writes are
+        ``executemany``: one INSERT for all new rows, and one UPDATE per
+        distinct changed-column set, each row's net change against the
+        stored row.
+        """
         conn = self.conn
         conn.execute("BEGIN IMMEDIATE")
         try:
-            inserted = updated = excluded = 0
+            batch: list[dict] = []
+            excluded = 0
             for listing in listings:
                 r = listing.to_row()
                 finnkode = str(r.get("Finnkode", "") or "").strip()
@@ -142,67 +155,102 @@ class ListingsRepo:
                 if _is_excluded_eiendom_url(url):
                     excluded += 1
                     continue
-
-                data = self._build_data(finnkode, url, r)
-                data = self._apply_overrides(finnkode, data)
-
-                existing = conn.execute(
-                    "SELECT * FROM eiendom WHERE finnkode = ?", (finnkode,)
-                ).fetchone()
-
+                batch.append(self._build_data(finnkode, url, r))
+
+            keys = load_keys(conn, "_listing_keys", (d["finnkode"] for d in batch))
+            overrides = {
+                row["finnkode"]: row
+                for row in conn.execute(
+                    f"SELECT o.finnkode, o.pris, o.adresse, o.postnummer "
+                    f"FROM manual_overrides o JOIN {keys} k ON k.k = o.finnkode"
+                )
+            }
+            stored = {
+                row["finnkode"]: dict(row)
+                for row in conn.execute(
+                    f"SELECT e.finnkode, e.active, {', '.join('e.' + c for c in _DATA_COLUMNS)} "
+                    f"FROM eiendom e JOIN {keys} k ON k.k = e.finnkode"
+                )
+            }
+
+            current = dict(stored)  # evolves as the batch is resolved
+            inserts: dict[str, dict] = {}
+            updates: dict[str, dict] = {}
+            inserted = updated = 0
+            for data in batch:
+                finnkode = data["finnkode"]
+                data = self._apply_overrides(finnkode, data, overrides.get(finnkode))
+                existing = current.get(finnkode)
                 if existing is None:
                     # User mandate 2026-07-20 (STATUS backlog #1, landed with
                     # phase-4 cutover): listings are active from FIRST
                     # appearance - same-day export/notify.
-                    cols = ["finnkode", "active"] + _DATA_COLUMNS
-                    placeholders = ", ".join("?" * len(cols))
-                    params = [data["finnkode"], 1] + [data[c] for c in _DATA_COLUMNS]
-                    conn.execute(
-                        f"INSERT INTO eiendom ({', '.join(cols)}) VALUES ({placeholders})",
-                        params,
-                    )
+                    inserts[finnkode] = data
                     inserted += 1
                 else:
                     # Update only columns whose value actually changed; always
                     # reactivate on re-appearance (legacy set active=1 on update).
                     changed = [c for c in _DATA_COLUMNS if existing[c] != data[c]]
-                    reactivate = not existing["active"]
-                    if changed or reactivate:
-                        set_cols = changed + ["active"]
-                        assignments = ", ".join(f"{c} = ?" for c in set_cols)
-                        params = [data[c] for c in changed] + [1, finnkode]
-                        conn.execute(
-                            f"UPDATE eiendom SET {assignments}, "
-                            f"updated_at = CURRENT_TIMESTAMP WHERE finnkode = ?",
-                            params,
-                        )
-                        updated += 1
+                    if not changed and existing["active"]:
+                        continue
+                    (inserts if finnkode in inserts else updates)[finnkode] = data
+                    updated += 1
+                current[finnkode] = {**data, "active": 1}
+
+            if inserts:
+                cols = ["finnkode", "active"] + _DATA_COLUMNS
+                conn.executemany(
+                    f"INSERT INTO eiendom ({', '.join(cols)}) "
+                    f"VALUES ({', '.join('?' * len(cols))})",
+                    [[d["finnkode"], 1] + [d[c] for c in _DATA_COLUMNS] for d in inserts.values()],
+                )
+            by_columns: dict[tuple[str, ...], list[list]] = {}
+            for finnkode, data in updates.items():
+                changed = tuple(c for c in _DATA_COLUMNS if stored[finnkode][c] != data[c])
+                by_columns.setdefault(changed, []).append(
+                    [data[c] for c in changed] + [1, finnkode]
+                )
+            for changed, params in by_columns.items():
+                set_cols = list(changed) + ["active"]
+                assignments = ", ".join(f"{c} = ?" for c in set_cols)
+                conn.executemany(
+                    f"UPDATE eiendom SET {assignments}, "
+                    f"updated_at = CURRENT_TIMESTAMP WHERE finnkode = ?",
+                    params,
+                )
         except Exception:
             conn.rollback()
             raise
         conn.commit()
         return {"inserted": inserted, "updated": updated, "excluded": excluded}
 
-    def mark_inactive(self, active_finnkodes: list[str]) -> int:
+    def mark_inactive(self, active_finnkodes: list[str]) -> list[str]:
         """Deactivate rows whose finnkode is absent from ``active_finnkodes``.
 
-        Never deletes; returns the number of rows deactivated. Ported from
+        Never deletes; returns the deactivated finnkodes (sorted). Ported from
         ``db.py:mark_inactive`` (541-565), scoped to the ``eiendom`` table.
+        The crawled set goes into a TEMP key table and the deactivation is an
+        anti-join against it, so its size is bounded by nothing but memory --
+        legacy's ``NOT IN (?, ?, ...)`` broke past SQLITE_MAX_VARIABLE_NUMBER.
         """
         conn = self.conn
-        if active_finnkodes:
-            placeholders = ",".join("?" * len(active_finnkodes))
-            cur = conn.execute(
-                f"UPDATE eiendom SET active = 0, updated_at = CURRENT_TIMESTAMP "
-                f"WHERE finnkode NOT IN ({placeholders}) AND active = 1",
-                active_finnkodes,
-            )
-        else:
-            cur = conn.execute(
-                "UPDATE eiendom SET active = 0, updated_at = CURRENT_TIMESTAMP "
-                "WHERE active = 1"
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            keys = load_keys(conn, "_crawled_keys", active_finnkodes)
+            deactivated = sorted(
+                row[0]
+                for row in conn.execute(
+                    "UPDATE eiendom SET active = 0, updated_at = CURRENT_TIMESTAMP "
+                    f"WHERE active = 1 AND NOT EXISTS "
+                    f"(SELECT 1 FROM {keys} k WHERE k.k = eiendom.finnkode) "
+                    "RETURNING finnkode"
+                )
             )
-        return cur.rowcount
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+        return deactivated
 
     def active_finnkodes(self) -> set[str]:
         rows = self.conn.execute(
@@ -0,0 +1,51 @@
+"""``parse_ledger`` repository (migration 020).
+
+One row per (finnkode, parser): the sha256 of the ad HTML a derived row was
+last parsed from, and the parser's ``PARSER_VERSION`` at the time. The
+ledger is a pure skip-hint -- it is always written AFTER the derived rows it
+describes are committed, so a crash between the two can only cause a
+redundant re-parse, never a missed one.
+"""
+import sqlite3
+
+
+class ParseLedgerRepo:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def fingerprints(self, parser: str, version: int) -> dict[str, str]:
+        """finnkode -> html_sha256 for every ad `parser` has already parsed
+        at exactly `version`. Rows from any other version are absent, so
+        they never match and get re-parsed."""
+        return {
+            r["finnkode"]: r["html_sha256"]
+            for r in self.conn.execute(
+                "SELECT finnkode, html_sha256 FROM parse_ledger "
+                "WHERE parser = ? AND parser_version = ?",
+                (parser, version),
+            )
+        }
+
+    def record(self, parser: str, version: int, entries: list[tuple[str, str]]) -> None:
+        """Upsert `(finnkode, html_sha256)` pairs in one transaction."""
+        if not entries:
+            return
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO parse_ledger "
+                "(finnkode, parser, parser_version, html_sha256, parsed_at) "
+                "VALUES (?, ?, ?, ?, datetime('now'))",
+                [(fk, parser, version, sha) for fk, sha in entries],
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def wipe(self, parser: str) -> None:
+        """Forget everything `parser` has parsed -- must accompany any wipe of
+        its derived table, or the rebuild would skip every ad."""
+        self.conn.execute("DELETE FROM parse_ledger WHERE parser = ?", (parser,))
+        self.conn.commit()
@@ -34,10 +34,26 @@ Ported from ``main/database/db.py``:
     non-null, otherwise the listing's own value is used. Single hop only
     (no chained donors). This is what the (now-retired) verify-enrich golden master compared during the rebuild.
 
+Write-behind: every write method commits on its own by default. Inside
+``with repo.write_behind(rows, seconds):`` the writes are validated and
+prepared as usual but held in memory, then applied in order in ONE
+``BEGIN IMMEDIATE`` transaction every ``rows`` writes, once ``seconds`` have
+passed since the oldest one (checked at each write), and always when the
+block exits -- normally, on ``BudgetExceeded`` or on any other exception,
+which then propagates. Nothing holds the write lock between flushes, so the
+Gateway's ledger and rate limiter (and other processes) never wait behind a
+window. A crash loses at most the one unflushed window, and never silently:
+those rows are simply still missing, so the next enrich/geocode pass picks
+them up as candidates again. A failing flush rolls its window back and
+raises. Reads through the repo do not see buffered writes until the flush.
+
 No pandas -- pure ``sqlite3`` + dicts, matching ``ListingsRepo``/``DnbRepo``.
 """
 
 import sqlite3
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from typing import Any, Optional
 
 # Coordinate bounds for Norway. Mirrors ``main/config/filters.py``
@@ -133,6 +149,67 @@ def google_maps_url(adresse: Any, postnummer: Any) -> str:
 class ProcessedRepo:
     def __init__(self, conn: sqlite3.Connection) -> None:
         self.conn = conn
+        self.commits = 0
+        # (rows, seconds) while inside write_behind(), else None.
+        self._window: Optional[tuple[int, float]] = None
+        self._buffer: list[tuple[Callable[..., None], tuple]] = []
+        self._opened_at = 0.0
+
+    # -- write-behind ------------------------------------------------------
+
+    @contextmanager
+    def write_behind(self, rows: int = 200, seconds: float = 5.0) -> Iterator["ProcessedRepo"]:
+        """Buffer this repo's writes and commit them ``rows`` at a time or
+        every ``seconds``; see the module docstring. Not reentrant."""
+        if rows < 1:
+            raise ValueError(f"rows must be >= 1 (got {rows})")
+        if self._window is not None:
+            raise RuntimeError("write_behind is already active on this repo")
+        self._window = (rows, seconds)
+        try:
+            yield self
+        finally:
+            self._window = None
+            self.flush()
+
+    def flush(self) -> None:
+        """Apply and commit the buffered writes, in order, in one transaction."""
+        if not self._buffer:
+            return
+        ops, self._buffer = self._buffer, []
+        conn = self.conn
+        # A transaction the caller already has open is joined and committed,
+        # as the per-write commit would have done.
+        began = not conn.in_transaction
+        if began:
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            for apply, args in ops:
+                apply(*args)
+            conn.commit()
+        except Exception:
+            if began:
+                conn.rollback()
+            raise
+        self.commits += 1
+
+    def _write(self, apply: Callable[..., None], *args: Any) -> None:
+        if self._window is None:
+            apply(*args)
+            self.conn.commit()
+            self.commits += 1
+            return
+        if not self._buffer:
+            self._opened_at = time.monotonic()
+        self._buffer.append((apply, args))
+        rows, seconds = self._window
+        if len(self._buffer) >= rows or time.monotonic() - self._opened_at >= seconds:
+            self.flush()
+
+    def _exists(self, finnkode: str) -> bool:
+        return self.conn.execute(
+            "SELECT id FROM eiendom_processed WHERE finnkode = ?", (finnkode,)
+        ).fetchone() is not None
 
     # -- write side --------------------------------------------------------
 
@@ -153,7 +230,6 @@ class ProcessedRepo:
         See the module docstring for the exact fill-only-vs-unconditional
         column semantics.
         """
-        conn = self.conn
         travel = travel or {}
         cntr = cntr or {}
 
@@ -162,21 +238,41 @@ class ProcessedRepo:
         adresse_cleaned = clean_address(adresse)
         maps_url = google_maps_url(adresse_cleaned, postnummer)
 
-        pendl_rush_brj = travel.get("pendl_rush_brj")
-        pendl_rush_mvv = travel.get("pendl_rush_mvv")
-        pendl_rush_mvv_uni_rush = travel.get("pendl_rush_mvv_uni_rush")
-
-        pendl_morn_cntr = cntr.get("pendl_morn_cntr")
-        bil_morn_cntr = cntr.get("bil_morn_cntr")
-        pendl_dag_cntr = cntr.get("pendl_dag_cntr")
-        bil_dag_cntr = cntr.get("bil_dag_cntr")
-
-        existing = conn.execute(
-            "SELECT id FROM eiendom_processed WHERE finnkode = ?", (finnkode,)
-        ).fetchone()
+        self._write(
+            self._apply_upsert,
+            finnkode,
+            adresse_cleaned,
+            lat_norm,
+            lng_norm,
+            travel.get("pendl_rush_brj"),
+            travel.get("pendl_rush_mvv"),
+            travel.get("pendl_rush_mvv_uni_rush"),
+            cntr.get("pendl_morn_cntr"),
+            cntr.get("bil_morn_cntr"),
+            cntr.get("pendl_dag_cntr"),
+            cntr.get("bil_dag_cntr"),
+            travel_copy_from_finnkode,
+            maps_url,
+        )
 
-        if existing:
-            conn.execute(
+    def _apply_upsert(
+        self,
+        finnkode,
+        adresse_cleaned,
+        lat_norm,
+        lng_norm,
+        pendl_rush_brj,
+        pendl_rush_mvv,
+        pendl_rush_mvv_uni_rush,
+        pendl_morn_cntr,
+        bil_morn_cntr,
+        pendl_dag_cntr,
+        bil_dag_cntr,
+        travel_copy_from_finnkode,
+        maps_url,
+    ) -> None:
+        if self._exists(finnkode):
+            self.conn.execute(
                 """
                 UPDATE eiendom_processed
                 SET adresse_cleaned = ?,
@@ -208,7 +304,7 @@ class ProcessedRepo:
                 ),
             )
         else:
-            conn.execute(
+            self.conn.execute(
                 """
                 INSERT INTO eiendom_processed
                 (finnkode, adresse_cleaned, lat, lng,
@@ -233,7 +329,6 @@ class ProcessedRepo:
                     maps_url,
                 ),
             )
-        conn.commit()
 
     def set_coordinates(self, finnkode: str, lat: Any, lng: Any) -> bool:
         """Set lat/lng for a listing, creating the row if needed.
@@ -241,7 +336,10 @@ class ProcessedRepo:
         Port of ``db.py:set_eiendom_coordinates`` (1199-1238). Invalid
         coordinates (unparseable, or out of bounds even after the swap
         correction) are rejected -- no row is written, returns ``False``.
-        A successful write also clears ``geocode_failed``.
+        A successful write also clears ``geocode_failed``. (A valid write
+        always touches exactly one row -- the UPDATE of the existing row or
+        the INSERT of a new one -- so ``True`` is known before a buffered
+        write is applied.)
         """
         if not finnkode:
             return False
@@ -250,64 +348,59 @@ class ProcessedRepo:
         if lat_norm is None or lng_norm is None:
             return False
 
-        conn = self.conn
-        existing = conn.execute(
-            "SELECT id FROM eiendom_processed WHERE finnkode = ?", (str(finnkode),)
-        ).fetchone()
+        self._write(self._apply_set_coordinates, str(finnkode), lat_norm, lng_norm)
+        return True
 
-        if existing:
-            cur = conn.execute(
+    def _apply_set_coordinates(self, finnkode: str, lat_norm: float, lng_norm: float) -> None:
+        if self._exists(finnkode):
+            self.conn.execute(
                 """
                 UPDATE eiendom_processed
                 SET lat = ?, lng = ?, geocode_failed = 0, updated_at = CURRENT_TIMESTAMP
                 WHERE finnkode = ?
                 """,
-                (lat_norm, lng_norm, str(finnkode)),
+                (lat_norm, lng_norm, finnkode),
             )
         else:
-            cur = conn.execute(
+            self.conn.execute(
                 """
                 INSERT INTO eiendom_processed (finnkode, lat, lng, geocode_failed)
                 VALUES (?, ?, ?, 0)
                 """,
-                (str(finnkode), lat_norm, lng_norm),
+                (finnkode, lat_norm, lng_norm),
             )
 
-        changed = cur.rowcount > 0
-        conn.commit()
-        return changed
-
     def mark_geocode_failed(self, finnkode: str) -> None:
         """Port of ``db.py:mark_eiendom_geocode_failed`` (1240-1258)."""
         if not finnkode:
             return
-        conn = self.conn
-        existing = conn.execute(
-            "SELECT id FROM eiendom_processed WHERE finnkode = ?", (str(finnkode),)
-        ).fetchone()
-        if existing:
-            conn.execute(
+        self._write(self._apply_mark_geocode_failed, str(finnkode))
+
+    def _apply_mark_geocode_failed(self, finnkode: str) -> None:
+        if self._exists(finnkode):
+            self.conn.execute(
                 "UPDATE eiendom_processed SET geocode_failed = 1, "
                 "updated_at = CURRENT_TIMESTAMP WHERE finnkode = ?",
-                (str(finnkode),),
+                (finnkode,),
             )
         else:
-            conn.execute(
+            self.conn.execute(
                 "INSERT INTO eiendom_processed (finnkode, geocode_failed) VALUES (?, 1)",
-                (str(finnkode),),
+                (finnkode,),
             )
-        conn.commit()
 
     def clear_geocode_failed(self, finnkode: str) -> None:
         """Port of ``db.py:clear_eiendom_geocode_failed`` (1260-1271)."""
         if not finnkode:
             return
+        self._write(self._apply_clear_geocode_failed, str(finnkode))
+
+    def _apply_clear_geocode_failed(self, finnkode: str) -> None:
         self.conn.execute(
             "UPDATE eiendom_processed SET geocode_failed = 0, "
             "updated_at = CURRENT_TIMESTAMP WHERE finnkode = ?",
-            (str(finnkode),),
+            (finnkode,),
         )
-        self.conn.commit()
 
     # -- read side -----------------------------------------------------
 
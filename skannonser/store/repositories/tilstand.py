@@ -32,9 +32,9 @@ _ROLLUP_COLS = (
 # resolves them to inactive. One definition of "active", not two.
 _STATUS_TIER = """
     CASE
-        WHEN LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) = 'solgt' THEN 2
+        WHEN e.status_norm = 'solgt' THEN 2
         WHEN e.active = 1
-             AND LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) NOT IN ('solgt', 'inaktiv')
+             AND e.status_norm NOT IN ('solgt', 'inaktiv')
         THEN 0
         ELSE 1
     END
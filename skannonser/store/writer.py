@@ -0,0 +1,268 @@
+"""Single-writer queue: many producers, one connection that writes.
+
+SQLite takes one writer at a time. Producers that each open a connection and
+`BEGIN IMMEDIATE` on their own queue up on the write lock, burn their busy
+timeout, and surface "database is locked" once contention outlasts it.
+`DbWriter` runs every write on one dedicated thread and connection instead:
+
+- **Producers submit jobs.** A job is a callable taking a connection --
+  usually a repository call, e.g.
+  ``writer.submit(lambda c: ProcessedRepo(c).upsert(fk, adresse, pnr))`` --
+  and `submit` returns a `Future` for its result. Any thread may submit.
+- **Jobs are coalesced.** The writer thread drains whatever is queued (up to
+  `max_batch` jobs, waiting at most `max_delay` seconds for stragglers) and
+  runs the lot inside ONE `BEGIN IMMEDIATE ... COMMIT`: one lock acquisition
+  and one WAL sync for the batch instead of one per job.
+- **Results are per job.** Each job runs inside its own SAVEPOINT. A job
+  that raises is rolled back to it alone and its future gets the exception;
+  the rest of the batch still commits. Futures resolve only after the batch
+  COMMIT has succeeded, so a result in hand is a durable write (if the
+  COMMIT itself fails, every future in the batch gets that error).
+
+Repositories need no changes. The job receives a `WriterConnection`, which
+forwards everything to the writer's connection but maps the repository's
+own transaction control onto the job's savepoint: `BEGIN ...` is a no-op
+(the batch is already open), `commit()` keeps the job's writes so far, and
+`rollback()` undoes the job's writes since its last `commit()` -- exactly
+what those calls meant on a private connection. Setting `isolation_level`
+(as `ListingsRepo`/`DnbRepo` do) is ignored; the writer owns it.
+
+Reads a job performs see the batch's earlier writes. Work that only reads
+should keep using its own (or a read-only) connection rather than queueing
+behind writes.
+"""
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, InvalidStateError
+from pathlib import Path
+from typing import Any, TypeVar
+
+from skannonser.store import connection
+
+__all__ = ["DbWriter", "WriterConnection"]
+
+T = TypeVar("T")
+
+_SAVEPOINT = "skannonser_writer_job"
+_STOP = object()
+
+
+class WriterConnection:
+    """The connection a job sees: the writer's connection with transaction
+    control scoped to the job's savepoint. Only valid while the job runs."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._open = True
+
+    def _check_open(self) -> None:
+        if not self._open:
+            raise sqlite3.ProgrammingError("writer job connection used after its job ended")
+
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor | None:
+        self._check_open()
+        verb = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+        if verb == "BEGIN":
+            return None
+        if verb in ("COMMIT", "END"):
+            self.commit()
+            return None
+        if verb == "ROLLBACK" and "TO" not in sql.upper().split():
+            self.rollback()
+            return None
+        return self._conn.execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> sqlite3.Cursor:
+        self._check_open()
+        return self._conn.executemany(sql, seq_of_parameters)
+
+    def commit(self) -> None:
+        self._check_open()
+        self._conn.execute(f"RELEASE {_SAVEPOINT}")
+        self._conn.execute(f"SAVEPOINT {_SAVEPOINT}")
+
+    def rollback(self) -> None:
+        self._check_open()
+        self._conn.execute(f"ROLLBACK TO {_SAVEPOINT}")
+
+    @property
+    def isolation_level(self) -> str | None:
+        return None
+
+    @isolation_level.setter
+    def isolation_level(self, value: str | None) -> None:
+        pass
+
+    @property
+    def in_transaction(self) -> bool:
+        return True
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+
+class DbWriter:
+    """One writer thread for `db_path`; see the module docstring.
+
+    Use as a context manager (or call `close()`): closing drains the queue,
+    commits the last batch and joins the thread.
+
+    If the writer thread dies -- its connection can't be opened, a failed
+    batch can't be rolled back -- every in-flight and queued future gets the
+    error, `failure` records it, and `submit` raises from then on."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        max_batch: int = 256,
+        max_delay: float = 0.05,
+        profile: str = "batch-writer",
+    ):
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1 (got {max_batch})")
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.profile = profile
+        self.stats = {"batches": 0, "jobs": 0, "failed": 0}
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._inflight: list = []
+        # What killed the writer thread, if anything did (see `_run`).
+        self.failure: BaseException | None = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="skannonser-db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[[sqlite3.Connection], T]) -> "Future[T]":
+        """Queue `fn` to run on the writer's connection; returns its future."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed or not self._thread.is_alive():
+                raise RuntimeError("DbWriter is closed") from self.failure
+            self._queue.put((fn, future))
+        return future
+
+    def run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """`submit` and wait for the committed result."""
+        return self.submit(fn).result()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self) -> "DbWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # -- writer thread -------------------------------------------------
+
+    def _next_batch(self) -> tuple[list, bool]:
+        """Block for one job, then take what else arrives within max_delay
+        (up to max_batch). Returns (jobs, stop_seen)."""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        jobs = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(jobs) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return jobs, True
+            jobs.append(item)
+        return jobs, False
+
+    def _run(self) -> None:
+        conn = None
+        try:
+            conn = connection.connect(self.db_path, profile=self.profile)
+            conn.isolation_level = None
+            stop = False
+            while not stop:
+                jobs, stop = self._next_batch()
+                if jobs:
+                    self._inflight = jobs
+                    self._run_batch(conn, jobs)
+                    self._inflight = []
+        except BaseException as exc:
+            # The thread is going down (the connection couldn't be opened, a
+            # ROLLBACK failed, a job raised a BaseException): nothing would
+            # ever resolve the in-flight or queued futures, so fail them all
+            # and refuse further jobs. The error lives on in `failure` and
+            # in those futures rather than in a thread traceback.
+            self._die(exc)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _die(self, exc: BaseException) -> None:
+        with self._lock:
+            self.failure = exc
+            self._closed = True
+            pending = list(self._inflight)
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    pending.append(item)
+        for _, future in pending:
+            if not future.done():
+                try:
+                    future.set_exception(exc)
+                except InvalidStateError:  # cancelled meanwhile
+                    pass
+
+    def _run_batch(self, conn: sqlite3.Connection, jobs: list) -> None:
+        outcomes: list[tuple[Future, bool, Any]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except Exception as exc:
+            for _, future in jobs:
+                future.set_exception(exc)
+            return
+        try:
+            for fn, future in jobs:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                job_conn = WriterConnection(conn)
+                conn.execute(f"SAVEPOINT {_SAVEPOINT}")
+                try:
+                    value = fn(job_conn)
+                except Exception as exc:
+                    conn.execute(f"ROLLBACK TO {_SAVEPOINT}")
+                    outcomes.append((future, False, exc))
+                else:
+                    outcomes.append((future, True, value))
+                finally:
+                    job_conn._open = False
+                    conn.execute(f"RELEASE {_SAVEPOINT}")
+            conn.execute("COMMIT")
+        except Exception as exc:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future in jobs:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self.stats["batches"] += 1
+        for future, ok, value in outcomes:
+            self.stats["jobs"] += 1
+            if ok:
+                future.set_result(value)
+            else:
+                self.stats["failed"] += 1
+                future.set_exception(value)
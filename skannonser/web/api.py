@@ -23,7 +23,9 @@ Three listing "buckets" are merged into ``/api/listings``:
   ``sold_date``/``price_suggestion``, LEFT-joined off ``sold_prices``) --
   null when the sold-price backlog hasn't covered that finnkode yet.
   ``?bucket=sold`` returns ONLY this bucket (no re-shipped actives; the lazy
-  sold toggle in the map/table uses it). Every item also carries
+  sold toggle in the map/table uses it). Like the visible bucket it is read
+  off the materialized ``listing_view`` (migration 023); the fragment-built
+  ``_SOLD_API_SQL`` stays as the oracle. Every item also carries
   ``scraped_at`` (first-seen; ``eiendom.updated_at`` is NOT last-seen, see
   README).
 * **DNB-unique** -- a fresh query against ``dnbeiendom`` mirroring
@@ -79,10 +81,16 @@ from skannonser.publish.rows import (
     _EIE_JOINS,
     _EIE_SELECT_HEAD,
     _EIE_SELECT_TAIL,
+    ANNOTATION_KEYS,
+    EIE_KEYS,
+    SOLD_PRICE_KEYS,
+    VIEW_SOLD_VISIBLE,
+    _EIE_VIEW_WHERE,
     _add_hidden_fields,
     _as_float,
     _rows_from_cursor,
     _sheet_filters,
+    _view_sql,
     listing_rows,
 )
 from skannonser.web.app import ro_conn, rw_conn
@@ -171,20 +179,38 @@ _SOLD_API_SQL = (
     + " LEFT JOIN annotations a ON a.finnkode = e.finnkode"
     + _SOLD_PRICE_JOIN
     + " WHERE e.active = 0"
-    + " AND LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) IN ('solgt', 'inaktiv')"
+    + " AND e.status_norm IN ('solgt', 'inaktiv')"
     + " AND COALESCE(e.pris, 0) <= ?"
     + " AND CAST(e.info_usable_i_area AS REAL) >= ?"
-    + " ORDER BY e.scraped_at DESC"
+    + " ORDER BY e.scraped_at DESC, e.id"
 )
 
 
+# What production runs: `_SOLD_API_SQL`'s filter/order over `listing_view`
+# (migration 023). `_SOLD_API_SQL` stays as the oracle it is tested against.
+_SOLD_API_VIEW_SQL = _view_sql(
+    EIE_KEYS + ANNOTATION_KEYS + SOLD_PRICE_KEYS,
+    VIEW_SOLD_VISIBLE
+    + ' AND COALESCE(v."Pris", 0) <= ?1'
+    + ' AND CAST(v."Internt bruksareal (BRA-i)" AS REAL) >= ?2',
+    '"SCRAPED_AT" DESC',
+)
+
+_FULL_ROW_VIEW_SQL = _view_sql(
+    EIE_KEYS + ANNOTATION_KEYS + SOLD_PRICE_KEYS, 'v."Finnkode" = ?1'
+)
+
+# `/api/meta`'s boligtype list (`_visible_boligtyper`).
+_BOLIGTYPE_VIEW_SQL = _view_sql(("Boligtype",), _EIE_VIEW_WHERE)
+
+
 def _sold_records(conn: sqlite3.Connection) -> list[dict]:
     """Same visibility predicate as ``export.sold_rows`` (active=0, status in
     solgt/inaktiv, price/BRA filters -- see that function's docstring), but
     additionally joined against ``annotations`` and hidden-field-enriched,
     for direct consumption by ``_eie_item``."""
     max_price, min_bra_i = _sheet_filters()
-    records = _rows_from_cursor(conn.execute(_SOLD_API_SQL, (max_price, min_bra_i)))
+    records = _rows_from_cursor(conn.execute(_SOLD_API_VIEW_SQL, (max_price, min_bra_i)))
     return _add_hidden_fields(records)
 
 
@@ -600,20 +626,7 @@ def get_listings(
 def _eie_full_row(conn: sqlite3.Connection, finnkode: str) -> dict | None:
     """Single Eie row (any visibility -- active, sold, inactive) by raw
     ``finnkode``, hidden-field-enriched. ``None`` if unknown."""
-    sql = (
-        "SELECT "
-        + _EIE_SELECT_HEAD
-        + _DONOR_TRAVEL_SQL
-        + ", "
-        + _EIE_SELECT_TAIL
-        + ', a.kommentar AS "Kommentar", a.tag AS "Tag"'
-        + _SOLD_PRICE_COLS
-        + _EIE_JOINS
-        + " LEFT JOIN annotations a ON a.finnkode = e.finnkode"
-        + _SOLD_PRICE_JOIN
-        + " WHERE e.finnkode = ?"
-    )
-    records = _rows_from_cursor(conn.execute(sql, (finnkode,)))
+    records = _rows_from_cursor(conn.execute(_FULL_ROW_VIEW_SQL, (finnkode,)))
     if not records:
         return None
     return _add_hidden_fields(records)[0]
@@ -730,14 +743,6 @@ def get_nabolag(
 @router.get("/meta")
 def get_meta(request: Request, conn: sqlite3.Connection = Depends(ro_conn)) -> dict:
     domain = _domain(request)
-    visible = listing_rows(conn, include_hidden_fields=True)
-    boligtyper = sorted(
-        {
-            b
-            for b in (_clean_boligtype(rec.get("_boligtype_raw")) for rec in visible)
-            if b
-        }
-    )
     return {
         "polygon": [list(p) for p in domain.polygon_points],
         # Only client-relevant filters are exposed (sheets_max_price, min_bra_i);
@@ -747,7 +752,7 @@ def get_meta(request: Request, conn: sqlite3.Connection = Depends(ro_conn)) -> d
             "sheets_max_price": domain.filters.sheets_max_price,
             "min_bra_i": domain.filters.min_bra_i,
         },
-        "boligtyper": boligtyper,
+        "boligtyper": _visible_boligtyper(conn),
         "destinations": [{"key": d.key, "label": d.label} for d in domain.destinations],
         "stations": _stations_meta(conn),
         "facilities": [
@@ -780,6 +785,14 @@ def get_meta(request: Request, conn: sqlite3.Connection = Depends(ro_conn)) -> d
     }
 
 
+def _visible_boligtyper(conn: sqlite3.Connection) -> list[str]:
+    """Distinct cleaned boligtyper over the Eie-visible rows, sorted. Reads
+    the one column off ``listing_view`` rather than the full
+    ``listing_rows`` dicts."""
+    raw = conn.execute(_BOLIGTYPE_VIEW_SQL, _sheet_filters())
+    return sorted({b for b in (_clean_boligtype(r[0]) for r in raw) if b})
+
+
 def _stations_meta(conn: sqlite3.Connection) -> list[dict]:
     """One entry per station: ``lines`` = distinct line names,
     ``travel`` = ``{destination: minutes}`` merged across all of the
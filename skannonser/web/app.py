@@ -53,9 +53,8 @@ def _ro_connect(db_path: Path) -> sqlite3.Connection:
     # sqlite3's same-thread guard. The connection is single-request-scoped
     # (opened + closed within the request, never shared), so relaxing the
     # guard is safe. (mode=ro still forbids writes -- see test_ro_conn_rejects_writes.)
-    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    # The "web-reader" pragma profile: mmap + a small cache, short busy timeout.
+    return connection_module.connect_readonly(db_path, check_same_thread=False)
 
 
 def ro_conn(request: Request) -> Iterator[sqlite3.Connection]:
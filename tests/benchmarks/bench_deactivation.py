@@ -0,0 +1,80 @@
+"""Benchmark: crawl-driven deactivation, legacy `NOT IN (?, ...)` vs the
+TEMP-table anti-join now in `ListingsRepo.mark_inactive`.
+
+Not collected by pytest (testpaths is tests/rebuild). Run directly:
+
+    python tests/benchmarks/bench_deactivation.py [--sizes 10000 50000 100000]
+
+For each size N it builds a fresh `eiendom` with N active listings, then
+deactivates against a crawl that is missing 1% of them, both ways. Legacy's
+form binds one parameter per crawled finnkode and fails outright once N
+exceeds SQLITE_MAX_VARIABLE_NUMBER (32766 on stock builds; some distros raise
+it); that is reported, not raised. `--stock-limit` pins the legacy connection
+to the stock ceiling so distro builds show what upstream SQLite does.
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from skannonser.store import connection, migrations
+from skannonser.store.repositories.listings import ListingsRepo
+
+
+def _seed(path: Path, n: int) -> sqlite3.Connection:
+    conn = connection.connect(path)
+    migrations.migrate(conn)
+    conn.executemany(
+        "INSERT INTO eiendom (finnkode, url, active) VALUES (?, 'u', 1)",
+        ((f"{i:07d}",) for i in range(n)),
+    )
+    conn.commit()
+    return conn
+
+
+def _legacy(conn: sqlite3.Connection, crawled: list[str]) -> int:
+    placeholders = ",".join("?" * len(crawled))
+    cur = conn.execute(
+        f"UPDATE eiendom SET active = 0, updated_at = CURRENT_TIMESTAMP "
+        f"WHERE finnkode NOT IN ({placeholders}) AND active = 1",
+        crawled,
+    )
+    conn.commit()
+    return cur.rowcount
+
+
+def _timed(fn) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    parser.add_argument("--stock-limit", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'active':>8}  {'legacy NOT IN':>16}  {'anti-join':>10}  deactivated")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            crawled = [f"{i:07d}" for i in range(n) if i % 100]
+            conn = _seed(Path(tmp) / f"legacy-{n}.db", n)
+            if args.stock_limit:
+                conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 32766)
+            try:
+                secs, _ = _timed(lambda: _legacy(conn, crawled))
+                legacy = f"{secs * 1000:.1f} ms"
+            except sqlite3.OperationalError as exc:  # too many SQL variables
+                legacy = "too many vars" if "variables" in str(exc) else "error"
+            conn.close()
+
+            conn = _seed(Path(tmp) / f"anti-{n}.db", n)
+            secs, keys = _timed(lambda: ListingsRepo(conn).mark_inactive(crawled))
+            conn.close()
+            print(f"{n:>8}  {legacy:>16}  {secs * 1000:>7.1f} ms  {len(keys)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark: donor-cache lookups, list scan vs `DonorCache` grid index.
+
+Not collected by pytest (testpaths is tests/rebuild). Run directly:
+
+    python tests/benchmarks/bench_donor_index.py [--sizes 10000 100000] [--sample 1000]
+
+For each size N it scatters N listings over a 40 x 40 km box around Oslo
+(roughly the real density), half of them complete donors, and replays the
+cache work of the enrich pre-pass and run loop: per listing, one
+nearest-donor query within 300 m excluding itself, evicting the listing from
+four caches when it finds a donor, else a membership check + append (what
+`add_row_as_donor_if_complete` does). The pre-pass's link cascade is left
+out -- it does not touch the caches.
+
+The list baseline is quadratic, so above `--sample` listings it replays only
+the first `--sample` and extrapolates linearly (marked `~`). Both variants
+must agree on every donor found in the replayed prefix; the run aborts
+otherwise.
+"""
+import argparse
+import random
+import time
+
+from skannonser.enrich.donor import DonorCache, _evict, _has_donor, find_nearby_donor
+
+RADIUS_M = 300
+OSLO = (59.9139, 10.7522)
+
+
+def _listings(n: int) -> list[tuple[float, float, str]]:
+    rng = random.Random(n)
+    return [
+        (OSLO[0] + rng.uniform(-0.18, 0.18), OSLO[1] + rng.uniform(-0.36, 0.36), f"{i:09d}")
+        for i in range(n)
+    ]
+
+
+def _replay(listings, make_cache, limit: int) -> tuple[float, list]:
+    donors = listings[::2]
+    caches = [make_cache(donors) for _ in range(4)]
+    found = []
+    started = time.perf_counter()
+    for lat, lng, fk in listings[:limit]:
+        donor = find_nearby_donor(lat, lng, caches[0], RADIUS_M, exclude_finnkode=fk)
+        found.append(donor)
+        if donor:
+            for cache in caches:
+                _evict(cache, fk)
+        elif not _has_donor(caches[0], fk):
+            for cache in caches:
+                cache.append((lat, lng, fk))
+    return time.perf_counter() - started, found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--sample", type=int, default=1000, help="list-scan rows replayed per size")
+    args = parser.parse_args()
+
+    print(f"{'rows':>7}  {'list scan':>11}  {'grid index':>10}  {'speedup':>8}")
+    for n in args.sizes:
+        listings = _listings(n)
+        limit = min(n, args.sample)
+        list_secs, list_found = _replay(listings, list, limit)
+        grid_secs, grid_found = _replay(listings, DonorCache, n)
+        if grid_found[:limit] != list_found:
+            raise SystemExit(f"{n}: grid index and list scan disagree")
+        mark = " " if limit == n else "~"
+        list_total = list_secs * n / limit
+        print(
+            f"{n:>7}  {mark}{list_total:>8.2f} s  {grid_secs:>8.2f} s  "
+            f"{list_total / grid_secs:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
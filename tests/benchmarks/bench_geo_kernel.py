@@ -0,0 +1,96 @@
+"""Benchmark: scalar geodesy helpers vs the NumPy kernels in `skannonser.geo`.
+
+Not collected by pytest (testpaths is tests/rebuild). Run directly:
+
+    python tests/benchmarks/bench_geo_kernel.py [--points 100000] [--radius 300]
+
+Scatters N points over a 40 x 40 km box around Oslo (plus a margin outside
+the domain polygon) and times, scalar loop vs kernel:
+
+- one point against all N (`haversine_meters` per point vs `haversine_array`);
+- every pair within `--radius` (a scalar grid search -- the approach the
+  kernel replaces in `validate` -- vs `pairs_within_radius`);
+- polygon containment of all N (`is_point_in_polygon` per point vs
+  `points_in_polygon`).
+
+Each row also reports the largest disagreement with the scalar result
+(meters, or mismatching points for containment).
+"""
+import argparse
+import math
+import random
+import time
+
+import numpy as np
+
+from skannonser.config.domain import load_domain
+from skannonser.geo import (
+    haversine_array,
+    haversine_meters,
+    is_point_in_polygon,
+    pairs_within_radius,
+    points_in_polygon,
+)
+
+
+def _scalar_pairs(lats, lngs, radius_m):
+    step_lat = radius_m / 111_000.0
+    step_lng = step_lat / math.cos(math.radians(max(abs(v) for v in lats)))
+    cells: dict[tuple[int, int], list[int]] = {}
+    for k, (lat, lng) in enumerate(zip(lats, lngs)):
+        cells.setdefault((math.floor(lat / step_lat), math.floor(lng / step_lng)), []).append(k)
+    pairs = {}
+    for (ci, cj), members in cells.items():
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                for b in cells.get((ci + di, cj + dj), ()):
+                    for a in members:
+                        if a < b:
+                            d = haversine_meters(lats[a], lngs[a], lats[b], lngs[b])
+                            if d <= radius_m:
+                                pairs[(a, b)] = d
+    return pairs
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--radius", type=float, default=300.0)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    lats = [59.9139 + rng.uniform(-0.25, 0.25) for _ in range(args.points)]
+    lngs = [10.7522 + rng.uniform(-0.5, 0.5) for _ in range(args.points)]
+    lat_a, lng_a = np.array(lats), np.array(lngs)
+    polygon = load_domain().polygon_points
+
+    print(f"{'operation':>24}  {'scalar':>9}  {'numpy':>9}  {'speedup':>7}  {'max diff':>9}")
+
+    def report(name, scalar_s, numpy_s, diff):
+        print(f"{name:>24}  {scalar_s:>7.3f} s  {numpy_s:>7.3f} s  {scalar_s / numpy_s:>6.0f}x  {diff:>9.2g}")
+
+    s_secs, scalar = _timed(lambda: [haversine_meters(lats[0], lngs[0], a, b) for a, b in zip(lats, lngs)])
+    n_secs, vector = _timed(lambda: haversine_array(lat_a[0], lng_a[0], lat_a, lng_a))
+    report("one vs all", s_secs, n_secs, float(np.max(np.abs(vector - np.array(scalar)))))
+
+    s_secs, scalar = _timed(lambda: _scalar_pairs(lats, lngs, args.radius))
+    n_secs, (i, j, meters) = _timed(lambda: pairs_within_radius(lat_a, lng_a, args.radius))
+    found = dict(zip(zip(i.tolist(), j.tolist()), meters.tolist()))
+    if found.keys() != scalar.keys():
+        raise SystemExit("pairs_within_radius and the scalar search disagree")
+    diff = max((abs(found[k] - scalar[k]) for k in scalar), default=0.0)
+    report(f"pairs <= {args.radius:g} m ({len(found)})", s_secs, n_secs, diff)
+
+    s_secs, scalar = _timed(lambda: [is_point_in_polygon(a, b, polygon) for a, b in zip(lats, lngs)])
+    n_secs, vector = _timed(lambda: points_in_polygon(lat_a, lng_a, polygon))
+    report("point in polygon", s_secs, n_secs, int(np.sum(vector != np.array(scalar))))
+
+
+if __name__ == "__main__":
+    main()
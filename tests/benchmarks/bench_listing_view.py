@@ -0,0 +1,149 @@
+"""Benchmark: `/api/meta` and `/api/listings` end to end, direct join vs `listing_view`.
+
+Not collected by pytest (testpaths is tests/rebuild). Run directly:
+
+    python tests/benchmarks/bench_listing_view.py [--sizes 6000 20000] [--reps 5]
+
+For each size N it seeds N listings: about a third sold or inactive, each
+with a processed row (30% borrow a donor's travel times) and a details row,
+half classified, 10% annotated. Every write goes through migration 023's
+triggers. It then times three read modes through the web app (TestClient,
+JSON included; median of `--reps`):
+
+- `join`: the pre-023 readers. Eie, sold and full rows come from the direct
+  fragment joins, and `/api/meta` builds its boligtype list from the full
+  `listing_rows` dicts.
+- `all dirty`: today's readers right after seeding, before any refresh.
+  Every row goes through the join arm of the overlay.
+- `view`: today's readers after `ListingViewRepo.refresh()`.
+
+It also reports the seeding time with the dirty-marking triggers on and
+with them dropped, and the time of that one full refresh.
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from skannonser.publish import rows
+from skannonser.store import connection, migrations
+from skannonser.store.repositories.listing_view import ListingViewRepo
+from skannonser.web import api
+from skannonser.web.app import create_app
+
+URLS = ("/api/meta", "/api/listings", "/api/listings?bucket=sold")
+
+
+def _seed(path: Path, n: int, triggers: bool) -> float:
+    conn = connection.connect(path)
+    migrations.migrate(conn)
+    if not triggers:
+        for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_listing_view_%'"
+        ).fetchall():
+            conn.execute(f"DROP TRIGGER {name}")
+    rng = random.Random(n)
+    started = time.perf_counter()
+    conn.execute("BEGIN")
+    for i in range(n):
+        fk = str(300_000_000 + i)
+        status = rng.choice(["Til salgs"] * 4 + ["Solgt", "Inaktiv"])
+        conn.execute(
+            "INSERT INTO eiendom (finnkode, url, tilgjengelighet, active, pris, "
+            "info_usable_i_area, info_property_type, scraped_at, adresse, image_url) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'https://img/x.jpg')",
+            (fk, f"https://www.finn.no/realestate/homes/ad.html?finnkode={fk}", status,
+             int(status == "Til salgs"), rng.randint(2_000_000, 9_000_000), rng.randint(40, 200),
+             rng.choice(["Leilighet", "Enebolig", "Rekkehus"]),
+             f"2026-0{rng.randint(1, 9)}-{rng.randint(10, 28)} 00:00:00", f"Gate {i}"),
+        )
+        donor = str(300_000_000 + rng.randrange(i)) if i and rng.random() < 0.3 else None
+        conn.execute(
+            "INSERT INTO eiendom_processed (finnkode, lat, lng, pendl_rush_brj, pendl_rush_mvv, "
+            "travel_copy_from_finnkode) VALUES (?, ?, ?, ?, ?, ?)",
+            (fk, 59.9 + rng.random() * 0.2, 10.7 + rng.random() * 0.3,
+             rng.randint(10, 90), rng.randint(10, 90), donor),
+        )
+        conn.execute(
+            "INSERT INTO listing_details (finnkode, totalpris, bedrooms) VALUES (?, ?, ?)",
+            (fk, rng.randint(2_000_000, 9_000_000), rng.randint(1, 5)),
+        )
+        if rng.random() < 0.5:
+            conn.execute(
+                "INSERT INTO listing_tilstand (finnkode, tg2_count, tg3_count, classified_at) "
+                "VALUES (?, ?, ?, 'now')",
+                (fk, rng.randint(0, 5), rng.randint(0, 3)),
+            )
+        if rng.random() < 0.1:
+            conn.execute("INSERT INTO annotations (finnkode, kommentar) VALUES (?, 'hmm')", (fk,))
+    conn.commit()
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return elapsed
+
+
+def _boligtyper_from_rows(conn):
+    """`/api/meta`'s boligtype list as it was built before 023."""
+    visible = rows.listing_rows(conn, include_hidden_fields=True)
+    cleaned = (api._clean_boligtype(rec.get("_boligtype_raw")) for rec in visible)
+    return sorted({b for b in cleaned if b})
+
+
+def _time(client: TestClient, url: str, reps: int) -> float:
+    samples = []
+    for _ in range(reps + 1):
+        started = time.perf_counter()
+        resp = client.get(url)
+        samples.append(time.perf_counter() - started)
+        if resp.status_code != 200:
+            raise SystemExit(f"{url}: HTTP {resp.status_code}")
+    return statistics.median(samples[1:]) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[6_000, 20_000])
+    parser.add_argument("--reps", type=int, default=5)
+    args = parser.parse_args()
+
+    join = (
+        mock.patch.object(rows, "_EIE_VIEW_SQL", rows._EIE_SQL),
+        mock.patch.object(api, "_SOLD_API_VIEW_SQL", api._SOLD_API_SQL),
+        mock.patch.object(api, "_visible_boligtyper", _boligtyper_from_rows),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            bare = _seed(Path(tmp) / f"bare-{n}.db", n, triggers=False)
+            db = Path(tmp) / f"view-{n}.db"
+            seeded = _seed(db, n, triggers=True)
+            print(f"{n} listings: seed {bare:.2f} s without triggers, {seeded:.2f} s with")
+
+            client = TestClient(create_app(db, thumbs_dir=None))
+            times = {}
+            for patch in join:
+                patch.start()
+            try:
+                times["join"] = [_time(client, url, args.reps) for url in URLS]
+            finally:
+                mock.patch.stopall()
+            times["all dirty"] = [_time(client, url, args.reps) for url in URLS]
+
+            conn = connection.connect(db)
+            started = time.perf_counter()
+            folded = ListingViewRepo(conn).refresh()
+            print(f"  refresh: {folded} rows in {time.perf_counter() - started:.2f} s")
+            conn.close()
+            times["view"] = [_time(client, url, args.reps) for url in URLS]
+
+            print(f"  {'mode':>9}" + "".join(f"  {url:>25}" for url in URLS))
+            for mode, ms in times.items():
+                print(f"  {mode:>9}" + "".join(f"  {t:>22.1f} ms" for t in ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: `run_sold_sweep`'s density ordering, full scan vs `_TargetGrid`.
+
+Not collected by pytest (testpaths is tests/rebuild). Run directly:
+
+    python tests/benchmarks/bench_sold_density.py [--sizes 1200 10000 50000] [--sample 500]
+
+For each size N it scatters N sold targets over a 40 x 40 km box around
+Oslo, in clusters about a street block wide, with mixed tiers and attempt
+counts. It then times the planner's sort key, (tier, attempts, -targets in
+the pad box). The scan baseline counts by testing every target against
+every box. The grid version builds `_TargetGrid` and counts from it; its
+time includes the grid build and the sort.
+
+The scan is quadratic, so above `--sample` targets only the first
+`--sample` counts are timed and the result is extrapolated linearly (marked
+`~`). The two must agree on every sampled count; the run aborts otherwise.
+"""
+import argparse
+import random
+import time
+
+from skannonser.enrich.sold import _PAD_LAT, _PAD_LON, _TargetGrid, target_bbox
+
+OSLO = (59.9139, 10.7522)
+
+
+def _targets(n: int) -> list[dict]:
+    rng = random.Random(n)
+    centres = [
+        (OSLO[0] + rng.uniform(-0.18, 0.18), OSLO[1] + rng.uniform(-0.36, 0.36))
+        for _ in range(max(1, n // 8))
+    ]
+    targets = []
+    for i in range(n):
+        lat, lng = rng.choice(centres)
+        targets.append({
+            "finnkode": str(100_000_000 + i),
+            "lat": lat + rng.uniform(-0.001, 0.001),
+            "lng": lng + rng.uniform(-0.002, 0.002),
+            "status": "solgt" if rng.random() < 0.85 else "inaktiv",
+            "attempts": rng.randrange(4),
+        })
+    return targets
+
+
+def _scan_count(targets: list[dict], t: dict) -> int:
+    lon0, lat0, lon1, lat1 = target_bbox(t)
+    return sum(1 for o in targets if lon0 <= o["lng"] <= lon1 and lat0 <= o["lat"] <= lat1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_200, 10_000, 50_000])
+    parser.add_argument("--sample", type=int, default=500, help="targets counted by the full scan")
+    args = parser.parse_args()
+
+    print(f"{'targets':>7}  {'full scan':>11}  {'grid':>8}  {'speedup':>8}")
+    for n in args.sizes:
+        targets = _targets(n)
+        limit = min(n, args.sample)
+
+        started = time.perf_counter()
+        scan = [_scan_count(targets, t) for t in targets[:limit]]
+        scan_secs = (time.perf_counter() - started) * n / limit
+
+        started = time.perf_counter()
+        grid = _TargetGrid(targets, _PAD_LON, _PAD_LAT)
+        counts = {id(t): grid.count(target_bbox(t)) for t in targets}
+        sorted(
+            targets,
+            key=lambda t: (t["status"] != "solgt", t["attempts"], -counts[id(t)]),
+        )
+        grid_secs = time.perf_counter() - started
+
+        if scan != [counts[id(t)] for t in targets[:limit]]:
+            raise SystemExit(f"{n}: grid and full-scan counts disagree")
+        mark = " " if limit == n else "~"
+        print(
+            f"{n:>7}  {mark}{scan_secs:>8.2f} s  {grid_secs:>6.3f} s  "
+            f"{scan_secs / grid_secs:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark: `validate_travel`, row-by-row (previous revision) vs columnar.
+
+Not collected by pytest (testpaths is tests/rebuild). Run directly:
+
+    python tests/benchmarks/bench_validate.py [--sizes 5000 20000] [--baseline-rev 32e17e1]
+
+For each size N it seeds N active listings in clusters over a 40 x 40 km box
+around Oslo, with noisy travel values, outliers, sentinels, donor links
+(near, far and dangling) and messy postnummer, and then runs
+`validate_travel` twice. The first run uses the row-by-row implementation
+from `--baseline-rev`, loaded with `git show`. The second uses the columnar
+one in the working tree. Both must return the same findings; the run aborts
+otherwise.
+"""
+import argparse
+import importlib.util
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from skannonser.config.domain import load_domain
+from skannonser.enrich.validate import validate_travel
+from skannonser.store import connection, migrations
+
+OSLO = (59.9139, 10.7522)
+
+
+def _baseline(rev: str, tmp: Path):
+    source = subprocess.run(
+        ["git", "show", f"{rev}:skannonser/enrich/validate.py"],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    path = tmp / "validate_baseline.py"
+    path.write_text(source)
+    spec = importlib.util.spec_from_file_location("validate_baseline", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.validate_travel
+
+
+def _seed(path: Path, n: int):
+    rng = random.Random(n)
+    conn = connection.connect(path)
+    migrations.migrate(conn)
+    centres = [
+        (OSLO[0] + rng.uniform(-0.18, 0.18), OSLO[1] + rng.uniform(-0.36, 0.36),
+         rng.uniform(20, 90), rng.uniform(20, 90), f"{rng.randrange(100, 1400):04d}")
+        for _ in range(max(1, n // 40))
+    ]
+    fks = [f"{5_000_000 + i}" for i in range(n)]
+
+    def travel(base):
+        roll = rng.random()
+        if roll < 0.04:
+            return rng.choice([None, -1, -2, 0, 500])
+        if roll < 0.09:
+            return round(base * rng.choice([0.3, 2.5, 3.0]))
+        return round(base + rng.uniform(-6, 6))
+
+    listings, processed = [], []
+    for i, fk in enumerate(fks):
+        lat, lng, brj, mvv, pnr = rng.choice(centres)
+        roll = rng.random()
+        link = rng.choice(fks) if roll < 0.12 else ("9999999" if roll < 0.13 else None)
+        listings.append((fk, f"Gate {i}", rng.choice([pnr, pnr, f" {pnr} ", None])))
+        processed.append((
+            fk, lat + rng.uniform(-0.004, 0.004), lng + rng.uniform(-0.008, 0.008),
+            travel(brj), travel(mvv), link,
+        ))
+    conn.executemany(
+        "INSERT INTO eiendom (finnkode, url, adresse, postnummer, active) VALUES (?, 'u', ?, ?, 1)",
+        listings,
+    )
+    conn.executemany(
+        "INSERT INTO eiendom_processed (finnkode, lat, lng, pendl_rush_brj, pendl_rush_mvv, "
+        "travel_copy_from_finnkode) VALUES (?, ?, ?, ?, ?, ?)",
+        processed,
+    )
+    conn.commit()
+    return conn
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5_000, 20_000])
+    parser.add_argument("--baseline-rev", default="32e17e1", help="git revision of the row-by-row version")
+    args = parser.parse_args()
+
+    domain = load_domain()
+    print(f"{'rows':>7}  {'row-by-row':>10}  {'columnar':>9}  {'speedup':>8}  {'findings':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        baseline = _baseline(args.baseline_rev, tmp)
+        for n in args.sizes:
+            conn = _seed(tmp / f"{n}.db", n)
+            old_secs, old = _timed(baseline, conn, domain)
+            new_secs, new = _timed(validate_travel, conn, domain)
+            conn.close()
+            if old != new:
+                sys.exit(f"{n}: columnar and row-by-row findings differ")
+            print(
+                f"{n:>7}  {old_secs:>8.2f} s  {new_secs:>7.2f} s  "
+                f"{old_secs / new_secs:>7.1f}x  {len(new):>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark: `run_enrich` with per-write commits vs `ProcessedRepo.write_behind`.
+
+Not collected by pytest (testpaths is tests/rebuild). Run directly:
+
+    python tests/benchmarks/bench_write_behind.py [--sizes 500 2000] [--rows 200]
+
+For each size N it seeds N active listings too far apart to donate to each
+other, all missing BRJ, then runs `run_enrich(targets="brj")` against a fake
+Routes API (no network, no sleeps) twice: once with `write_behind` disabled
+(today's commit per `eiendom_processed` write) and once with it on. It
+reports wall-clock and the number of transactions the connection committed
+-- explicit COMMITs plus statements that ran in autocommit mode -- split into
+the Gateway ledger's (one per API call either way) and everything else. The
+connection keeps SQLite's default synchronous=FULL, so every commit is a
+real WAL sync.
+"""
+import argparse
+import contextlib
+import re
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from skannonser.config.domain import Budget, load_domain
+from skannonser.enrich.travel import run_enrich
+from skannonser.gateway import Gateway
+from skannonser.store import connection, migrations
+from skannonser.store.repositories.processed import ProcessedRepo
+
+_WRITE = re.compile(r"^\s*(INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+
+class _Response:
+    status_code = 200
+
+    def json(self):
+        return {"routes": [{"duration": "1500s", "distanceMeters": 1000}]}
+
+
+def _seed(path: Path, n: int) -> sqlite3.Connection:
+    conn = connection.connect(path)
+    migrations.migrate(conn)
+    conn.executemany(
+        "INSERT INTO eiendom (finnkode, url, adresse, postnummer, active) "
+        "VALUES (?, 'u', ?, '0575', 1)",
+        ((f"{i:07d}", f"gate {i}") for i in range(n)),
+    )
+    conn.executemany(
+        "INSERT INTO eiendom_processed (finnkode, lat, lng) VALUES (?, ?, 10.75)",
+        # ~1.1 km apart in latitude: no listing can donate to another
+        ((f"{i:07d}", 59.0 + i * 0.01) for i in range(n)),
+    )
+    conn.commit()
+    return conn
+
+
+def _run(conn: sqlite3.Connection, write_behind: bool, rows: int) -> tuple[float, int, int]:
+    commits = {"ledger": 0, "other": 0}
+    last = [""]
+
+    def trace(sql: str) -> None:
+        # Each trigger program the statement fires is traced again under the
+        # statement's own (parameter-expanded) text: count it once.
+        if sql == last[0]:
+            return
+        last[0] = sql
+        kind = "ledger" if "api_usage" in sql else "other"
+        if sql.strip().upper() == "COMMIT":
+            commits["other"] += 1
+        elif _WRITE.match(sql) and not conn.in_transaction:
+            commits[kind] += 1
+
+    budget = Budget(
+        routes_monthly_cap=10**6, geocode_monthly_cap=10**6, warn_pcts=[],
+        routes_rpm=10**6, routes_burst=10**6,
+    )
+    gateway = Gateway(conn, budget, notify=lambda m: None, sleeper=lambda s: None)
+    original = ProcessedRepo.write_behind
+    if write_behind:
+        replacement = lambda self, *a, **k: original(self, rows=rows)  # noqa: E731
+    else:
+        replacement = lambda self, *a, **k: contextlib.nullcontext(self)  # noqa: E731
+    with mock.patch.object(ProcessedRepo, "write_behind", replacement):
+        conn.set_trace_callback(trace)
+        try:
+            started = time.perf_counter()
+            run_enrich(conn, load_domain(), gateway, "key", targets="brj",
+                       post=lambda *a, **k: _Response())
+            elapsed = time.perf_counter() - started
+        finally:
+            conn.set_trace_callback(None)
+    return elapsed, commits["ledger"], commits["other"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--rows", type=int, default=200, help="write_behind window size")
+    args = parser.parse_args()
+
+    print(f"{'rows':>6}  {'mode':>12}  {'wall':>9}  {'ledger tx':>9}  {'other tx':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            for label, on in (("per-write", False), ("write-behind", True)):
+                conn = _seed(Path(tmp) / f"{label}-{n}.db", n)
+                secs, ledger, other = _run(conn, on, args.rows)
+                conn.close()
+                print(f"{n:>6}  {label:>12}  {secs:>7.2f} s  {ledger:>9}  {other:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,9 @@ def test_backfill_parses_cached_html(conn, tmp_path):
         "parsed": 1,
         "missing_html": 1,
         "upserted": 1,
+        "skipped": 0,
+        "unchanged": 0,
+        "resumed": 0,
     }
     row = conn.execute(
         "SELECT totalpris FROM listing_details WHERE finnkode = '448347467'"
@@ -0,0 +1,123 @@
+"""backfill_engine: the shared parallel, checkpointed re-parse walk behind
+tools backfill-details / backfill-salgsoppgave."""
+import shutil
+from pathlib import Path
+
+import pytest
+
+from skannonser.ingest.finn.backfill import backfill_details
+from skannonser.ingest.finn.backfill_engine import MISSING, SKIPPED, iter_parsed, run_backfill
+from skannonser.ingest.finn.backfill_salgsoppgave import backfill_salgsoppgave
+from skannonser.store import connection, migrations
+from skannonser.store.repositories.checkpoints import CheckpointRepo
+
+FIXTURES = Path(__file__).parent / "fixtures" / "finn"
+ADS = ["432672475", "448347467", "451631591"]
+
+
+@pytest.fixture()
+def conn(tmp_path):
+    c = connection.connect(tmp_path / "t.db")
+    migrations.migrate(c)
+    return c
+
+
+def _project(tmp_path, finnkodes):
+    project = tmp_path / "eiendom"
+    (project / "html_extracted").mkdir(parents=True)
+    for fk in finnkodes:
+        shutil.copy(FIXTURES / f"{fk}.html", project / "html_extracted" / f"{fk}.html")
+    return project
+
+
+def _seed(conn, *finnkodes):
+    for fk in finnkodes:
+        conn.execute("INSERT INTO eiendom (finnkode, url) VALUES (?, ?)", (fk, "u"))
+    conn.commit()
+
+
+def _echo(html, finnkode):
+    return finnkode
+
+
+def _boom(html, finnkode):
+    raise ValueError(finnkode)
+
+
+def test_iter_parsed_reports_missing_and_failures_in_order(tmp_path):
+    project = _project(tmp_path, ADS[:1])
+    out = list(iter_parsed(project, [ADS[0], "1"], _echo))
+    assert [(fk, value) for fk, value, _ in out] == [(ADS[0], ADS[0]), ("1", MISSING)]
+    assert out[1][2] is None
+    assert [v for _, v, _ in iter_parsed(project, [ADS[0]], _boom)] == [SKIPPED]
+
+
+def test_parallel_backfill_matches_serial(tmp_path):
+    project = _project(tmp_path, ADS)
+    tables = {}
+    for workers in (1, 2):
+        c = connection.connect(tmp_path / f"w{workers}.db")
+        migrations.migrate(c)
+        _seed(c, *ADS, "999999999")
+        assert backfill_salgsoppgave(c, project, workers=workers)["parsed"] == 3
+        assert backfill_details(c, project, workers=workers)["upserted"] == 3
+        # parsed_at is wall-clock; everything else must match exactly.
+        c.execute("UPDATE listing_details SET parsed_at = NULL")
+        c.execute("UPDATE listing_salgsoppgave SET parsed_at = NULL")
+        tables[workers] = [
+            tuple(r) for r in c.execute(
+                "SELECT d.*, s.* FROM listing_details d "
+                "JOIN listing_salgsoppgave s USING (finnkode) ORDER BY finnkode"
+            )
+        ]
+    assert tables[1] == tables[2]
+    assert len(tables[1]) == 3
+
+
+def test_interrupted_run_resumes_after_last_committed_batch(conn, tmp_path):
+    project = _project(tmp_path, ADS)
+    _seed(conn, *ADS)
+    written = []
+
+    def dying_write(batch):
+        if written:
+            raise KeyboardInterrupt
+        written.extend(batch)
+        return {"upserted": len(batch)}
+
+    with pytest.raises(KeyboardInterrupt):
+        run_backfill(conn, "t", project, _echo, dying_write, batch_size=1)
+    assert CheckpointRepo(conn).get("t") == (ADS[0], 1)
+
+    def write(batch):
+        written.extend(batch)
+        return {"upserted": len(batch)}
+
+    stats = run_backfill(conn, "t", project, _echo, write, batch_size=1)
+    assert written == ADS  # the first ad was not parsed or written twice
+    assert stats["resumed"] == 1
+    assert stats["parsed"] == 2
+    assert CheckpointRepo(conn).get("t") is None  # completed -> cleared
+
+
+def test_restart_ignores_checkpoint(conn, tmp_path):
+    project = _project(tmp_path, ADS)
+    _seed(conn, *ADS)
+    CheckpointRepo(conn).save("t", ADS[1], 2)
+    written = []
+    stats = run_backfill(
+        conn, "t", project, _echo,
+        lambda b: written.extend(b) or {"upserted": len(b)},
+        resume=False,
+    )
+    assert written == ADS
+    assert stats["resumed"] == 0
+
+
+def test_wipe_restarts_the_named_backfill(conn, tmp_path):
+    project = _project(tmp_path, ADS)
+    _seed(conn, *ADS)
+    CheckpointRepo(conn).save("details", ADS[-1], 3)
+    stats = backfill_details(conn, project, wipe=True)
+    assert stats["parsed"] == 3
+    assert stats["resumed"] == 0
@@ -43,6 +43,8 @@ def test_backfill_parses_cached_html(conn, tmp_path):
         "missing_html": 1,
         "upserted": 1,
         "skipped": 0,
+        "unchanged": 0,
+        "resumed": 0,
     }
     row = conn.execute(
         "SELECT finnkode, parsed_at FROM listing_salgsoppgave WHERE finnkode='448347467'"
@@ -96,6 +98,8 @@ def test_a_failing_listing_is_skipped_not_fatal(conn, tmp_path, monkeypatch):
         "missing_html": 0,
         "upserted": 2,
         "skipped": 1,
+        "unchanged": 0,
+        "resumed": 0,
     }
     codes = {r[0] for r in conn.execute("SELECT finnkode FROM listing_salgsoppgave")}
     assert codes == {"448347467", "451631591"}
@@ -86,7 +86,7 @@ def test_cli_nightly_exits_nonzero_on_drift(tmp_path, monkeypatch):
     migrations.migrate(c)
     c.close()
 
-    def fake_run_nightly(conn, domain, gateway, api_key, client, fetch=None, post=None, sheets_writer=None):
+    def fake_run_nightly(conn, domain, gateway, api_key, client, fetch=None, post=None, sheets_writer=None, workers=1):
         return {
             "steps": {
                 "ingest_finn": {
@@ -140,7 +140,7 @@ def test_cli_nightly_no_drift_key_when_finn_step_hard_failed(tmp_path, monkeypat
     migrations.migrate(c)
     c.close()
 
-    def fake_run_nightly(conn, domain, gateway, api_key, client, fetch=None, post=None, sheets_writer=None):
+    def fake_run_nightly(conn, domain, gateway, api_key, client, fetch=None, post=None, sheets_writer=None, workers=1):
         return {
             "steps": {"ingest_finn": {"ok": False, "error": "boom"}},
             "failed": ["ingest_finn"],
@@ -162,6 +162,43 @@ def test_cli_nightly_no_drift_key_when_finn_step_hard_failed(tmp_path, monkeypat
     assert calls == []
 
 
+def test_cli_nightly_logs_deactivated_key_count_not_keys(tmp_path, monkeypatch):
+    from skannonser.commands import run_cmd
+    from skannonser.store import connection, migrations
+
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "K")
+    monkeypatch.setenv("SPREADSHEET_ID", "SHEET1")
+    sa_path = tmp_path / "sa.json"
+    sa_path.write_text("{}")
+    monkeypatch.setenv("GOOGLE_SERVICE_ACCOUNT_FILE", str(sa_path))
+
+    db = tmp_path / "cli.db"
+    c = connection.connect(db)
+    migrations.migrate(c)
+    c.close()
+
+    urls = [f"https://www.dnbeiendom.no/bolig/{i}" for i in range(300)]
+
+    def fake_run_nightly(conn, domain, gateway, api_key, client, fetch=None, post=None, sheets_writer=None, workers=1):
+        return {
+            "steps": {
+                "ingest_dnb": {"ok": True, "stats": {"crawled": 5, "deactivated": 300,
+                                                     "deactivated_keys": urls}},
+                "ingest_finn": {"ok": False, "error": "boom"},
+            },
+            "failed": [],
+            "budget_exhausted": [],
+        }
+
+    monkeypatch.setattr(run_cmd, "run_nightly", fake_run_nightly)
+    _stub_drift_ok_sender(monkeypatch, run_cmd, lambda *a, **k: True)
+
+    result = CliRunner().invoke(app, ["run", "nightly", "--db", str(db)])
+    assert result.exit_code == 0, result.output
+    assert "'deactivated_keys': 300" in result.output
+    assert urls[0] not in result.output
+
+
 # --- tools classify-tilstand -----------------------------------------------
 
 
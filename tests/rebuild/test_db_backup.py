@@ -1,8 +1,12 @@
+import itertools
+import json
 import sqlite3
 
+import pytest
 from typer.testing import CliRunner
 
 from skannonser.cli import app
+from skannonser.store import backup as backup_mod
 
 
 def test_backup_copies_database(tmp_path, monkeypatch):
@@ -67,3 +71,139 @@ def test_backup_removes_partial_file_on_failure(tmp_path, monkeypatch):
 
     assert result.exit_code != 0
     assert not list(dest_dir.glob("properties-*.db"))
+
+
+# -- skannonser.store.backup: compressed / incremental points and restore --
+
+@pytest.fixture
+def stamps(monkeypatch):
+    """Distinct, increasing point names without sleeping between backups."""
+    counter = itertools.count(1)
+    monkeypatch.setattr(backup_mod, "_stamp", lambda: f"20260101-{next(counter):06d}")
+
+
+def _live(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO t (body) VALUES (?)", [(f"row {i}" * 20,) for i in range(2000)])
+    conn.commit()
+    return conn
+
+
+def _rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT id, body FROM t ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def test_compressed_backup_restores(tmp_path, stamps):
+    src = tmp_path / "live.db"
+    _live(src).close()
+    dest_dir = tmp_path / "backups"
+
+    entry = backup_mod.create_backup(src, dest_dir, compress=True, step_pages=16, pause=0)
+
+    assert entry["file"].endswith(".db.gz") and entry["kind"] == "full"
+    assert entry["written_bytes"] < entry["db_bytes"]
+    result = backup_mod.restore(dest_dir, "latest", tmp_path / "restored.db")
+    assert result["chain"] == [entry["point"]]
+    assert _rows(tmp_path / "restored.db") == _rows(src)
+
+
+def test_incremental_chain_restores_every_point(tmp_path, stamps):
+    src = tmp_path / "live.db"
+    conn = _live(src)
+    dest_dir = tmp_path / "backups"
+    expected = {}
+    entries = []
+    for step in range(4):
+        entries.append(backup_mod.create_backup(src, dest_dir, incremental=True, pause=0))
+        expected[entries[-1]["point"]] = _rows(src)
+        conn.execute("UPDATE t SET body = ? WHERE id % 50 = ?", (f"edit {step}", step))
+        conn.execute("DELETE FROM t WHERE id > ?", (1900 - step * 300,))
+        conn.commit()
+    conn.close()
+
+    assert [e["kind"] for e in entries] == ["full", "delta", "delta", "delta"]
+    assert all(e["changed_pages"] < e["pages"] for e in entries[1:])
+    for point, rows in expected.items():
+        target = tmp_path / f"{point}.db"
+        result = backup_mod.restore(dest_dir, point, target)
+        assert result["chain"][0] == entries[0]["point"]
+        assert _rows(target) == rows
+
+    ledger = [json.loads(line) for line in (dest_dir / "ledger.jsonl").read_text().splitlines()]
+    assert [e["point"] for e in ledger] == list(expected)
+    assert {e["integrity"] for e in ledger} == {"ok"}
+
+
+def test_full_every_cuts_the_chain(tmp_path, stamps):
+    src = tmp_path / "live.db"
+    _live(src).close()
+    dest_dir = tmp_path / "backups"
+    kinds = [
+        backup_mod.create_backup(src, dest_dir, incremental=True, full_every=2, pause=0)["kind"]
+        for _ in range(5)
+    ]
+    assert kinds == ["full", "delta", "full", "delta", "full"]
+
+
+def test_prune_keeps_chain_ancestors(tmp_path, stamps):
+    src = tmp_path / "live.db"
+    _live(src).close()
+    dest_dir = tmp_path / "backups"
+    points = [
+        backup_mod.create_backup(src, dest_dir, incremental=True, full_every=3, pause=0)["point"]
+        for _ in range(5)
+    ]
+    # chains: [0, 1, 2], [3, 4]; keeping 3 needs 2's base 0 and 1 too
+    assert backup_mod.prune(dest_dir, 3) == []
+    assert backup_mod.prune(dest_dir, 2) == points[:3]
+    assert list(backup_mod.list_points(dest_dir)) == points[3:]
+    assert not list(dest_dir.glob(f"{points[0]}.*"))
+    backup_mod.restore(dest_dir, "latest", tmp_path / "restored.db")
+
+
+def test_restore_refuses_to_overwrite_without_force(tmp_path, stamps):
+    src = tmp_path / "live.db"
+    _live(src).close()
+    dest_dir = tmp_path / "backups"
+    backup_mod.create_backup(src, dest_dir, pause=0)
+    target = tmp_path / "target.db"
+    target.write_bytes(b"existing")
+    stale_wal = tmp_path / "target.db-wal"
+    stale_wal.write_bytes(b"stale wal")
+
+    with pytest.raises(backup_mod.BackupError, match="exists"):
+        backup_mod.restore(dest_dir, "latest", target)
+    assert target.read_bytes() == b"existing"
+
+    backup_mod.restore(dest_dir, "latest", target, force=True)
+    assert not stale_wal.exists()
+    assert _rows(target) == _rows(src)
+
+
+def test_restore_unknown_point_fails(tmp_path):
+    with pytest.raises(backup_mod.BackupError):
+        backup_mod.restore(tmp_path, "latest", tmp_path / "x.db")
+
+
+def test_restore_command_round_trip(tmp_path, monkeypatch, stamps):
+    src = tmp_path / "live.db"
+    _live(src).close()
+    monkeypatch.setenv("SKANNONSER_DB_PATH", str(src))
+    dest_dir = tmp_path / "backups"
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["db", "backup", "--dest-dir", str(dest_dir), "--incremental"])
+    assert result.exit_code == 0, result.output
+    assert "full:" in result.output and "integrity ok" in result.output
+
+    assert runner.invoke(app, ["db", "restore", "--dest-dir", str(dest_dir)]).exit_code == 1
+    target = tmp_path / "restored.db"
+    result = runner.invoke(app, ["db", "restore", "--dest-dir", str(dest_dir), "--to", str(target)])
+    assert result.exit_code == 0, result.output
+    assert _rows(target) == _rows(src)
@@ -0,0 +1,151 @@
+"""DbWriter: many producer threads, one writer connection, per-job results."""
+import sqlite3
+import threading
+
+import pytest
+
+from skannonser.store import connection, migrations
+from skannonser.store.repositories.listings import ListingsRepo
+from skannonser.store.repositories.processed import ProcessedRepo
+from skannonser.store.repositories.sold import SoldPricesRepo
+from skannonser.store.writer import DbWriter
+
+FKS = [str(1000 + i) for i in range(40)]
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "w.db"
+    conn = connection.connect(path)
+    migrations.migrate(conn)
+    conn.executemany("INSERT INTO eiendom (finnkode, url) VALUES (?, 'u')", [(fk,) for fk in FKS])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _count(db, table):
+    conn = connection.connect(db)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_producers_share_one_writer(db):
+    with DbWriter(db, max_delay=0.02) as writer:
+        futures = []
+        lock = threading.Lock()
+
+        def producer(chunk):
+            for fk in chunk:
+                f1 = writer.submit(lambda c, fk=fk: ProcessedRepo(c).upsert(fk, "Gate 1", "0150"))
+                f2 = writer.submit(
+                    lambda c, fk=fk: SoldPricesRepo(c).upsert([{"finnkode": fk, "sold_price": 1}])
+                )
+                with lock:
+                    futures.extend([f1, f2])
+
+        threads = [threading.Thread(target=producer, args=(FKS[i::4],)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        results = [f.result() for f in futures]
+
+    assert results.count({"inserted": 1, "updated": 0}) == len(FKS)
+    assert _count(db, "eiendom_processed") == len(FKS)
+    assert _count(db, "sold_prices") == len(FKS)
+    assert writer.stats["jobs"] == 2 * len(FKS)
+    assert writer.stats["batches"] < writer.stats["jobs"]  # coalesced
+
+
+def test_failing_job_rolls_back_alone(db):
+    def bad(conn):
+        ProcessedRepo(conn).upsert(FKS[1], "Kept", "0150")  # commits: survives
+        conn.execute("INSERT INTO annotations (finnkode, kommentar) VALUES (?, 'x')", (FKS[1],))
+        raise RuntimeError("boom")
+
+    with DbWriter(db, max_delay=0.2) as writer:
+        ok1 = writer.submit(lambda c: ProcessedRepo(c).upsert(FKS[0], "A", "0150"))
+        failed = writer.submit(bad)
+        ok2 = writer.submit(lambda c: ProcessedRepo(c).upsert(FKS[2], "B", "0150"))
+        ok1.result(), ok2.result()
+        with pytest.raises(RuntimeError, match="boom"):
+            failed.result()
+
+    assert writer.stats == {"batches": 1, "jobs": 3, "failed": 1}
+    assert _count(db, "eiendom_processed") == 3
+    assert _count(db, "annotations") == 0
+
+
+def test_repository_rollback_undoes_only_the_job(db):
+    with DbWriter(db) as writer:
+        writer.run(lambda c: ProcessedRepo(c).upsert(FKS[0], "A", "0150"))
+        with pytest.raises(sqlite3.Error):
+            # the second row can't be bound: SoldPricesRepo rolls back and re-raises
+            writer.run(lambda c: SoldPricesRepo(c).upsert(
+                [{"finnkode": FKS[0]}, {"finnkode": FKS[1], "sold_price": object()}]
+            ))
+    assert _count(db, "sold_prices") == 0
+    assert _count(db, "eiendom_processed") == 1
+
+
+def test_explicit_transaction_repo_runs_unchanged(db):
+    """ListingsRepo sets isolation_level and issues its own BEGIN IMMEDIATE;
+    both are absorbed into the batch."""
+    with DbWriter(db) as writer:
+        writer.run(lambda c: c.execute("UPDATE eiendom SET active = 1"))
+        writer.run(lambda c: ListingsRepo(c).replace_active_snapshot(FKS[:3]))
+        deactivated = writer.run(lambda c: ListingsRepo(c).mark_inactive(FKS[:5]))
+    assert deactivated == FKS[5:]
+    assert _count(db, "daily_listing_snapshot") == 3
+
+
+def test_job_connection_is_dead_after_the_job(db):
+    with DbWriter(db) as writer:
+        leaked = writer.run(lambda c: c)
+    with pytest.raises(sqlite3.ProgrammingError):
+        leaked.execute("SELECT 1")
+
+
+def test_submit_after_close_is_an_error(db):
+    writer = DbWriter(db)
+    writer.close()
+    writer.close()  # idempotent
+    with pytest.raises(RuntimeError):
+        writer.submit(lambda c: None)
+
+
+def test_writer_that_cannot_connect_fails_jobs_instead_of_hanging(tmp_path):
+    writer = DbWriter(tmp_path / "missing-dir" / "w.db")
+    writer._thread.join(timeout=5)
+    assert not writer._thread.is_alive()
+    assert isinstance(writer.failure, sqlite3.OperationalError)
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.submit(lambda c: None)
+    writer.close()  # still fine after the thread died
+
+
+def test_queued_jobs_fail_when_the_writer_dies(db):
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking(conn):
+        started.set()
+        release.wait(5)
+        raise SystemExit("writer job bailed out")  # not an Exception: kills the thread
+
+    writer = DbWriter(db, max_batch=1)
+    doomed = writer.submit(blocking)
+    assert started.wait(5)
+    queued = writer.submit(lambda c: ProcessedRepo(c).upsert(FKS[0], "A", "0150"))
+    release.set()
+    writer._thread.join(timeout=5)
+
+    for future in (doomed, queued):
+        with pytest.raises(SystemExit):
+            future.result(timeout=5)
+    with pytest.raises(RuntimeError):
+        writer.submit(lambda c: None)
+    assert _count(db, "eiendom_processed") == 0
@@ -185,6 +185,94 @@ def test_upsert_matches_by_dnb_id_when_url_lookup_misses(conn):
     assert rows[0]["url"] is None  # legacy UPDATE never sets url
 
 
+def _per_row_upsert(conn, rows):
+    """The pre-bulk per-row algorithm, kept as the oracle: url lookup, then
+    dnb_id lookup, then a single-row INSERT or UPDATE."""
+    repo = DnbRepo(conn)
+    counts = {"inserted": 0, "updated": 0}
+    conn.execute("BEGIN")
+    for row in rows:
+        d = repo._build_data(row)
+        if not d["url"] and not d["dnb_id"]:
+            continue
+        existing = None
+        if d["url"]:
+            existing = conn.execute("SELECT id FROM dnbeiendom WHERE url = ?", (d["url"],)).fetchone()
+        if existing is None and d["dnb_id"]:
+            existing = conn.execute(
+                "SELECT id FROM dnbeiendom WHERE dnb_id = ?", (d["dnb_id"],)
+            ).fetchone()
+        values = (
+            d["adresse"], d["postnummer"], d["pris"], d["lat"], d["lng"],
+            d["duplicate_of_finnkode"] or None, d["property_type"] or None,
+        )
+        if existing is not None:
+            conn.execute(
+                "UPDATE dnbeiendom SET dnb_id = COALESCE(?, dnb_id), adresse = ?, postnummer = ?, "
+                "pris = ?, lat = COALESCE(?, lat), lng = COALESCE(?, lng), "
+                "duplicate_of_finnkode = COALESCE(?, duplicate_of_finnkode), "
+                "property_type = COALESCE(?, property_type), active = 1 WHERE id = ?",
+                (d["dnb_id"] or None,) + values + (existing["id"],),
+            )
+            counts["updated"] += 1
+        else:
+            conn.execute(
+                "INSERT INTO dnbeiendom (dnb_id, url, adresse, postnummer, pris, lat, lng, "
+                "duplicate_of_finnkode, property_type) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (d["dnb_id"] or None, d["url"] or None) + values,
+            )
+            counts["inserted"] += 1
+    conn.commit()
+    return counts
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_bulk_upsert_matches_per_row_semantics(tmp_path, seed):
+    """Counts and every stored column (COALESCE vs overwrite, which row a
+    url/dnb_id resolves to, intra-batch repeats) match the per-row port."""
+    import random
+
+    rng = random.Random(seed)
+    conns = []
+    for name in ("bulk", "oracle"):
+        c = connection.connect(tmp_path / f"{name}.db")
+        migrations.migrate(c)
+        c.isolation_level = None
+        c.executemany(
+            "INSERT INTO eiendom (finnkode, url) VALUES (?, 'u')", [(str(k),) for k in range(1, 4)]
+        )
+        conns.append(c)
+    bulk, oracle = conns
+
+    def batch():
+        out = []
+        for _ in range(rng.randint(0, 30)):
+            url = rng.choice([None, ""] + [f"https://dnbeiendom.no/bolig/{k}" for k in range(8)])
+            out.append(_dnb_row(
+                url,
+                dnb_id=rng.choice(["", "", "D1", "D2", "D3", "D4"]),
+                StreetAddress=rng.choice(["A", "B", None]),
+                Price=rng.choice([None, 100, 200]),
+                Latitude=rng.choice([None, 59.9, 60.1]),
+                PropertyType=rng.choice(["", "Enebolig", "Leilighet"]),
+                duplicate_of_finnkode=rng.choice([None, "1", "2", "3"]),
+            ))
+        return out
+
+    for _ in range(5):
+        rows = batch()
+        assert DnbRepo(bulk).upsert(rows) == _per_row_upsert(oracle, rows)
+
+    def snapshot(c):
+        return [tuple(r) for r in c.execute(
+            "SELECT id, dnb_id, url, adresse, postnummer, pris, lat, lng, "
+            "duplicate_of_finnkode, property_type, active FROM dnbeiendom ORDER BY id"
+        )]
+
+    assert snapshot(bulk) == snapshot(oracle)
+    assert snapshot(bulk)  # the batches did write something
+
+
 def test_deactivate_missing_skips_null_url_rows(conn):
     # Legacy's ``if r[1] and ...`` guard: active rows with a NULL/empty url
     # are never deactivated (filter_and_load_dnbeiendom_no_buffer.py:124-127).
@@ -197,8 +285,7 @@ def test_deactivate_missing_skips_null_url_rows(conn):
     ).fetchone()["active"]
     assert active == 1
 
-    n = repo.deactivate_missing([])
-    assert n == 0
+    assert repo.deactivate_missing([]) == []
     active = conn.execute(
         "SELECT active FROM dnbeiendom WHERE dnb_id = 'X-1'"
     ).fetchone()["active"]
@@ -215,8 +302,9 @@ def test_deactivate_missing_never_deletes(conn):
     # Second appearance activates both under the live-schema quirk.
     repo.upsert(rows)
 
-    n = repo.deactivate_missing(["https://dnbeiendom.no/bolig/a"])
-    assert n == 1
+    assert repo.deactivate_missing(["https://dnbeiendom.no/bolig/a"]) == [
+        "https://dnbeiendom.no/bolig/b"
+    ]
 
     total = conn.execute("SELECT COUNT(*) FROM dnbeiendom").fetchone()[0]
     assert total == 2  # deactivated, not deleted
@@ -232,9 +320,18 @@ def test_deactivate_missing_empty_list_deactivates_all(conn):
     rows = [_dnb_row("https://dnbeiendom.no/bolig/a")]
     repo.upsert(rows)
     repo.upsert(rows)
-    n = repo.deactivate_missing([])
-    assert n == 1
+    assert repo.deactivate_missing([]) == ["https://dnbeiendom.no/bolig/a"]
     active_urls = {
         r["url"] for r in conn.execute("SELECT url FROM dnbeiendom WHERE active = 1")
     }
     assert active_urls == set()
+
+
+def test_deactivate_missing_normalizes_both_sides(conn):
+    repo = DnbRepo(conn)
+    rows = [_dnb_row("https://dnbeiendom.no/bolig/A/"), _dnb_row("https://dnbeiendom.no/bolig/b")]
+    repo.upsert(rows)
+    repo.upsert(rows)
+    assert repo.deactivate_missing([" HTTPS://dnbeiendom.no/bolig/a "]) == [
+        "https://dnbeiendom.no/bolig/b"
+    ]
@@ -6,9 +6,15 @@ number of meters due north, which is precise enough to place points reliably
 inside/outside a given radius without needing to reimplement haversine here.
 """
 
+import json
+import random
+from pathlib import Path
+
 import pytest
 
 from skannonser.enrich.donor import (
+    DonorCache,
+    DonorLinkIndex,
     add_row_as_donor_if_complete,
     assign_donors_prepass,
     build_donor_cache,
@@ -17,6 +23,8 @@ from skannonser.enrich.donor import (
     resolve_mvv_uni_donor_value,
 )
 
+FIXTURES = Path(__file__).parent / "fixtures" / "donor"
+
 OSLO_LAT = 59.9139
 OSLO_LNG = 10.7522
 MAX_MINUTES = 60
@@ -78,6 +86,64 @@ def test_find_nearby_donor_missing_coords_returns_none():
     assert find_nearby_donor(OSLO_LAT, None, cache, 300) is None
 
 
+# ---------------------------------------------------------------------------
+# DonorCache: the grid index must return exactly what the list scan returns
+# ---------------------------------------------------------------------------
+
+
+def _random_entries(rng, n, lat0, lng0, spread):
+    entries = []
+    for i in range(n):
+        lat = round(lat0 + rng.uniform(-spread, spread), 3)  # coarse: many exact ties
+        lng = round(lng0 + rng.uniform(-spread, spread), 3)
+        entries.append((lat, lng, f"fk{i % (n - 5)}"))  # a few duplicate finnkodes
+    return entries
+
+
+@pytest.mark.parametrize(
+    "lat0,lng0,spread",
+    [(OSLO_LAT, OSLO_LNG, 0.05), (70.9, 25.8, 0.05), (89.99, 0.0, 0.02), (0.0, 179.99, 0.02)],
+)
+def test_donor_cache_matches_linear_scan(lat0, lng0, spread):
+    rng = random.Random(f"{lat0}{lng0}")
+    entries = _random_entries(rng, 400, lat0, lng0, spread)
+    listed, indexed = list(entries), DonorCache(entries)
+
+    for step in range(600):
+        lat = lat0 + rng.uniform(-spread, spread)
+        lng = lng0 + rng.uniform(-spread, spread)
+        radius = rng.choice([50, 300, 300, 2000])
+        exclude = rng.choice([None, f"fk{rng.randrange(400)}"])
+        expected = find_nearby_donor(lat, lng, listed, radius, exclude_finnkode=exclude)
+        assert find_nearby_donor(lat, lng, indexed, radius, exclude_finnkode=exclude) == expected
+        if step % 3 == 0:  # evict and re-add like the pre-pass / run loop do
+            gone = f"fk{rng.randrange(400)}"
+            listed[:] = [c for c in listed if c[2] != gone]
+            indexed.discard(gone)
+            extra = (round(lat, 3), round(lng, 3), f"new{step}")
+            listed.append(extra)
+            indexed.append(extra)
+    assert indexed == listed
+
+
+def test_donor_cache_tie_goes_to_earliest_entry():
+    north = _offset_north(OSLO_LAT, 100)
+    cache = DonorCache([(north, OSLO_LNG, "FIRST"), (north, OSLO_LNG, "SECOND")])
+    assert find_nearby_donor(OSLO_LAT, OSLO_LNG, cache, 300) == "FIRST"
+    cache.discard("FIRST")
+    cache.append((north, OSLO_LNG, "FIRST"))
+    assert find_nearby_donor(OSLO_LAT, OSLO_LNG, cache, 300) == "SECOND"
+
+
+def test_donor_cache_membership_and_discard():
+    cache = DonorCache([(OSLO_LAT, OSLO_LNG, "A"), (OSLO_LAT, OSLO_LNG, "B")])
+    assert cache.has("A") and len(cache) == 2
+    cache.discard("A")
+    cache.discard("missing")
+    assert not cache.has("A")
+    assert cache == [(OSLO_LAT, OSLO_LNG, "B")]
+
+
 # ---------------------------------------------------------------------------
 # build_donor_cache
 # ---------------------------------------------------------------------------
@@ -220,6 +286,50 @@ def test_prepass_noop_when_all_cache_empty():
     assert row["donor_link"] is None
 
 
+
+def _recorded_prepass_scenarios():
+    # Recorded from the scan-every-row cascade before DonorLinkIndex replaced
+    # it: messy stored links (padded, dangling, empty), rows without
+    # finnkode/coords, sentinel and out-of-range values.
+    recorded = json.loads((FIXTURES / "prepass_cascade.json").read_text())
+    return [
+        pytest.param(recorded, scenario, id=f"seed{scenario['seed']}")
+        for scenario in recorded["scenarios"]
+    ]
+
+
+@pytest.mark.parametrize("recorded,scenario", _recorded_prepass_scenarios())
+def test_prepass_matches_recorded_links(recorded, scenario):
+    rows = scenario["rows"]
+    required, max_minutes = recorded["required_columns"], recorded["max_travel_minutes"]
+    caches = {
+        "brj": build_donor_cache(rows, required[:1], max_minutes),
+        "all": build_donor_cache(rows, required, max_minutes),
+    }
+    assign_donors_prepass(rows, caches, scenario["reuse_within_meters"])
+
+    assert [r["donor_link"] for r in rows] == scenario["expected_donor_links"]
+    assert [f for _, _, f in caches["all"]] == scenario["expected_all_cache"]
+    assert [f for _, _, f in caches["brj"]] == scenario["expected_brj_cache"]
+
+
+def test_link_index_tracks_cleaned_links():
+    a = _row("a", donor_link=" root ")
+    b = _row("b", donor_link="root")
+    c = _row("c", donor_link="   ")
+    links = DonorLinkIndex([a, b, c])
+    assert links.acceptors("root") == [a, b]
+    assert links.acceptors("") == []
+
+    links.redirect("root", "new", skip=b)
+    assert a["donor_link"] == "new" and b["donor_link"] == "root"
+    assert links.acceptors("root") == [b]
+    assert links.acceptors("new") == [a]
+
+    links.link(c, "new")
+    links.link(a, None)
+    assert links.acceptors("new") == [c]
+
 # ---------------------------------------------------------------------------
 # maybe_assign_donor
 # ---------------------------------------------------------------------------
@@ -1,9 +1,10 @@
 from datetime import datetime, timezone
+from pathlib import Path
 
 import pytest
 
-from skannonser.config.domain import Budget
-from skannonser.gateway import BudgetExceeded, Gateway
+from skannonser.config.domain import Budget, load_domain
+from skannonser.gateway import BudgetExceeded, Gateway, usage_drift
 from skannonser.store import connection, migrations
 
 CURRENT_MONTH = datetime.now(timezone.utc).strftime("%Y-%m")
@@ -160,3 +161,179 @@ def test_default_clock_is_utc_matching_sql_default(conn):
 
     from skannonser.gateway import _default_clock
     assert _default_clock() == sql_month
+
+
+def test_monthly_counters_match_the_ledger(conn):
+    seed_rows(conn, "routes", 3)
+    seed_rows(conn, "routes", 2, outcome="error")
+    seed_rows(conn, "geocode", 1, outcome="blocked", month="2025-01")
+    seed_rows(conn, "routes", 4, outcome="warn:50")  # ledger-only bookkeeping
+    conn.execute("DELETE FROM api_usage WHERE id = (SELECT MIN(id) FROM api_usage)")
+    conn.execute(
+        "UPDATE api_usage SET outcome = 'ok' WHERE id = "
+        "(SELECT MIN(id) FROM api_usage WHERE outcome = 'error')"
+    )
+    conn.commit()
+
+    assert usage_drift(conn) == []
+    counters = {
+        (r["api"], r["month"]): (r["ok"], r["error"], r["blocked"])
+        for r in conn.execute("SELECT * FROM api_usage_monthly")
+    }
+    assert counters == {("routes", CURRENT_MONTH): (3, 1, 0), ("geocode", "2025-01"): (0, 0, 1)}
+
+    conn.execute("UPDATE api_usage_monthly SET ok = 99 WHERE api = 'routes'")
+    assert usage_drift(conn) == [("routes", CURRENT_MONTH, 3, 1, 0), ("routes", CURRENT_MONTH, 99, 1, 0)]
+
+
+def test_rolled_back_ledger_row_is_not_counted(conn):
+    conn.execute("INSERT INTO api_usage (api, outcome) VALUES ('routes', 'ok')")
+    conn.rollback()
+    assert conn.execute("SELECT COUNT(*) FROM api_usage_monthly").fetchone()[0] == 0
+
+
+@pytest.mark.parametrize("ledger_batch", [1, 4])
+def test_batched_ledger_keeps_caps_and_warnings(conn, ledger_batch):
+    cap = 10
+    budget = make_budget(routes_monthly_cap=cap, warn_pcts=[50, 80], routes_rpm=6000)
+    notifications = []
+    gw = Gateway(
+        conn, budget, notify=notifications.append, sleeper=lambda s: None,
+        clock=fixed_clock, ledger_batch=ledger_batch,
+    )
+    seed_rows(conn, "routes", 3)
+
+    for _ in range(cap - 3):
+        gw.call("routes", lambda: "ok")
+    assert gw.month_usage("routes") == cap
+    with pytest.raises(BudgetExceeded):
+        gw.call("routes", lambda: "never")
+
+    # the blocked call flushed the buffer: ledger, counters and warnings agree
+    outcomes = [r[0] for r in conn.execute("SELECT outcome FROM api_usage ORDER BY id")]
+    assert outcomes.count("ok") == cap and outcomes[-1] == "blocked"
+    assert sorted(o for o in outcomes if o.startswith("warn:")) == ["warn:50", "warn:80"]
+    assert len(notifications) == 2
+    assert usage_drift(conn) == []
+
+
+def test_batched_ledger_writes_once_per_batch(conn):
+    budget = make_budget(routes_rpm=6000)
+    gw = Gateway(
+        conn, budget, notify=lambda m: None, sleeper=lambda s: None,
+        clock=fixed_clock, ledger_batch=3,
+    )
+    gw.call("routes", lambda: "ok")
+    gw.call("routes", lambda: "ok")
+    assert conn.execute("SELECT COUNT(*) FROM api_usage").fetchone()[0] == 0
+    assert gw.month_usage("routes") == 2  # buffered calls still count
+    gw.call("routes", lambda: "ok")
+    assert conn.execute("SELECT COUNT(*) FROM api_usage").fetchone()[0] == 3
+    gw.call("routes", lambda: "ok")
+    gw.flush()
+    assert conn.execute("SELECT COUNT(*) FROM api_usage").fetchone()[0] == 4
+    assert not conn.in_transaction
+
+
+def test_ledger_batch_must_be_positive(conn):
+    with pytest.raises(ValueError):
+        Gateway(conn, make_budget(), ledger_batch=0)
+
+
+def test_close_releases_the_limiter_connection(conn):
+    with Gateway(conn, make_budget(routes_rpm=6000), notify=lambda m: None,
+                 sleeper=lambda s: None, clock=fixed_clock) as gw:
+        limiter_conn = gw.limiter.conn
+        gw.call("routes", lambda: "ok")
+    with pytest.raises(Exception, match="closed"):
+        limiter_conn.execute("SELECT 1")
+    gw.close()  # idempotent
+
+
+def test_call_inside_an_open_write_transaction_does_not_deadlock(conn):
+    conn.execute("INSERT INTO eiendom (finnkode, url) VALUES ('1', 'u')")
+    conn.commit()
+    gw = Gateway(conn, make_budget(routes_rpm=6000), notify=lambda m: None,
+                 sleeper=lambda s: None, clock=fixed_clock)
+    gw.limiter.conn.execute("PRAGMA busy_timeout = 200")  # a wrong path fails fast
+
+    conn.execute("UPDATE eiendom SET adresse = 'x' WHERE finnkode = '1'")
+    assert conn.in_transaction
+    assert gw.call("routes", lambda: "ok") == "ok"
+
+    assert conn.execute("SELECT adresse FROM eiendom").fetchone()[0] == "x"
+    assert gw.limiter.conn.execute("SELECT COUNT(*) FROM rate_limit_bucket").fetchone()[0] == 1
+    gw.close()
+
+
+def test_draw_inside_a_transaction_is_committed_before_the_call(conn, tmp_path):
+    """With the shipped ledger_batch the ledger write no longer commits after
+    every call: the joined draw must still be committed before the paid
+    call, so other processes see the bucket and can take the write lock."""
+    batch = load_domain().budget.ledger_batch
+    assert batch > 1
+    gw = Gateway(conn, make_budget(routes_rpm=6000, ledger_batch=batch),
+                 notify=lambda m: None, sleeper=lambda s: None, clock=fixed_clock)
+    other = connection.connect(Path(conn.execute("PRAGMA database_list").fetchone()[2]))
+    other.execute("PRAGMA busy_timeout = 0")
+
+    def paid_call():
+        other.execute("BEGIN IMMEDIATE")  # the write lock is free mid-call
+        other.rollback()
+        return "ok"
+
+    for _ in range(2):
+        conn.execute("INSERT OR IGNORE INTO eiendom (finnkode, url) VALUES ('1', 'u')")
+        assert conn.in_transaction
+        assert gw.call("routes", paid_call) == "ok"
+        assert not conn.in_transaction
+    assert other.execute("SELECT COUNT(*) FROM rate_limit_bucket").fetchone()[0] == 1
+    assert other.execute("SELECT COUNT(*) FROM eiendom").fetchone()[0] == 1
+    assert gw.month_usage("routes") == 2
+    other.close()
+    gw.close()
+
+
+def test_in_memory_db_gets_a_private_bucket():
+    import sqlite3
+
+    mem = sqlite3.connect(":memory:")
+    mem.row_factory = sqlite3.Row
+    migrations.migrate(mem)
+    sleeps = []
+    gw = Gateway(mem, make_budget(routes_rpm=60), notify=lambda m: None,
+                 sleeper=sleeps.append, clock=fixed_clock)
+    assert gw.limiter.conn is not mem
+
+    mem.execute("INSERT INTO eiendom (finnkode, url) VALUES ('1', 'u')")
+    with pytest.raises(ValueError):
+        gw.limiter.reserve("routes", 0, 1)  # a failed draw never rolls back the caller
+    assert mem.in_transaction
+    gw.call("routes", lambda: None)
+    gw.call("routes", lambda: None)
+    assert len(sleeps) == 1  # still rate limited
+    assert mem.execute("SELECT COUNT(*) FROM rate_limit_bucket").fetchone()[0] == 0
+    gw.close()
+
+
+def test_ledger_batch_defaults_to_the_budget_and_close_flushes(conn):
+    budget = make_budget(routes_rpm=6000, ledger_batch=5)
+    with pytest.raises(RuntimeError):
+        with Gateway(conn, budget, notify=lambda m: None, sleeper=lambda s: None,
+                     clock=fixed_clock) as gw:
+            assert gw.ledger_batch == 5
+            gw.call("routes", lambda: "ok")
+            gw.call("routes", lambda: "ok")
+            assert conn.execute("SELECT COUNT(*) FROM api_usage").fetchone()[0] == 0
+            raise RuntimeError("enrich crashed mid-run")
+    # leaving the block -- even on an error -- wrote the buffered rows
+    assert conn.execute("SELECT COUNT(*) FROM api_usage").fetchone()[0] == 2
+    assert usage_drift(conn) == []
+
+
+def test_configured_ledger_batch_is_loaded():
+    from skannonser.config.domain import load_domain
+
+    assert load_domain().budget.ledger_batch > 1
+    with pytest.raises(ValueError):
+        make_budget(ledger_batch=0)
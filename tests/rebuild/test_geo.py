@@ -1,5 +1,16 @@
+import math
+import random
+
+import numpy as np
+
 from skannonser.config.domain import load_domain
-from skannonser.geo import is_point_in_polygon
+from skannonser.geo import (
+    haversine_array,
+    haversine_meters,
+    is_point_in_polygon,
+    pairs_within_radius,
+    points_in_polygon,
+)
 from skannonser.textnorm import normalize_addr, normalize_pc
 
 
@@ -38,3 +49,62 @@ def test_normalizers_match_legacy():
     ]
     for raw, expected in pc_pairs:
         assert normalize_pc(raw) == expected
+
+
+def _scatter(seed, n, lat0=59.9139, lng0=10.7522, spread=0.05):
+    rng = random.Random(seed)
+    return (
+        [lat0 + rng.uniform(-spread, spread) for _ in range(n)],
+        [lng0 + rng.uniform(-2 * spread, 2 * spread) for _ in range(n)],
+    )
+
+
+def test_haversine_array_matches_scalar():
+    lats, lngs = _scatter(1, 500, spread=5.0)
+    one_vs_many = haversine_array(lats[0], lngs[0], lats, lngs)
+    pairwise = haversine_array(lats[:-1], lngs[:-1], lats[1:], lngs[1:])
+    for k in range(500):
+        expected = haversine_meters(lats[0], lngs[0], lats[k], lngs[k])
+        assert math.isclose(one_vs_many[k], expected, abs_tol=1e-6)
+    for k in range(499):
+        expected = haversine_meters(lats[k], lngs[k], lats[k + 1], lngs[k + 1])
+        assert math.isclose(pairwise[k], expected, abs_tol=1e-6)
+
+
+def test_pairs_within_radius_matches_brute_force():
+    for lat0, spread in ((59.9139, 0.02), (70.9, 0.02), (89.999, 0.001)):
+        lats, lngs = _scatter(int(lat0), 400, lat0=lat0, spread=spread)
+        lats[5] = float("nan")
+        lats[7], lngs[7] = lats[8], lngs[8]  # a zero-distance pair
+        i, j, meters = pairs_within_radius(lats, lngs, 300.0)
+        expected = [
+            (a, b)
+            for a in range(400)
+            for b in range(a + 1, 400)
+            if haversine_meters(lats[a], lngs[a], lats[b], lngs[b]) <= 300.0
+        ]
+        assert list(zip(i.tolist(), j.tolist())) == expected
+        assert (7, 8) in expected
+        assert np.all(meters <= 300.0)
+
+
+def test_pairs_within_radius_degenerate_inputs():
+    assert len(pairs_within_radius([], [], 300.0)[0]) == 0
+    assert len(pairs_within_radius([59.9], [10.7], 300.0)[0]) == 0
+    i, j, meters = pairs_within_radius([59.9, 59.9], [10.7, 10.7], 0.0)
+    assert i.tolist() == [0] and j.tolist() == [1] and meters.tolist() == [0.0]
+
+
+def test_points_in_polygon_matches_scalar():
+    polygon = load_domain().polygon_points
+    lats, lngs = _scatter(3, 5000, spread=0.6)
+    # polygon vertices and edge midpoints: the ray cast's boundary cases
+    for (x1, y1), (x2, y2) in zip(polygon, polygon[1:]):
+        lats += [y1, (y1 + y2) / 2]
+        lngs += [x1, (x1 + x2) / 2]
+    lats.append(float("nan"))
+    lngs.append(10.75)
+    inside = points_in_polygon(lats, lngs, polygon)
+    assert inside.tolist() == [is_point_in_polygon(a, b, polygon) for a, b in zip(lats, lngs)]
+    assert inside.any() and not inside.all()
+    assert not points_in_polygon([59.9], [10.75], polygon[:2]).any()
@@ -0,0 +1,117 @@
+"""tools extract-history: snapshot archive -> listing_history, incrementally."""
+from pathlib import Path
+
+import pytest
+
+from skannonser.ingest.finn.history import changes, extract_history
+from skannonser.ingest.finn.html_cache import html_sha256
+from skannonser.ingest.finn.snapshot_archive import SnapshotArchive
+from skannonser.store import connection, migrations
+
+FIXTURES = Path(__file__).parent / "fixtures" / "finn"
+FK = "211471492"
+PAGE = (FIXTURES / f"{FK}.html").read_text(encoding="utf-8")
+
+
+def _priced(kr: str) -> str:
+    return PAGE.replace("3\xa0275\xa0000 kr", f"{kr} kr")
+
+
+@pytest.fixture()
+def conn(tmp_path):
+    c = connection.connect(tmp_path / "t.db")
+    migrations.migrate(c)
+    return c
+
+
+@pytest.fixture()
+def archive(tmp_path):
+    return SnapshotArchive(tmp_path / "eiendom" / "html_snapshots")
+
+
+def _add(archive, day, html, uid=FK):
+    archive.add(uid, day, html, html_sha256(html))
+
+
+def _pris(conn):
+    return [
+        tuple(r) for r in conn.execute(
+            "SELECT snapshot_day, value FROM listing_history "
+            "WHERE finnkode = ? AND field = 'pris' ORDER BY snapshot_day", (FK,)
+        )
+    ]
+
+
+def test_changes_records_first_values_and_differences_only():
+    states = [
+        ("20260701", {"pris": 100, "status": None}),
+        ("20260702", {"pris": 100, "status": None}),
+        ("20260703", {"pris": 90, "status": "Solgt"}),
+        ("20260704", {"pris": None, "status": "Solgt"}),
+    ]
+    assert changes({}, states) == [
+        ("2026-07-01", "pris", 100),
+        ("2026-07-03", "pris", 90),
+        ("2026-07-03", "status", "Solgt"),
+        ("2026-07-04", "pris", None),
+    ]
+    assert changes({"pris": 90, "status": "Solgt"}, states[3:]) == [("2026-07-04", "pris", None)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_extracts_price_changes(conn, tmp_path, archive, workers):
+    _add(archive, "20260701", PAGE)
+    _add(archive, "20260702", _priced("3\xa0275\xa0000"))  # identical values
+    _add(archive, "20260710", _priced("3\xa0150\xa0000"))
+    _add(archive, "20260803", _priced("2\xa0990\xa0000"))
+    _add(archive, "20260801", PAGE, uid="999")
+
+    stats = extract_history(conn, tmp_path / "eiendom", workers=workers)
+    assert (stats["listings"], stats["processed"], stats["snapshots"]) == (2, 2, 5)
+    assert stats["failed_snapshots"] == stats["failed_listings"] == 0
+    assert _pris(conn) == [
+        ("2026-07-01", 3275000), ("2026-07-10", 3150000), ("2026-08-03", 2990000),
+    ]
+
+
+def test_second_run_only_parses_new_snapshots(conn, tmp_path, archive):
+    _add(archive, "20260701", PAGE)
+    extract_history(conn, tmp_path / "eiendom")
+    again = extract_history(conn, tmp_path / "eiendom")
+    assert (again["up_to_date"], again["snapshots"], again["rows"]) == (1, 0, 0)
+
+    _add(archive, "20260705", _priced("3\xa0000\xa0000"))
+    stats = extract_history(conn, tmp_path / "eiendom")
+    assert (stats["processed"], stats["snapshots"], stats["rebuilt"]) == (1, 1, 0)
+    assert _pris(conn) == [("2026-07-01", 3275000), ("2026-07-05", 3000000)]
+
+
+def test_out_of_order_snapshot_rebuilds_the_listing(conn, tmp_path, archive):
+    _add(archive, "20260701", PAGE)
+    _add(archive, "20260710", _priced("3\xa0000\xa0000"))
+    extract_history(conn, tmp_path / "eiendom")
+
+    _add(archive, "20260705", _priced("3\xa0100\xa0000"))  # older than the last one seen
+    stats = extract_history(conn, tmp_path / "eiendom")
+    assert (stats["rebuilt"], stats["snapshots"]) == (1, 3)
+    assert _pris(conn) == [
+        ("2026-07-01", 3275000), ("2026-07-05", 3100000), ("2026-07-10", 3000000),
+    ]
+
+
+def test_unparseable_snapshot_is_counted_not_fatal(conn, tmp_path, archive, monkeypatch):
+    from skannonser.ingest.finn import history as history_mod
+
+    real = history_mod.snapshot_fields
+
+    def flaky(html, finnkode):
+        if "BROKEN" in html:
+            raise ValueError("bad page")
+        return real(html, finnkode)
+
+    monkeypatch.setattr(history_mod, "snapshot_fields", flaky)
+    _add(archive, "20260701", PAGE)
+    _add(archive, "20260702", PAGE + "BROKEN")
+    stats = extract_history(conn, tmp_path / "eiendom")
+    assert (stats["snapshots"], stats["failed_snapshots"]) == (1, 1)
+    assert _pris(conn) == [("2026-07-01", 3275000)]
@@ -14,6 +14,7 @@ import pytest
 
 from skannonser.ingest.finn import html_cache
 from skannonser.ingest.finn.html_cache import load_or_fetch, save_ad_html
+from skannonser.ingest.finn.snapshot_archive import SnapshotArchive
 
 
 def _fail_if_called(*a, **k):
@@ -21,24 +22,28 @@ def _fail_if_called(*a, **k):
 
 
 def canonical_path(project, uid):
+    """The legacy plain layout -- how these tests seed a prior canonical."""
     return project / "html_extracted" / f"{uid}.html"
 
 
-def snapshot_path(project, uid, day):
-    return project / "html_snapshots" / f"{uid}.{day}.html.gz"
+def cached(project, uid):
+    return html_cache.read_cached(project, uid)
+
+
+def snapshot(project, uid, day):
+    return SnapshotArchive(project / "html_snapshots").read(uid, day)
 
 
 def test_writes_canonical_file_with_exact_content(tmp_path):
     save_ad_html(tmp_path, "111", "<html>hello</html>", today="20260709")
-    assert canonical_path(tmp_path, "111").read_text(encoding="utf-8") == "<html>hello</html>"
+    assert cached(tmp_path, "111") == "<html>hello</html>"
 
 
 def test_new_uid_creates_baseline_snapshot(tmp_path):
     save_ad_html(tmp_path, "222", "<html>A</html>", today="20260709")
-    snap = snapshot_path(tmp_path, "222", "20260709")
-    assert snap.exists(), "expected a baseline snapshot for a brand-new uid"
-    with gzip.open(snap, "rt", encoding="utf-8") as fh:
-        assert fh.read() == "<html>A</html>"
+    assert snapshot(tmp_path, "222", "20260709") == "<html>A</html>", (
+        "expected a baseline snapshot for a brand-new uid"
+    )
 
 
 def test_unchanged_resave_creates_no_snapshot(tmp_path):
@@ -49,7 +54,7 @@ def test_unchanged_resave_creates_no_snapshot(tmp_path):
 
     save_ad_html(tmp_path, "333", "<html>same</html>", today="20260709")
 
-    assert not snapshot_path(tmp_path, "333", "20260709").exists(), (
+    assert snapshot(tmp_path, "333", "20260709") is None, (
         "unchanged content must not produce a snapshot"
     )
 
@@ -62,12 +67,9 @@ def test_changed_resave_creates_dated_snapshot_of_new_content(tmp_path):
     save_ad_html(tmp_path, "444", "<html>new</html>", today="20260709")
 
     # canonical updated
-    assert canonical.read_text(encoding="utf-8") == "<html>new</html>"
+    assert cached(tmp_path, "444") == "<html>new</html>"
     # snapshot holds the NEW content, dated today
-    snap = snapshot_path(tmp_path, "444", "20260709")
-    assert snap.exists()
-    with gzip.open(snap, "rt", encoding="utf-8") as fh:
-        assert fh.read() == "<html>new</html>"
+    assert snapshot(tmp_path, "444", "20260709") == "<html>new</html>"
 
 
 def test_failed_write_preserves_existing_canonical(tmp_path):
@@ -109,10 +111,10 @@ def test_load_or_fetch_fetches_and_caches_on_miss(tmp_path):
 
     assert calls == ["https://x/99"]
     assert "fresh" in html
-    assert canonical_path(tmp_path, "99").exists()
+    assert html_cache.is_cached(tmp_path, "99")
     # Second call is served from cache -- fetch must not be called again.
     html2 = load_or_fetch("https://x/99", tmp_path, "99", fetch=_fail_if_called, fetch_delay=lambda: None)
-    assert html2 == canonical_path(tmp_path, "99").read_text(encoding="utf-8")
+    assert html2 == cached(tmp_path, "99") == html
 
 
 def _fake_fetch_ok(url):
@@ -184,9 +186,59 @@ def test_force_refetches_even_when_cached(tmp_path):
 
     assert calls == ["https://x/42"], "force=True must bypass the cache-read and always fetch"
     assert "new" in html
-    assert canonical_path(proj, "42").read_text(encoding="utf-8") == html
+    assert cached(proj, "42") == html
 
     # Content changed relative to the pre-existing canonical -> a dated
     # snapshot must be created (save_ad_html's normal change-detection).
     today = datetime.now().strftime("%Y%m%d")
-    assert snapshot_path(proj, "42", today).exists()
+    assert snapshot(proj, "42", today) == html
+
+
+# --- Compressed, hashed canonical layout ------------------------------------
+
+
+def test_canonical_is_compressed_with_hash_sidecar(tmp_path):
+    html = "<html>" + "x" * 5000 + "</html>"
+    body = save_ad_html(tmp_path, "1", html, today="20260709")
+    assert body == tmp_path / "html_extracted" / "1.html.gz"
+    assert gzip.decompress(body.read_bytes()).decode() == html
+    assert body.stat().st_size < len(html) / 10
+    assert html_cache.stored_sha256(tmp_path, "1") == html_cache.html_sha256(html)
+    assert not canonical_path(tmp_path, "1").exists()
+
+
+def test_change_detection_reads_only_the_sidecar(tmp_path, monkeypatch):
+    save_ad_html(tmp_path, "2", "<html>same</html>", today="20260708")
+    monkeypatch.setattr(html_cache, "read_path", _fail_if_called)
+    save_ad_html(tmp_path, "2", "<html>same</html>", today="20260709")
+    assert snapshot(tmp_path, "2", "20260709") is None
+
+
+def test_save_upgrades_a_legacy_entry_in_place(tmp_path):
+    canonical = canonical_path(tmp_path, "3")
+    canonical.parent.mkdir(parents=True)
+    canonical.write_text("<html>same</html>", encoding="utf-8")
+    save_ad_html(tmp_path, "3", "<html>same</html>", today="20260709")
+    assert not canonical.exists()
+    assert html_cache.stored_sha256(tmp_path, "3") is not None
+    assert cached(tmp_path, "3") == "<html>same</html>"
+
+
+def test_compact_cache_converts_legacy_files(tmp_path):
+    base = tmp_path / "html_extracted"
+    base.mkdir()
+    pages = {str(uid): f"<html>{'ad ' * 300}{uid}</html>" for uid in (10, 11, 12)}
+    for uid, html in pages.items():
+        (base / f"{uid}.html").write_text(html, encoding="utf-8")
+
+    stats = html_cache.compact_cache(tmp_path)
+    assert stats["converted"] == 3
+    assert stats["bytes_after"] < stats["bytes_before"]
+    assert sorted(p.name for p in base.iterdir()) == [
+        f"{uid}.{ext}" for uid in pages for ext in ("html.gz", "sha256")
+    ]
+    for uid, html in pages.items():
+        assert cached(tmp_path, uid) == html
+        assert html_cache.stored_sha256(tmp_path, uid) == html_cache.html_sha256(html)
+    assert not (tmp_path / "html_snapshots").exists()
+    assert html_cache.compact_cache(tmp_path)["converted"] == 0  # idempotent
@@ -0,0 +1,93 @@
+"""Configurable HTML parser backend + the golden-equivalence harness that
+guards switching it."""
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from skannonser import htmlsoup
+from skannonser.cli import app
+from skannonser.config import settings
+from skannonser.ingest.finn.equivalence import ad_files, compare_ad, compare_corpus
+
+FIXTURES = Path(__file__).parent / "fixtures" / "finn"
+
+
+@pytest.fixture()
+def fresh_settings():
+    settings.get_secrets.cache_clear()
+    yield
+    settings.get_secrets.cache_clear()
+
+
+def test_default_backend_is_the_reference(fresh_settings, monkeypatch):
+    monkeypatch.delenv("SKANNONSER_HTML_PARSER", raising=False)
+    assert htmlsoup.backend() == htmlsoup.REFERENCE == "html.parser"
+
+
+def test_backend_comes_from_settings(fresh_settings, monkeypatch):
+    monkeypatch.setenv("SKANNONSER_HTML_PARSER", "lxml")
+    assert htmlsoup.backend() == "lxml"
+
+
+def test_unknown_backend_is_rejected(fresh_settings, monkeypatch):
+    monkeypatch.setenv("SKANNONSER_HTML_PARSER", "regex")
+    with pytest.raises(ValueError, match="regex"):
+        htmlsoup.make_soup("<p></p>")
+
+
+def test_using_switches_and_restores():
+    before = htmlsoup.backend()
+    with htmlsoup.using("lxml"):
+        assert htmlsoup.backend() == "lxml"
+    assert htmlsoup.backend() == before
+
+
+def test_reference_against_itself_is_identical():
+    report = compare_corpus(ad_files(FIXTURES), htmlsoup.REFERENCE)
+    assert report.ads == len(list(ad_files(FIXTURES))) > 0
+    assert report.identical
+
+
+def test_harness_reports_field_level_differences(monkeypatch):
+    """A 'backend' that loses every <script> must surface as per-field diffs
+    in the payload-derived rows, never as a pass."""
+    real = htmlsoup.BeautifulSoup
+
+    def lossy(markup, builder):
+        if builder != "lossy":
+            return real(markup, builder)
+        soup = real(markup, "html.parser")
+        for script in soup.find_all("script"):
+            script.decompose()
+        return soup
+
+    monkeypatch.setattr(htmlsoup, "BACKENDS", htmlsoup.BACKENDS + ("lossy",))
+    monkeypatch.setattr(htmlsoup, "BeautifulSoup", lossy)
+    html = (FIXTURES / "448347467.html").read_text(encoding="utf-8")
+    seconds = {}
+    diffs = compare_ad(html, "448347467", "lossy", seconds)
+    assert diffs
+    assert {d.extractor for d in diffs} >= {"details", "salgsoppgave"}
+    assert all(d.reference != d.candidate for d in diffs)
+    assert set(seconds) == {"html.parser", "lossy"}
+
+
+def test_lxml_matches_the_golden_reference():
+    pytest.importorskip("lxml")
+    report = compare_corpus(ad_files(FIXTURES), "lxml")
+    assert report.identical, report.diffs[:10]
+
+
+def test_cli_exit_status_tracks_equivalence(tmp_path):
+    ok = CliRunner().invoke(app, [
+        "tools", "parser-equivalence", "--backend", "html.parser",
+        "--fixtures", str(FIXTURES), "--project-dir", str(tmp_path),
+    ])
+    assert ok.exit_code == 0, ok.output
+    assert "0 differing" in ok.output
+    bad = CliRunner().invoke(app, [
+        "tools", "parser-equivalence", "--backend", "regex",
+        "--fixtures", str(FIXTURES), "--project-dir", str(tmp_path),
+    ])
+    assert bad.exit_code == 1
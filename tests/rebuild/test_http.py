@@ -3,10 +3,24 @@ browser User-Agent fetch used on the FINN/DNB scraping paths, and the
 jittered inter-request delay factory used to pace crawls.
 """
 
+import gzip
+import inspect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 
 from skannonser import http as http_mod
-from skannonser.http import BROWSER_USER_AGENT, browser_get, jittered_delay
+from skannonser import nightly, pipeline
+from skannonser.enrich import sold, thumbs
+from skannonser.http import (
+    BROWSER_USER_AGENT,
+    PooledTransport,
+    browser_get,
+    jittered_delay,
+    pooled_get,
+)
+from skannonser.ingest.finn import crawl, html_cache, refresh
 
 
 def test_browser_user_agent_is_a_real_browser_string():
@@ -100,3 +114,96 @@ def test_jittered_delay_draws_from_the_configured_bounds():
 def test_jittered_delay_rejects_inverted_bounds():
     with pytest.raises(ValueError):
         jittered_delay(5.0, 1.0)
+
+
+# --- Pooled keep-alive transport, against a local stub server ---------------
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        server = self.server
+        server.peers.add(self.client_address)
+        server.seen.append(dict(self.headers))
+        body = b"<html>" + b"x" * 2000 + b"</html>"
+        extra = {}
+        if self.path == "/gz":
+            body, extra = gzip.compress(body), {"Content-Encoding": "gzip"}
+        self.send_response(200)
+        for name, value in {**extra, "Set-Cookie": "sid=1; Path=/"}.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.peers, server.seen = set(), []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pooled_transport_reuses_one_connection(stub):
+    server, base = stub
+    transport = PooledTransport()
+    for _ in range(5):
+        assert transport.get(f"{base}/ad").status_code == 200
+    assert len(server.peers) == 1  # one TCP connection for all five requests
+    assert transport.stats() == {"127.0.0.1": {"requests": 5, "connections": 1, "reused": 4}}
+    transport.close()
+
+
+def test_pooled_transport_decodes_gzip_and_keeps_no_cookies(stub):
+    server, base = stub
+    transport = PooledTransport()
+    first = transport.get(f"{base}/gz")
+    assert first.text.startswith("<html>xx")
+    assert "gzip" in server.seen[0]["Accept-Encoding"]
+    transport.get(f"{base}/ad")
+    assert "Cookie" not in server.seen[1]  # stateless, like a bare requests.get
+    transport.close()
+
+
+def test_browser_get_defaults_to_the_shared_pooled_transport(stub, monkeypatch):
+    server, base = stub
+    monkeypatch.setattr(http_mod, "_default", PooledTransport())
+    browser_get(f"{base}/a")
+    browser_get(f"{base}/b")
+    assert [h["User-Agent"] for h in server.seen] == [BROWSER_USER_AGENT] * 2
+    assert http_mod.default_transport().stats()["127.0.0.1"]["reused"] == 1
+
+
+@pytest.mark.parametrize(
+    "fn",
+    [
+        crawl.crawl,
+        html_cache.load_or_fetch,
+        pipeline.run_finn_ingest,
+        refresh.refresh_listings,
+        sold.fetch_sold_cards,
+        sold.run_sold_sweep,
+        sold.run_sold_backlog,
+        sold.run_sold_enrich,
+        thumbs.cache_thumbnails,
+        nightly.run_nightly,
+    ],
+)
+def test_every_scraping_fetch_defaults_to_the_pooled_transport(fn):
+    assert inspect.signature(fn).parameters["fetch"].default in (browser_get, pooled_get)
+
+
+def test_load_or_fetch_default_uses_the_shared_session(stub, monkeypatch, tmp_path):
+    server, base = stub
+    monkeypatch.setattr(http_mod, "_default", PooledTransport())
+    for uid in ("1", "2"):
+        html_cache.load_or_fetch(f"{base}/ad/{uid}", tmp_path, uid, fetch_delay=lambda: None)
+    assert [h["User-Agent"] for h in server.seen] == [BROWSER_USER_AGENT] * 2
+    assert len(server.peers) == 1
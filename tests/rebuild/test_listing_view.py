@@ -0,0 +1,248 @@
+"""listing_view (migration 023): the materialized Eie/Sold/API rows.
+
+The direct fragment-built joins (`rows._EIE_SQL`, `export._SOLD_SQL`,
+`api._SOLD_API_SQL`) are the oracle: after any sequence of writes to any
+source table, refreshed or not, the view-backed readers must return exactly
+what they return.
+"""
+import random
+from collections import Counter
+
+import pytest
+from typer.testing import CliRunner
+
+from skannonser.cli import app
+from skannonser.publish import export, rows
+from skannonser.publish.rows import _rows_from_cursor, _sheet_filters
+from skannonser.store import connection, migrations
+from skannonser.store.repositories.listing_view import ListingViewRepo
+from skannonser.web import api
+
+FKS = [str(100 + i) for i in range(12)]
+STATUSES = ["Til salgs", "Solgt", " solgt ", "Inaktiv", None, "Reservert"]
+
+
+@pytest.fixture()
+def conn(tmp_path):
+    c = connection.connect(tmp_path / "v.db")
+    migrations.migrate(c)
+    return c
+
+
+def _oracle(conn, sql):
+    return _rows_from_cursor(conn.execute(sql, _sheet_filters()))
+
+
+def _assert_matches_oracle(conn):
+    assert ListingViewRepo(conn).drift() == []
+    assert rows.listing_rows(conn) == _oracle(conn, rows._EIE_SQL)
+    assert Counter(r[0] for r in conn.execute(api._BOLIGTYPE_VIEW_SQL, _sheet_filters())) == (
+        Counter(r["Boligtype"] for r in _oracle(conn, rows._EIE_SQL))
+    )
+    assert api._sold_records(conn) == rows._add_hidden_fields(_oracle(conn, api._SOLD_API_SQL))
+    header, sold = export.sold_rows(conn)
+    expected = [
+        [export._norm_base_cell(h, rec.get(h)) for h in header]
+        for rec in _oracle(conn, export._SOLD_SQL)
+    ]
+    assert sold == expected
+
+
+def _random_write(conn, rng):
+    fk = rng.choice(FKS)
+    table = rng.choice(["eiendom", "processed", "details", "tilstand", "annotations", "sold"])
+    if table == "eiendom":
+        conn.execute(
+            "INSERT INTO eiendom (finnkode, url, tilgjengelighet, active, pris, "
+            "info_usable_i_area, scraped_at, info_property_type) VALUES (?, 'u', ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(finnkode) DO UPDATE SET tilgjengelighet = excluded.tilgjengelighet, "
+            "active = excluded.active, pris = excluded.pris, "
+            "info_usable_i_area = excluded.info_usable_i_area, scraped_at = excluded.scraped_at, "
+            "info_property_type = excluded.info_property_type",
+            (fk, rng.choice(STATUSES), rng.randint(0, 1), rng.choice([None, 3_000_000, 9_000_000]),
+             rng.choice([60, 90]), f"2026-0{rng.randint(1, 9)}-01 00:00:00",
+             rng.choice([None, "Leilighet", "Enebolig"])),
+        )
+    elif table == "processed":
+        if rng.random() < 0.2:
+            conn.execute("DELETE FROM eiendom_processed WHERE finnkode = ?", (fk,))
+        else:
+            conn.execute(
+                "INSERT INTO eiendom_processed (finnkode, lat, lng, pendl_rush_brj, "
+                "travel_copy_from_finnkode) VALUES (?, 59.9, 10.7, ?, ?) "
+                "ON CONFLICT(finnkode) DO UPDATE SET pendl_rush_brj = excluded.pendl_rush_brj, "
+                "travel_copy_from_finnkode = excluded.travel_copy_from_finnkode",
+                (fk, rng.choice([None, 20, 45]), rng.choice([None, "", *FKS[:4]])),
+            )
+    elif table == "details":
+        conn.execute(
+            "INSERT OR REPLACE INTO listing_details (finnkode, bedrooms) VALUES (?, ?)",
+            (fk, rng.randint(1, 5)),
+        )
+    elif table == "tilstand":
+        conn.execute(
+            "INSERT OR REPLACE INTO listing_tilstand (finnkode, tg2_count, tg3_count, "
+            "classified_at) VALUES (?, ?, 0, 'now')",
+            (fk, rng.randint(0, 4)),
+        )
+    elif table == "annotations":
+        if rng.random() < 0.3:
+            conn.execute("DELETE FROM annotations WHERE finnkode = ?", (fk,))
+        else:
+            conn.execute(
+                "INSERT INTO annotations (finnkode, kommentar) VALUES (?, ?) "
+                "ON CONFLICT(finnkode) DO UPDATE SET kommentar = excluded.kommentar",
+                (fk, rng.choice(["fin", "nei"])),
+            )
+    else:
+        conn.execute(
+            "INSERT OR REPLACE INTO sold_prices (finnkode, sold_price) VALUES (?, ?)",
+            (fk, rng.randint(2, 5) * 1_000_000),
+        )
+    conn.commit()
+
+
+def test_random_writes_keep_the_view_equal_to_the_oracle(conn):
+    rng = random.Random(23)
+    for fk in FKS:  # eiendom_processed.finnkode references eiendom
+        conn.execute("INSERT INTO eiendom (finnkode, url) VALUES (?, 'u')", (fk,))
+    conn.commit()
+    seen_eie = seen_sold = 0
+    for step in range(300):
+        _random_write(conn, rng)
+        if step % 10 == 0:
+            _assert_matches_oracle(conn)
+            seen_eie += bool(rows.listing_rows(conn))
+            seen_sold += bool(api._sold_records(conn))
+        if step % 25 == 0:
+            ListingViewRepo(conn).refresh()
+            assert ListingViewRepo(conn).pending() == 0
+            _assert_matches_oracle(conn)
+    _assert_matches_oracle(conn)
+    assert seen_eie and seen_sold  # both visibility branches were exercised
+
+
+def test_scraped_at_ties_keep_the_oracle_order(conn):
+    """A batch insert shares one CURRENT_TIMESTAMP; rows tied on SCRAPED_AT,
+    split across the clean table and the dirty join, come out in id order
+    exactly as the direct queries return them."""
+    for i in range(40):
+        conn.execute(
+            "INSERT INTO eiendom (finnkode, url, tilgjengelighet, active, pris, "
+            "info_usable_i_area, scraped_at) VALUES (?, 'u', ?, ?, 3000000, 90, "
+            "'2026-05-01 00:00:00')",
+            (str(1000 + i), "Til salgs" if i % 4 else "Solgt", int(i % 4 != 0)),
+        )
+    conn.commit()
+    ListingViewRepo(conn).refresh()
+    for i in range(0, 40, 3):
+        conn.execute(
+            "UPDATE eiendom SET pris = pris + 1 WHERE finnkode = ?", (str(1000 + i),)
+        )
+    conn.commit()
+    assert 0 < ListingViewRepo(conn).pending() < 40
+    _assert_matches_oracle(conn)
+    assert [r["Finnkode"] for r in rows.listing_rows(conn)] == [
+        str(1000 + i) for i in range(40) if i % 4
+    ]
+    assert [r["Finnkode"] for r in api._sold_records(conn)] == [
+        str(1000 + i) for i in range(0, 40, 4)
+    ]
+
+
+def test_donor_change_refreshes_the_borrowers(conn):
+    for fk in ("1", "2"):
+        conn.execute(
+            "INSERT INTO eiendom (finnkode, url, active) VALUES (?, 'u', 1)", (fk,)
+        )
+    conn.execute("INSERT INTO eiendom_processed (finnkode, pendl_rush_brj) VALUES ('1', 30)")
+    conn.execute(
+        "INSERT INTO eiendom_processed (finnkode, travel_copy_from_finnkode) VALUES ('2', '1')"
+    )
+    conn.commit()
+    assert ListingViewRepo(conn).refresh() == 2
+    conn.execute("UPDATE eiendom_processed SET pendl_rush_brj = 12 WHERE finnkode = '1'")
+    conn.commit()
+    assert ListingViewRepo(conn).pending() == 2
+    ListingViewRepo(conn).refresh()
+    brj = dict(conn.execute('SELECT "Finnkode", "PENDL RUSH BRJ" FROM listing_view'))
+    assert brj == {"1": 12, "2": 12}
+
+
+def test_rolled_back_write_leaves_the_view_alone(conn):
+    conn.execute("INSERT INTO eiendom (finnkode, url, active) VALUES ('1', 'u', 1)")
+    conn.commit()
+    ListingViewRepo(conn).refresh()
+    conn.execute("INSERT INTO annotations (finnkode, kommentar) VALUES ('1', 'x')")
+    conn.rollback()
+    assert ListingViewRepo(conn).pending() == 0
+    assert conn.execute('SELECT "Kommentar" FROM listing_view').fetchone()[0] is None
+
+
+def test_every_source_table_keeps_its_dirty_triggers(conn):
+    """A migration that rebuilds a source table drops its triggers with it;
+    this is the reminder to re-create them."""
+    triggers = {
+        (r["tbl_name"], r["name"].rsplit("_", 1)[1])
+        for r in conn.execute(
+            "SELECT tbl_name, name FROM sqlite_master"
+            " WHERE type = 'trigger' AND name LIKE 'trg_listing_view_%'"
+        )
+    }
+    tables = {
+        "eiendom", "eiendom_processed", "listing_details", "listing_salgsoppgave",
+        "listing_tilstand", "annotations", "sold_prices",
+    }
+    assert triggers == {(t, e) for t in tables for e in ("ins", "upd", "del")}
+
+
+def test_source_table_rebuild_needs_no_legacy_alter(conn):
+    """The create-copy-drop-rename rebuild works with the default ALTER
+    TABLE: nothing in the schema joins the source tables."""
+    conn.execute("INSERT INTO eiendom (finnkode, url) VALUES ('1', 'u')")
+    conn.execute("INSERT INTO listing_details (finnkode, bedrooms) VALUES ('1', 3)")
+    conn.commit()
+    conn.executescript(
+        "CREATE TABLE ld_new AS SELECT * FROM listing_details;"
+        "DROP TABLE listing_details;"
+        "ALTER TABLE ld_new RENAME TO listing_details;"
+    )
+    conn.execute("INSERT INTO eiendom (finnkode, url) VALUES ('2', 'u')")
+    conn.commit()
+    assert ListingViewRepo(conn).refresh() == 2
+    assert ListingViewRepo(conn).drift() == []
+
+
+def test_drift_and_rebuild(conn):
+    for fk in FKS[:3]:
+        conn.execute("INSERT INTO eiendom (finnkode, url, pris) VALUES (?, 'u', 1)", (fk,))
+    conn.commit()
+    ListingViewRepo(conn).refresh()
+    conn.execute('UPDATE listing_view SET "Pris" = 2 WHERE "Finnkode" = ?', (FKS[1],))
+    conn.execute('DELETE FROM listing_view WHERE "Finnkode" = ?', (FKS[2],))
+    conn.commit()
+    repo = ListingViewRepo(conn)
+    assert repo.drift() == [FKS[1], FKS[2]]
+    assert repo.rebuild() == 3
+    assert repo.drift() == []
+
+
+def test_rebuild_cli_check_and_rebuild(tmp_path, monkeypatch):
+    db = tmp_path / "cli.db"
+    c = connection.connect(db)
+    migrations.migrate(c)
+    c.execute("INSERT INTO eiendom (finnkode, url) VALUES ('1', 'u')")
+    c.commit()
+    ListingViewRepo(c).refresh()
+    c.execute("DELETE FROM listing_view")
+    c.commit()
+    c.close()
+    monkeypatch.setenv("SKANNONSER_DB_PATH", str(db))
+
+    checked = CliRunner().invoke(app, ["db", "rebuild-listing-view", "--check"])
+    assert checked.exit_code == 1 and "drift: 1 (1)" in checked.output
+    rebuilt = CliRunner().invoke(app, ["db", "rebuild-listing-view"])
+    assert rebuilt.exit_code == 0, rebuilt.output
+    assert "rebuilt: 1 rows" in rebuilt.output
+    again = CliRunner().invoke(app, ["db", "rebuild-listing-view", "--check"])
+    assert again.exit_code == 0 and "drift: 0" in again.output
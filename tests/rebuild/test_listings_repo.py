@@ -83,8 +83,7 @@ def test_excluded_urls_are_skipped_and_counted(repo):
 
 def test_mark_inactive_deactivates_missing_never_deletes(repo):
     repo.upsert([_listing("111"), _listing("222")])  # both active on first upsert
-    n = repo.mark_inactive(["111"])
-    assert n == 1
+    assert repo.mark_inactive(["111"]) == ["222"]
     assert repo.active_finnkodes() == {"111"}
     total = repo.conn.execute("SELECT COUNT(*) FROM eiendom").fetchone()[0]
     assert total == 2  # 222 deactivated, not deleted
@@ -92,8 +91,7 @@ def test_mark_inactive_deactivates_missing_never_deletes(repo):
 
 def test_mark_inactive_empty_list_deactivates_all(repo):
     repo.upsert([_listing("111"), _listing("222")])  # both active on first upsert
-    n = repo.mark_inactive([])
-    assert n == 2
+    assert repo.mark_inactive([]) == ["111", "222"]
     assert repo.active_finnkodes() == set()
 
 
@@ -155,8 +153,8 @@ def test_upsert_is_one_transaction(repo, monkeypatch):
     # failure is reachable through the public ``upsert()`` path here, because
     # within a single batch/connection, uncommitted reads of rows already
     # written earlier in the same transaction turn intra-batch duplicate
-    # finnkodes into UPDATEs (via the ``existing = conn.execute("SELECT * ...")``
-    # lookup), not INSERT/PK-constraint failures. So the only way to exercise
+    # finnkodes into UPDATEs (via the batch's evolving prefetch of existing
+    # rows), not INSERT/PK-constraint failures. So the only way to exercise
     # "an error mid-batch rolls back the whole batch" is to inject a failure
     # at an internal seam that runs per-listing, as done below. A future
     # reader should not treat this as a shortcut that needs upgrading to a
@@ -164,10 +162,10 @@ def test_upsert_is_one_transaction(repo, monkeypatch):
     listings = [_listing("111"), _listing("BAD")]
     real_apply = repo._apply_overrides
 
-    def flaky(finnkode, data):
+    def flaky(finnkode, data, override):
         if finnkode == "BAD":
             raise sqlite3.OperationalError("boom")
-        return real_apply(finnkode, data)
+        return real_apply(finnkode, data, override)
 
     monkeypatch.setattr(repo, "_apply_overrides", flaky)
     with pytest.raises(sqlite3.OperationalError):
@@ -221,3 +219,106 @@ def test_reparse_backfills_primary_area_and_changes_pris_kvm(repo):
     assert before == round(5_000_000 / 105)
     assert after == round(row["pris"] / 100)
     assert after != before
+
+
+# --- Set-based upsert: identical to the per-row port -------------------------
+
+
+def _per_row_upsert(conn, listings):
+    """The pre-bulk per-row algorithm, kept as the oracle: point-query the
+    override and the existing row, then INSERT or UPDATE changed columns."""
+    from skannonser.store.repositories import listings as mod
+
+    repo = ListingsRepo(conn)
+    counts = {"inserted": 0, "updated": 0, "excluded": 0}
+    conn.execute("BEGIN")
+    for listing in listings:
+        r = listing.to_row()
+        finnkode = str(r["Finnkode"]).strip()
+        if mod._is_excluded_eiendom_url(r["URL"]):
+            counts["excluded"] += 1
+            continue
+        override = conn.execute(
+            "SELECT pris, adresse, postnummer FROM manual_overrides WHERE finnkode = ?",
+            (finnkode,),
+        ).fetchone()
+        data = repo._apply_overrides(finnkode, repo._build_data(finnkode, r["URL"], r), override)
+        existing = conn.execute("SELECT * FROM eiendom WHERE finnkode = ?", (finnkode,)).fetchone()
+        if existing is None:
+            cols = ["finnkode", "active"] + mod._DATA_COLUMNS
+            conn.execute(
+                f"INSERT INTO eiendom ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                [finnkode, 1] + [data[c] for c in mod._DATA_COLUMNS],
+            )
+            counts["inserted"] += 1
+            continue
+        changed = [c for c in mod._DATA_COLUMNS if existing[c] != data[c]]
+        if changed or not existing["active"]:
+            sets = ", ".join(f"{c} = ?" for c in changed + ["active"])
+            conn.execute(
+                f"UPDATE eiendom SET {sets} WHERE finnkode = ?",
+                [data[c] for c in changed] + [1, finnkode],
+            )
+            counts["updated"] += 1
+    conn.commit()
+    return counts
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_bulk_upsert_matches_per_row_semantics(tmp_path, seed):
+    import random
+
+    rng = random.Random(seed)
+
+    def batch():
+        out = []
+        for _ in range(rng.randint(0, 40)):
+            fk = str(rng.randint(1, 25))  # small key space: repeats within a batch
+            kw = {"Pris": rng.choice([None, 100, 200]), "Adresse": rng.choice(["A", "B"])}
+            if rng.random() < 0.1:
+                out.append(NormalizedListing(
+                    Finnkode=fk, URL=f"https://www.finn.no/realestate/planned/ad.html?finnkode={fk}",
+                ))
+            else:
+                out.append(_listing(fk, **kw))
+        return out
+
+    conns = []
+    for name in ("bulk", "oracle"):
+        conn = connection.connect(tmp_path / f"{name}.db")
+        migrations.migrate(conn)
+        conn.isolation_level = None
+        conn.execute(
+            "INSERT INTO manual_overrides (finnkode, pris, adresse) VALUES ('3', 999, 'Fast 1')"
+        )
+        conns.append(conn)
+    bulk, oracle = conns
+    for _ in range(4):
+        rows = batch()
+        assert ListingsRepo(bulk).upsert(rows) == _per_row_upsert(oracle, rows)
+        deactivate = [str(k) for k in range(1, 26) if rng.random() < 0.3]
+        for conn in conns:
+            conn.execute(
+                f"UPDATE eiendom SET active = 0 WHERE finnkode IN ({','.join('?' * len(deactivate))})",
+                deactivate,
+            )
+
+    def snapshot(conn):
+        return [tuple(r) for r in conn.execute(
+            "SELECT id, finnkode, active, pris, adresse, url FROM eiendom ORDER BY id"
+        )]
+
+    assert snapshot(bulk) == snapshot(oracle)
+
+
+def test_mark_inactive_scales_past_the_sql_variable_limit(repo):
+    """The crawled set is a TEMP table, not bound parameters: a crawl larger
+    than SQLITE_MAX_VARIABLE_NUMBER (32766) must work."""
+    n = 40_000
+    repo.conn.executemany(
+        "INSERT INTO eiendom (finnkode, url, active) VALUES (?, 'u', 1)",
+        [(f"{i:06d}",) for i in range(n)],
+    )
+    crawled = [f"{i:06d}" for i in range(n) if i % 1000]
+    assert repo.mark_inactive(crawled) == [f"{i:06d}" for i in range(0, n, 1000)]
+    assert len(repo.active_finnkodes()) == n - 40
@@ -0,0 +1,92 @@
+"""Connection pragma profiles and `db optimize`."""
+import sqlite3
+
+import pytest
+from typer.testing import CliRunner
+
+from skannonser.cli import app
+from skannonser.store import connection, migrations
+from skannonser.store.maintenance import optimize
+
+
+@pytest.fixture()
+def db(tmp_path):
+    path = tmp_path / "m.db"
+    conn = connection.connect(path)
+    migrations.migrate(conn)
+    conn.executemany(
+        "INSERT INTO eiendom (finnkode, url, active) VALUES (?, ?, 1)",
+        [(str(i), "x" * 500) for i in range(2000)],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.mark.parametrize("profile", sorted(connection.PROFILES))
+def test_profiles_apply_their_pragmas(db, profile):
+    conn = connection.connect(db, profile=profile)
+    expected = connection.PROFILES[profile]
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == expected["cache_size"]
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == expected["busy_timeout"]
+    synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+    assert synchronous == {"NORMAL": 1, "FULL": 2}[expected["synchronous"]]
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_unknown_profile_is_an_error(db):
+    with pytest.raises(KeyError):
+        connection.connect(db, profile="nope")
+
+
+def test_readonly_connection_cannot_write(db):
+    conn = connection.connect_readonly(db)
+    assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM eiendom")
+
+
+def test_optimize_analyzes_and_truncates_wal(db):
+    conn = connection.connect(db, profile="maintenance")
+    report = optimize(conn, db)
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+    assert report["after"]["wal_bytes"] == 0
+    assert not report["checkpoint"]["busy"]
+    assert set(report["timings"]) == {"analyze", "checkpoint"}
+    assert 0.0 <= report["before"]["fragmentation"] <= 1.0
+
+
+def test_optimize_vacuum_reclaims_free_pages(db):
+    conn = connection.connect(db, profile="maintenance")
+    conn.execute("DELETE FROM eiendom")
+    conn.commit()
+    report = optimize(conn, db, vacuum=True)
+    assert report["before"]["free_pages"] > 0
+    assert report["after"]["free_pages"] == 0
+    assert report["after"]["pages"] < report["before"]["pages"]
+
+
+def test_incremental_needs_conversion_first(db):
+    conn = connection.connect(db, profile="maintenance")
+    skipped = optimize(conn, db, incremental=True)
+    assert "incremental_vacuum" not in skipped["timings"]
+    assert skipped["notes"][0].startswith("incremental vacuum skipped")
+
+    converted = optimize(conn, db, vacuum=True, incremental=True)
+    assert converted["after"]["auto_vacuum"] == "incremental"
+    again = optimize(conn, db, incremental=True)
+    assert "incremental_vacuum" in again["timings"]
+
+
+def test_optimize_cli_reports_before_and_after(db, monkeypatch):
+    monkeypatch.setenv("SKANNONSER_DB_PATH", str(db))
+    result = CliRunner().invoke(app, ["db", "optimize"])
+    assert result.exit_code == 0, result.output
+    assert "pages: " in result.output and " -> " in result.output
+    assert "analyze: " in result.output
+
+
+def test_optimize_cli_fails_loud_when_db_missing(tmp_path, monkeypatch):
+    monkeypatch.setenv("SKANNONSER_DB_PATH", str(tmp_path / "missing.db"))
+    result = CliRunner().invoke(app, ["db", "optimize"])
+    assert result.exit_code == 1
@@ -12,6 +12,10 @@ EXPECTED_TABLES = {
     "listing_salgsoppgave", "listing_tg_findings", "listing_egenerklaering",
     "listing_tilstand",
     "salgsoppgave_llm_cache",
+    "backfill_checkpoint",
+    "parse_ledger",
+    "listing_history", "listing_history_progress",
+    "listing_view", "listing_view_dirty", "api_usage_monthly", "rate_limit_bucket",
 }
 
 ALL_MIGRATIONS = [
@@ -21,7 +25,9 @@ ALL_MIGRATIONS = [
     "010_listing_details", "011_neighbour_sold", "012_neighbour_sold_index",
     "013_gjovikbanen_missing_stations", "014_r31_north_of_jaren",
     "015_salgsoppgave", "016_tilstand", "017_classification_provenance",
-    "018_radon",
+    "018_radon", "019_backfill_checkpoint", "020_parse_ledger",
+    "021_listing_history", "022_status_norm_indexes", "023_listing_view",
+    "024_api_usage_monthly", "025_rate_limit_bucket",
 ]
 
 
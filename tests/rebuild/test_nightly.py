@@ -103,7 +103,7 @@ def _install_happy_fakes(monkeypatch, order):
 
     def fake_finn(
         domain, conn, project_dir, fetch=None, archive_dir=None,
-        page_delay=None, fetch_delay=None,
+        page_delay=None, fetch_delay=None, workers=1,
     ):
         order.append("ingest_finn")
         return dict(_INGEST_OK)
@@ -126,7 +126,7 @@ def _install_happy_fakes(monkeypatch, order):
 
     def fake_refresh(
         conn, domain, project_dir, mode, fetch=None,
-        fetch_delay=None, listing_delay=None,
+        fetch_delay=None, listing_delay=None, workers=1,
     ):
         order.append(f"refresh:{mode}")
         return dict(_REFRESH_OK)
@@ -226,7 +226,7 @@ def test_refresh_failure_does_not_skip_thumbs_or_sheets(conn, domain, gateway, m
 
     def failing_refresh(
         conn, domain, project_dir, mode, fetch=None,
-        fetch_delay=None, listing_delay=None,
+        fetch_delay=None, listing_delay=None, workers=1,
     ):
         order.append(f"refresh:{mode}(FAIL)")
         raise RuntimeError("refresh boom")
@@ -292,7 +292,7 @@ def test_ingest_finn_failure_does_not_skip_ingest_dnb(conn, domain, gateway, mon
 
     def failing_finn(
         domain, conn, project_dir, fetch=None, archive_dir=None,
-        page_delay=None, fetch_delay=None,
+        page_delay=None, fetch_delay=None, workers=1,
     ):
         order.append("ingest_finn(FAIL)")
         raise RuntimeError("network exploded")
@@ -317,7 +317,7 @@ def test_ingest_zero_url_crawl_recorded_as_failure_not_exception(conn, domain, g
 
     def zero_url_finn(
         domain, conn, project_dir, fetch=None, archive_dir=None,
-        page_delay=None, fetch_delay=None,
+        page_delay=None, fetch_delay=None, workers=1,
     ):
         order.append("ingest_finn")
         return {"crawled": 0, "parsed": 0, "failed": 0, "upserted": 0, "deactivated": 0}
@@ -526,6 +526,42 @@ def test_run_sheets_per_tab_counts(conn):
     assert ("Eie", 3) in client.calls  # header + 2 data rows
 
 
+def test_run_sheets_publishes_when_the_listing_view_refresh_cannot_start(conn, caplog):
+    """An earlier step left the shared connection mid-transaction: the fold's
+    BEGIN IMMEDIATE fails, the tabs still publish (dirty rows come through
+    the join) and the caller's transaction is left alone."""
+    _ins_eiendom(conn, "111")
+    conn.execute(
+        "INSERT INTO eiendom (finnkode, tilgjengelighet, active, pris, url, "
+        "info_usable_i_area) VALUES ('222', 'Til salgs', 1, 5000000, 'u', 80)"
+    )
+    assert conn.in_transaction
+
+    client = RecordingClient()
+    with caplog.at_level("WARNING", logger="skannonser.nightly"):
+        result = run_sheets(conn, client)
+
+    assert result["Eie"]["rows"] == 2
+    assert conn.in_transaction
+    assert "listing_view refresh skipped" in caplog.text
+
+
+def test_run_sheets_publishes_when_another_writer_holds_the_lock(conn, tmp_path, caplog):
+    _ins_eiendom(conn, "111")
+    other = connection.connect(tmp_path / "nightly.db")
+    other.execute("BEGIN IMMEDIATE")
+    conn.execute("PRAGMA busy_timeout = 0")
+    try:
+        with caplog.at_level("WARNING", logger="skannonser.nightly"):
+            result = run_sheets(conn, RecordingClient())
+    finally:
+        other.rollback()
+        other.close()
+
+    assert result["Eie"]["rows"] == 1
+    assert "locked" in caplog.text
+
+
 # ---------------------------------------------------------------------------
 # CLI: `skannonser run sheets`
 # ---------------------------------------------------------------------------
@@ -628,7 +664,7 @@ def test_cli_nightly_real_step_failure_exits_nonzero(tmp_path, monkeypatch):
     monkeypatch.setenv("GOOGLE_SERVICE_ACCOUNT_FILE", str(sa_path))
     db = _seeded_db(tmp_path)
 
-    def fake_run_nightly(conn, domain, gateway, api_key, client, fetch=None, post=None, sheets_writer=None):
+    def fake_run_nightly(conn, domain, gateway, api_key, client, fetch=None, post=None, sheets_writer=None, workers=1):
         return {
             "steps": {"ingest_finn": {"ok": False, "error": "boom"}},
             "failed": ["ingest_finn"],
@@ -649,7 +685,7 @@ def test_cli_nightly_budget_exhausted_only_exits_0(tmp_path, monkeypatch):
     monkeypatch.setenv("GOOGLE_SERVICE_ACCOUNT_FILE", str(sa_path))
     db = _seeded_db(tmp_path)
 
-    def fake_run_nightly(conn, domain, gateway, api_key, client, fetch=None, post=None, sheets_writer=None):
+    def fake_run_nightly(conn, domain, gateway, api_key, client, fetch=None, post=None, sheets_writer=None, workers=1):
         return {
             "steps": {"geocode": {"ok": True, "stats": {"budget_exhausted": True}}},
             "failed": [],
@@ -776,7 +812,7 @@ def test_run_nightly_paces_and_uses_browser_fetch(conn, domain, gateway, monkeyp
 
     def recording_finn(
         domain, conn, project_dir, fetch=None, archive_dir=None,
-        page_delay=None, fetch_delay=None,
+        page_delay=None, fetch_delay=None, workers=1,
     ):
         captured["finn_fetch"] = fetch
         captured["page_delay"] = page_delay
@@ -785,7 +821,7 @@ def test_run_nightly_paces_and_uses_browser_fetch(conn, domain, gateway, monkeyp
 
     def recording_refresh(
         conn, domain, project_dir, mode, fetch=None,
-        fetch_delay=None, listing_delay=None,
+        fetch_delay=None, listing_delay=None, workers=1,
     ):
         captured["refresh_fetch"] = fetch
         captured["listing_delay"] = listing_delay
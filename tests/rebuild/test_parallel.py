@@ -0,0 +1,71 @@
+"""skannonser.parallel.ordered_map: input order out, failures as values, and
+a serial path that never leaves the calling process."""
+import os
+
+import pytest
+
+from skannonser.parallel import ordered_map, resolve_workers
+
+
+def _square(x):
+    return x * x
+
+
+def _boom_on_three(x):
+    if x == 3:
+        raise ValueError("three")
+    return x
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_results_come_back_in_input_order(workers):
+    items = [(i,) for i in range(40)]
+    out = [value for _, value, _ in ordered_map(_square, items, workers, window=5)]
+    assert out == [i * i for i in range(40)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_a_failing_item_is_yielded_not_raised(workers):
+    out = list(ordered_map(_boom_on_three, [(i,) for i in range(6)], workers))
+    assert [item for item, _, _ in out] == [(i,) for i in range(6)]
+    assert [v for _, v, e in out if e is None] == [0, 1, 2, 4, 5]
+    (failed,) = [e for _, _, e in out if e is not None]
+    assert isinstance(failed, ValueError)
+
+
+def test_serial_path_interleaves_producer_and_consumer():
+    """workers=1 must produce item N+1 only after item N's result was
+    consumed -- the refresh pacing relies on it."""
+    log = []
+
+    def produce():
+        for i in range(3):
+            log.append(f"produce {i}")
+            yield (i,)
+
+    for item, _, _ in ordered_map(_square, produce(), 1):
+        log.append(f"consume {item[0]}")
+    assert log == [
+        "produce 0", "consume 0", "produce 1", "consume 1", "produce 2", "consume 2",
+    ]
+
+
+def test_pool_bounds_items_in_flight():
+    produced = []
+
+    def produce():
+        for i in range(20):
+            produced.append(i)
+            yield (i,)
+
+    gen = ordered_map(_square, produce(), 2, window=4)
+    next(gen)
+    assert len(produced) <= 5
+    gen.close()
+
+
+def test_resolve_workers():
+    assert resolve_workers(0) == (os.cpu_count() or 1)
+    assert resolve_workers(None) == (os.cpu_count() or 1)
+    assert resolve_workers(3) == 3
+    assert resolve_workers(-2) == 1
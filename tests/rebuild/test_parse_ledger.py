@@ -0,0 +1,113 @@
+"""Parse ledger (migration 020): unchanged HTML at an unchanged
+PARSER_VERSION is never re-parsed -- by the backfills or by nightly ingest."""
+import shutil
+from pathlib import Path
+
+import pytest
+
+from skannonser.config.domain import load_domain
+from skannonser.ingest.finn import backfill as backfill_mod
+from skannonser.ingest.finn import parse_details as pd_mod
+from skannonser.ingest.finn.backfill import backfill_details
+from skannonser.ingest.finn.backfill_salgsoppgave import backfill_salgsoppgave
+from skannonser.pipeline import run_finn_ingest
+from skannonser.store import connection, migrations
+from skannonser.store.repositories.parse_ledger import ParseLedgerRepo
+
+FIXTURES = Path(__file__).parent / "fixtures" / "finn"
+ADS = ["432672475", "448347467", "451631591"]
+
+
+@pytest.fixture()
+def conn(tmp_path):
+    c = connection.connect(tmp_path / "t.db")
+    migrations.migrate(c)
+    return c
+
+
+@pytest.fixture()
+def project(tmp_path):
+    project = tmp_path / "eiendom"
+    (project / "html_extracted").mkdir(parents=True)
+    for fk in ADS:
+        shutil.copy(FIXTURES / f"{fk}.html", project / "html_extracted" / f"{fk}.html")
+    return project
+
+
+def _seed(conn):
+    for fk in ADS:
+        conn.execute("INSERT INTO eiendom (finnkode, url) VALUES (?, ?)", (fk, "u"))
+    conn.commit()
+
+
+def test_second_backfill_parses_nothing(conn, project):
+    _seed(conn)
+    assert backfill_details(conn, project)["parsed"] == 3
+    stats = backfill_details(conn, project)
+    assert (stats["parsed"], stats["unchanged"]) == (0, 3)
+    assert len(ParseLedgerRepo(conn).fingerprints("details", pd_mod.PARSER_VERSION)) == 3
+
+
+def test_changed_html_is_reparsed(conn, project):
+    _seed(conn)
+    backfill_salgsoppgave(conn, project)
+    path = project / "html_extracted" / f"{ADS[1]}.html"
+    path.write_text(path.read_text(encoding="utf-8") + "<!-- edited -->", encoding="utf-8")
+    stats = backfill_salgsoppgave(conn, project)
+    assert (stats["parsed"], stats["unchanged"]) == (1, 2)
+
+
+def test_version_bump_reparses_the_corpus(conn, project, monkeypatch):
+    _seed(conn)
+    backfill_details(conn, project)
+    monkeypatch.setattr(backfill_mod, "PARSER_VERSION", pd_mod.PARSER_VERSION + 1)
+    stats = backfill_details(conn, project)
+    assert (stats["parsed"], stats["unchanged"]) == (3, 0)
+
+
+def test_wipe_forgets_the_ledger(conn, project):
+    _seed(conn)
+    backfill_details(conn, project)
+    stats = backfill_details(conn, project, wipe=True)
+    assert stats["parsed"] == 3
+    assert conn.execute("SELECT COUNT(*) FROM listing_details").fetchone()[0] == 3
+
+
+def test_parsers_are_tracked_independently(conn, project):
+    _seed(conn)
+    backfill_details(conn, project)
+    assert backfill_salgsoppgave(conn, project)["parsed"] == 3
+
+
+def test_nightly_cache_hits_skip_derived_parses(tmp_path, project, monkeypatch):
+    conn = connection.connect(tmp_path / "n.db")
+    migrations.migrate(conn)
+    urls = [(fk, f"https://www.finn.no/realestate/homes/ad.html?finnkode={fk}") for fk in ADS]
+
+    def run():
+        return run_finn_ingest(
+            load_domain(), conn, project, fetch=None, skip_crawl_urls=urls,
+            fetch_delay=lambda: None,
+        )
+
+    first = run()
+    assert first["details_upserted"] == first["salgsoppgave_upserted"] == 3
+
+    calls = []
+    real = pd_mod.parse_details
+    monkeypatch.setattr(pd_mod, "parse_details", lambda *a: calls.append(a) or real(*a))
+    second = run()
+    assert second["parsed"] == 3  # the listing itself is always parsed
+    assert second["details_upserted"] == second["salgsoppgave_upserted"] == 0
+    assert calls == []
+
+
+def test_compacted_cache_skips_via_sidecar_without_reading(conn, project, monkeypatch):
+    from skannonser.ingest.finn import html_cache
+
+    _seed(conn)
+    assert html_cache.compact_cache(project)["converted"] == 3
+    assert backfill_details(conn, project)["parsed"] == 3
+    monkeypatch.setattr(html_cache, "read_path", lambda *a, **k: pytest.fail("body read"))
+    stats = backfill_details(conn, project)
+    assert (stats["parsed"], stats["unchanged"]) == (0, 3)
@@ -0,0 +1,90 @@
+"""One shared parse per ad: every extractor accepts a `ParsedAd` and returns
+exactly what it returns for the raw HTML string."""
+from pathlib import Path
+
+import pytest
+from bs4 import FeatureNotFound
+
+from skannonser import htmlsoup
+from skannonser.enrich.tilstand import classify_input
+from skannonser.ingest.finn import parsed_ad as parsed_ad_mod
+from skannonser.ingest.finn.parse import parse_ad
+from skannonser.ingest.finn.parse_details import parse_details
+from skannonser.ingest.finn.parse_salgsoppgave import parse_salgsoppgave
+from skannonser.ingest.finn.parsed_ad import ParsedAd
+from skannonser.ingest.finn.payload import decode_ad, sections
+
+FIXTURES = Path(__file__).parent / "fixtures" / "finn"
+ADS = sorted(p for p in FIXTURES.glob("*.html") if p.stem.isdigit())
+
+
+def _load(path):
+    return path.read_text(encoding="utf-8", errors="replace")
+
+
+@pytest.mark.parametrize("path", ADS, ids=lambda p: p.stem)
+def test_shared_parse_matches_per_extractor_parse(path):
+    html, fk = _load(path), path.stem
+    url = f"https://www.finn.no/realestate/homes/ad.html?finnkode={fk}"
+    doc = ParsedAd(html)
+    assert parse_ad(doc, fk, url) == parse_ad(html, fk, url)
+    assert parse_details(doc, fk) == parse_details(html, fk)
+    assert parse_salgsoppgave(doc, fk) == parse_salgsoppgave(html, fk)
+    assert classify_input(doc) == classify_input(html)
+    assert doc.ad == decode_ad(html)
+    assert doc.sections == sections(decode_ad(html))
+
+
+def test_all_extractors_share_one_soup(monkeypatch):
+    real = parsed_ad_mod.make_soup
+    built = []
+
+    def counting(*args, **kwargs):
+        built.append(1)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(parsed_ad_mod, "make_soup", counting)
+    doc = ParsedAd(_load(FIXTURES / "448347467.html"))
+    parse_ad(doc, "448347467", "u")
+    parse_details(doc, "448347467")
+    parse_salgsoppgave(doc, "448347467")
+    classify_input(doc)
+    assert len(built) == 1
+
+
+def test_of_passes_parsed_through_and_wraps_strings():
+    doc = ParsedAd("<html></html>")
+    assert ParsedAd.of(doc) is doc
+    assert ParsedAd.of("<html></html>").html == "<html></html>"
+
+
+@pytest.mark.parametrize("junk", ["", "<html>", "<script>enqueue(</script>", "\x00<<>>"])
+def test_junk_degrades_like_the_string_path(junk):
+    doc = ParsedAd(junk)
+    assert doc.ad is None
+    assert doc.sections == []
+    assert doc.targeting == {}
+
+
+def _raising(exc):
+    def soup(markup, builder):
+        raise exc
+    return soup
+
+
+def test_a_missing_backend_is_not_a_missing_payload(monkeypatch):
+    """A selected-but-uninstalled tree builder must fail the decode, not
+    read as "no payload" (htmlsoup's fail-loudly contract)."""
+    html = _load(ADS[0])
+    monkeypatch.setattr(htmlsoup, "BeautifulSoup", _raising(FeatureNotFound("lxml")))
+    with pytest.raises(FeatureNotFound):
+        decode_ad(html)
+    with pytest.raises(FeatureNotFound):
+        ParsedAd(html).ad
+
+
+def test_rejected_markup_still_degrades_to_none(monkeypatch):
+    html = _load(ADS[0])
+    monkeypatch.setattr(htmlsoup, "BeautifulSoup", _raising(htmlsoup.ParserRejectedMarkup("bad")))
+    assert decode_ad(html) is None
+    assert ParsedAd(html).ad is None
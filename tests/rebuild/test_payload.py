@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from skannonser.ingest.finn import payload
 from skannonser.ingest.finn.payload import Section, _resolve, decode_ad, sections
 
 FIXTURES = Path(__file__).parent / "fixtures" / "finn"
@@ -126,3 +127,108 @@ def test_resolve_rejects_boolean_index():
     arr = [10, 20, 30]
     assert _resolve(arr, True, frozenset()) is None
     assert _resolve(arr, False, frozenset()) is None
+
+
+# --- Iterative, memoised resolver ------------------------------------------
+# `_recursive_resolve` is the pre-iterative implementation, kept verbatim as
+# the oracle: the explicit-stack resolver, its memo and the lazy ad-only walk
+# must all reproduce it exactly, cycle and depth cut-offs included.
+
+
+def _recursive_resolve(arr, index, seen, depth=0):
+    if isinstance(index, bool) or not isinstance(index, int):
+        return None
+    if index < 0:
+        return payload._NEGATIVE.get(index)
+    if index in seen or index >= len(arr):
+        return None
+    if depth >= payload._MAX_DEPTH:
+        return None
+    value = arr[index]
+    if isinstance(value, dict):
+        seen = seen | {index}
+        out = {}
+        for raw_key, raw_val in value.items():
+            try:
+                key_index = int(str(raw_key).lstrip("_"))
+            except ValueError:
+                continue
+            key = _recursive_resolve(arr, key_index, seen, depth + 1)
+            if key is not None:
+                out[str(key)] = _recursive_resolve(arr, raw_val, seen, depth + 1)
+        return out
+    if isinstance(value, list):
+        seen = seen | {index}
+        return [_recursive_resolve(arr, i, seen, depth + 1) for i in value]
+    return value
+
+
+def _eager_decode(script):
+    arr = payload._turbostream_array(script)
+    root = _recursive_resolve(arr, 0, frozenset()) if arr else None
+    if not isinstance(root, dict) or not root:
+        root = payload._from_remix(script)
+    return payload._ad_from_root(root)
+
+
+_WORDS = ["loaderData", "objectData", "ad", "routes/homes.ad", "x"]
+
+
+def _random_graph(rng):
+    """A small turbo-stream array: root, the key words, dicts/lists wired to
+    random indices (shared sub-objects, cycles, bogus refs), and a
+    root -> loaderData -> route -> objectData -> ad spine whose `ad` points
+    anywhere, the root included."""
+    words = {w: i + 1 for i, w in enumerate(_WORDS)}
+    arr: list = [None] + list(_WORDS)
+    n = len(arr) + rng.randint(1, 12)
+    ref = lambda: rng.choice(  # noqa: E731
+        [rng.randrange(n + 6), rng.choice(list(words.values())), -7, -8, -5, True, "s"]
+    )
+    while len(arr) < n:
+        kind = rng.random()
+        if kind < 0.6:
+            arr.append({f"_{rng.choice(list(words.values()))}": ref() for _ in range(rng.randint(0, 4))})
+        elif kind < 0.85:
+            arr.append([ref() for _ in range(rng.randint(0, 3))])
+        else:
+            arr.append(rng.choice([1, "v", None, 2.5]))
+    loader, route, object_data = n, n + 1, n + 2
+    arr[0] = {f"_{words['loaderData']}": loader, f"_{words['x']}": ref()}
+    arr.append({f"_{words['routes/homes.ad']}": route})
+    arr.append({f"_{words['objectData']}": object_data})
+    arr.append({f"_{words['ad']}": rng.randrange(len(arr) + 1)})
+    return arr
+
+
+@pytest.mark.parametrize("max_depth", [3, 6, 500])
+def test_iterative_resolver_matches_recursive_oracle(monkeypatch, max_depth):
+    import random
+
+    monkeypatch.setattr(payload, "_MAX_DEPTH", max_depth)
+    rng = random.Random(max_depth)
+    for _ in range(400):
+        arr = _random_graph(rng)
+        for start in range(len(arr)):
+            assert _resolve(arr, start, frozenset()) == _recursive_resolve(arr, start, frozenset())
+        script = f"enqueue({json.dumps(json.dumps(arr))})"
+        assert payload.decode_script(script) == _eager_decode(script)
+
+
+@pytest.mark.parametrize("path", sorted(FIXTURES.glob("*.html")), ids=lambda p: p.stem)
+def test_lazy_ad_decode_matches_eager_on_fixtures(path):
+    script = payload._largest_script(path.read_text(encoding="utf-8", errors="replace"))
+    assert payload.decode_script(script) == _eager_decode(script)
+
+
+def test_shared_subobject_is_built_once():
+    """A node referenced from many places resolves once (memo), not once per
+    reference -- the fan-out that made the recursive walk expensive."""
+    # 30 levels, each referencing the next level twice: 2**30 paths.
+    n = 30
+    arr = [[i + 1, i + 1] for i in range(n)] + ["leaf"]
+    value = _resolve(arr, 0, frozenset())
+    for _ in range(n):
+        assert value[0] is value[1]
+        value = value[0]
+    assert value == "leaf"
@@ -132,6 +132,7 @@ def test_finn_mark_inactive_skipped_when_crawl_yields_zero_urls(conn, domain, tm
         "failed": 0,
         "upserted": 0,
         "deactivated": 0,
+        "deactivated_keys": [],
         "details_upserted": 0,
         "salgsoppgave_upserted": 0,
         "drift": [],
@@ -168,6 +169,7 @@ def test_dnb_deactivate_missing_skipped_when_crawl_yields_zero_urls(conn, domain
         "failed": 0,
         "upserted": 0,
         "deactivated": 0,
+        "deactivated_keys": [],
     }
     active = {
         r["url"] for r in conn.execute("SELECT url FROM dnbeiendom WHERE active = 1")
@@ -332,7 +334,7 @@ def test_dnb_listing_fetch_uses_legacy_ua_and_timeout_when_defaults_used(domain,
         calls.append((u, kwargs))
         return FakeResponse()
 
-    monkeypatch.setattr(pipeline.requests, "get", recording_get)
+    monkeypatch.setattr(pipeline, "pooled_get", recording_get)
 
     # `fetch` is left at its default (None) -- the assertion is specifically
     # about that default path, not an explicit override.
@@ -438,6 +440,7 @@ def test_finn_parse_failure_is_counted_and_not_upserted(tmp_path):
         "failed": 1,
         "upserted": 0,
         "deactivated": 0,
+        "deactivated_keys": [],
         "details_upserted": 0,
         "salgsoppgave_upserted": 0,
         "drift": [],
@@ -503,6 +506,22 @@ def test_cli_ingest_source_routing_and_db_override(tmp_path, monkeypatch):
     assert calls == ["finn", "dnb"]
 
 
+def test_cli_ingest_logs_deactivated_key_count_not_keys(tmp_path, monkeypatch):
+    db = _seeded_db(tmp_path)
+    keys = [f"{900000 + i}" for i in range(500)]
+
+    def fake_finn(domain, conn, project_dir, **kwargs):
+        return {"crawled": 3, "parsed": 3, "failed": 0, "upserted": 3,
+                "deactivated": len(keys), "deactivated_keys": keys}
+
+    monkeypatch.setattr(run_cmd, "run_finn_ingest", fake_finn)
+
+    result = CliRunner().invoke(app, ["run", "ingest", "--source", "finn", "--db", str(db)])
+    assert result.exit_code == 0, result.output
+    assert "'deactivated_keys': 500" in result.output
+    assert keys[0] not in result.output
+
+
 def test_cli_ingest_exits_nonzero_on_high_failure_rate(tmp_path, monkeypatch):
     db = _seeded_db(tmp_path)
 
@@ -822,3 +841,52 @@ def test_finn_ingest_salgsoppgave_failure_never_fails_listing_upsert(tmp_path, m
     assert (
         conn.execute("SELECT COUNT(*) FROM listing_salgsoppgave").fetchone()[0] == 0
     )
+
+
+# ---------------------------------------------------------------------------
+# Parallel parse stage: same inputs to drift/upsert/guards as a serial run.
+# ---------------------------------------------------------------------------
+
+
+def test_finn_ingest_parallel_parse_matches_serial(tmp_path, monkeypatch):
+    proj = tmp_path / "proj"
+    cases = sorted(p for p in FINN_FIXTURES.glob("*.html") if p.stem.isdigit())
+    (proj / "html_extracted").mkdir(parents=True)
+    for c in cases:
+        shutil.copy(c, proj / "html_extracted" / c.name)
+    # One uncached ad fails its fetch, so the failure count is exercised too.
+    urls = [
+        (c.stem, f"https://www.finn.no/realestate/homes/ad.html?finnkode={c.stem}")
+        for c in cases
+    ] + [("999", "https://www.finn.no/realestate/homes/ad.html?finnkode=999")]
+
+    seen = []
+
+    def spy(conn, listing_rows, detail_rows):
+        seen.append(([r["Finnkode"] for r in listing_rows], detail_rows))
+        return [], {}
+
+    monkeypatch.setattr("skannonser.pipeline.drift_check", spy)
+
+    def failing_fetch(url):
+        raise OSError("offline")
+
+    results = []
+    for workers in (1, 3):
+        conn = connection.connect(tmp_path / f"w{workers}.db")
+        migrations.migrate(conn)
+        stats = run_finn_ingest(
+            load_domain(), conn, proj, fetch=failing_fetch, skip_crawl_urls=urls,
+            fetch_delay=lambda: None, workers=workers,
+        )
+        rows = [
+            tuple(r) for r in conn.execute(
+                "SELECT * FROM eiendom ORDER BY finnkode"
+            )
+        ]
+        results.append((stats["parsed"], stats["failed"], stats["details_upserted"],
+                        stats["salgsoppgave_upserted"], len(rows)))
+    assert results[0] == results[1]
+    assert results[0][1] == 1
+    assert seen[0][0] == [fk for fk, _ in urls[:-1]]
+    assert seen[0] == seen[1]
@@ -454,3 +454,76 @@ def test_sheet_travel_values_dangling_pointer_falls_back_to_own(repo, listings):
 def test_sheet_travel_values_unknown_finnkode_returns_all_none(repo, listings):
     values = repo.sheet_travel_values("does-not-exist")
     assert values == {"PENDL RUSH BRJ": None, "PENDL RUSH MVV": None, "MVV UNI RUSH": None}
+
+
+# -- write_behind ------------------------------------------------------------
+
+
+def _committed_count(tmp_path):
+    """Rows another connection can see, i.e. committed ones."""
+    other = connection.connect(tmp_path / "t.db")
+    try:
+        return other.execute("SELECT COUNT(*) FROM eiendom_processed").fetchone()[0]
+    finally:
+        other.close()
+
+
+def test_write_behind_commits_every_n_rows(repo, listings, tmp_path):
+    for i in range(7):
+        _seed_eiendom(listings, str(i))
+    with repo.write_behind(rows=3, seconds=3600):
+        for i in range(7):
+            repo.upsert(str(i), "Gate 1", "0150")
+            assert _committed_count(tmp_path) == (i + 1) // 3 * 3
+        commits_inside = repo.commits
+    assert commits_inside == 2
+    assert repo.commits == 3  # the final partial window on exit
+    assert _committed_count(tmp_path) == 7
+
+
+def test_write_behind_flushes_on_elapsed_seconds(repo, listings, tmp_path):
+    _seed_eiendom(listings, "1")
+    with repo.write_behind(rows=100, seconds=0):
+        repo.mark_geocode_failed("1")
+        assert _committed_count(tmp_path) == 1
+
+
+def test_write_behind_flushes_then_reraises(repo, listings, tmp_path):
+    _seed_eiendom(listings, "1")
+    with pytest.raises(RuntimeError, match="budget"):
+        with repo.write_behind(rows=100):
+            assert repo.set_coordinates("1", 59.9, 10.7) is True
+            assert repo.set_coordinates("1", "x", None) is False
+            raise RuntimeError("budget")
+    row = repo.conn.execute("SELECT lat, geocode_failed FROM eiendom_processed").fetchone()
+    assert (row["lat"], row["geocode_failed"]) == (59.9, 0)
+
+
+def test_write_behind_failed_flush_rolls_back_and_raises(repo, listings, tmp_path):
+    _seed_eiendom(listings, "1")
+    _seed_eiendom(listings, "2")
+    with pytest.raises(Exception):
+        with repo.write_behind(rows=100):
+            repo.upsert("1", "Gate 1", "0150")
+            repo.upsert("2", "Gate 2", "0150", cntr={"bil_dag_cntr": object()})
+    assert _committed_count(tmp_path) == 0
+    assert not repo.conn.in_transaction
+
+
+def test_write_behind_applies_in_order(repo, listings):
+    _seed_eiendom(listings, "1")
+    with repo.write_behind():
+        repo.upsert("1", "Gate 1", "0150", travel={"pendl_rush_brj": 30})
+        repo.mark_geocode_failed("1")
+        repo.set_coordinates("1", 59.9, 10.7)
+    row = repo.conn.execute(
+        "SELECT pendl_rush_brj, lat, geocode_failed FROM eiendom_processed"
+    ).fetchone()
+    assert tuple(row) == (30, 59.9, 0)
+
+
+def test_write_behind_is_not_reentrant(repo):
+    with repo.write_behind():
+        with pytest.raises(RuntimeError):
+            with repo.write_behind():
+                pass
@@ -0,0 +1,124 @@
+"""EXPLAIN QUERY PLAN regression tests for the hot queries (migration 022).
+
+Each registered entry runs the REAL production function against a migrated
+DB with the statement trace on, then asks SQLite for the plan of every
+statement it issued against a guarded table. A plan that reads a guarded
+table without an index ("SCAN e", no "USING ...") or sorts the result in a
+temp b-tree fails -- so an edit that reintroduces e.g.
+LOWER(TRIM(COALESCE(tilgjengelighet, ''))) or strftime() on called_at is
+caught here rather than as a slow nightly.
+"""
+import re
+
+import pytest
+
+from skannonser.config.domain import load_domain
+from skannonser.enrich import sold
+from skannonser.gateway import Gateway
+from skannonser.ingest.finn import refresh
+from skannonser.publish import export, rows
+from skannonser.store import connection, migrations
+from skannonser.web import api
+
+GUARDED = {"eiendom", "api_usage", "api_usage_monthly", "listing_view"}
+
+HOT_QUERIES = {
+    "rows.listing_rows": lambda conn, domain: rows.listing_rows(conn),
+    "api.sold_records": lambda conn, domain: api._sold_records(conn),
+    "export.sold_rows": lambda conn, domain: export.sold_rows(conn),
+    "api.visible_boligtyper": lambda conn, domain: api._visible_boligtyper(conn),
+    **{
+        f"refresh.select_rows[{mode}]": (
+            lambda conn, domain, mode=mode: refresh._select_rows(conn, domain, mode)
+        )
+        for mode in refresh.MODES
+    },
+    "sold.select_sold_targets": lambda conn, domain: sold.select_sold_targets(conn),
+    "sold.sold_coverage": lambda conn, domain: sold.sold_coverage(conn),
+    "sold.inaktiv_pending": lambda conn, domain: sold.inaktiv_pending(conn),
+    "sold.given_up_targets": lambda conn, domain: sold.given_up_targets(conn),
+    "gateway.month_usage": (
+        lambda conn, domain: Gateway(conn, domain.budget, notify=print).month_usage("routes")
+    ),
+    "gateway.already_warned": (
+        lambda conn, domain: Gateway(conn, domain.budget, notify=print)._already_warned(
+            "routes", 50, "2026-12"
+        )
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    c = connection.connect(tmp_path_factory.mktemp("plans") / "p.db")
+    migrations.migrate(c)
+    return c
+
+
+_TABLE_RE = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+
+
+def _guarded_names(sql: str) -> set[str]:
+    """Guarded tables read by `sql`, plus the aliases they go by there."""
+    names = set()
+    for table, alias in _TABLE_RE.findall(sql):
+        if table in GUARDED:
+            names |= {table, alias} - {""}
+    return names
+
+
+def _traced(conn, fn) -> list[str]:
+    """The SELECTs `fn` ran that read a guarded table (params inlined)."""
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    try:
+        fn()
+    finally:
+        conn.set_trace_callback(None)
+    return [
+        s for s in statements
+        if s.lstrip().upper().startswith("SELECT") and _guarded_names(s)
+    ]
+
+
+def _plan(conn, sql: str) -> list[str]:
+    return [r["detail"] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_an_index(conn, name):
+    domain = load_domain()
+    statements = _traced(conn, lambda: HOT_QUERIES[name](conn, domain))
+    assert statements, f"{name} issued no statement against {sorted(GUARDED)}"
+    for sql in statements:
+        plan = _plan(conn, sql)
+        names = _guarded_names(sql)
+        for line in plan:
+            match = re.match(r"(?:SCAN|SEARCH) (\w+)", line)
+            if match and match.group(1) in names:
+                assert "USING" in line, f"{name}: full scan in plan {plan}\n{sql}"
+            assert "TEMP B-TREE FOR ORDER BY" not in line, f"{name}: sort in plan {plan}"
+
+
+def test_unindexable_rewrite_would_be_caught(conn):
+    """The guard itself: the pre-022 form of the status filter scans."""
+    plan = _plan(
+        conn,
+        "SELECT finnkode FROM eiendom e "
+        "WHERE LOWER(TRIM(COALESCE(e.tilgjengelighet, ''))) = 'solgt'",
+    )
+    assert any(line.startswith("SCAN e") and "USING" not in line for line in plan)
+
+
+def test_status_norm_tracks_tilgjengelighet(conn):
+    conn.execute(
+        "INSERT INTO eiendom (finnkode, url, tilgjengelighet) VALUES ('plan1', 'u', '  Solgt ')"
+    )
+    assert conn.execute(
+        "SELECT status_norm FROM eiendom WHERE finnkode = 'plan1'"
+    ).fetchone()[0] == "solgt"
+    conn.execute("UPDATE eiendom SET tilgjengelighet = NULL WHERE finnkode = 'plan1'")
+    assert conn.execute(
+        "SELECT finnkode FROM eiendom WHERE status_norm = '' AND finnkode = 'plan1'"
+    ).fetchone() is not None
+    conn.rollback()
@@ -0,0 +1,132 @@
+"""TokenBucket (migration 025): one per-minute rate shared by every
+connection, thread and process on the DB."""
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from skannonser.config.domain import Budget
+from skannonser.gateway import Gateway
+from skannonser.ratelimit import TokenBucket
+from skannonser.store import connection, migrations
+
+T0 = 1_000_000.0
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "rl.db"
+    migrations.migrate(connection.connect(path))
+    return path
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = T0
+
+    def __call__(self):
+        return self.t
+
+
+def test_burst_then_steady_rate(db):
+    clock = FakeClock()
+    bucket = TokenBucket(connection.connect(db), now=clock)
+    # 60/min, burst 3: three free tokens, then each one is 1s further out
+    assert [bucket.reserve("routes", 60, 3) for _ in range(5)] == [0, 0, 0, 1, 2]
+    clock.t += 10  # the debt is paid and the bucket refills to burst, no more
+    assert [bucket.reserve("routes", 60, 3) for _ in range(4)] == [0, 0, 0, 1]
+
+
+def test_keys_are_independent(db):
+    bucket = TokenBucket(connection.connect(db), now=FakeClock())
+    assert bucket.reserve("routes", 60, 1) == 0
+    assert bucket.reserve("geocode", 60, 1) == 0
+    assert bucket.reserve("routes", 60, 1) == 1
+
+
+def test_clock_stepping_back_does_not_drain(db):
+    clock = FakeClock()
+    bucket = TokenBucket(connection.connect(db), now=clock)
+    bucket.reserve("routes", 60, 2)
+    clock.t -= 3600
+    assert bucket.reserve("routes", 60, 2) == 0
+    assert bucket.reserve("routes", 60, 2) == 1
+
+
+def test_acquire_sleeps_the_wait(db):
+    sleeps = []
+    bucket = TokenBucket(connection.connect(db), sleeper=sleeps.append, now=FakeClock())
+    bucket.acquire("routes", 30, 1)
+    bucket.acquire("routes", 30, 1)
+    assert sleeps == [2.0]
+
+
+def test_bucket_is_shared_across_connections(db):
+    clock = FakeClock()
+    a = TokenBucket(connection.connect(db), now=clock)
+    b = TokenBucket(connection.connect(db), now=clock)
+    assert a.reserve("routes", 60, 2) == 0
+    assert b.reserve("routes", 60, 2) == 0
+    assert a.reserve("routes", 60, 2) == 1
+
+
+def test_threads_share_one_bucket(db):
+    bucket = TokenBucket(connection.connect(db, check_same_thread=False), now=FakeClock())
+    waits = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(10):
+            wait = bucket.reserve("routes", 120, 4)
+            with lock:
+                waits.append(wait)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # every token handed out exactly once: 4 free, then one per 0.5s
+    assert sorted(waits) == [0.0] * 4 + [0.5 * k for k in range(1, 77)]
+
+
+def _reserve_in_child(db_path, count):
+    bucket = TokenBucket(connection.connect(db_path), now=lambda: T0)
+    return [bucket.reserve("routes", 60, 2) for _ in range(count)]
+
+
+def test_processes_share_one_bucket(db):
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(_reserve_in_child, [db] * 3, [5] * 3))
+    waits = sorted(w for r in results for w in r)
+    assert waits == [0.0, 0.0] + [float(k) for k in range(1, 14)]
+
+
+def test_invalid_rate_is_rejected(db):
+    bucket = TokenBucket(connection.connect(db))
+    with pytest.raises(ValueError):
+        bucket.reserve("routes", 0, 1)
+    with pytest.raises(ValueError):
+        bucket.reserve("routes", 60, 0)
+
+
+def test_gateways_on_one_db_share_the_rate(db):
+    budget = Budget(
+        routes_monthly_cap=100, geocode_monthly_cap=100, warn_pcts=[],
+        routes_rpm=60, routes_burst=2,
+    )
+    sleeps = []
+    first, second = (
+        Gateway(connection.connect(db), budget, notify=lambda m: None, sleeper=sleeps.append)
+        for _ in range(2)
+    )
+    first.call("routes", lambda: None)
+    second.call("routes", lambda: None)
+    assert sleeps == []  # the burst of 2, across both
+    first.call("routes", lambda: None)
+    assert len(sleeps) == 1 and sleeps[0] == pytest.approx(1.0, abs=0.1)
+
+
+def test_budget_rejects_non_positive_burst():
+    with pytest.raises(ValueError):
+        Budget(routes_monthly_cap=1, geocode_monthly_cap=1, warn_pcts=[], routes_burst=0)
@@ -174,7 +174,7 @@ def test_refresh_updates_status_from_html(conn, domain, tmp_path):
 
     # force=True means the re-download actually happened; the fetched HTML
     # was cached as the new canonical for "999".
-    canonical = tmp_path / "proj" / "html_extracted" / "999.html"
+    canonical = tmp_path / "proj" / "html_extracted" / "999.html.gz"
     assert canonical.exists()
 
 
@@ -463,7 +463,7 @@ def test_cli_refresh_routes_to_refresh_listings(tmp_path, monkeypatch):
     db = _seeded_db(tmp_path)
     calls = []
 
-    def fake_refresh_listings(conn, domain, project_dir, mode):
+    def fake_refresh_listings(conn, domain, project_dir, mode, workers=1):
         calls.append(mode)
         return {"candidates": 0, "refreshed": 0, "status_changed": 0, "errors": 0}
 
@@ -581,3 +581,39 @@ def test_refresh_salgsoppgave_failure_never_fails_run(conn, domain, tmp_path, mo
         ).fetchone()[0]
         == 0
     )
+
+
+def test_refresh_parallel_parse_matches_serial(tmp_path, domain):
+    """workers>1 moves only the parse off-process: statuses, history and
+    counts are the same as the serial run, and fetch order is unchanged."""
+    fixtures = sorted(p for p in FINN_FIXTURES.glob("*.html") if p.stem.isdigit())[:5]
+    pages = {p.stem: p.read_text(encoding="utf-8", errors="replace") for p in fixtures}
+
+    outcomes = []
+    for workers in (1, 2):
+        conn = connection.connect(tmp_path / f"r{workers}.db")
+        migrations.migrate(conn)
+        ListingsRepo(conn).upsert([_listing(fk, Tilgjengelighet="Til salgs") for fk in pages])
+        fetched = []
+
+        def fake_fetch(url):
+            fk = url.rsplit("=", 1)[1]
+            fetched.append(fk)
+
+            class FakeResponse:
+                content = pages[fk].encode("utf-8")
+
+                def raise_for_status(self):
+                    pass
+
+            return FakeResponse()
+
+        stats = refresh_listings(
+            conn, domain, tmp_path / f"proj{workers}", mode="all", fetch=fake_fetch,
+            fetch_delay=lambda: None, listing_delay=lambda: None, workers=workers,
+        )
+        statuses = dict(conn.execute("SELECT finnkode, tilgjengelighet FROM eiendom"))
+        history = conn.execute("SELECT COUNT(*) FROM eiendom_status_history").fetchone()[0]
+        details = conn.execute("SELECT COUNT(*) FROM listing_details").fetchone()[0]
+        outcomes.append((stats, statuses, history, details, fetched))
+    assert outcomes[0] == outcomes[1]
@@ -0,0 +1,101 @@
+"""snapshot_archive: monthly delta-encoded packs replacing one loose gzip
+file per ad-HTML snapshot."""
+import gzip
+import random
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from skannonser.ingest.finn.html_cache import html_sha256, save_ad_html
+from skannonser.ingest.finn.snapshot_archive import SnapshotArchive, decode_delta, encode_delta
+
+FIXTURES = Path(__file__).parent / "fixtures" / "finn"
+PAGE = (FIXTURES / "448347467.html").read_text(encoding="utf-8")
+
+
+def _versions(n):
+    """`n` successive versions of one ad, each a small edit of the last --
+    the shape FINN re-downloads actually have."""
+    out, page = [], PAGE
+    for i in range(n):
+        page = page.replace("kr", f"kr{i}", 1).replace("</body>", f"<!-- {i} --></body>")
+        out.append(page)
+    return out
+
+
+def _rows(root, month):
+    with sqlite3.connect(root / f"{month}.pack") as conn:
+        return conn.execute("SELECT day, base, length(data) FROM snapshot ORDER BY day").fetchall()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_delta_roundtrip(seed):
+    rng = random.Random(seed)
+    old = PAGE.encode()
+    new = bytearray(old)
+    for _ in range(rng.randint(0, 40)):
+        pos = rng.randrange(len(new))
+        new[pos:pos + rng.randint(0, 30)] = rng.randbytes(rng.randint(0, 30))
+    assert decode_delta(old, encode_delta(old, bytes(new))) == bytes(new)
+    assert decode_delta(b"", encode_delta(b"", old)) == old
+
+
+def test_versions_are_stored_as_small_deltas(tmp_path):
+    archive = SnapshotArchive(tmp_path)
+    versions = _versions(4)
+    for i, html in enumerate(versions):
+        archive.add("1", f"2026070{i + 1}", html, html_sha256(html))
+
+    rows = _rows(tmp_path, "202607")
+    assert rows[0][1] is None  # keyframe
+    assert [base for _, base, _ in rows[1:]] == ["20260701", "20260702", "20260703"]
+    assert all(size < rows[0][2] / 50 for _, _, size in rows[1:])
+    assert list(archive.history("1")) == [
+        (f"2026070{i + 1}", html) for i, html in enumerate(versions)
+    ]
+    assert archive.read("1", "20260703") == versions[2]
+    assert [s.sha256 for s in archive.snapshots("1")] == [html_sha256(v) for v in versions]
+
+
+def test_each_month_starts_with_a_keyframe(tmp_path):
+    archive = SnapshotArchive(tmp_path)
+    a, b = _versions(2)
+    archive.add("1", "20260731", a, html_sha256(a))
+    archive.add("1", "20260801", b, html_sha256(b))
+    assert _rows(tmp_path, "202608")[0][1] is None
+    assert [day for day, _ in archive.history("1")] == ["20260731", "20260801"]
+    assert archive.uids() == ["1"]
+
+
+def test_same_day_replace_rekeys_dependents(tmp_path):
+    archive = SnapshotArchive(tmp_path)
+    a, b, c = _versions(3)
+    archive.add("1", "20260701", a, html_sha256(a))
+    archive.add("1", "20260702", b, html_sha256(b))
+    archive.add("1", "20260701", c, html_sha256(c))  # overwrites the base of 0702
+    assert dict(archive.history("1")) == {"20260701": c, "20260702": b}
+
+
+def test_save_ad_html_writes_into_the_monthly_pack(tmp_path):
+    for i, html in enumerate(_versions(3)):
+        save_ad_html(tmp_path, "7", html, today=f"2026070{i + 1}")
+    root = tmp_path / "html_snapshots"
+    assert [p.name for p in root.iterdir()] == ["202607.pack"]
+    assert len(list(SnapshotArchive(root).history("7"))) == 3
+
+
+def test_pack_loose_migrates_legacy_files(tmp_path):
+    versions = _versions(3)
+    days = ["20260628", "20260701", "20260702"]
+    for day, html in zip(days, versions):
+        (tmp_path / f"9.{day}.html.gz").write_bytes(gzip.compress(html.encode()))
+    archive = SnapshotArchive(tmp_path)
+    assert [s.packed for s in archive.snapshots("9")] == [False] * 3
+
+    stats = archive.pack_loose()
+    assert stats["packed"] == 3
+    assert stats["bytes_after"] < stats["bytes_before"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["202606.pack", "202607.pack"]
+    assert list(archive.history("9")) == list(zip(days, versions))
+    assert archive.pack_loose()["packed"] == 0
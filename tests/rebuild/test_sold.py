@@ -568,6 +568,51 @@ def test_run_sold_sweep_density_first_within_request_budget(conn):
     assert stats["tiles_queried"] == 1
 
 
+def test_density_order_matches_full_scan(conn):
+    import random
+
+    from skannonser.enrich.sold import _PAD_LAT, _PAD_LON, run_sold_sweep, target_bbox
+
+    # Clusters tight enough to share boxes, exact duplicates, and points on a
+    # box edge exactly -- every density tie must break like the plain scan.
+    rng = random.Random(25)
+    centres = [(59.9 + rng.uniform(-0.01, 0.01), 10.75 + rng.uniform(-0.02, 0.02)) for _ in range(8)]
+    targets = []
+    for i in range(400):
+        lat, lng = rng.choice(centres)
+        if i % 7 == 0 and targets:
+            lat, lng = targets[-1]["lat"] + _PAD_LAT, targets[-1]["lng"] - _PAD_LON
+        elif i % 11 == 0 and targets:
+            lat, lng = targets[-1]["lat"], targets[-1]["lng"]
+        else:
+            lat, lng = lat + rng.uniform(-0.002, 0.002), lng + rng.uniform(-0.003, 0.003)
+        targets.append({
+            "finnkode": str(700000 + i), "lat": lat, "lng": lng,
+            "status": rng.choice(["solgt", "solgt", "inaktiv"]), "attempts": rng.randrange(3),
+        })
+
+    def scan_count(t):
+        lon0, lat0, lon1, lat1 = target_bbox(t)
+        return sum(lon0 <= o["lng"] <= lon1 and lat0 <= o["lat"] <= lat1 for o in targets)
+
+    expected = sorted(
+        targets,
+        key=lambda t: (t["status"] != "solgt", t["attempts"], -scan_count(t)),
+    )
+
+    centred = []
+
+    def fetch(url, **kwargs):
+        lon0, lat0, lon1, lat1 = (float(x) for x in kwargs["params"]["bbox"].split(","))
+        centred.append(((lat0 + lat1) / 2, (lon0 + lon1) / 2))
+        return FakeResp({"docs": []})
+
+    run_sold_sweep(conn, fetch=fetch, targets=targets, order_by_density=True)
+
+    assert len(centred) == len(targets)
+    assert centred == [pytest.approx((t["lat"], t["lng"])) for t in expected]
+
+
 def test_run_sold_sweep_tightens_box_when_target_hidden_by_cap(conn):
     from skannonser.enrich.sold import run_sold_sweep
 
@@ -23,6 +23,8 @@ by meters -- same convention as `test_enrich.py`'s `_north`):
     check is skipped for group-size reasons alone, so nothing is flagged
     despite the values looking like obvious outliers.
 """
+import json
+import random
 from pathlib import Path
 
 import pytest
@@ -36,6 +38,8 @@ from skannonser.store import connection, migrations
 from skannonser.store.repositories.listings import ListingsRepo
 from skannonser.store.repositories.processed import ProcessedRepo
 
+FIXTURES = Path(__file__).parent / "fixtures" / "validate"
+
 OSLO_LAT = 59.9139
 OSLO_LNG = 10.7522
 
@@ -275,6 +279,86 @@ def test_donor_distance_outlier_flagged(db_path, domain):
     assert not any(r.startswith("Postnr:") for r in finding["reasons"])
 
 
+# ---------------------------------------------------------------------------
+# Recorded findings: a seeded, messy listing history scored by the original
+# row-at-a-time implementation; any rewrite must reproduce them exactly.
+# ---------------------------------------------------------------------------
+
+
+def _seed_history(conn, seed: int, n: int) -> None:
+    """`n` listings in clusters around Oslo: noisy per-cluster travel values
+    with outliers, sentinels and out-of-range values, messy postnummer,
+    missing coordinates, donor links (near, far, chained, cyclic, dangling,
+    self), inactive listings acting as donors, unprocessed listings."""
+    rng = random.Random(seed)
+    centres = [
+        (OSLO_LAT + rng.uniform(-0.1, 0.1), OSLO_LNG + rng.uniform(-0.2, 0.2),
+         rng.uniform(20, 90), rng.uniform(20, 90), f"{rng.randrange(100, 1400):04d}")
+        for _ in range(max(1, n // 40))
+    ]
+    fks = [f"{500000 + i}" for i in range(n)]
+
+    def travel(base):
+        roll = rng.random()
+        if roll < 0.04:
+            return rng.choice([None, -1, -2, 0, 500, "abc"])
+        if roll < 0.09:
+            return round(base * rng.choice([0.3, 2.5, 3.0]))
+        return round(base + rng.uniform(-6, 6))
+
+    for i, fk in enumerate(fks):
+        lat0, lng0, brj, mvv, pnr = rng.choice(centres)
+        roll = rng.random()
+        link = None
+        if roll < 0.12:
+            link = rng.choice(fks)  # anywhere: often beyond the radius
+        elif roll < 0.15:
+            link = rng.choice([fk, "9999999", f" {fks[max(0, i - 1)]} ", ""])
+        active = 0 if rng.random() < 0.08 else 1
+        postnummer = rng.choice([pnr, pnr, pnr, int(pnr), f" {pnr} ", pnr.lstrip("0"), "N/A", None])
+        conn.execute(
+            "INSERT INTO eiendom (finnkode, url, adresse, postnummer, active) VALUES (?, 'u', ?, ?, ?)",
+            (fk, f"Gate {i}", postnummer, active),
+        )
+        if rng.random() < 0.03:
+            continue  # listed, never processed
+        lat = None if rng.random() < 0.03 else lat0 + rng.uniform(-0.004, 0.004)
+        conn.execute(
+            "INSERT INTO eiendom_processed (finnkode, lat, lng, pendl_rush_brj, pendl_rush_mvv, "
+            "travel_copy_from_finnkode) VALUES (?, ?, ?, ?, ?, ?)",
+            (fk, lat, lng0 + rng.uniform(-0.008, 0.008), travel(brj), travel(mvv), link),
+        )
+    conn.commit()
+
+
+@pytest.mark.parametrize(
+    "name,seed,n,params",
+    [
+        ("default", 7, 1500, {}),
+        ("wide", 11, 1500, {"radius_m": 750.0, "min_neighbors": 3, "score_threshold": 2}),
+    ],
+)
+def test_findings_match_recorded(db_path, domain, name, seed, n, params):
+    conn = connection.connect(db_path)
+    _seed_history(conn, seed, n)
+    findings = validate_travel(conn, domain, **params)
+    expected = json.loads((FIXTURES / f"history_{name}.json").read_text())
+    assert findings == expected
+
+
+def test_include_inactive_widens_the_scan(db_path, domain):
+    conn = connection.connect(db_path)
+    for i, (fk, val) in enumerate({"I1": 29, "I2": 30, "I3": 31, "I4": 30, "I5": 32}.items()):
+        _seed_row(conn, fk, offset_m=i * 40, brj=val, postnummer="1006")
+    _seed_row(conn, "IOUT", offset_m=200, brj=90, postnummer="1006")
+    conn.execute("UPDATE eiendom SET active = 0 WHERE finnkode IN ('I1', 'IOUT')")
+    conn.commit()
+
+    assert validate_travel(conn, domain) == []
+    flagged = [f["finnkode"] for f in validate_travel(conn, domain, include_inactive=True)]
+    assert flagged == ["IOUT"]
+
+
 # ---------------------------------------------------------------------------
 # CLI smoke test
 # ---------------------------------------------------------------------------